@@ -226,6 +226,12 @@ def main():
         logger.info("Starting Qt event loop...")
         exit_code = app.exec()
         logger.info(f"Application exited with code: {exit_code}")
+
+        # Finish pending background DB writes before exiting
+        from core.db_worker import shutdown_db_worker
+        from database.usage_queue import close_usage_queues
+        shutdown_db_worker()
+        close_usage_queues()
         sys.exit(exit_code)
 
     except Exception as e:
@@ -173,9 +173,6 @@ class MainController:
         try:
             logger.info("Loading all categories (clearing filters)")
 
-            # Clear filter engine cache (database may have changed)
-            self.category_filter_engine.clear_cache()
-
             # Reload ALL categories from database
             self._all_categories = self.config_manager.load_default_categories()
             self.categories = self._all_categories  # Reset to all categories
@@ -194,14 +191,14 @@ class MainController:
 
     def invalidate_filter_cache(self) -> None:
         """
-        Invalidate filter engine cache when database changes
-        This should be called after any category/item modifications
+        Invalidate filter engine and categories caches
+
+        Writes through DBManager invalidate them automatically (change bus);
+        this forces a full reload, e.g. after restoring a database file.
         """
         logger.debug("Invalidating filter engine cache")
         self.category_filter_engine.clear_cache()
-        # Also clear config manager cache
-        if hasattr(self.config_manager, '_categories_cache'):
-            self.config_manager._categories_cache = None
+        self.config_manager.invalidate_cache()
 
     def toggle_browser(self):
         """Toggle browser window visibility"""
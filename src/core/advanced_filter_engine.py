@@ -1,15 +1,397 @@
 """
 Advanced Filter Engine
 Motor de filtrado avanzado para items
+
+Cada dict de filtros se compila una vez (CompiledFilters) en un único
+predicado fusionado, más la clave de orden y el top N, y se guarda (LRU)
+por su forma canónica hashable: aplicarlo recorre los items una sola vez, sin listas
+intermedias por filtro. Con top N y orden se seleccionan los N primeros
+con un heap (heapq) en vez de ordenar todo; con top N sin orden el
+recorrido se detiene al llegar a N.
+
+Los presets relativos ("today", "last_7_days"...) se resuelven al aplicar
+el filtro, así un plan cacheado sigue siendo válido al cambiar el día.
+
+El plan incluye también la traducción a SQL (FilterSQL): filter_item_ids()
+filtra, ordena y limita en la base de datos y devuelve los IDs, sin cargar
+las filas descartadas (los paneles flotantes cargan así solo los items que
+cumplen sus filtros); apply_filters() da los mismos resultados sobre items
+ya cargados en memoria.
 """
 
-from typing import List, Dict, Any, Optional
+import heapq
+import json
+import logging
+import sqlite3
+from collections import OrderedDict
 from datetime import datetime, timedelta
+from itertools import islice
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
 import sys
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
+from core.flag_index import FlagIndex
 from models.item import Item, ItemType
+from utils.hashable import freeze
+
+logger = logging.getLogger(__name__)
+
+# Planes compilados guardados (LRU por forma canónica de los filtros)
+PLAN_CACHE_SIZE = 64
+
+# Orden: criterio -> (clave, descendente)
+_SORT_KEYS = {
+    'use_count_desc': (lambda x: getattr(x, 'use_count', 0), True),
+    'use_count_asc': (lambda x: getattr(x, 'use_count', 0), False),
+    'recent': (lambda x: getattr(x, 'last_used', None) or datetime.min, True),
+    'oldest': (lambda x: getattr(x, 'created_at', None) or datetime.max, False),
+    'label_asc': (lambda x: x.label.lower(), False),
+    'label_desc': (lambda x: x.label.lower(), True),
+}
+
+
+def _start_of_day(now: datetime) -> datetime:
+    return now.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+# Presets de fecha: campo -> preset -> inicio del periodo según la fecha actual
+_DATE_PRESETS = {
+    'last_used': {
+        'today': _start_of_day,
+        'last_7_days': lambda now: now - timedelta(days=7),
+        'last_30_days': lambda now: now - timedelta(days=30),
+        'last_90_days': lambda now: now - timedelta(days=90),
+    },
+    'created_at': {
+        'today': _start_of_day,
+        'this_week': lambda now: _start_of_day(now - timedelta(days=now.weekday())),
+        'this_month': lambda now: _start_of_day(now.replace(day=1)),
+        'last_7_days': lambda now: now - timedelta(days=7),
+        'last_30_days': lambda now: now - timedelta(days=30),
+    },
+}
+
+# Filtros de flags que resuelve un FlagIndex: filtro -> bitmap
+_INDEX_FLAGS = {
+    'is_favorite': 'favorite',
+    'is_sensitive': 'sensitive',
+    'is_list': 'list',
+}
+
+_COMPARE = {
+    '>': lambda a, b: a > b,
+    '>=': lambda a, b: a >= b,
+    '<': lambda a, b: a < b,
+    '<=': lambda a, b: a <= b,
+    '=': lambda a, b: a == b,
+}
+
+Check = Callable[[Item], bool]
+
+
+def _fuse(checks: List[Check]) -> Optional[Check]:
+    """Un único predicado que cumple todas las condiciones (None si no hay)"""
+    if not checks:
+        return None
+    if len(checks) == 1:
+        return checks[0]
+    if len(checks) == 2:
+        first, second = checks
+        return lambda item: first(item) and second(item)
+    checks = tuple(checks)
+
+    def all_checks(item):
+        for check in checks:
+            if not check(item):
+                return False
+        return True
+    return all_checks
+
+
+def _parse_created_at(item: Item) -> Optional[datetime]:
+    """created_at del item como datetime (los textos se convierten)"""
+    item_date = item.created_at
+    if isinstance(item_date, str):
+        try:
+            return datetime.fromisoformat(item_date.replace('Z', '+00:00'))
+        except ValueError:
+            try:
+                return datetime.strptime(item_date, '%Y-%m-%d %H:%M:%S')
+            except ValueError:
+                logger.warning(f"Could not parse created_at for item '{item.label}': {item_date}")
+                return None
+    return item_date
+
+
+# ========== SQL (push-down) ==========
+#
+# Los mismos filtros como WHERE/ORDER BY/LIMIT parametrizados sobre items
+# (alias i), para no cargar como Item las filas que se van a descartar.
+# Equivalen al predicado en memoria sobre Items con los valores de la fila
+# (tags parseados como en get_items_by_category, fechas desde *_ts en UTC):
+# - las fechas de los filtros se comparan como UTC, igual que los Items
+# - los tags se leen del JSON de items.tags (exactos, distinguiendo
+#   mayúsculas); el CSV antiguo se convierte con filter_tags_json
+# - el orden por label usa str.lower de Python (filter_lower)
+# - a igualdad de clave se mantiene el orden de carga (created_at, id)
+# Si algún valor no se puede traducir (fechas guardadas como texto, por
+# ejemplo) no hay plan SQL y se filtra en memoria.
+
+_EPOCH = datetime(1970, 1, 1)
+
+# Items con tags (JSON, o CSV antiguo convertido)
+_TAGS_SQL = "(CASE WHEN i.tags LIKE '[%' AND json_valid(i.tags) THEN i.tags ELSE filter_tags_json(i.tags) END)"
+
+_SQL_ORDER = {
+    'use_count_desc': "COALESCE(i.use_count, 0) DESC",
+    'use_count_asc': "COALESCE(i.use_count, 0)",
+    'recent': "i.last_used_ts DESC",
+    'oldest': "i.created_at_ts IS NULL, i.created_at_ts",
+    'label_asc': "filter_lower(i.label)",
+    'label_desc': "filter_lower(i.label) DESC",
+}
+
+# Orden de carga de los items (get_items_by_category)
+_SQL_BASE_ORDER = "i.created_at, i.id"
+
+_SQL_OPERATORS = {'>': '>', '>=': '>=', '<': '<', '<=': '<=', '=': '='}
+
+
+def _tags_json(raw) -> str:
+    """Tags de items.tags como array JSON (formato CSV antiguo incluido)"""
+    if not raw:
+        return '[]'
+    try:
+        tags = json.loads(raw)
+    except (TypeError, ValueError):
+        tags = [tag.strip() for tag in str(raw).split(',') if tag.strip()]
+    if not tags:
+        return '[]'
+    return json.dumps(tags if isinstance(tags, list) else [tags])
+
+
+def register_sql_functions(conn) -> None:
+    """Registrar en la conexión las funciones que usan los planes SQL"""
+    conn.create_function('filter_tags_json', 1, _tags_json, deterministic=True)
+    conn.create_function('filter_lower', 1,
+                         lambda value: value.lower() if isinstance(value, str) else value,
+                         deterministic=True)
+
+
+def _epoch_from(value: datetime) -> int:
+    """Primer segundo entero >= value (datetime naive como UTC)"""
+    delta = value - _EPOCH
+    seconds = delta.days * 86400 + delta.seconds
+    return seconds + 1 if delta.microseconds else seconds
+
+
+def _epoch_to(value: datetime) -> int:
+    """Último segundo entero <= value (datetime naive como UTC)"""
+    delta = value - _EPOCH
+    return delta.days * 86400 + delta.seconds
+
+
+def _is_naive_datetime(value) -> bool:
+    return isinstance(value, datetime) and value.tzinfo is None
+
+
+class FilterSQL:
+    """
+    Filtros traducidos a SQL
+
+    where y order_by usan el alias i; los parámetros de los presets de
+    fecha son funciones (ahora) -> valor y se resuelven en sql().
+    """
+
+    def __init__(self, conditions: List[str], params: list, order_by: Optional[str],
+                 top_n: Optional[int]):
+        self.where = " AND ".join(conditions) if conditions else "1"
+        self._params = tuple(params)
+        self.order_by = f"{order_by}, {_SQL_BASE_ORDER}" if order_by else _SQL_BASE_ORDER
+        self.top_n = top_n
+
+    def sql(self, columns: str = "i.id", category_id: Optional[int] = None,
+            exclude_lists: bool = False, now: Optional[datetime] = None) -> Tuple[str, tuple]:
+        """
+        Sentencia SELECT completa sobre items i
+
+        Args:
+            columns: Columnas a devolver
+            category_id: Solo los items de esta categoría
+            exclude_lists: Excluir los items de listas (como los paneles)
+            now: Fecha actual para los presets relativos
+
+        Returns:
+            (sql, parámetros)
+        """
+        now = now or datetime.now()
+        params = [param(now) if callable(param) else param for param in self._params]
+        conditions = [self.where]
+        if category_id is not None:
+            conditions.insert(0, "i.category_id = ?")
+            params.insert(0, category_id)
+        if exclude_lists:
+            conditions.append("NOT COALESCE(i.is_list = 1, 0)")
+        sql = f"SELECT {columns} FROM items i WHERE {' AND '.join(conditions)} ORDER BY {self.order_by}"
+        if self.top_n:
+            sql += " LIMIT ?"
+            params.append(self.top_n)
+        return sql, tuple(params)
+
+
+def _compile_sql(filters: Dict[str, Any]) -> Optional[FilterSQL]:
+    """Traducir un dict de filtros a SQL (None si algún valor no se puede traducir)"""
+    conditions: List[str] = []
+    params: list = []
+
+    if 'type' in filters and filters['type']:
+        wanted = {t.upper() for t in filters['type']}
+        values = sorted(t.value.upper() for t in ItemType if t.value.upper() in wanted)
+        if not values:
+            conditions.append("0")
+        else:
+            conditions.append(f"i.type IN ({', '.join('?' for _ in values)})")
+            params.extend(values)
+
+    for flag, column in (('is_favorite', 'is_favorite'), ('is_sensitive', 'is_sensitive')):
+        if flag in filters and filters[flag] is not None:
+            expected = filters[flag]
+            if expected not in (True, False):
+                conditions.append("0")
+            else:
+                conditions.append(f"COALESCE(i.{column}, 0) {'<>' if expected else '='} 0")
+
+    if 'has_tags' in filters and filters['has_tags'] is not None:
+        exists = f"EXISTS (SELECT 1 FROM json_each({_TAGS_SQL}))"
+        conditions.append(exists if filters['has_tags'] else f"NOT {exists}")
+
+    if 'is_list' in filters and filters['is_list'] is not None:
+        expected = filters['is_list']
+        if expected not in (True, False):
+            conditions.append("0")
+        else:
+            conditions.append("COALESCE(i.is_list = 1, 0)" if expected else "NOT COALESCE(i.is_list = 1, 0)")
+
+    if 'tags' in filters and filters['tags'] and 'values' in filters['tags']:
+        target_tags = list(filters['tags']['values'])
+        if filters['tags'].get('mode', 'OR').upper() == 'AND':
+            conditions.append(f"EXISTS (SELECT 1 FROM json_each({_TAGS_SQL}))")
+            for tag in target_tags:
+                conditions.append(f"EXISTS (SELECT 1 FROM json_each({_TAGS_SQL}) WHERE value = ?)")
+                params.append(tag)
+        elif not target_tags:
+            conditions.append("0")
+        else:
+            conditions.append(f"EXISTS (SELECT 1 FROM json_each({_TAGS_SQL})"
+                              f" WHERE value IN ({', '.join('?' for _ in target_tags)}))")
+            params.extend(target_tags)
+
+    if 'use_count' in filters and filters['use_count']:
+        operator = _SQL_OPERATORS.get(filters['use_count'].get('operator', '>'))
+        value = filters['use_count'].get('value', 0)
+        if operator is None:
+            conditions.append("0")
+        elif isinstance(value, (int, float)):
+            conditions.append(f"COALESCE(i.use_count, 0) {operator} ?")
+            params.append(value)
+        else:
+            return None
+
+    for field in ('last_used', 'created_at'):
+        date_filter = filters.get(field)
+        if not date_filter:
+            continue
+        column = f"i.{field}_ts"
+        if 'preset' in date_filter:
+            preset = date_filter['preset']
+            if field == 'last_used' and preset == 'never':
+                conditions.append("COALESCE(i.use_count, 0) = 0")
+                continue
+            start_of = _DATE_PRESETS[field].get(preset)
+            if start_of is not None:
+                conditions.append(f"{column} >= ?")
+                params.append(lambda now, start_of=start_of: _epoch_from(start_of(now)))
+        elif 'custom_from' in date_filter and 'custom_to' in date_filter:
+            from_date = date_filter['custom_from']
+            to_date = date_filter['custom_to']
+            if not (_is_naive_datetime(from_date) and _is_naive_datetime(to_date)):
+                return None
+            conditions.append(f"{column} BETWEEN ? AND ?")
+            params.extend([_epoch_from(from_date), _epoch_to(to_date)])
+
+    return FilterSQL(conditions, params, _SQL_ORDER.get(filters.get('sort_by')),
+                     filters.get('top_n') or None)
+
+
+class CompiledFilters:
+    """
+    Filtros compilados: predicado fusionado, orden y top N
+
+    checks son condiciones fijas; timed_checks, funciones (ahora) ->
+    condición para los presets relativos a la fecha actual. sql_plan es
+    la traducción a SQL (FilterSQL), si la hay.
+    """
+
+    def __init__(self, checks: List[Check], timed_checks: List[Callable[[datetime], Check]],
+                 sort_by: Optional[str], top_n: Optional[int], sql: Optional[FilterSQL] = None,
+                 index_checks: List[Check] = (), index_terms: List[Tuple[str, Any]] = ()):
+        self.checks = list(index_checks) + checks
+        self.timed_checks = timed_checks
+        self.sort_key, self.reverse = _SORT_KEYS.get(sort_by, (None, False))
+        self.top_n = top_n or None
+        self._predicate = _fuse(self.checks)
+        self.sql_plan = sql  # None: solo en memoria
+        # Condiciones de flags/tipo que resuelve un FlagIndex: (bitmap, esperado)
+        self.index_terms = list(index_terms)
+        self._residual_checks = checks
+        self._residual = _fuse(checks)
+
+    def predicate(self, now: Optional[datetime] = None, residual: bool = False) -> Optional[Check]:
+        """
+        Predicado fusionado con los presets resueltos en now (None = sin condiciones)
+
+        residual: sin las condiciones de index_terms (ya aplicadas con bitmaps)
+        """
+        checks, fused = (self._residual_checks, self._residual) if residual else (self.checks, self._predicate)
+        if not self.timed_checks:
+            return fused
+        now = now or datetime.now()
+        return _fuse(checks + [timed(now) for timed in self.timed_checks])
+
+    def index_bits(self, index: FlagIndex) -> int:
+        """Bitmap de los items de index que cumplen index_terms"""
+        bits = index.live
+        for name, expected in self.index_terms:
+            if name == 'type':
+                bits &= index.types_bitmap(expected)
+            else:
+                bits &= getattr(index, name) if expected else ~getattr(index, name)
+        return bits
+
+    def apply(self, items: List[Item], now: Optional[datetime] = None,
+              flag_index: Optional[FlagIndex] = None) -> List[Item]:
+        """
+        Filtrar (una pasada), ordenar y limitar
+
+        flag_index: FlagIndex de items (mismos items y orden); los filtros de
+        flags y tipo se resuelven con sus bitmaps y el resto solo se evalúa
+        sobre los candidatos
+        """
+        if flag_index is not None and self.index_terms:
+            items = flag_index.select(self.index_bits(flag_index))
+            predicate = self.predicate(now, residual=True)
+        else:
+            predicate = self.predicate(now)
+        matching = filter(predicate, items) if predicate else iter(items)
+
+        if self.sort_key is None:
+            return list(islice(matching, self.top_n)) if self.top_n else list(matching)
+        if self.top_n:
+            # Igual que sorted(...)[:top_n], también en los empates
+            select = heapq.nlargest if self.reverse else heapq.nsmallest
+            return select(self.top_n, matching, key=self.sort_key)
+        return sorted(matching, key=self.sort_key, reverse=self.reverse)
 
 
 class AdvancedFilterEngine:
@@ -26,15 +408,18 @@ class AdvancedFilterEngine:
 
     def __init__(self):
         """Inicializar el motor de filtrado"""
-        self.cache = {}  # Caché para resultados de filtros (optimización futura)
+        # Planes compilados por forma canónica de los filtros (LRU)
+        self.cache: "OrderedDict[Hashable, CompiledFilters]" = OrderedDict()
 
-    def apply_filters(self, items: List[Item], filters: Dict[str, Any]) -> List[Item]:
+    def apply_filters(self, items: List[Item], filters: Dict[str, Any],
+                      flag_index: Optional[FlagIndex] = None) -> List[Item]:
         """
         Aplicar todos los filtros a la lista de items
 
         Args:
             items: Lista de items a filtrar
             filters: Diccionario con los criterios de filtrado
+            flag_index: FlagIndex de items (opcional): flags y tipo con bitmaps
 
         Returns:
             Lista de items que cumplen todos los criterios
@@ -47,409 +432,236 @@ class AdvancedFilterEngine:
                 "use_count": {"operator": ">", "value": 5}
             }
         """
-        import logging
-        logger = logging.getLogger(__name__)
-
-        logger.debug(f"apply_filters called with {len(items)} items and filters: {filters}")
-
         if not filters:
             return items
+        return self.compile(filters).apply(items, flag_index=flag_index)
 
-        filtered = items.copy()
-
-        # Aplicar cada filtro secuencialmente
-        if 'type' in filters and filters['type']:
-            filtered = self._filter_by_type(filtered, filters['type'])
-
-        if 'is_favorite' in filters and filters['is_favorite'] is not None:
-            filtered = self._filter_by_favorite(filtered, filters['is_favorite'])
-
-        if 'is_sensitive' in filters and filters['is_sensitive'] is not None:
-            filtered = self._filter_by_sensitive(filtered, filters['is_sensitive'])
-
-        if 'has_tags' in filters and filters['has_tags'] is not None:
-            filtered = self._filter_by_has_tags(filtered, filters['has_tags'])
-
-        if 'is_list' in filters and filters['is_list'] is not None:
-            filtered = self._filter_by_is_list(filtered, filters['is_list'])
-
-        if 'tags' in filters and filters['tags']:
-            filtered = self._filter_by_tags(filtered, filters['tags'])
-
-        if 'use_count' in filters and filters['use_count']:
-            filtered = self._filter_by_use_count(filtered, filters['use_count'])
-
-        if 'last_used' in filters and filters['last_used']:
-            filtered = self._filter_by_last_used(filtered, filters['last_used'])
-
-        if 'created_at' in filters and filters['created_at']:
-            logger.debug(f"Applying created_at filter: {filters['created_at']}")
-            before_count = len(filtered)
-            filtered = self._filter_by_created_date(filtered, filters['created_at'])
-            logger.debug(f"After created_at filter: {len(filtered)} items (was {before_count})")
-
-        # Aplicar ordenamiento si se especifica
-        if 'sort_by' in filters and filters['sort_by']:
-            filtered = self._sort_items(filtered, filters['sort_by'])
-
-        # Limitar a top N si se especifica
-        if 'top_n' in filters and filters['top_n']:
-            filtered = filtered[:filters['top_n']]
-
-        return filtered
-
-    def _filter_by_type(self, items: List[Item], types: List[str]) -> List[Item]:
+    def filter_item_ids(self, db, filters: Dict[str, Any], category_id: Optional[int] = None,
+                        exclude_lists: bool = False) -> Optional[List[int]]:
         """
-        Filtrar por tipo de item
+        Aplicar los filtros en la base de datos (SQL) en lugar de en memoria
 
         Args:
-            items: Lista de items
-            types: Lista de tipos permitidos (ej: ["TEXT", "URL"])
+            db: DBManager
+            filters: Diccionario con los criterios de filtrado
+            category_id: Solo los items de esta categoría
+            exclude_lists: Excluir los items de listas
 
         Returns:
-            Items que son de alguno de los tipos especificados
+            IDs de los items que cumplen los filtros, ordenados y limitados
+            como apply_filters; None si no se pueden traducir a SQL o la
+            consulta falla (usar apply_filters)
         """
-        if not types:
-            return items
+        plan = self.compile(filters).sql_plan
+        if plan is None:
+            return None
+
+        sql, params = plan.sql(category_id=category_id, exclude_lists=exclude_lists)
+        try:
+            conn = db.connect()
+            register_sql_functions(conn)
+            return [row[0] for row in conn.execute(sql, params).fetchall()]
+        except sqlite3.Error as e:
+            logger.warning(f"Filter push-down failed, filtering in memory: {e}")
+            return None
+
+    def compile(self, filters: Dict[str, Any]) -> CompiledFilters:
+        """
+        Plan compilado de un dict de filtros (cacheado por su forma canónica)
 
-        return [
-            item for item in items
-            if item.type.value.upper() in [t.upper() for t in types]
-        ]
+        Args:
+            filters: Diccionario con los criterios de filtrado
 
-    def _filter_by_favorite(self, items: List[Item], is_favorite: bool) -> List[Item]:
+        Returns:
+            CompiledFilters
         """
-        Filtrar por items favoritos
+        key = self._filter_key(filters)
+        plan = self.cache.get(key)
+        if plan is not None:
+            self.cache.move_to_end(key)
+            return plan
+
+        plan = self._compile(filters)
+        self.cache[key] = plan
+        if len(self.cache) > PLAN_CACHE_SIZE:
+            # El usado hace más tiempo
+            self.cache.popitem(last=False)
+        return plan
+
+    @staticmethod
+    def _filter_key(filters: Dict[str, Any]) -> Hashable:
+        """
+        Clave canónica de una combinación de filtros
 
         Args:
-            items: Lista de items
-            is_favorite: True para solo favoritos, False para solo no favoritos
+            filters: Diccionario de filtros
 
         Returns:
-            Items filtrados
+            frozenset de pares (filtro, valor), independiente del orden
         """
-        import logging
-        logger = logging.getLogger(__name__)
-        logger.debug(f"_filter_by_favorite called with {len(items)} items, is_favorite={is_favorite}")
+        return freeze(filters)
 
-        filtered = [
-            item for item in items
-            if hasattr(item, 'is_favorite') and item.is_favorite == is_favorite
-        ]
+    def _compile(self, filters: Dict[str, Any]) -> CompiledFilters:
+        """Compilar cada filtro activo a una condición, las más baratas primero"""
+        checks: List[Check] = []
+        timed_checks: List[Callable[[datetime], Check]] = []
+        # Las condiciones que también puede resolver un FlagIndex van aparte
+        index_checks: List[Check] = []
+        index_terms: List[Tuple[str, Any]] = []
 
-        logger.debug(f"_filter_by_favorite returning {len(filtered)} items")
-        for item in items[:3]:  # Log first 3 items for debugging
-            has_attr = hasattr(item, 'is_favorite')
-            value = getattr(item, 'is_favorite', None) if has_attr else None
-            logger.debug(f"  Item '{item.label}': has_is_favorite={has_attr}, value={value}")
+        if 'type' in filters and filters['type']:
+            index_checks.append(self._compile_type(filters['type']))
+            index_terms.append(('type', [t.upper() for t in filters['type']]))
+
+        for flag in ('is_favorite', 'is_sensitive', 'has_tags', 'is_list'):
+            if flag in filters and filters[flag] is not None:
+                check = self._compile_flag(flag, filters[flag])
+                if flag in _INDEX_FLAGS and filters[flag] in (True, False):
+                    index_checks.append(check)
+                    index_terms.append((_INDEX_FLAGS[flag], bool(filters[flag])))
+                else:
+                    checks.append(check)
 
-        return filtered
+        if 'tags' in filters and filters['tags']:
+            check = self._compile_tags(filters['tags'])
+            if check:
+                checks.append(check)
 
-    def _filter_by_sensitive(self, items: List[Item], is_sensitive: bool) -> List[Item]:
-        """
-        Filtrar por items sensibles
+        if 'use_count' in filters and filters['use_count']:
+            checks.append(self._compile_use_count(filters['use_count']))
 
-        Args:
-            items: Lista de items
-            is_sensitive: True para solo sensibles, False para solo no sensibles
+        for field in ('last_used', 'created_at'):
+            if field in filters and filters[field]:
+                fixed, timed = self._compile_date(field, filters[field])
+                if fixed:
+                    checks.append(fixed)
+                if timed:
+                    timed_checks.append(timed)
 
-        Returns:
-            Items filtrados
-        """
-        return [
-            item for item in items
-            if item.is_sensitive == is_sensitive
-        ]
+        return CompiledFilters(checks, timed_checks, filters.get('sort_by'), filters.get('top_n'),
+                               sql=_compile_sql(filters), index_checks=index_checks,
+                               index_terms=index_terms)
 
-    def _filter_by_has_tags(self, items: List[Item], has_tags: bool) -> List[Item]:
+    def _compile_type(self, types: List[str]) -> Check:
         """
-        Filtrar por items con/sin tags
+        Filtrar por tipo de item
 
         Args:
-            items: Lista de items
-            has_tags: True para items con tags, False para items sin tags
-
-        Returns:
-            Items filtrados
+            types: Lista de tipos permitidos (ej: ["TEXT", "URL"])
         """
-        if has_tags:
-            return [item for item in items if item.tags and len(item.tags) > 0]
-        else:
-            return [item for item in items if not item.tags or len(item.tags) == 0]
+        wanted = {t.upper() for t in types}
+        # Valores de ItemType aceptados: sin pasar a mayúsculas en cada item
+        allowed = frozenset(t.value for t in ItemType if t.value.upper() in wanted)
+        return lambda item: item.type.value in allowed
 
-    def _filter_by_is_list(self, items: List[Item], is_list: bool) -> List[Item]:
+    def _compile_flag(self, flag: str, expected: bool) -> Check:
         """
-        Filtrar por items que son listas
+        Filtrar por favorito, sensible, con/sin tags o lista
 
         Args:
-            items: Lista de items
-            is_list: True para solo listas, False para solo items normales
-
-        Returns:
-            Items filtrados
+            flag: is_favorite, is_sensitive, has_tags o is_list
+            expected: True para solo los que lo cumplen, False para el resto
         """
-        return [
-            item for item in items
-            if hasattr(item, 'is_list_item') and item.is_list_item() == is_list
-        ]
-
-    def _filter_by_tags(self, items: List[Item], tag_filter: Dict[str, Any]) -> List[Item]:
+        if flag == 'is_favorite':
+            return lambda item: getattr(item, 'is_favorite', None) == expected
+        if flag == 'is_sensitive':
+            return lambda item: item.is_sensitive == expected
+        if flag == 'has_tags':
+            if expected:
+                return lambda item: bool(item.tags)
+            return lambda item: not item.tags
+        return lambda item: hasattr(item, 'is_list_item') and item.is_list_item() == expected
+
+    def _compile_tags(self, tag_filter: Dict[str, Any]) -> Optional[Check]:
         """
         Filtrar por tags específicos
 
         Args:
-            items: Lista de items
             tag_filter: Dict con "values" (lista de tags) y "mode" (AND/OR)
 
-        Returns:
-            Items filtrados
-
         Ejemplo:
             tag_filter = {"values": ["git", "docker"], "mode": "OR"}
         """
-        if not tag_filter or 'values' not in tag_filter:
-            return items
+        if 'values' not in tag_filter:
+            return None
 
-        target_tags = tag_filter['values']
-        mode = tag_filter.get('mode', 'OR').upper()
-
-        if mode == 'AND':
+        target_tags = tuple(tag_filter['values'])
+        if tag_filter.get('mode', 'OR').upper() == 'AND':
             # Item debe tener TODOS los tags
-            return [
-                item for item in items
-                if item.tags and all(tag in item.tags for tag in target_tags)
-            ]
-        else:  # OR
-            # Item debe tener AL MENOS UN tag
-            return [
-                item for item in items
-                if item.tags and any(tag in item.tags for tag in target_tags)
-            ]
-
-    def _filter_by_use_count(self, items: List[Item], count_filter: Dict[str, Any]) -> List[Item]:
+            return lambda item: bool(item.tags) and all(tag in item.tags for tag in target_tags)
+        # Item debe tener AL MENOS UN tag
+        return lambda item: bool(item.tags) and any(tag in item.tags for tag in target_tags)
+
+    def _compile_use_count(self, count_filter: Dict[str, Any]) -> Check:
         """
         Filtrar por número de usos
 
         Args:
-            items: Lista de items
             count_filter: Dict con "operator" y "value"
 
-        Returns:
-            Items filtrados
-
         Ejemplo:
             count_filter = {"operator": ">", "value": 5}
         """
-        if not count_filter:
-            return items
-
-        operator = count_filter.get('operator', '>')
+        compare = _COMPARE.get(count_filter.get('operator', '>'))
         value = count_filter.get('value', 0)
+        if compare is None:
+            # Operador desconocido: ningún item lo cumple
+            return lambda item: False
+        return lambda item: compare(getattr(item, 'use_count', 0), value)
 
-        filtered = []
-        for item in items:
-            use_count = getattr(item, 'use_count', 0)
-
-            if operator == '>':
-                if use_count > value:
-                    filtered.append(item)
-            elif operator == '>=':
-                if use_count >= value:
-                    filtered.append(item)
-            elif operator == '<':
-                if use_count < value:
-                    filtered.append(item)
-            elif operator == '<=':
-                if use_count <= value:
-                    filtered.append(item)
-            elif operator == '=':
-                if use_count == value:
-                    filtered.append(item)
-
-        return filtered
-
-    def _filter_by_last_used(self, items: List[Item], date_filter: Dict[str, Any]) -> List[Item]:
+    def _compile_date(self, field: str, date_filter: Dict[str, Any]
+                      ) -> Tuple[Optional[Check], Optional[Callable[[datetime], Check]]]:
         """
-        Filtrar por fecha de último uso
+        Filtrar por fecha de último uso o de creación
 
         Args:
-            items: Lista de items
+            field: last_used o created_at
             date_filter: Dict con preset o rango personalizado
 
         Returns:
-            Items filtrados
+            (condición fija, condición según la fecha actual); None si no filtra
 
         Ejemplo:
             date_filter = {"preset": "last_7_days"}
             date_filter = {"custom_from": datetime, "custom_to": datetime}
         """
-        if not date_filter:
-            return items
-
-        now = datetime.now()
-
         # Usar preset si está disponible
         if 'preset' in date_filter:
             preset = date_filter['preset']
-
-            if preset == 'today':
-                start_date = now.replace(hour=0, minute=0, second=0, microsecond=0)
-            elif preset == 'last_7_days':
-                start_date = now - timedelta(days=7)
-            elif preset == 'last_30_days':
-                start_date = now - timedelta(days=30)
-            elif preset == 'last_90_days':
-                start_date = now - timedelta(days=90)
-            elif preset == 'never':
+            if field == 'last_used' and preset == 'never':
                 # Items nunca usados (use_count = 0)
-                return [item for item in items if getattr(item, 'use_count', 0) == 0]
-            else:
-                return items
-
-            return [
-                item for item in items
-                if hasattr(item, 'last_used') and item.last_used >= start_date
-            ]
-
-        # Usar rango personalizado
-        if 'custom_from' in date_filter and 'custom_to' in date_filter:
-            from_date = date_filter['custom_from']
-            to_date = date_filter['custom_to']
-
-            return [
-                item for item in items
-                if hasattr(item, 'last_used') and from_date <= item.last_used <= to_date
-            ]
-
-        return items
+                return (lambda item: getattr(item, 'use_count', 0) == 0), None
 
-    def _filter_by_created_date(self, items: List[Item], date_filter: Dict[str, Any]) -> List[Item]:
-        """
-        Filtrar por fecha de creación
-
-        Args:
-            items: Lista de items
-            date_filter: Dict con preset o rango personalizado
+            start_of = _DATE_PRESETS[field].get(preset)
+            if start_of is None:
+                return None, None
 
-        Returns:
-            Items filtrados
-        """
-        import logging
-        logger = logging.getLogger(__name__)
-
-        if not date_filter:
-            return items
-
-        now = datetime.now()
-
-        # Usar preset si está disponible
-        if 'preset' in date_filter:
-            preset = date_filter['preset']
-
-            if preset == 'today':
-                start_date = now.replace(hour=0, minute=0, second=0, microsecond=0)
-            elif preset == 'this_week':
-                start_date = now - timedelta(days=now.weekday())
-                start_date = start_date.replace(hour=0, minute=0, second=0, microsecond=0)
-            elif preset == 'this_month':
-                start_date = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-            elif preset == 'last_7_days':
-                start_date = now - timedelta(days=7)
-            elif preset == 'last_30_days':
-                start_date = now - timedelta(days=30)
+            if field == 'last_used':
+                def timed(now):
+                    start_date = start_of(now)
+                    return lambda item: getattr(item, 'last_used', None) is not None and item.last_used >= start_date
             else:
-                return items
-
-            logger.debug(f"Date filter preset '{preset}': start_date={start_date}, now={now}")
-
-            filtered = []
-            for item in items:
-                if hasattr(item, 'created_at') and item.created_at:
-                    if item.created_at >= start_date:
-                        filtered.append(item)
-                        logger.debug(f"Item '{item.label}' included: created_at={item.created_at}")
-                    else:
-                        logger.debug(f"Item '{item.label}' excluded: created_at={item.created_at} < {start_date}")
-                else:
-                    logger.debug(f"Item '{item.label}' has no created_at attribute")
-
-            return filtered
+                def timed(now):
+                    start_date = start_of(now)
+                    return lambda item: bool(getattr(item, 'created_at', None)) and item.created_at >= start_date
+            return None, timed
 
         # Usar rango personalizado
         if 'custom_from' in date_filter and 'custom_to' in date_filter:
             from_date = date_filter['custom_from']
             to_date = date_filter['custom_to']
-
-            logger.debug(f"Date filter custom range: from={from_date}, to={to_date}")
-
-            filtered = []
-            for item in items:
-                if hasattr(item, 'created_at') and item.created_at:
-                    # Asegurar que created_at es datetime
-                    item_date = item.created_at
-                    if isinstance(item_date, str):
-                        try:
-                            item_date = datetime.fromisoformat(item_date.replace('Z', '+00:00'))
-                        except:
-                            try:
-                                item_date = datetime.strptime(item_date, '%Y-%m-%d %H:%M:%S')
-                            except:
-                                logger.warning(f"Could not parse created_at for item '{item.label}': {item_date}")
-                                continue
-
-                    if from_date <= item_date <= to_date:
-                        filtered.append(item)
-                        logger.debug(f"Item '{item.label}' included: created_at={item_date}")
-                    else:
-                        logger.debug(f"Item '{item.label}' excluded: created_at={item_date} not in range [{from_date}, {to_date}]")
-                else:
-                    logger.debug(f"Item '{item.label}' has no created_at attribute")
-
-            logger.debug(f"Filtered {len(filtered)} items out of {len(items)}")
-            return filtered
-
-        return items
-
-    def _sort_items(self, items: List[Item], sort_by: str) -> List[Item]:
-        """
-        Ordenar items según criterio
-
-        Args:
-            items: Lista de items
-            sort_by: Criterio de ordenamiento
-
-        Returns:
-            Items ordenados
-
-        Opciones de sort_by:
-            - use_count_desc: Más usados primero
-            - use_count_asc: Menos usados primero
-            - recent: Usados recientemente primero
-            - oldest: Más antiguos primero
-            - label_asc: Alfabético A-Z
-            - label_desc: Alfabético Z-A
-        """
-        if sort_by == 'use_count_desc':
-            return sorted(items, key=lambda x: getattr(x, 'use_count', 0), reverse=True)
-        elif sort_by == 'use_count_asc':
-            return sorted(items, key=lambda x: getattr(x, 'use_count', 0))
-        elif sort_by == 'recent':
-            return sorted(
-                items,
-                key=lambda x: getattr(x, 'last_used', datetime.min),
-                reverse=True
-            )
-        elif sort_by == 'oldest':
-            return sorted(
-                items,
-                key=lambda x: getattr(x, 'created_at', datetime.max)
-            )
-        elif sort_by == 'label_asc':
-            return sorted(items, key=lambda x: x.label.lower())
-        elif sort_by == 'label_desc':
-            return sorted(items, key=lambda x: x.label.lower(), reverse=True)
-        else:
-            return items
+            if field == 'last_used':
+                return (lambda item: getattr(item, 'last_used', None) is not None
+                        and from_date <= item.last_used <= to_date), None
+
+            def in_range(item):
+                if not getattr(item, 'created_at', None):
+                    return False
+                item_date = _parse_created_at(item)
+                return item_date is not None and from_date <= item_date <= to_date
+            return in_range, None
+
+        return None, None
 
     def get_available_tags(self, items: List[Item]) -> Dict[str, int]:
         """
@@ -217,7 +217,7 @@ class AIBulkItemManager:
         Proceso:
         1. Validar que categoría existe
         2. Filtrar items seleccionados
-        3. Insertar en transacción
+        3. Insertar en una sola transacción (DBManager.add_items_bulk)
         4. Actualizar item_count de categoría
         5. Retornar estadísticas
 
@@ -251,50 +251,44 @@ class AIBulkItemManager:
             f"to category {category_id} ({category['name']})"
         )
 
-        # Inserción en transacción
+        # Inserción masiva en una sola transacción
         try:
-            with self.db.transaction() as conn:
-                for item in selected_items:
-                    try:
-                        # Convertir tags de string a lista
-                        # Ej: "clonar_proyecto" → ["clonar_proyecto"]
-                        # Ej: "git,deploy,automation" → ["git", "deploy", "automation"]
-                        tags_list = [tag.strip() for tag in item.tags.split(',') if tag.strip()] if item.tags else []
-
-                        # Crear item usando el método del DBManager
-                        item_id = self.db.add_item(
-                            category_id=category_id,
-                            label=item.label,
-                            content=item.content,
-                            item_type=item.type,
-                            tags=tags_list,
-                            description=item.description,
-                            icon=item.icon,
-                            color=item.color,
-                            is_sensitive=item.is_sensitive,
-                            is_favorite=item.is_favorite,
-                            working_dir=item.working_dir,
-                            badge=item.badge
-                        )
-
-                        result.created_count += 1
-
-                        logger.debug(
-                            f"Created item {item_id}: '{item.label}' "
-                            f"(type: {item.type}, sensitive: {item.is_sensitive})"
-                        )
-
-                    except Exception as e:
-                        error_msg = f"Error creando '{item.label}': {str(e)}"
-                        result.add_error(error_msg)
-                        logger.error(f"Failed to create item '{item.label}': {e}", exc_info=True)
-
-                # Actualizar item_count de categoría
-                try:
-                    self.db.update_category_item_count(category_id)
-                except Exception as e:
-                    logger.error(f"Failed to update category item_count: {e}")
-                    # No es crítico, continuar
+            rows = []
+            for item in selected_items:
+                # Convertir tags de string a lista
+                # Ej: "clonar_proyecto" → ["clonar_proyecto"]
+                # Ej: "git,deploy,automation" → ["git", "deploy", "automation"]
+                tags_list = [tag.strip() for tag in item.tags.split(',') if tag.strip()] if item.tags else []
+
+                rows.append({
+                    'category_id': category_id,
+                    'label': item.label,
+                    'content': item.content,
+                    'item_type': item.type,
+                    'tags': tags_list,
+                    'description': item.description,
+                    'icon': item.icon,
+                    'color': item.color,
+                    'is_sensitive': item.is_sensitive,
+                    'is_favorite': item.is_favorite,
+                    'working_dir': item.working_dir,
+                    'badge': item.badge
+                })
+
+            item_ids, errors = self.db.add_items_bulk(rows)
+            result.created_count = sum(1 for item_id in item_ids if item_id is not None)
+
+            for index, error in errors:
+                label = selected_items[index].label
+                result.add_error(f"Error creando '{label}': {error}")
+                logger.error(f"Failed to create item '{label}': {error}")
+
+            # Actualizar item_count de categoría
+            try:
+                self.db.update_category_item_count(category_id)
+            except Exception as e:
+                logger.error(f"Failed to update category item_count: {e}")
+                # No es crítico, continuar
 
             # Si se creó al menos un item, es exitoso
             result.success = result.created_count > 0
@@ -9,13 +9,17 @@ Filtros soportados:
 - Popularidad: rangos de items, usos totales, accesos
 - Fechas: creación, actualización, último acceso
 - Ordenamiento: alfabético, popularidad, fecha, accesos, anclado
+
+Caché de resultados LRU: la clave es la forma canónica de los filtros más
+la versión de la tabla categories en el ChangeBus, así que un resultado
+nunca se sirve después de un cambio en los datos. Cada entrada guarda sus
+propias estadísticas y el tamaño total está acotado en entradas y en
+categorías guardadas.
 """
 
-import sqlite3
 import logging
-import hashlib
-import json
-from typing import List, Dict, Any, Optional, Tuple
+from collections import OrderedDict
+from typing import List, Dict, Any, Hashable, Optional, Tuple
 from datetime import datetime, timedelta
 from dataclasses import dataclass
 
@@ -24,6 +28,9 @@ import sys
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from src.models.category import Category
+from database.connection_pool import get_connection
+from database.change_bus import get_change_bus
+from utils.hashable import freeze
 
 logger = logging.getLogger(__name__)
 
@@ -37,6 +44,13 @@ class FilterStats:
     execution_time_ms: float
 
 
+@dataclass(frozen=True)
+class CachedResult:
+    """Entrada del caché: resultado y total de categorías al calcularlo"""
+    categories: Tuple[Category, ...]
+    total_categories: int
+
+
 class CategoryFilterEngine:
     """
     Motor de filtrado avanzado para categorías
@@ -48,7 +62,8 @@ class CategoryFilterEngine:
     - Optimización con índices
     """
 
-    def __init__(self, db_path: str, cache_enabled: bool = True, cache_max_size: int = 100):
+    def __init__(self, db_path: str, cache_enabled: bool = True, cache_max_size: int = 100,
+                 cache_max_categories: int = 5000):
         """
         Inicializar el motor de filtrado
 
@@ -56,6 +71,7 @@ class CategoryFilterEngine:
             db_path: Ruta a la base de datos SQLite
             cache_enabled: Si está habilitado el caché de resultados
             cache_max_size: Tamaño máximo del caché (número de entradas)
+            cache_max_categories: Máximo de categorías guardadas entre todas las entradas
         """
         self.db_path = db_path
         self.last_query = None
@@ -65,9 +81,26 @@ class CategoryFilterEngine:
         # Sistema de caché
         self.cache_enabled = cache_enabled
         self.cache_max_size = cache_max_size
-        self._result_cache: Dict[str, List[Category]] = {}
+        self.cache_max_categories = cache_max_categories
+        self._result_cache: "OrderedDict[Tuple[Hashable, int], CachedResult]" = OrderedDict()
+        self._cached_categories = 0
         self._cache_hits = 0
         self._cache_misses = 0
+        self._cache_evictions = 0
+        self._cache_invalidations = 0
+
+        # Los resultados solo dependen de la tabla categories
+        self._changes = get_change_bus(db_path)
+        self._changes.subscribe(self._on_db_change, tables=('categories',))
+
+    def _on_db_change(self, event) -> None:
+        """Suscriptor del ChangeBus: liberar las entradas de versiones anteriores"""
+        # La versión ya forma parte de la clave: esto solo libera memoria
+        if self._result_cache:
+            logger.debug(f"Categories changed ({event.action}), clearing filter cache")
+            self._cache_invalidations += len(self._result_cache)
+            self._result_cache.clear()
+            self._cached_categories = 0
 
     def apply_filters(self, filters: Dict[str, Any]) -> List[Category]:
         """
@@ -93,41 +126,41 @@ class CategoryFilterEngine:
         }
         """
         start_time = datetime.now()
+        active_filters = sum(1 for v in filters.values() if v is not None and v != '')
 
         # Verificar caché
-        filter_hash = None
+        cache_key = None
         if self.cache_enabled:
-            filter_hash = self._hash_filters(filters)
-
-            if filter_hash in self._result_cache:
+            # Escrituras de otras conexiones/procesos
+            self._changes.poll_external()
+            # Versión leída antes de la query: un cambio durante la query
+            # deja la entrada guardada bajo la versión anterior
+            cache_key = (self._filter_key(filters), self._changes.version('categories'))
+
+            entry = self._result_cache.get(cache_key)
+            if entry is not None:
                 self._cache_hits += 1
-                cached_result = self._result_cache[filter_hash]
+                self._result_cache.move_to_end(cache_key)
 
-                # Calcular estadísticas (más rápido desde caché)
                 end_time = datetime.now()
                 execution_time = (end_time - start_time).total_seconds() * 1000
 
-                active_filters = sum(1 for v in filters.values() if v is not None and v != '')
-
-                # Reutilizar stats pero actualizar tiempo de ejecución
-                if self.last_stats:
-                    self.last_stats = FilterStats(
-                        total_categories=self.last_stats.total_categories,
-                        filtered_categories=len(cached_result),
-                        active_filters_count=active_filters,
-                        execution_time_ms=execution_time
-                    )
+                self.last_stats = FilterStats(
+                    total_categories=entry.total_categories,
+                    filtered_categories=len(entry.categories),
+                    active_filters_count=active_filters,
+                    execution_time_ms=execution_time
+                )
 
-                logger.info(f"Cache HIT: Returning {len(cached_result)} categories from cache "
+                logger.info(f"Cache HIT: Returning {len(entry.categories)} categories from cache "
                            f"({execution_time:.2f}ms, hits: {self._cache_hits}, "
                            f"misses: {self._cache_misses})")
 
-                return cached_result
+                return list(entry.categories)
 
-            else:
-                self._cache_misses += 1
-                logger.debug(f"Cache MISS: Executing query "
-                            f"(hits: {self._cache_hits}, misses: {self._cache_misses})")
+            self._cache_misses += 1
+            logger.debug(f"Cache MISS: Executing query "
+                        f"(hits: {self._cache_hits}, misses: {self._cache_misses})")
 
         try:
             # Construir query dinámicamente
@@ -136,8 +169,7 @@ class CategoryFilterEngine:
             self.last_params = params
 
             # Ejecutar query
-            conn = sqlite3.connect(self.db_path)
-            conn.row_factory = sqlite3.Row
+            conn = get_connection(self.db_path)
             cursor = conn.cursor()
 
             logger.debug(f"Executing query: {query}")
@@ -182,8 +214,6 @@ class CategoryFilterEngine:
             end_time = datetime.now()
             execution_time = (end_time - start_time).total_seconds() * 1000
 
-            active_filters = sum(1 for v in filters.values() if v is not None and v != '')
-
             self.last_stats = FilterStats(
                 total_categories=total_count,
                 filtered_categories=len(categories),
@@ -195,8 +225,8 @@ class CategoryFilterEngine:
                        f"{active_filters} filters, {execution_time:.2f}ms")
 
             # Guardar en caché
-            if self.cache_enabled and filter_hash:
-                self._add_to_cache(filter_hash, categories)
+            if cache_key is not None:
+                self._add_to_cache(cache_key, CachedResult(tuple(categories), total_count))
 
             return categories
 
@@ -386,7 +416,7 @@ class CategoryFilterEngine:
             Lista de colores (hex) únicos
         """
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = get_connection(self.db_path)
             cursor = conn.cursor()
 
             cursor.execute("""
@@ -413,7 +443,7 @@ class CategoryFilterEngine:
             Diccionario con fechas mínimas y máximas
         """
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = get_connection(self.db_path)
             cursor = conn.cursor()
 
             cursor.execute("""
@@ -451,7 +481,7 @@ class CategoryFilterEngine:
             Diccionario con estadísticas min/max/avg
         """
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = get_connection(self.db_path)
             cursor = conn.cursor()
 
             cursor.execute("""
@@ -488,10 +518,13 @@ class CategoryFilterEngine:
             return {}
 
     def clear_cache(self):
-        """Limpiar caché de resultados"""
+        """Limpiar caché de resultados y sus métricas"""
         self._result_cache.clear()
+        self._cached_categories = 0
         self._cache_hits = 0
         self._cache_misses = 0
+        self._cache_evictions = 0
+        self._cache_invalidations = 0
         self.last_query = None
         self.last_params = None
         self.last_stats = None
@@ -511,46 +544,55 @@ class CategoryFilterEngine:
             'cache_enabled': self.cache_enabled,
             'cache_size': len(self._result_cache),
             'cache_max_size': self.cache_max_size,
+            'cached_categories': self._cached_categories,
+            'cache_max_categories': self.cache_max_categories,
             'cache_hits': self._cache_hits,
             'cache_misses': self._cache_misses,
+            'cache_evictions': self._cache_evictions,
+            'cache_invalidations': self._cache_invalidations,
             'hit_rate': hit_rate
         }
 
-    def _hash_filters(self, filters: Dict[str, Any]) -> str:
+    @staticmethod
+    def _filter_key(filters: Dict[str, Any]) -> Hashable:
         """
-        Generar hash único para una combinación de filtros
+        Clave canónica de una combinación de filtros
 
         Args:
             filters: Diccionario de filtros
 
         Returns:
-            Hash MD5 del diccionario de filtros
+            frozenset de pares (filtro, valor), independiente del orden
         """
-        # Convertir a JSON ordenado para consistencia
-        filter_json = json.dumps(filters, sort_keys=True, default=str)
-
-        # Generar hash MD5
-        hash_obj = hashlib.md5(filter_json.encode('utf-8'))
-        return hash_obj.hexdigest()
+        return freeze(filters)
 
-    def _add_to_cache(self, filter_hash: str, categories: List[Category]) -> None:
+    def _add_to_cache(self, cache_key: Tuple[Hashable, int], entry: CachedResult) -> None:
         """
-        Agregar resultado al caché
+        Agregar resultado al caché (LRU, acotado en entradas y en categorías)
 
         Args:
-            filter_hash: Hash del filtro
-            categories: Lista de categorías a cachear
+            cache_key: (clave de los filtros, versión de categories)
+            entry: Resultado a cachear
         """
-        # Si el caché está lleno, eliminar entrada más antigua (FIFO)
-        if len(self._result_cache) >= self.cache_max_size:
-            # Obtener primera clave (más antigua)
-            oldest_key = next(iter(self._result_cache))
-            del self._result_cache[oldest_key]
-            logger.debug(f"Cache full, removed oldest entry: {oldest_key[:8]}...")
-
-        # Agregar al caché
-        self._result_cache[filter_hash] = categories
-        logger.debug(f"Added to cache: {filter_hash[:8]}... ({len(categories)} categories)")
+        size = len(entry.categories)
+        if size > self.cache_max_categories:
+            logger.debug(f"Result too large to cache ({size} categories)")
+            return
+
+        previous = self._result_cache.pop(cache_key, None)
+        if previous is not None:
+            self._cached_categories -= len(previous.categories)
+        self._result_cache[cache_key] = entry
+        self._cached_categories += size
+
+        # Eliminar las entradas usadas hace más tiempo
+        while (len(self._result_cache) > self.cache_max_size
+               or self._cached_categories > self.cache_max_categories):
+            _, evicted = self._result_cache.popitem(last=False)
+            self._cached_categories -= len(evicted.categories)
+            self._cache_evictions += 1
+        logger.debug(f"Added to cache: {size} categories "
+                     f"({len(self._result_cache)} entries, {self._cached_categories} categories)")
 
 
 # Función de utilidad para crear filtros predefinidos
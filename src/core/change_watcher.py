@@ -0,0 +1,163 @@
+"""
+Change Watcher - Cambios de items y categorías para las vistas abiertas
+Lee el change_log (migrations/add_change_log) y avisa a la UI
+
+Los paneles flotantes, los paneles anclados y el dashboard reciben un
+ChangeSet con los items y categorías que cambiaron y actualizan solo esas
+filas, en lugar de recargar la categoría o el árbol completo.
+
+El temporizador no consulta la base de datos si el ChangeBus no registró
+cambios (propios o externos vía PRAGMA data_version) desde la última vez.
+
+Uso:
+    self.change_watcher = ChangeLogWatcher(db_manager, parent=self)
+    self.change_watcher.changes_detected.connect(self.on_db_changes)
+    self.change_watcher.reload_required.connect(self.on_db_reload_required)
+    self.change_watcher.start()
+"""
+
+import logging
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Set
+
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+
+from core.db_worker import AsyncLoader
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POLL_INTERVAL_MS = 500
+
+
+@dataclass
+class ChangeSet:
+    """
+    Resumen de un lote de entradas de change_log
+
+    Attributes:
+        item_categories: Items insertados, modificados o eliminados, con las
+            categorías en las que estaban o están (dos si se movió)
+        category_ids: Categorías con algún cambio (en sus items o en la fila)
+        changed_categories: Categorías cuya fila cambió (nombre, icono, ...)
+        structure_changed: Se crearon o eliminaron categorías
+        last_seq: Última secuencia incluida
+    """
+    item_categories: Dict[int, Set[int]] = field(default_factory=dict)
+    category_ids: Set[int] = field(default_factory=set)
+    changed_categories: Set[int] = field(default_factory=set)
+    structure_changed: bool = False
+    last_seq: int = 0
+
+    @classmethod
+    def from_rows(cls, rows: List[Dict]) -> 'ChangeSet':
+        """Crear el resumen a partir de DBManager.get_changes_since()"""
+        change_set = cls()
+        for row in rows:
+            change_set.last_seq = max(change_set.last_seq, row['seq'])
+            if row['category_id'] is not None:
+                change_set.category_ids.add(row['category_id'])
+            if row['entity'] == 'item':
+                categories = change_set.item_categories.setdefault(row['entity_id'], set())
+                if row['category_id'] is not None:
+                    categories.add(row['category_id'])
+            else:
+                change_set.changed_categories.add(row['entity_id'])
+                if row['op'] != 'update':
+                    change_set.structure_changed = True
+        return change_set
+
+    @property
+    def item_ids(self) -> Set[int]:
+        """Items insertados, modificados o eliminados"""
+        return set(self.item_categories)
+
+    def affects_category(self, category_id: int) -> bool:
+        """True si la categoría o alguno de sus items cambió"""
+        return category_id in self.category_ids
+
+    def item_ids_for(self, category_id: int, shown_ids: Iterable[int] = ()) -> Set[int]:
+        """
+        Items cambiados que una vista de la categoría debe actualizar
+
+        Args:
+            category_id: Categoría que muestra la vista
+            shown_ids: Items que la vista muestra ahora (para los movidos o
+                       eliminados cuya categoría no se conoce)
+        """
+        shown = set(shown_ids)
+        return {item_id for item_id, categories in self.item_categories.items()
+                if category_id in categories or item_id in shown}
+
+
+class ChangeLogWatcher(QObject):
+    """
+    Sondeo periódico del change_log
+
+    Signals:
+        changes_detected(ChangeSet): Cambios desde el último aviso
+        reload_required(): Se perdieron cambios (log recortado o demasiados):
+            las vistas deben recargar todo
+    """
+
+    changes_detected = pyqtSignal(object)
+    reload_required = pyqtSignal()
+
+    def __init__(self, db_manager, interval_ms: int = DEFAULT_POLL_INTERVAL_MS,
+                 parent: Optional[QObject] = None):
+        """
+        Args:
+            db_manager: DBManager de la base de datos a vigilar
+            interval_ms: Intervalo de sondeo
+            parent: QObject padre
+        """
+        super().__init__(parent)
+        self.db = db_manager
+        self.last_seq = db_manager.get_change_log_seq()
+        self._seen_versions = self._versions()
+
+        self._loader = AsyncLoader(self)
+        self._loader.loaded.connect(self._on_changes_loaded)
+
+        self._timer = QTimer(self)
+        self._timer.setInterval(interval_ms)
+        self._timer.timeout.connect(self.check_now)
+
+    def start(self) -> None:
+        """Empezar a sondear"""
+        self._timer.start()
+
+    def stop(self) -> None:
+        """Dejar de sondear"""
+        self._timer.stop()
+        self._loader.cancel()
+
+    def check_now(self) -> None:
+        """Buscar cambios nuevos (sin consultar la BD si el bus no vio ninguno)"""
+        self.db.changes.poll_external()
+        versions = self._versions()
+        if versions == self._seen_versions or self._loader.is_loading:
+            return
+        self._seen_versions = versions
+        self._loader.load(self._fetch_changes, self.last_seq)
+
+    def _versions(self) -> tuple:
+        return (self.db.changes.version('items'), self.db.changes.version('categories'))
+
+    def _fetch_changes(self, since_seq: int) -> dict:
+        """Leer el change_log (se ejecuta en un hilo lector)"""
+        changes = self.db.get_changes_since(since_seq)
+        if changes is None:
+            return {'changes': None, 'seq': self.db.get_change_log_seq()}
+        return {'changes': changes, 'seq': changes[-1]['seq'] if changes else since_seq}
+
+    def _on_changes_loaded(self, result: dict) -> None:
+        """Emitir el ChangeSet en el hilo de la UI"""
+        self.last_seq = result['seq']
+        if result['changes'] is None:
+            logger.info("Change log gap detected, views will reload")
+            self.reload_required.emit()
+        elif result['changes']:
+            change_set = ChangeSet.from_rows(result['changes'])
+            logger.debug(f"Changes up to seq {change_set.last_seq}: "
+                         f"{len(change_set.item_ids)} items, {len(change_set.category_ids)} categories")
+            self.changes_detected.emit(change_set)
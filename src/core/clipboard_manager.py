@@ -9,6 +9,7 @@ from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 from models.item import Item
+from core.encryption_manager import reveal_content
 
 
 class ClipboardHistory:
@@ -26,9 +27,9 @@ class ClipboardManager:
         self.history: List[ClipboardHistory] = []
 
     def copy_text(self, content: str) -> bool:
-        """Copy text to clipboard"""
+        """Copy text to clipboard (sealed content is decrypted here)"""
         try:
-            pyperclip.copy(content)
+            pyperclip.copy(reveal_content(content))
             return True
         except Exception as e:
             print(f"Error copying to clipboard: {e}")
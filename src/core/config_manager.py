@@ -4,6 +4,7 @@ Manages application configuration using SQLite database
 """
 import json
 import sys
+import threading
 from pathlib import Path
 from typing import Dict, List, Any, Optional
 
@@ -12,7 +13,8 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from models.category import Category
 from models.item import Item, ItemType
 from database.db_manager import DBManager
-from core.encryption_manager import EncryptionManager
+from database.change_bus import ChangeEvent
+from core.encryption_manager import get_encryption_manager
 
 
 class ConfigManager:
@@ -47,10 +49,15 @@ class ConfigManager:
 
         # Initialize encryption manager
         env_path = str(self.base_dir / ".env")
-        self.encryption_manager = EncryptionManager(env_path)
+        self.encryption_manager = get_encryption_manager(env_path)
 
-        # Cache for categories
+        # Cache for categories, kept in sync by the database change bus:
+        # item changes refresh only their categories, anything else reloads all
         self._categories_cache: Optional[List[Category]] = None
+        self._stale_category_ids = set()
+        self._cache_generation = 0
+        self._cache_lock = threading.Lock()
+        self.db.changes.subscribe(self._on_db_change, tables=('items', 'categories'))
 
     def load_config(self) -> Dict[str, Any]:
         """
@@ -88,30 +95,90 @@ class ConfigManager:
         Returns:
             List[Category]: List of Category objects
         """
-        # Return cached categories if available
-        if self._categories_cache is not None:
-            return self._categories_cache
-
-        # Load from database
-        categories_data = self.db.get_categories(include_inactive=False)
-        categories = []
-
-        for cat_data in categories_data:
-            # Convert database dict to Category object
-            category = self._dict_to_category(cat_data)
+        # Writes from other connections/processes invalidate the cache too
+        self.db.changes.poll_external()
+
+        with self._cache_lock:
+            cached = self._categories_cache
+            stale_ids = self._stale_category_ids
+            self._stale_category_ids = set()
+            generation = self._cache_generation
+
+        # Return cached categories if available (refreshing changed ones)
+        if cached is not None:
+            if stale_ids:
+                cached = self._refresh_categories(cached, stale_ids, generation)
+            return cached
+
+        # Load categories and items from database in a single bulk load
+        categories_data = self.db.get_categories_with_items(include_inactive=False)
+        categories = [self._build_category(cat_data) for cat_data in categories_data]
+
+        # Cache results (unless a change arrived while loading)
+        with self._cache_lock:
+            if generation == self._cache_generation:
+                self._categories_cache = categories
+        return categories
 
-            # Load items for this category
-            items_data = self.db.get_items_by_category(cat_data['id'])
-            for item_data in items_data:
-                item = self._dict_to_item(item_data)
-                category.add_item(item)
+    def invalidate_cache(self) -> None:
+        """Drop the categories cache (next get_categories() reloads everything)"""
+        with self._cache_lock:
+            self._categories_cache = None
+            self._stale_category_ids = set()
+            self._cache_generation += 1
+
+    def _on_db_change(self, event: ChangeEvent) -> None:
+        """Change bus subscriber: mark the affected categories as stale"""
+        if event.usage_only:
+            # use_count/last_used are not part of the cached Item objects
+            return
+        if event.table == 'items' and event.category_ids:
+            with self._cache_lock:
+                self._stale_category_ids.update(event.category_ids)
+            return
+        # Category rows (order, active state) or unknown scope: reload all
+        self.invalidate_cache()
+
+    def _refresh_categories(self, cached: List[Category], stale_ids: set,
+                            generation: int) -> List[Category]:
+        """
+        Reload only the stale categories of the cached list
+
+        Returns a new list (callers may still hold the previous one).
+        """
+        cached_ids = {int(category.id) for category in cached}
+        fresh = {
+            cat_data['id']: self._build_category(cat_data)
+            for cat_data in self.db.get_categories_with_items(
+                include_inactive=False, category_ids=sorted(stale_ids & cached_ids)
+            )
+        }
 
+        categories = []
+        for category in cached:
+            category_id = int(category.id)
+            if category_id in stale_ids:
+                category = fresh.get(category_id)
+                if category is None:
+                    continue
             categories.append(category)
 
-        # Cache results
-        self._categories_cache = categories
+        # A full invalidation while refreshing wins over this result
+        with self._cache_lock:
+            if generation == self._cache_generation:
+                self._categories_cache = categories
         return categories
 
+    def _build_category(self, cat_data: Dict) -> Category:
+        """Category object with its items from a get_categories_with_items() row"""
+        # Convert database dict to Category object
+        category = self._dict_to_category(cat_data)
+
+        # Items come from the DB already unique per category, so skip the
+        # O(n) duplicate check done by Category.add_item()
+        category.items = [self._dict_to_item(item_data) for item_data in cat_data['items']]
+        return category
+
     def get_category(self, category_id) -> Optional[Category]:
         """
         Get a specific category by ID
@@ -184,28 +251,30 @@ class ConfigManager:
             )
             logger.info(f"[ConfigManager] Category added to DB: {category.name} (ID: {cat_id}, order_index: {category.order_index})")
 
-            # Add items
-            for item in category.items:
-                item_id = self.db.add_item(
-                    category_id=cat_id,
-                    label=item.label,
-                    content=item.content,
-                    item_type=item.type.value.upper(),
-                    icon=item.icon,
-                    is_sensitive=item.is_sensitive,
-                    is_favorite=getattr(item, 'is_favorite', False),  # FIX: Add is_favorite
-                    tags=item.tags,
-                    description=item.description,
-                    working_dir=getattr(item, 'working_dir', None),
-                    color=getattr(item, 'color', None),  # FIX: Add color
-                    is_active=getattr(item, 'is_active', True),  # Add is_active (default True)
-                    is_archived=getattr(item, 'is_archived', False)  # Add is_archived (default False)
-                )
-                logger.info(f"  [ConfigManager] Item added: {item.label} (ID: {item_id})")
-
-            # Clear cache
-            self._categories_cache = None
-            return True
+            # Add items in a single transaction
+            item_ids, errors = self.db.add_items_bulk([
+                {
+                    'category_id': cat_id,
+                    'label': item.label,
+                    'content': item.content,
+                    'item_type': item.type.value.upper(),
+                    'icon': item.icon,
+                    'is_sensitive': item.is_sensitive,
+                    'is_favorite': getattr(item, 'is_favorite', False),  # FIX: Add is_favorite
+                    'tags': item.tags,
+                    'description': item.description,
+                    'working_dir': getattr(item, 'working_dir', None),
+                    'color': getattr(item, 'color', None),  # FIX: Add color
+                    'is_active': getattr(item, 'is_active', True),  # Add is_active (default True)
+                    'is_archived': getattr(item, 'is_archived', False)  # Add is_archived (default False)
+                }
+                for item in category.items
+            ])
+            logger.info(f"  [ConfigManager] {sum(1 for i in item_ids if i is not None)} items added to category {category.name}")
+            for index, error in errors:
+                logger.error(f"  [ConfigManager] Item '{category.items[index].label}' not added: {error}")
+
+            return not errors
 
         except Exception as e:
             import logging
@@ -273,8 +342,6 @@ class ConfigManager:
                     is_archived=getattr(item, 'is_archived', False)  # Add is_archived (default False)
                 )
 
-            # Clear cache
-            self._categories_cache = None
             return True
 
         except Exception as e:
@@ -301,8 +368,6 @@ class ConfigManager:
 
             self.db.delete_category(cat_id)
 
-            # Clear cache
-            self._categories_cache = None
             return True
 
         except Exception as e:
@@ -364,7 +429,7 @@ class ConfigManager:
             bool: True if successful
         """
         try:
-            self.db.add_to_history(item_id, content)
+            self.db.queue_history_entry(item_id, content)
             return True
         except Exception as e:
             print(f"Error adding to history: {e}")
@@ -426,8 +491,6 @@ class ConfigManager:
                 if category.validate():
                     self.add_category(category)
 
-            # Clear cache
-            self._categories_cache = None
             return True
 
         except Exception as e:
@@ -458,8 +521,6 @@ class ConfigManager:
             for category in categories:
                 self.add_category(category)
 
-            # Clear cache
-            self._categories_cache = None
             return True
 
         except Exception as e:
@@ -5,6 +5,17 @@ Manages business logic for the Structure Dashboard
 
 from typing import Dict, List, Tuple
 import logging
+import threading
+import time
+
+from core.flag_index import FlagIndex
+from core.fuzzy_index import get_fuzzy_index
+from core.search_ranker import (
+    get_search_ranker, label_key_quality, LABEL_SUBSTRING, TAG_MATCH, CONTENT_MATCH, FUZZY_MATCH
+)
+from core.search_session import SearchSession
+from core.query_language import CompiledQuery, try_compile_query
+from utils.search_keys import fold
 
 logger = logging.getLogger(__name__)
 
@@ -22,6 +33,24 @@ class DashboardManager:
         self.db = db_manager
         self._structure_cache = None
         self._statistics_cache = None
+        # Categories whose items changed since the structure was cached
+        # (filled from change-bus callbacks on worker/flush threads)
+        self._stale_category_ids = set()
+        self._stale_lock = threading.Lock()
+        self.db.changes.subscribe(self._on_db_change, tables=('items', 'categories'))
+        # Orden de los resultados de búsqueda (calidad + frecencia)
+        self.ranker = get_search_ranker(db_manager)
+        # Coincidencias con errores de escritura (índice de trigramas)
+        self.fuzzy_index = get_fuzzy_index(db_manager)
+        # Búsqueda incremental mientras se escribe (ver core/search_session)
+        self.search_session = SearchSession(self._match_entries, key=lambda entry: entry[2]['id'])
+        self._search_scope = {}
+        self._search_item_lists = []
+        self._search_entries_cache = []
+        # Bitmaps de flags y tipos de los items de la estructura (ver _sync_flag_index)
+        self.flag_index = FlagIndex()
+        self._flag_categories = {}  # category id -> (category dict, id(items), len(items), positions)
+        self._flag_owners = []  # position -> category id
         logger.info("DashboardManager initialized")
 
     def get_full_structure(self, force_refresh: bool = False) -> Dict:
@@ -57,56 +86,31 @@ class DashboardManager:
                     ]
                 }
         """
+        # Writes from other connections/processes invalidate the cache too
+        self.db.changes.poll_external()
+
         # Return cached if available and no force refresh
         if self._structure_cache and not force_refresh:
+            self._refresh_stale_categories()
             logger.debug("Returning cached structure")
             return self._structure_cache
 
         logger.info("Loading full structure from database...")
 
         try:
-            # Get all categories
-            categories = self.db.get_categories()
-
-            structure = {'categories': []}
-
-            for category in categories:
-                # Get items for this category
-                items = self.db.get_items_by_category(category['id'])
-
-                category_data = {
-                    'id': category['id'],
-                    'name': category['name'],
-                    'icon': category.get('icon', '📁'),
-                    'tags': self._parse_tags(category.get('tags', '')),
-                    'is_predefined': category.get('is_predefined', False),
-                    'is_active': category.get('is_active', 1),  # Agregar campo is_active
-                    'items': []
-                }
-
-                # Process each item
-                for item in items:
-                    item_data = {
-                        'id': item['id'],
-                        'label': item['label'],
-                        'content': item['content'],
-                        'type': item['type'],
-                        'tags': self._parse_tags(item.get('tags', '')),
-                        'is_favorite': bool(item.get('is_favorite', 0)),
-                        'is_sensitive': bool(item.get('is_sensitive', 0)),
-                        'description': item.get('description', ''),
-                        'is_list': bool(item.get('is_list', 0)),
-                        'list_group': item.get('list_group', None),
-                        'is_active': item.get('is_active', 1),  # Agregar campo is_active
-                        'is_archived': bool(item.get('is_archived', 0))  # Agregar campo is_archived
-                    }
-                    category_data['items'].append(item_data)
+            # Get all categories with their items in a single bulk load
+            with self._stale_lock:
+                self._stale_category_ids = set()
+            categories = self.db.get_categories_with_items()
 
-                structure['categories'].append(category_data)
+            structure = {'categories': [self._build_category_data(category) for category in categories]}
 
             # Cache the structure
             self._structure_cache = structure
 
+            # Build/update the fuzzy index here (loader thread), not on the first search
+            self.fuzzy_index.sync()
+
             logger.info(f"Loaded structure: {len(structure['categories'])} categories, "
                        f"{sum(len(c['items']) for c in structure['categories'])} total items")
 
@@ -116,6 +120,83 @@ class DashboardManager:
             logger.error(f"Error loading full structure: {e}", exc_info=True)
             return {'categories': []}
 
+    def _build_category_data(self, category: Dict) -> Dict:
+        """Dashboard dict for a get_categories_with_items() row and its items"""
+        category_data = {
+            'id': category['id'],
+            'name': category['name'],
+            'icon': category.get('icon', '📁'),
+            'tags': self._parse_tags(category.get('tags', '')),
+            'is_predefined': category.get('is_predefined', False),
+            'is_active': category.get('is_active', 1),  # Agregar campo is_active
+            'items': []
+        }
+        # Claves de búsqueda normalizadas (minúsculas, sin acentos), una vez por carga
+        category_data['search_name'] = fold(category_data['name'])
+        category_data['search_tags'] = [fold(tag) for tag in category_data['tags']]
+
+        # Process each item
+        for item in category['items']:
+            item_data = {
+                'id': item['id'],
+                'label': item['label'],
+                'content': item['content'],
+                'type': item['type'],
+                'tags': self._parse_tags(item.get('tags', '')),
+                'is_favorite': bool(item.get('is_favorite', 0)),
+                'is_sensitive': bool(item.get('is_sensitive', 0)),
+                'description': item.get('description', ''),
+                'is_list': bool(item.get('is_list', 0)),
+                'list_group': item.get('list_group', None),
+                'is_active': item.get('is_active', 1),  # Agregar campo is_active
+                'is_archived': bool(item.get('is_archived', 0))  # Agregar campo is_archived
+            }
+            item_data['search_label'] = fold(item_data['label'])
+            item_data['search_tags'] = [fold(tag) for tag in item_data['tags']]
+            item_data['search_list_group'] = fold(item_data['list_group'])
+            # Sensitive content is never searched
+            item_data['search_content'] = '' if item_data['is_sensitive'] else fold(item_data['content'])
+            category_data['items'].append(item_data)
+
+        return category_data
+
+    def _on_db_change(self, event) -> None:
+        """Change bus subscriber: refresh only the categories that changed"""
+        if event.usage_only:
+            # Usage counters are not part of the structure
+            return
+        if event.table == 'items' and event.category_ids:
+            with self._stale_lock:
+                self._stale_category_ids.update(event.category_ids)
+            self._statistics_cache = None
+            return
+        self.invalidate_cache()
+
+    def _refresh_stale_categories(self) -> None:
+        """Reload the stale categories into a new cached structure"""
+        with self._stale_lock:
+            stale_ids, self._stale_category_ids = self._stale_category_ids, set()
+        if not stale_ids:
+            return
+
+        cached = self._structure_cache['categories']
+        cached_ids = {category['id'] for category in cached}
+        fresh = {
+            category['id']: self._build_category_data(category)
+            for category in self.db.get_categories_with_items(category_ids=sorted(stale_ids & cached_ids))
+        }
+
+        categories = []
+        for category in cached:
+            if category['id'] in stale_ids:
+                category = fresh.get(category['id'])
+                if category is None:
+                    continue
+            categories.append(category)
+
+        self._structure_cache = {'categories': categories}
+        logger.debug(f"Refreshed {len(fresh)} changed categories in cached structure")
+
     def calculate_statistics(self, structure: Dict = None) -> Dict:
         """
         Calculate statistics from the structure
@@ -270,30 +351,26 @@ class DashboardManager:
         """
         Get tag cloud data (tag name, count)
 
+        Item tags are counted in SQL over the item_tags index
+        (DBManager.get_tag_counts), without loading the full structure.
+
         Args:
-            structure: Optional structure dict
+            structure: Optional structure dict whose category tags are added
 
         Returns:
             List[Tuple[str, int]]: List of (tag, count) tuples sorted by count desc
         """
-        if structure is None:
-            structure = self.get_full_structure()
-
         logger.info("Generating tag cloud...")
 
         try:
-            tag_counts = {}
+            # Count item tags
+            tag_counts = dict(self.db.get_tag_counts())
 
-            for category in structure['categories']:
-                # Count category tags
+            # Count category tags
+            for category in (structure or {}).get('categories', []):
                 for tag in category['tags']:
                     tag_counts[tag] = tag_counts.get(tag, 0) + 1
 
-                # Count item tags
-                for item in category['items']:
-                    for tag in item['tags']:
-                        tag_counts[tag] = tag_counts.get(tag, 0) + 1
-
             # Sort by count descending
             sorted_tags = sorted(tag_counts.items(), key=lambda x: x[1], reverse=True)
 
@@ -304,10 +381,128 @@ class DashboardManager:
             logger.error(f"Error generating tag cloud: {e}", exc_info=True)
             return []
 
+    # ========== FLAG BITMAPS ==========
+
+    def _sync_flag_index(self, structure: Dict) -> FlagIndex:
+        """
+        Update the flag index to the items of structure
+
+        Only the categories whose dict or item list changed are reindexed
+        (the cache refresh replaces just the stale categories). The index is
+        rebuilt instead when most items changed or removals left too many
+        holes.
+        """
+        categories = structure['categories']
+        index = self.flag_index
+        indexed = self._flag_categories
+
+        changed = []
+        for category in categories:
+            entry = indexed.get(category['id'])
+            if (entry is None or entry[0] is not category or entry[1] != id(category['items'])
+                    or entry[2] != len(category['items'])):
+                changed.append(category)
+        current_ids = {category['id'] for category in categories}
+        removed_ids = [category_id for category_id in indexed if category_id not in current_ids]
+
+        # Per-position updates touch every bitmap: rebuild when most items changed
+        if (not indexed or index.holes > len(index)
+                or 2 * sum(len(category['items']) for category in changed) > len(index)):
+            self._rebuild_flag_index(categories)
+            return index
+
+        for category_id in removed_ids:
+            for position in indexed.pop(category_id)[3]:
+                index.remove(position)
+        for category in changed:
+            entry = indexed.get(category['id'])
+            if entry is not None:
+                for position in entry[3]:
+                    index.remove(position)
+            positions = [index.add(item) for item in category['items']]
+            self._flag_owners.extend([category['id']] * len(positions))
+            indexed[category['id']] = (category, id(category['items']), len(category['items']), positions)
+        return index
+
+    def _rebuild_flag_index(self, categories: List[Dict]) -> None:
+        """Index all the items of categories from scratch"""
+        records = []
+        owners = []
+        self._flag_categories = {}
+        for category in categories:
+            start = len(records)
+            records.extend(category['items'])
+            owners.extend([category['id']] * len(category['items']))
+            self._flag_categories[category['id']] = (
+                category, id(category['items']), len(category['items']), range(start, len(records))
+            )
+        self.flag_index.rebuild(records)
+        self._flag_owners = owners
+
+    def _structure_from_bits(self, structure: Dict, bits: int) -> Dict:
+        """Copy of structure with only the items whose bits are set"""
+        index = self.flag_index
+        items_by_category = {}
+        for position in index.positions(bits):
+            items_by_category.setdefault(self._flag_owners[position], []).append(index.records[position])
+        return dict(structure, categories=[
+            dict(category, items=items_by_category.get(category['id'], []))
+            for category in structure['categories']
+        ])
+
+    def _toggle_bits(self, index: FlagIndex, state: str = None, types=None) -> Tuple[int, int]:
+        """(bits of the state toggle, bits of the type toggles) of the dashboard"""
+        state_bits = {
+            'favorites': index.favorite,
+            'inactive': ~index.active,
+            'archived': index.archived,
+        }.get(state, index.live)
+        type_bits = index.types_bitmap(types) if types else index.live
+        return state_bits, type_bits
+
+    def filter_items(self, structure: Dict, state: str = None, types=None) -> Dict:
+        """
+        Items matching the dashboard toggles
+
+        Args:
+            structure: Structure dict
+            state: 'favorites', 'inactive', 'archived' or None
+            types: Item types to show ('URL', 'CODE', ...); empty for all
+
+        Returns:
+            Dict: Copy of structure with the matching items (shared item dicts)
+        """
+        index = self._sync_flag_index(structure)
+        state_bits, type_bits = self._toggle_bits(index, state, types)
+        return self._structure_from_bits(structure, state_bits & type_bits)
+
+    def toggle_counts(self, structure: Dict, state: str = None, types=None) -> Dict[str, int]:
+        """
+        Live counts for every dashboard toggle
+
+        Each state toggle counts its items within the active type toggles,
+        and each type toggle its items within the active state toggle.
+
+        Returns:
+            Dict: {'favorites': int, 'inactive': int, 'archived': int,
+                   'URL': int, 'CODE': int, 'PATH': int, 'TEXT': int}
+        """
+        index = self._sync_flag_index(structure)
+        state_bits, type_bits = self._toggle_bits(index, state, types)
+        counts = {
+            name: index.count(self._toggle_bits(index, name)[0] & type_bits)
+            for name in ('favorites', 'inactive', 'archived')
+        }
+        for item_type in ('URL', 'CODE', 'PATH', 'TEXT'):
+            counts[item_type] = index.count(state_bits & index.types_bitmap([item_type]))
+        return counts
+
     def invalidate_cache(self):
         """Invalidate all caches to force data reload"""
         self._structure_cache = None
         self._statistics_cache = None
+        with self._stale_lock:
+            self._stale_category_ids = set()
         logger.info("Dashboard caches invalidated")
 
     def refresh_data(self) -> Dict:
@@ -337,8 +532,13 @@ class DashboardManager:
 
         Returns:
             List[Tuple[str, int, int]]: List of (match_type, category_index, item_index)
-                match_type can be: 'category', 'item', 'tag', 'content'
+                match_type can be: 'category', 'item', 'list', 'tag', 'content',
+                'fuzzy' (label, tags or list name with typos, e.g. "dokcer")
                 item_index is -1 for category matches
+                Category matches come first, then item matches best first
+                (match quality and frecency, see rank_matches)
+                Structured queries ("tag:git is:fav", see search_plan) only
+                return 'item' matches and ignore scope_filters
         """
         if not query:
             return []
@@ -346,9 +546,14 @@ class DashboardManager:
         if structure is None:
             structure = self.get_full_structure()
 
+        plan = try_compile_query(query)
+        if plan is not None:
+            return self.search_plan(plan, structure)
+
         logger.info(f"Searching for '{query}' with filters: {scope_filters}")
 
-        query_lower = query.lower()
+        # Case- and accent-insensitive: compared against the precomputed search keys
+        query_lower = fold(query)
         matches = []
 
         categories = structure['categories']
@@ -356,53 +561,140 @@ class DashboardManager:
         for cat_idx, category in enumerate(categories):
             # Search in category name
             if scope_filters.get('categories', True):
-                if query_lower in category['name'].lower():
+                if query_lower in category['search_name']:
                     matches.append(('category', cat_idx, -1))
                     logger.debug(f"Category match: {category['name']}")
 
             # Search in category tags
             if scope_filters.get('tags', True):
-                for tag in category['tags']:
-                    if query_lower in tag.lower():
-                        matches.append(('tag', cat_idx, -1))
-                        logger.debug(f"Category tag match: {tag} in {category['name']}")
-                        break  # Only count once per category
-
-            # Search in items
-            for item_idx, item in enumerate(category['items']):
-                # Search in item label
-                if scope_filters.get('items', True):
-                    if query_lower in item['label'].lower():
-                        matches.append(('item', cat_idx, item_idx))
-                        logger.debug(f"Item match: {item['label']}")
-                        continue  # Skip other checks for this item
-
-                # Search in list_group (if is_list)
-                if scope_filters.get('lists', True):
-                    if item.get('is_list') and item.get('list_group'):
-                        if query_lower in item['list_group'].lower():
-                            matches.append(('list', cat_idx, item_idx))
-                            logger.debug(f"List match: {item['list_group']} - {item['label']}")
-                            continue
-
-                # Search in item tags
-                if scope_filters.get('tags', True):
-                    for tag in item['tags']:
-                        if query_lower in tag.lower():
-                            matches.append(('tag', cat_idx, item_idx))
-                            logger.debug(f"Item tag match: {tag} in {item['label']}")
-                            break
-
-                # Search in item content (if not sensitive)
-                if scope_filters.get('content', True):
-                    if not item['is_sensitive'] and item['content']:
-                        if query_lower in item['content'].lower():
-                            matches.append(('content', cat_idx, item_idx))
-                            logger.debug(f"Content match in {item['label']}")
-
+                if any(query_lower in tag for tag in category['search_tags']):
+                    matches.append(('tag', cat_idx, -1))
+                    logger.debug(f"Category tag match in {category['name']}")
+
+        # Search in items: while typing, only the previous query's matches are re-checked
+        self._search_scope = scope_filters
+        scope_key = tuple(sorted((scope, bool(enabled)) for scope, enabled in scope_filters.items()))
+        matched_entries = self.search_session.search(query_lower, self._search_entries(categories), scope_key)
+        for cat_idx, item_idx, item in matched_entries:
+            for match_type in self._item_match_types(item, query_lower, scope_filters):
+                matches.append((match_type, cat_idx, item_idx))
+
+        # Typo-tolerant matches for the items nothing else matched
+        fuzzy_scores = {}
+        if len(query_lower.strip()) >= 3 and \
+                (scope_filters.get('items', True) or scope_filters.get('tags', True)):
+            entries_by_id = self.search_session.candidates_by_id()
+            matched_ids = {item['id'] for _, _, item in matched_entries}
+            for item_id, score in self.fuzzy_index.search(query_lower, item_ids=entries_by_id):
+                if item_id in matched_ids:
+                    continue
+                fuzzy_scores[item_id] = score
+                cat_idx, item_idx, _ = entries_by_id[item_id]
+                matches.append(('fuzzy', cat_idx, item_idx))
+
+        matches = self.rank_matches(matches, query_lower, categories, fuzzy_scores)
         logger.info(f"Search found {len(matches)} matches")
         return matches
 
+    def search_plan(self, plan: CompiledQuery, structure: Dict) -> List[Tuple[str, int, int]]:
+        """
+        Item matches of a compiled structured query (core.query_language)
+
+        Args:
+            plan: Compiled query ("tag:git type:code -archived docker")
+            structure: Structure dict from get_full_structure()
+
+        Returns:
+            List[Tuple[str, int, int]]: ('item', category_index, item_index), best first
+        """
+        categories = structure['categories']
+        now = time.time()
+        matches = [
+            ('item', cat_idx, item_idx)
+            for cat_idx, item_idx, item in self._search_entries(categories)
+            if plan.matches(item, now, categories[cat_idx]['name'])
+        ]
+        logger.info(f"Query '{plan.query}' found {len(matches)} matches")
+        return self.rank_matches(matches, fold(plan.text), categories)
+
+    def _search_entries(self, categories: List[Dict]) -> List[Tuple[int, int, Dict]]:
+        """(category_index, item_index, item) of every item, rebuilt only when the structure changes"""
+        item_lists = [category['items'] for category in categories]
+        if len(item_lists) != len(self._search_item_lists) or \
+                any(new is not old for new, old in zip(item_lists, self._search_item_lists)):
+            self._search_item_lists = item_lists
+            self._search_entries_cache = [
+                (cat_idx, item_idx, item)
+                for cat_idx, items in enumerate(item_lists)
+                for item_idx, item in enumerate(items)
+            ]
+        return self._search_entries_cache
+
+    def _match_entries(self, query_lower: str, entries: List[Tuple[int, int, Dict]]) -> List[Tuple[int, int, Dict]]:
+        """Search session matcher: entries whose item matches in the current scope"""
+        scope_filters = self._search_scope
+        return [entry for entry in entries if self._item_match_types(entry[2], query_lower, scope_filters)]
+
+    @staticmethod
+    def _item_match_types(item: Dict, query_lower: str, scope_filters: Dict) -> List[str]:
+        """Match types of an item: 'item' or 'list' alone, otherwise 'tag' and/or 'content'"""
+        # Search in item label
+        if scope_filters.get('items', True):
+            if query_lower in item['search_label']:
+                return ['item']  # Skip other checks for this item
+
+        # Search in list_group (if is_list)
+        if scope_filters.get('lists', True):
+            if item.get('is_list') and query_lower in item['search_list_group']:
+                return ['list']
+
+        match_types = []
+        # Search in item tags
+        if scope_filters.get('tags', True):
+            if any(query_lower in tag for tag in item['search_tags']):
+                match_types.append('tag')
+
+        # Search in item content (empty key if sensitive)
+        if scope_filters.get('content', True):
+            if query_lower in item['search_content']:
+                match_types.append('content')
+        return match_types
+
+    def rank_matches(self, matches: List[Tuple[str, int, int]], query_lower: str,
+                     categories: List[Dict],
+                     fuzzy_scores: Dict[int, float] = None) -> List[Tuple[str, int, int]]:
+        """
+        Order item matches by match quality and frecency
+
+        Args:
+            matches: (match_type, category_index, item_index) tuples from search()
+            query_lower: Normalized search query (utils.search_keys.fold)
+            categories: Structure categories the indices refer to
+            fuzzy_scores: FuzzyIndex score of each 'fuzzy' match (item_id -> 0-1)
+
+        Returns:
+            Category matches (original order) followed by item matches, best first
+        """
+        category_matches = [match for match in matches if match[2] == -1]
+        item_matches = [match for match in matches if match[2] != -1]
+
+        type_quality = {'list': LABEL_SUBSTRING, 'tag': TAG_MATCH, 'content': CONTENT_MATCH}
+        now = time.time()
+        self.ranker.refresh()
+
+        def sort_key(match):
+            match_type, cat_idx, item_idx = match
+            item = categories[cat_idx]['items'][item_idx]
+            if match_type == 'item':
+                quality = label_key_quality(item['search_label'], query_lower)
+            elif match_type == 'fuzzy':
+                quality = FUZZY_MATCH * (fuzzy_scores or {}).get(item['id'], 0.0)
+            else:
+                quality = type_quality.get(match_type, CONTENT_MATCH)
+            return -self.ranker.score(quality, item['id'], now)
+
+        return category_matches + sorted(item_matches, key=sort_key)
+
     def filter_and_sort_structure(
         self,
         structure: Dict = None,
@@ -420,48 +712,35 @@ class DashboardManager:
             sort_by: Sort order - 'name_asc', 'name_desc', 'items_desc', 'items_asc'
 
         Returns:
-            Dict: Filtered and sorted structure
+            Dict: Filtered and sorted structure (new category dicts and item
+                lists; the item dicts are shared with structure)
         """
         if structure is None:
             structure = self.get_full_structure()
 
         logger.info(f"Filtering structure - Types: {type_filters}, States: {state_filters}, Sort: {sort_by}")
 
-        # Deep copy to avoid modifying original
-        import copy
-        filtered_structure = copy.deepcopy(structure)
-
-        # Apply filters if provided
+        # Apply filters if provided (bitmaps: one AND/OR per toggle, not per item)
         if type_filters or state_filters:
-            for category in filtered_structure['categories']:
-                filtered_items = []
-
-                for item in category['items']:
-                    # Check type filter
-                    if type_filters:
-                        if not type_filters.get(item['type'], True):
-                            continue
-
-                    # Check state filter
-                    if state_filters:
-                        is_favorite = item['is_favorite']
-                        is_sensitive = item['is_sensitive']
-                        is_normal = not is_favorite and not is_sensitive
-
-                        include = False
-                        if state_filters.get('favorites', True) and is_favorite:
-                            include = True
-                        if state_filters.get('sensitive', True) and is_sensitive:
-                            include = True
-                        if state_filters.get('normal', True) and is_normal:
-                            include = True
-
-                        if not include:
-                            continue
-
-                    filtered_items.append(item)
-
-                category['items'] = filtered_items
+            index = self._sync_flag_index(structure)
+            bits = index.live
+            if type_filters:
+                # Types missing from type_filters stay visible
+                bits &= ~index.types_bitmap(t for t, enabled in type_filters.items() if not enabled)
+            if state_filters:
+                state_bits = 0
+                if state_filters.get('favorites', True):
+                    state_bits |= index.favorite
+                if state_filters.get('sensitive', True):
+                    state_bits |= index.sensitive
+                if state_filters.get('normal', True):
+                    state_bits |= ~(index.favorite | index.sensitive)
+                bits &= state_bits
+            filtered_structure = self._structure_from_bits(structure, bits)
+        else:
+            filtered_structure = dict(structure, categories=[
+                dict(category, items=list(category['items'])) for category in structure['categories']
+            ])
 
         # Sort categories
         if sort_by == 'name_asc':
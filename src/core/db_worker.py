@@ -0,0 +1,196 @@
+"""
+DB Worker - Acceso asíncrono a la base de datos
+Ejecuta las consultas fuera del hilo de la UI de Qt
+
+- Un hilo escritor dedicado: todas las escrituras se serializan en él
+  (con WAL solo puede haber un escritor a la vez).
+- Un pool de hilos lectores: consultas de carga, estadísticas y búsqueda.
+
+Cada hilo obtiene su propia conexión del pool (database.connection_pool),
+así que los gestores existentes (StatsManager, UsageTracker, ...) pueden
+ejecutarse tal cual dentro del worker. DBManager.connect() también la
+devuelve fuera del hilo que creó el DBManager: un worker nunca comparte la
+conexión de la UI ni ve sus escrituras sin confirmar.
+
+Uso desde la UI:
+    self.loader = AsyncLoader(self)
+    self.loader.loaded.connect(self.on_data_loaded)
+    self.loader.load(stats_manager.get_dashboard_stats)
+
+Solo se entrega el resultado de la petición más reciente de cada loader:
+las anteriores se cancelan si no han empezado o se descartan al terminar.
+"""
+
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from PyQt6.QtCore import QObject, pyqtSignal, pyqtSlot
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_READER_THREADS = 2
+
+
+class DBWorker:
+    """
+    Ejecutor de operaciones de base de datos en segundo plano
+
+    submit_read() usa el pool de lectores y submit_write() el hilo escritor;
+    ambos devuelven un concurrent.futures.Future.
+    """
+
+    def __init__(self, reader_threads: int = DEFAULT_READER_THREADS):
+        """
+        Args:
+            reader_threads: Número de hilos lectores
+        """
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="db-writer")
+        self._readers = ThreadPoolExecutor(max_workers=reader_threads, thread_name_prefix="db-reader")
+        logger.info(f"DBWorker started (1 writer, {reader_threads} readers)")
+
+    def submit_read(self, fn: Callable, *args, **kwargs) -> Future:
+        """
+        Ejecutar una lectura en el pool de lectores
+
+        Args:
+            fn: Función a ejecutar (p.ej. un método de StatsManager)
+
+        Returns:
+            Future con el resultado de fn(*args, **kwargs)
+        """
+        return self._readers.submit(fn, *args, **kwargs)
+
+    def submit_write(self, fn: Callable, *args, **kwargs) -> Future:
+        """
+        Ejecutar una escritura en el hilo escritor (en orden de llegada)
+
+        Args:
+            fn: Función a ejecutar
+
+        Returns:
+            Future con el resultado de fn(*args, **kwargs)
+        """
+        return self._writer.submit(fn, *args, **kwargs)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Detener los hilos (las escrituras pendientes se completan)"""
+        self._readers.shutdown(wait=wait, cancel_futures=True)
+        self._writer.shutdown(wait=wait)
+        logger.info("DBWorker stopped")
+
+
+_worker: Optional[DBWorker] = None
+_worker_lock = threading.Lock()
+
+
+def get_db_worker() -> DBWorker:
+    """Obtener el DBWorker compartido del proceso (se crea al primer uso)"""
+    global _worker
+    if _worker is None:
+        with _worker_lock:
+            if _worker is None:
+                _worker = DBWorker()
+    return _worker
+
+
+def shutdown_db_worker(wait: bool = True) -> None:
+    """Detener el DBWorker compartido (al cerrar la aplicación)"""
+    global _worker
+    with _worker_lock:
+        if _worker is not None:
+            _worker.shutdown(wait=wait)
+            _worker = None
+
+
+class AsyncLoader(QObject):
+    """
+    Puente entre DBWorker y la UI de Qt
+
+    Ejecuta la función en un hilo lector y emite loaded/failed en el hilo
+    de la UI. Una nueva llamada a load() invalida la anterior.
+
+    Signals:
+        loaded(object): Resultado de la petición más reciente
+        failed(str): Error de la petición más reciente
+    """
+
+    loaded = pyqtSignal(object)
+    failed = pyqtSignal(str)
+
+    # Señal interna emitida desde el hilo del worker (conexión en cola)
+    _finished = pyqtSignal(int, object, object)
+
+    def __init__(self, parent: Optional[QObject] = None, worker: Optional[DBWorker] = None,
+                 write: bool = False):
+        """
+        Args:
+            parent: QObject padre
+            worker: DBWorker a usar (por defecto el compartido)
+            write: Ejecutar en el hilo escritor en lugar de los lectores
+        """
+        super().__init__(parent)
+        self._worker = worker
+        self._write = write
+        self._generation = 0
+        self._future: Optional[Future] = None
+        self._finished.connect(self._on_finished)
+
+    @property
+    def is_loading(self) -> bool:
+        """True si hay una petición en curso"""
+        return self._future is not None and not self._future.done()
+
+    def load(self, fn: Callable, *args, **kwargs) -> Future:
+        """
+        Ejecutar fn(*args, **kwargs) fuera del hilo de la UI
+
+        Returns:
+            Future de la petición
+        """
+        self.cancel()
+        generation = self._generation
+        worker = self._worker or get_db_worker()
+        submit = worker.submit_write if self._write else worker.submit_read
+
+        future = submit(fn, *args, **kwargs)
+        self._future = future
+        future.add_done_callback(lambda f: self._emit_result(generation, f))
+        return future
+
+    def cancel(self) -> None:
+        """Cancelar/descartar la petición en curso"""
+        self._generation += 1
+        if self._future is not None:
+            self._future.cancel()
+            self._future = None
+
+    def _emit_result(self, generation: int, future: Future) -> None:
+        """Callback del Future (se ejecuta en el hilo del worker)"""
+        if future.cancelled():
+            return
+        try:
+            self._finished.emit(generation, future.result(), None)
+        except RuntimeError:
+            # El QObject ya fue destruido (ventana cerrada)
+            pass
+        except Exception as e:
+            try:
+                self._finished.emit(generation, None, e)
+            except RuntimeError:
+                pass
+
+    @pyqtSlot(int, object, object)
+    def _on_finished(self, generation: int, result: Any, error: Optional[Exception]) -> None:
+        """Entregar el resultado en el hilo de la UI si sigue vigente"""
+        if generation != self._generation:
+            logger.debug("Discarding stale DB result")
+            return
+
+        self._future = None
+        if error is not None:
+            logger.error(f"Async DB request failed: {error}")
+            self.failed.emit(str(error))
+        else:
+            self.loaded.emit(result)
@@ -5,13 +5,24 @@ Maneja el cifrado y descifrado de datos sensibles usando AES-256 (Fernet)
 
 import os
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Iterable, List, Optional
 from cryptography.fernet import Fernet, InvalidToken
 from dotenv import load_dotenv, set_key
 
 logger = logging.getLogger(__name__)
 
+# Instancias compartidas por archivo .env (ver get_encryption_manager)
+_shared_managers: Dict[Path, "EncryptionManager"] = {}
+_shared_lock = threading.Lock()
+
+DECRYPTION_ERROR = "[DECRYPTION ERROR]"
+
+# A partir de este tamaño encrypt_many reparte el trabajo en hilos
+PARALLEL_ENCRYPT_THRESHOLD = 64
+
 
 class EncryptionManager:
     """
@@ -146,6 +157,53 @@ class EncryptionManager:
             logger.error(f"Decryption error: {e}")
             raise
 
+    def encrypt_many(self, plaintexts: List[str], max_workers: Optional[int] = None) -> List[str]:
+        """
+        Encrypt several texts (bulk inserts), in parallel for large batches
+
+        Args:
+            plaintexts: Texts to encrypt
+            max_workers: Thread pool size (default: ThreadPoolExecutor default)
+
+        Returns:
+            List[str]: Encrypted texts in the same order
+        """
+        if len(plaintexts) < PARALLEL_ENCRYPT_THRESHOLD:
+            return [self.encrypt(text) for text in plaintexts]
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(self.encrypt, plaintexts, chunksize=32))
+
+    def decrypt_many(self, encrypted_texts: Iterable[str]) -> List[Optional[str]]:
+        """
+        Decrypt several texts with the same cipher (bulk operations)
+
+        Args:
+            encrypted_texts: Encrypted texts (base64-encoded)
+
+        Returns:
+            List[Optional[str]]: Plaintexts in the same order, None for
+            tokens that could not be decrypted
+        """
+        if not self.cipher_suite:
+            raise RuntimeError("Encryption manager not initialized")
+
+        results = []
+        failed = 0
+        for encrypted_text in encrypted_texts:
+            if not encrypted_text:
+                results.append("")
+                continue
+            try:
+                results.append(self.cipher_suite.decrypt(encrypted_text.encode()).decode())
+            except Exception:
+                failed += 1
+                results.append(None)
+
+        if failed:
+            logger.error(f"Bulk decryption: {failed} token(s) failed (wrong key or corrupted data)")
+        return results
+
     def is_encrypted(self, text: str) -> bool:
         """
         Check if text appears to be encrypted
@@ -180,3 +238,120 @@ class EncryptionManager:
             return test_data == decrypted
         except Exception:
             return False
+
+
+def get_encryption_manager(env_file: str = ".env") -> EncryptionManager:
+    """
+    Obtener la instancia compartida de EncryptionManager para un .env
+
+    La clave se carga y el cipher Fernet se construye una sola vez por
+    proceso; Fernet es seguro para uso concurrente entre hilos.
+
+    Args:
+        env_file: Path to .env file
+
+    Returns:
+        EncryptionManager: Instancia compartida
+    """
+    key = Path(env_file).resolve()
+    manager = _shared_managers.get(key)
+    if manager is None:
+        with _shared_lock:
+            manager = _shared_managers.get(key)
+            if manager is None:
+                manager = EncryptionManager(env_file)
+                _shared_managers[key] = manager
+    return manager
+
+
+class SealedContent:
+    """
+    Contenido cifrado que se descifra solo cuando se necesita
+
+    Los items sensibles se cargan con su token cifrado envuelto en
+    SealedContent; el descifrado ocurre al copiar, revelar o ejecutar
+    (reveal()/str()), una única vez, y nunca al listar o buscar.
+    """
+
+    __slots__ = ("token", "_env_file", "_plaintext", "_lock")
+
+    def __init__(self, token: str, env_file: str = ".env"):
+        self.token = token or ""
+        self._env_file = env_file
+        self._plaintext: Optional[str] = None
+        self._lock = threading.Lock()
+
+    @property
+    def is_revealed(self) -> bool:
+        """True si el contenido ya fue descifrado"""
+        return self._plaintext is not None
+
+    def reveal(self) -> str:
+        """
+        Descifrar el contenido (una sola vez)
+
+        Returns:
+            str: Texto plano, o DECRYPTION_ERROR si el token no es válido
+        """
+        if self._plaintext is None:
+            with self._lock:
+                if self._plaintext is None:
+                    try:
+                        self._plaintext = get_encryption_manager(self._env_file).decrypt(self.token)
+                    except Exception as e:
+                        logger.error(f"Error decrypting sealed content: {e}")
+                        self._plaintext = DECRYPTION_ERROR
+        return self._plaintext
+
+    def _set_plaintext(self, plaintext: Optional[str]) -> None:
+        """Fijar el texto plano ya descifrado (usado por reveal_all)"""
+        self._plaintext = DECRYPTION_ERROR if plaintext is None else plaintext
+
+    def __str__(self) -> str:
+        return self.reveal()
+
+    def __bool__(self) -> bool:
+        return bool(self.token)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, SealedContent):
+            return self.token == other.token
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        # Nunca exponer el contenido en logs
+        return "SealedContent(***)"
+
+
+def reveal_content(content) -> str:
+    """
+    Devolver el texto plano de un contenido posiblemente sellado
+
+    Args:
+        content: str o SealedContent
+
+    Returns:
+        str: Texto plano
+    """
+    if isinstance(content, SealedContent):
+        return content.reveal()
+    return content
+
+
+def reveal_all(contents: Iterable, env_file: str = ".env") -> None:
+    """
+    Descifrar en lote varios SealedContent con un único cipher
+
+    Args:
+        contents: Valores de contenido (los que no están sellados se ignoran)
+        env_file: Path to .env file
+    """
+    pending = [c for c in contents if isinstance(c, SealedContent) and not c.is_revealed]
+    if not pending:
+        return
+
+    plaintexts = get_encryption_manager(env_file).decrypt_many(c.token for c in pending)
+    for sealed, plaintext in zip(pending, plaintexts):
+        sealed._set_plaintext(plaintext)
@@ -8,9 +8,14 @@ import sqlite3
 import logging
 from pathlib import Path
 from typing import List, Dict, Optional
+from database.change_bus import get_change_bus
+from database.connection_pool import get_connection
 
 logger = logging.getLogger(__name__)
 
+# Columnas que cambian los métodos de este manager
+FAVORITE_COLUMNS = ('is_favorite', 'favorite_order', 'updated_at')
+
 
 class FavoritesManager:
     """Gestor de items favoritos"""
@@ -23,11 +28,24 @@ class FavoritesManager:
             logger.error(f"Database not found: {self.db_path}")
             raise FileNotFoundError(f"Database not found: {self.db_path}")
 
+        # Las escrituras van por el pool: se publican para invalidar cachés
+        self._changes = get_change_bus(self.db_path)
+
     def _get_connection(self) -> sqlite3.Connection:
-        """Obtener conexión a la base de datos"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        return conn
+        """Obtener conexión a la base de datos (pool compartido, por hilo)"""
+        return get_connection(self.db_path)
+
+    def _publish(self, conn: sqlite3.Connection, item_ids: List[int]) -> None:
+        """Publicar en el ChangeBus el cambio (ya confirmado) de estos items"""
+        if not item_ids:
+            return
+        placeholders = ','.join('?' * len(item_ids))
+        cursor = conn.execute(
+            f"SELECT DISTINCT category_id FROM items WHERE id IN ({placeholders})", list(item_ids)
+        )
+        category_ids = [row[0] for row in cursor.fetchall()]
+        self._changes.publish('items', 'update', ids=item_ids,
+                              category_ids=category_ids, columns=FAVORITE_COLUMNS)
 
     # ==================== CRUD Básico ====================
 
@@ -35,22 +53,23 @@ class FavoritesManager:
         """Marcar item como favorito"""
         try:
             conn = self._get_connection()
-            cursor = conn.cursor()
+            with conn:
+                cursor = conn.cursor()
 
-            # Si order es 0, asignar el siguiente disponible
-            if order == 0:
-                order = self.get_next_order_index()
+                # Si order es 0, asignar el siguiente disponible
+                if order == 0:
+                    order = self.get_next_order_index()
 
-            cursor.execute("""
-                UPDATE items
-                SET is_favorite = 1,
-                    favorite_order = ?,
-                    updated_at = datetime('now')
-                WHERE id = ?
-            """, (order, item_id))
-
-            conn.commit()
-            conn.close()
+                self._changes.poll_external()
+                cursor.execute("""
+                    UPDATE items
+                    SET is_favorite = 1,
+                        favorite_order = ?,
+                        updated_at = datetime('now')
+                    WHERE id = ?
+                """, (order, item_id))
+
+            self._publish(conn, [item_id])
 
             logger.info(f"Item {item_id} marked as favorite with order {order}")
             return True
@@ -63,18 +82,19 @@ class FavoritesManager:
         """Desmarcar item como favorito"""
         try:
             conn = self._get_connection()
-            cursor = conn.cursor()
+            with conn:
+                cursor = conn.cursor()
 
-            cursor.execute("""
-                UPDATE items
-                SET is_favorite = 0,
-                    favorite_order = 0,
-                    updated_at = datetime('now')
-                WHERE id = ?
-            """, (item_id,))
+                self._changes.poll_external()
+                cursor.execute("""
+                    UPDATE items
+                    SET is_favorite = 0,
+                        favorite_order = 0,
+                        updated_at = datetime('now')
+                    WHERE id = ?
+                """, (item_id,))
 
-            conn.commit()
-            conn.close()
+            self._publish(conn, [item_id])
 
             logger.info(f"Item {item_id} unmarked as favorite")
             return True
@@ -197,17 +217,18 @@ class FavoritesManager:
         """Cambiar orden de un favorito"""
         try:
             conn = self._get_connection()
-            cursor = conn.cursor()
+            with conn:
+                cursor = conn.cursor()
 
-            cursor.execute("""
-                UPDATE items
-                SET favorite_order = ?,
-                    updated_at = datetime('now')
-                WHERE id = ? AND is_favorite = 1
-            """, (new_order, item_id))
+                self._changes.poll_external()
+                cursor.execute("""
+                    UPDATE items
+                    SET favorite_order = ?,
+                        updated_at = datetime('now')
+                    WHERE id = ? AND is_favorite = 1
+                """, (new_order, item_id))
 
-            conn.commit()
-            conn.close()
+            self._publish(conn, [item_id])
 
             logger.info(f"Item {item_id} reordered to position {new_order}")
             return True
@@ -220,19 +241,20 @@ class FavoritesManager:
         """Reordenar múltiples favoritos (drag & drop)"""
         try:
             conn = self._get_connection()
-            cursor = conn.cursor()
+            with conn:
+                cursor = conn.cursor()
 
-            # Asignar orden basado en posición en la lista
-            for order, item_id in enumerate(item_ids, start=1):
-                cursor.execute("""
-                    UPDATE items
-                    SET favorite_order = ?,
-                        updated_at = datetime('now')
-                    WHERE id = ? AND is_favorite = 1
-                """, (order, item_id))
+                self._changes.poll_external()
+                # Asignar orden basado en posición en la lista
+                for order, item_id in enumerate(item_ids, start=1):
+                    cursor.execute("""
+                        UPDATE items
+                        SET favorite_order = ?,
+                            updated_at = datetime('now')
+                        WHERE id = ? AND is_favorite = 1
+                    """, (order, item_id))
 
-            conn.commit()
-            conn.close()
+            self._publish(conn, list(item_ids))
 
             logger.info(f"Reordered {len(item_ids)} favorites")
             return True
@@ -250,31 +272,32 @@ class FavoritesManager:
                 return False
 
             conn = self._get_connection()
-            cursor = conn.cursor()
+            with conn:
+                cursor = conn.cursor()
 
-            # Obtener favoritos ordenados por criterio
-            order_clause = f"{by} DESC" if by != "label" else "label ASC"
+                # Obtener favoritos ordenados por criterio
+                order_clause = f"{by} DESC" if by != "label" else "label ASC"
 
-            cursor.execute(f"""
-                SELECT id FROM items
-                WHERE is_favorite = 1
-                ORDER BY {order_clause}
-            """)
+                self._changes.poll_external()
+                cursor.execute(f"""
+                    SELECT id FROM items
+                    WHERE is_favorite = 1
+                    ORDER BY {order_clause}
+                """)
 
-            results = cursor.fetchall()
-            item_ids = [row['id'] for row in results]
+                results = cursor.fetchall()
+                item_ids = [row['id'] for row in results]
 
-            # Actualizar orden
-            for order, item_id in enumerate(item_ids, start=1):
-                cursor.execute("""
-                    UPDATE items
-                    SET favorite_order = ?,
-                        updated_at = datetime('now')
-                    WHERE id = ?
-                """, (order, item_id))
+                # Actualizar orden
+                for order, item_id in enumerate(item_ids, start=1):
+                    cursor.execute("""
+                        UPDATE items
+                        SET favorite_order = ?,
+                            updated_at = datetime('now')
+                        WHERE id = ?
+                    """, (order, item_id))
 
-            conn.commit()
-            conn.close()
+            self._publish(conn, item_ids)
 
             logger.info(f"Auto-ordered {len(item_ids)} favorites by {by}")
             return True
@@ -367,23 +390,25 @@ class FavoritesManager:
         """Quitar todos los favoritos (retorna cantidad removida)"""
         try:
             conn = self._get_connection()
-            cursor = conn.cursor()
+            with conn:
+                cursor = conn.cursor()
 
-            # Contar antes de limpiar
-            cursor.execute("SELECT COUNT(*) as count FROM items WHERE is_favorite = 1")
-            count = cursor.fetchone()['count']
+                self._changes.poll_external()
+                # Contar antes de limpiar
+                cursor.execute("SELECT id FROM items WHERE is_favorite = 1")
+                item_ids = [row['id'] for row in cursor.fetchall()]
+                count = len(item_ids)
 
-            # Limpiar
-            cursor.execute("""
-                UPDATE items
-                SET is_favorite = 0,
-                    favorite_order = 0,
-                    updated_at = datetime('now')
-                WHERE is_favorite = 1
-            """)
+                # Limpiar
+                cursor.execute("""
+                    UPDATE items
+                    SET is_favorite = 0,
+                        favorite_order = 0,
+                        updated_at = datetime('now')
+                    WHERE is_favorite = 1
+                """)
 
-            conn.commit()
-            conn.close()
+            self._publish(conn, item_ids)
 
             logger.info(f"Cleared {count} favorites")
             return count
@@ -0,0 +1,150 @@
+"""
+Flag Index for Widget Sidebar
+Índice de bitmaps sobre los flags y el tipo de los items
+
+Los filtros de estado del panel flotante, los botones de tipo/estado del
+dashboard y AdvancedFilterEngine comprobaban is_favorite, is_sensitive,
+is_active, is_archived, is_list y type item a item. Este índice guarda un
+bitmap por flag y por tipo (enteros de Python: el bit N es el item en la
+posición N), así que cualquier combinación de filtros es un AND/OR/NOT de
+enteros y los conteos son int.bit_count():
+
+- favorite, sensitive, active, archived, list: bitmaps de cada flag
+- types['CODE'], ...: bitmap de cada tipo (en mayúsculas)
+- live: posiciones ocupadas (remove() deja un hueco hasta rebuild())
+
+Los registros pueden ser Item o dicts de la base de datos/dashboard. Se
+actualiza por posición (add / update / remove).
+
+Uso:
+    index = FlagIndex(items)
+    bits = index.types_bitmap(['CODE', 'URL']) & index.favorite & ~index.archived
+    favorites = index.select(bits)
+    count = index.count(bits)
+"""
+
+from itertools import compress
+from typing import Iterable, List, Tuple
+
+FLAGS = ('favorite', 'sensitive', 'active', 'archived', 'list')
+
+_BITS_TO_BYTES = bytes.maketrans(b'01', b'\x00\x01')
+
+
+def record_flags(record) -> Tuple[Tuple[bool, ...], str]:
+    """(valores de FLAGS, tipo en mayúsculas) de un Item o un dict"""
+    if isinstance(record, dict):
+        return (
+            bool(record.get('is_favorite')),
+            bool(record.get('is_sensitive')),
+            bool(record.get('is_active', 1)),
+            bool(record.get('is_archived')),
+            bool(record.get('is_list')),
+        ), str(record.get('type') or '').upper()
+    return (
+        bool(getattr(record, 'is_favorite', False)),
+        bool(record.is_sensitive),
+        bool(getattr(record, 'is_active', True)),
+        bool(getattr(record, 'is_archived', False)),
+        record.is_list_item(),
+    ), record.type.value.upper()
+
+
+def _bitmap(positions: List[int], size: int) -> int:
+    """Entero con los bits de positions (en O(size), sin OR por posición)"""
+    if not positions:
+        return 0
+    buffer = bytearray((size + 7) // 8)
+    for position in positions:
+        buffer[position >> 3] |= 1 << (position & 7)
+    return int.from_bytes(buffer, 'little')
+
+
+class FlagIndex:
+    """Bitmaps de flags y tipos por posición de item"""
+
+    def __init__(self, records: Iterable = ()):
+        self.rebuild(records)
+
+    def rebuild(self, records: Iterable) -> None:
+        """Reconstruir el índice con los registros en este orden (sin huecos)"""
+        self.records = list(records)
+        positions = {flag: [] for flag in FLAGS}
+        type_positions = {}
+        for position, record in enumerate(self.records):
+            values, item_type = record_flags(record)
+            for flag, value in zip(FLAGS, values):
+                if value:
+                    positions[flag].append(position)
+            type_positions.setdefault(item_type, []).append(position)
+
+        size = len(self.records)
+        for flag in FLAGS:
+            setattr(self, flag, _bitmap(positions[flag], size))
+        self.types = {item_type: _bitmap(bits, size) for item_type, bits in type_positions.items()}
+        self.live = (1 << size) - 1
+        self.holes = 0
+
+    def add(self, record) -> int:
+        """Añadir un registro al final; devuelve su posición"""
+        position = len(self.records)
+        self.records.append(record)
+        self._set(position, record)
+        return position
+
+    def update(self, position: int, record) -> None:
+        """Reemplazar el registro de una posición"""
+        self._clear(position)
+        self.records[position] = record
+        self._set(position, record)
+
+    def remove(self, position: int) -> None:
+        """Quitar el registro de una posición (queda un hueco)"""
+        if self.records[position] is None:
+            return
+        self._clear(position)
+        self.records[position] = None
+        self.holes += 1
+
+    def _set(self, position: int, record) -> None:
+        bit = 1 << position
+        values, item_type = record_flags(record)
+        for flag, value in zip(FLAGS, values):
+            if value:
+                setattr(self, flag, getattr(self, flag) | bit)
+        self.types[item_type] = self.types.get(item_type, 0) | bit
+        self.live |= bit
+
+    def _clear(self, position: int) -> None:
+        mask = ~(1 << position)
+        for flag in FLAGS:
+            setattr(self, flag, getattr(self, flag) & mask)
+        for item_type in self.types:
+            self.types[item_type] &= mask
+        self.live &= mask
+
+    def types_bitmap(self, types: Iterable[str]) -> int:
+        """Items de cualquiera de los tipos (sin distinguir mayúsculas)"""
+        bits = 0
+        for item_type in {item_type.upper() for item_type in types}:
+            bits |= self.types.get(item_type, 0)
+        return bits
+
+    def _selectors(self, bits: int) -> bytes:
+        # bin() invertido como bytes 0/1: compress() recorre los bits en C
+        return bin(bits & self.live)[:1:-1].encode().translate(_BITS_TO_BYTES)
+
+    def positions(self, bits: int) -> List[int]:
+        """Posiciones de los bits activos, en orden"""
+        return list(compress(range(len(self.records)), self._selectors(bits)))
+
+    def select(self, bits: int) -> list:
+        """Registros de los bits activos, en orden"""
+        return list(compress(self.records, self._selectors(bits)))
+
+    def count(self, bits: int) -> int:
+        """Número de registros de los bits activos"""
+        return (bits & self.live).bit_count()
+
+    def __len__(self) -> int:
+        return self.live.bit_count()
@@ -0,0 +1,418 @@
+"""
+Fuzzy Index for Widget Sidebar
+Búsqueda tolerante a errores de escritura con un índice de trigramas
+
+La búsqueda normal es por subcadena exacta, así que "dokcer" no encuentra
+"docker". Este índice en memoria trabaja sobre el vocabulario (las
+palabras distintas de labels, tags y list_group), mucho más pequeño que
+el número de items:
+
+- trigramas -> palabras: candidatos que comparten trigramas con la palabra
+  buscada ("$dokcer$" y "$docker$" comparten "$do" y "er$")
+- los candidatos se verifican con distancia de edición (Damerau/OSA, una
+  transposición cuenta como un error) contra la palabra completa o su
+  prefijo, para que "dokc" encuentre "docker" mientras se escribe
+- palabras -> items: cada item puntúa con la mejor palabra de cada
+  término; todos los términos deben coincidir
+
+El índice se construye una vez y se actualiza por item (update_item /
+remove_item). get_fuzzy_index() devuelve uno sincronizado con la base de
+datos mediante el ChangeBus.
+
+Uso:
+    index = get_fuzzy_index(config_manager.db)
+    for item_id, score in index.search("dokcer compose", limit=50):
+        ...
+"""
+
+import heapq
+import logging
+import re
+import threading
+from collections import Counter
+from itertools import chain
+from operator import itemgetter
+from pathlib import Path
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+from database.change_bus import ALL_TABLES
+from utils.search_keys import fold
+
+logger = logging.getLogger(__name__)
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+# Palabras más cortas no se buscan con errores (solo coincidencia exacta o prefijo)
+MIN_FUZZY_LENGTH = 3
+# Consultas repetidas mientras no cambie el vocabulario
+QUERY_CACHE_SIZE = 256
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Palabras normalizadas (minúsculas, sin acentos) de un texto"""
+    if not text:
+        return []
+    return _WORD_RE.findall(fold(text))
+
+
+def trigrams(word: str) -> Set[str]:
+    """Trigramas de una palabra con bordes marcados ($docker$ -> $do, doc, ..., er$)"""
+    padded = f"${word}$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def max_typos(length: int) -> int:
+    """Errores tolerados según la longitud de la palabra buscada"""
+    if length < MIN_FUZZY_LENGTH:
+        return 0
+    if length <= 5:
+        return 1
+    return 2
+
+
+def bag_distance(a_counts: Dict[str, int], a_length: int, b: str) -> int:
+    """
+    Cota inferior barata de la distancia de edición (letras que sobran o faltan)
+
+    Args:
+        a_counts: Número de veces que aparece cada letra en la primera palabra
+        a_length: Longitud de la primera palabra
+        b: Segunda palabra
+    """
+    missing = 0
+    for letter, count in a_counts.items():
+        found = b.count(letter)
+        if found < count:
+            missing += count - found
+    # Letras de b que no se emparejan con ninguna de a
+    extra = len(b) - (a_length - missing)
+    return max(missing, extra)
+
+
+def osa_distance(a: str, b: str, limit: int) -> int:
+    """
+    Distancia de edición con transposiciones adyacentes (optimal string alignment)
+
+    Devuelve limit + 1 en cuanto se sabe que la distancia supera limit.
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous2 = None
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        row_min = i
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            value = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if previous2 is not None and i > 1 and j > 1 \
+                    and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                value = min(value, previous2[j - 2] + 1)
+            current[j] = value
+            if value < row_min:
+                row_min = value
+        if row_min > limit:
+            return limit + 1
+        previous2, previous = previous, current
+    return previous[-1]
+
+
+class FuzzyIndex:
+    """
+    Índice invertido de trigramas sobre el vocabulario de los items
+
+    Thread-safe: las búsquedas y actualizaciones se serializan con un lock.
+    """
+
+    def __init__(self):
+        self._item_words: Dict[int, FrozenSet[str]] = {}
+        self._word_items: Dict[str, Set[int]] = {}
+        self._gram_words: Dict[str, Set[str]] = {}
+        self._query_cache: Dict[str, List[Tuple[str, float]]] = {}
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._item_words)
+
+    @property
+    def vocabulary_size(self) -> int:
+        """Número de palabras distintas indexadas"""
+        return len(self._word_items)
+
+    # ==================== Actualización ====================
+
+    def update_item(self, item_id: int, label: Optional[str],
+                    tags: Iterable[str] = (), list_group: Optional[str] = None) -> None:
+        """Indexar (o reindexar) los textos de un item"""
+        words = frozenset(chain(tokenize(label), tokenize(list_group),
+                                chain.from_iterable(tokenize(tag) for tag in tags or ())))
+        with self._lock:
+            old_words = self._item_words.get(item_id)
+            if old_words == words:
+                return
+            if old_words:
+                self._unlink(item_id, old_words - words)
+            self._item_words[item_id] = words
+            for word in words - (old_words or frozenset()):
+                items = self._word_items.get(word)
+                if items is None:
+                    items = self._word_items[word] = set()
+                    for gram in trigrams(word):
+                        self._gram_words.setdefault(gram, set()).add(word)
+                    self._query_cache.clear()
+                items.add(item_id)
+
+    def remove_item(self, item_id: int) -> None:
+        """Quitar un item del índice"""
+        with self._lock:
+            words = self._item_words.pop(item_id, None)
+            if words:
+                self._unlink(item_id, words)
+
+    def _unlink(self, item_id: int, words: Iterable[str]) -> None:
+        """Quitar item_id de las palabras; las que quedan vacías salen del vocabulario"""
+        for word in words:
+            items = self._word_items.get(word)
+            if items is None:
+                continue
+            items.discard(item_id)
+            if not items:
+                del self._word_items[word]
+                for gram in trigrams(word):
+                    grams = self._gram_words.get(gram)
+                    if grams is not None:
+                        grams.discard(word)
+                        if not grams:
+                            del self._gram_words[gram]
+                self._query_cache.clear()
+
+    def clear(self) -> None:
+        """Vaciar el índice"""
+        with self._lock:
+            self._item_words.clear()
+            self._word_items.clear()
+            self._gram_words.clear()
+            self._query_cache.clear()
+
+    # ==================== Búsqueda ====================
+
+    def match_words(self, token: str) -> List[Tuple[str, float]]:
+        """
+        Palabras del vocabulario parecidas a un término
+
+        Returns:
+            Lista (palabra, similitud) ordenada de menor a mayor similitud;
+            1.0 = palabra exacta, 0.9 = prefijo exacto, menos por cada error
+        """
+        with self._lock:
+            cached = self._query_cache.get(token)
+            if cached is not None:
+                return cached
+
+            matches = self._match_words(token)
+            if len(self._query_cache) >= QUERY_CACHE_SIZE:
+                self._query_cache.pop(next(iter(self._query_cache)))
+            self._query_cache[token] = matches
+            return matches
+
+    def _match_words(self, token: str) -> List[Tuple[str, float]]:
+        length = len(token)
+        typos = max_typos(length)
+        grams = trigrams(token)
+        # Con pocos trigramas basta uno en común; si no, al menos dos
+        min_shared = 1 if len(grams) <= 4 else 2
+
+        shared = Counter(chain.from_iterable(
+            self._gram_words.get(gram, ()) for gram in grams
+        ))
+        candidates = [word for word, count in shared.items()
+                      if count >= min_shared and len(word) >= length - typos]
+
+        matches = []
+        token_letters = Counter(token)
+        token_set = frozenset(token)
+        # Muchas palabras comparten prefijo (docker, docker_prod, docker2...)
+        prefix_distances: Dict[str, int] = {}
+        for word in candidates:
+            if word == token:
+                matches.append((word, 1.0))
+                continue
+            if word.startswith(token):
+                matches.append((word, 0.9))
+                continue
+            if not typos:
+                continue
+
+            # Filtros baratos antes de la distancia de edición: letras distintas
+            # que faltan (conjuntos, en C) y luego letras que sobran o faltan
+            if len(word) - length <= typos and len(token_set.difference(word)) <= typos \
+                    and bag_distance(token_letters, length, word) <= typos:
+                distance = osa_distance(token, word, typos)
+                if distance <= typos:
+                    matches.append((word, 1.0 - distance / length))
+                    continue
+            if len(word) > length:
+                prefix = word[:length]
+                distance = prefix_distances.get(prefix)
+                if distance is None:
+                    distance = typos + 1
+                    if len(token_set.difference(prefix)) <= typos \
+                            and bag_distance(token_letters, length, prefix) <= typos:
+                        distance = osa_distance(token, prefix, typos)
+                    prefix_distances[prefix] = distance
+                if distance <= typos:
+                    matches.append((word, 0.9 * (1.0 - distance / length)))
+
+        matches.sort(key=itemgetter(1))
+        return matches
+
+    def search(self, query: str, limit: Optional[int] = None,
+               item_ids: Optional[Iterable[int]] = None) -> List[Tuple[int, float]]:
+        """
+        Items cuyas palabras se parecen a todos los términos de la consulta
+
+        Args:
+            query: Texto buscado (puede tener errores de escritura)
+            limit: Máximo de resultados (None = todos)
+            item_ids: Restringir a estos items (p. ej. los de una categoría)
+
+        Returns:
+            Lista (item_id, score) de mejor a peor; score en (0, 1]
+        """
+        tokens = list(dict.fromkeys(tokenize(query)))
+        if not tokens:
+            return []
+        allowed = set(item_ids) if item_ids is not None else None
+
+        with self._lock:
+            if len(tokens) == 1:
+                return self._search_token(tokens[0], limit, allowed)
+
+            per_token = []
+            for token in tokens:
+                # De menor a mayor similitud: cada item se queda con la mejor palabra
+                token_scores: Dict[int, float] = {}
+                for word, similarity in self.match_words(token):
+                    token_scores.update(dict.fromkeys(self._word_items[word], similarity))
+                if not token_scores:
+                    return []
+                per_token.append(token_scores)
+
+        # Intersección en C (vistas de claves) antes de puntuar en Python
+        per_token.sort(key=len)
+        candidates = per_token[0].keys() & allowed if allowed is not None else per_token[0].keys()
+        for token_scores in per_token[1:]:
+            candidates = candidates & token_scores.keys()
+
+        scores = {item_id: sum(token_scores[item_id] for token_scores in per_token) / len(per_token)
+                  for item_id in candidates}
+
+        if limit is not None and limit < len(scores):
+            return heapq.nlargest(limit, scores.items(), key=itemgetter(1))
+        return sorted(scores.items(), key=itemgetter(1), reverse=True)
+
+    def _search_token(self, token: str, limit: Optional[int],
+                      allowed: Optional[Set[int]]) -> List[Tuple[int, float]]:
+        """Un solo término: recorrer las palabras de mejor a peor (sin puntuar todo)"""
+        results = []
+        seen: Set[int] = set()
+        for word, similarity in reversed(self.match_words(token)):
+            for item_id in self._word_items[word]:
+                if item_id in seen or (allowed is not None and item_id not in allowed):
+                    continue
+                seen.add(item_id)
+                results.append((item_id, similarity))
+                if limit is not None and len(results) >= limit:
+                    return results
+        return results
+
+
+class SyncedFuzzyIndex(FuzzyIndex):
+    """
+    FuzzyIndex sincronizado con una base de datos
+
+    Se construye en la primera búsqueda (o con build()). Los eventos del
+    ChangeBus marcan items a releer; la siguiente búsqueda los lee por id
+    y actualiza solo esas entradas. Cambios externos reconstruyen todo.
+    """
+
+    def __init__(self, db_manager):
+        super().__init__()
+        self.db = db_manager
+        self._built = False
+        self._needs_rebuild = True
+        self._stale_ids: Set[int] = set()
+        self._sync_lock = threading.Lock()
+        db_manager.changes.subscribe(self._on_db_change, tables=('items',))
+
+    def _on_db_change(self, event) -> None:
+        """Suscriptor del ChangeBus: marcar los items a reindexar"""
+        if event.usage_only:
+            return
+        with self._sync_lock:
+            if event.table == ALL_TABLES or not event.ids:
+                self._needs_rebuild = True
+            else:
+                self._stale_ids.update(event.ids)
+
+    def build(self) -> None:
+        """Indexar todos los items (una consulta)"""
+        rows = self.db.get_item_search_fields()
+        with self._lock:
+            self.clear()
+            for row in rows:
+                self.update_item(row['id'], row['label'], row['tags'], row['list_group'])
+        self._built = True
+        logger.info(f"Fuzzy index built: {len(rows)} items, {self.vocabulary_size} words")
+
+    def sync(self) -> None:
+        """Aplicar los cambios pendientes (reconstruir o releer items sueltos)"""
+        with self._sync_lock:
+            rebuild = self._needs_rebuild or not self._built
+            stale_ids = self._stale_ids
+            self._needs_rebuild = False
+            self._stale_ids = set()
+
+        try:
+            if rebuild:
+                self.build()
+            elif stale_ids:
+                rows = {row['id']: row for row in self.db.get_item_search_fields(list(stale_ids))}
+                with self._lock:
+                    for item_id in stale_ids:
+                        row = rows.get(item_id)
+                        if row is None:
+                            self.remove_item(item_id)
+                        else:
+                            self.update_item(item_id, row['label'], row['tags'], row['list_group'])
+        except Exception as e:
+            logger.error(f"Error updating fuzzy index: {e}")
+            with self._sync_lock:
+                self._needs_rebuild = self._needs_rebuild or rebuild
+                self._stale_ids.update(stale_ids)
+
+    def search(self, query: str, limit: Optional[int] = None,
+               item_ids: Optional[Iterable[int]] = None) -> List[Tuple[int, float]]:
+        self.sync()
+        return super().search(query, limit, item_ids)
+
+
+_indexes: Dict[str, SyncedFuzzyIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_fuzzy_index(db_manager) -> SyncedFuzzyIndex:
+    """
+    Obtener el índice difuso compartido del proceso para una base de datos
+
+    Las bases de datos :memory: tienen un índice propio.
+    """
+    if str(db_manager.db_path) == ":memory:":
+        return SyncedFuzzyIndex(db_manager)
+
+    key = str(Path(db_manager.db_path).resolve())
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            index = _indexes[key] = SyncedFuzzyIndex(db_manager)
+        return index
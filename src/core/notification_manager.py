@@ -4,10 +4,11 @@ Autor: Widget Sidebar Team
 Fecha: 2025-01-23
 """
 
-import sqlite3
 from typing import List, Dict, Optional
 from pathlib import Path
 import logging
+from database.connection_pool import get_connection
+from database.usage_rollups import ITEM_TOTALS_CTE
 
 logger = logging.getLogger(__name__)
 
@@ -124,22 +125,21 @@ class NotificationManager:
     def _get_failing_items(self, min_executions: int = 10, min_error_rate: int = 30) -> List[Dict]:
         """Obtener items con alta tasa de error"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            conn.row_factory = sqlite3.Row
+            conn = get_connection(self.db_path)
             cursor = conn.cursor()
 
-            cursor.execute("""
+            cursor.execute(f"""
+                WITH {ITEM_TOTALS_CTE}
                 SELECT
                     i.id,
                     i.label,
                     i.badge,
-                    COUNT(h.id) as total_executions,
-                    SUM(CASE WHEN h.success = 0 THEN 1 ELSE 0 END) as error_count,
-                    ROUND(100.0 * SUM(CASE WHEN h.success = 0 THEN 1 ELSE 0 END) / COUNT(h.id), 1) as error_rate
+                    t.executions as total_executions,
+                    t.failures as error_count,
+                    ROUND(100.0 * t.failures / t.executions, 1) as error_rate
                 FROM items i
-                JOIN item_usage_history h ON i.id = h.item_id
-                GROUP BY i.id
-                HAVING total_executions >= ? AND error_rate >= ?
+                JOIN usage_totals t ON t.item_id = i.id
+                WHERE t.executions >= ? AND ROUND(100.0 * t.failures / t.executions, 1) >= ?
                 ORDER BY error_rate DESC
                 LIMIT 10
             """, (min_executions, min_error_rate))
@@ -165,22 +165,21 @@ class NotificationManager:
     def _get_slow_items(self, min_executions: int = 10, min_avg_time_seconds: float = 5.0) -> List[Dict]:
         """Obtener items con tiempo de ejecución lento"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            conn.row_factory = sqlite3.Row
+            conn = get_connection(self.db_path)
             cursor = conn.cursor()
 
-            cursor.execute("""
+            cursor.execute(f"""
+                WITH {ITEM_TOTALS_CTE}
                 SELECT
                     i.id,
                     i.label,
                     i.badge,
-                    COUNT(h.id) as executions,
-                    ROUND(AVG(h.execution_time_ms) / 1000.0, 2) as avg_time_seconds
+                    t.successes as executions,
+                    ROUND(CAST(t.success_time_ms AS REAL) / t.successes / 1000.0, 2) as avg_time_seconds
                 FROM items i
-                JOIN item_usage_history h ON i.id = h.item_id
-                WHERE h.success = 1
-                GROUP BY i.id
-                HAVING executions >= ? AND avg_time_seconds >= ?
+                JOIN usage_totals t ON t.item_id = i.id
+                WHERE t.successes > 0 AND t.successes >= ?
+                  AND ROUND(CAST(t.success_time_ms AS REAL) / t.successes / 1000.0, 2) >= ?
                 ORDER BY avg_time_seconds DESC
                 LIMIT 10
             """, (min_executions, min_avg_time_seconds))
@@ -205,8 +204,7 @@ class NotificationManager:
     def _get_popular_items_without_shortcuts(self, min_use_count: int = 30) -> List[Dict]:
         """Obtener items populares sin atajos asignados"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            conn.row_factory = sqlite3.Row
+            conn = get_connection(self.db_path)
             cursor = conn.cursor()
 
             cursor.execute("""
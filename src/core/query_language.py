@@ -0,0 +1,708 @@
+"""
+Query Language for Widget Sidebar
+Búsquedas estructuradas: tag:git type:code is:fav cat:Docker -archived used>5 "frase"
+
+SearchEngine, AdvancedFilterEngine y SmartCollectionsManager tenían cada
+uno su propia forma de describir filtros. Este módulo define un lenguaje
+común para la barra de búsqueda y las colecciones guardadas:
+
+- parse_query() convierte el texto en un árbol (AST) de nodos inmutables
+- compile_query() compila el árbol a una cláusula WHERE parametrizada
+  sobre items (alias i; usa items_fts e item_tags cuando existen) y a un
+  predicado en memoria equivalente, para Item y para filas dict
+- los planes compilados se guardan por texto de consulta (LRU): escribir
+  o ejecutar la misma consulta no vuelve a analizarla
+
+Sintaxis:
+    docker comp           todas las palabras, por prefijo (docker* compose*)
+    "docker compose"      frase exacta (palabras consecutivas)
+    tag:git               tag exacto, sin distinguir mayúsculas (tag:"mi tag")
+    type:code             tipo de item: text, url, code, path
+    is:fav                fav, sensitive, archived, active, list, tagged, used
+    cat:Docker            categoría por nombre (cat:"Mis comandos")
+    used>5                veces usado (>, >=, <, <=, =)
+    created>=2025-01-01   fecha de creación (UTC); lastused igual
+    lastused<7d           usado hace menos de 7 días (h, d, w)
+    -tag:wip, -archived   negación de un filtro (o de un flag suelto)
+    NOT docker            negación de texto ("ls -la" sigue siendo texto)
+    a OR b, (a b) OR c    OR y grupos; los términos seguidos se combinan con AND
+
+Las palabras se comparan normalizadas (utils.search_keys.fold) contra
+label, contenido (no sensible), descripción, tags y nombre de lista.
+
+Uso:
+    plan = compile_query('tag:git is:fav "git push"')
+    sql, params = plan.sql()
+    items = plan.filter(items)
+"""
+
+import calendar
+import json
+import logging
+import re
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Callable, Iterable, List, Optional, Tuple, Union
+
+from utils.search_keys import fold
+from utils.timestamps import row_datetime
+
+logger = logging.getLogger(__name__)
+
+# Planes compilados guardados (por texto de consulta)
+PLAN_CACHE_SIZE = 128
+
+
+class QuerySyntaxError(ValueError):
+    """La consulta no se puede analizar (paréntesis, valores o campos inválidos)"""
+
+
+# ========== AST ==========
+
+@dataclass(frozen=True)
+class TextTerm:
+    """Palabras normalizadas; prefix: la última puede ser un prefijo"""
+    words: Tuple[str, ...]
+    phrase: bool = False
+    prefix: bool = True
+
+
+@dataclass(frozen=True)
+class TagTerm:
+    name: str
+
+
+@dataclass(frozen=True)
+class TypeTerm:
+    value: str
+
+
+@dataclass(frozen=True)
+class FlagTerm:
+    flag: str
+
+
+@dataclass(frozen=True)
+class CategoryTerm:
+    name: str
+
+
+@dataclass(frozen=True)
+class Age:
+    """Antigüedad relativa (segundos antes de ahora); se resuelve al ejecutar"""
+    seconds: int
+
+
+@dataclass(frozen=True)
+class CompareTerm:
+    """field: 'use_count', 'created_at' o 'last_used'; value: int (epoch) o Age"""
+    field: str
+    op: str
+    value: Union[int, Age]
+
+
+@dataclass(frozen=True)
+class Not:
+    child: Any
+
+
+@dataclass(frozen=True)
+class And:
+    children: Tuple[Any, ...]
+
+
+@dataclass(frozen=True)
+class Or:
+    children: Tuple[Any, ...]
+
+
+# ========== VOCABULARIO ==========
+
+_FIELDS = {
+    'tag': 'tag', 'tags': 'tag',
+    'type': 'type', 'tipo': 'type',
+    'is': 'is', 'has': 'is',
+    'cat': 'cat', 'category': 'cat', 'categoria': 'cat',
+}
+
+_COMPARE_FIELDS = {
+    'used': 'use_count', 'uses': 'use_count',
+    'created': 'created_at',
+    'lastused': 'last_used', 'last_used': 'last_used',
+}
+
+_FLAGS = {
+    'fav': 'fav', 'favorite': 'fav', 'favorito': 'fav',
+    'sensitive': 'sensitive', 'sensible': 'sensitive',
+    'archived': 'archived', 'archivado': 'archived',
+    'active': 'active', 'activo': 'active',
+    'list': 'list', 'lista': 'list',
+    'tagged': 'tagged', 'tags': 'tagged',
+    'used': 'used', 'usado': 'used',
+}
+
+_ITEM_TYPES = ('TEXT', 'URL', 'CODE', 'PATH')
+
+_AGE_UNITS = {'h': 3600, 'd': 86400, 'w': 7 * 86400}
+
+# Al comparar antigüedades el sentido se invierte: lastused<7d es "más
+# reciente que hace 7 días", es decir last_used > ahora - 7d
+_AGE_OPS = {'<': '>', '<=': '>=', '>': '<', '>=': '<='}
+
+# Mismo criterio que el tokenizador unicode61 de FTS5: letras y dígitos
+_WORD_RE = re.compile(r'[^\W_]+')
+
+_TOKEN_RE = re.compile(r'\s+|(\()|(\))|(-?(?:[^\s()"]*"[^"]*"?|[^\s()"]+))')
+
+_FIELD_RE = re.compile(r'([A-Za-z_]+)(>=|<=|>|<|=|:)(.*)', re.DOTALL)
+
+
+def words_of(text: Optional[str]) -> Tuple[str, ...]:
+    """Palabras normalizadas de un texto (como las indexa items_fts)"""
+    return tuple(_WORD_RE.findall(fold(text)))
+
+
+# ========== PARSER ==========
+
+def parse_query(text: str):
+    """
+    Analizar una consulta
+
+    Args:
+        text: Consulta escrita por el usuario
+
+    Returns:
+        Nodo raíz del AST (And vacío si la consulta no tiene términos)
+
+    Raises:
+        QuerySyntaxError: Si la consulta no es válida
+    """
+    return _Parser(_tokenize(text or '')).parse()
+
+
+def _tokenize(text: str) -> List[Tuple[str, str]]:
+    tokens = []
+    for match in _TOKEN_RE.finditer(text):
+        lparen, rparen, term = match.groups()
+        if lparen:
+            tokens.append(('(', lparen))
+        elif rparen:
+            tokens.append((')', rparen))
+        elif term:
+            if term in ('OR', 'AND', 'NOT'):
+                tokens.append((term, term))
+            elif term == '-':
+                tokens.append(('NOT', term))
+            else:
+                tokens.append(('term', term))
+    return tokens
+
+
+class _Parser:
+    """Descenso recursivo: or := and (OR and)*; and := unary+; unary := NOT unary | (or) | term"""
+
+    def __init__(self, tokens: List[Tuple[str, str]]):
+        self.tokens = tokens
+        self.pos = 0
+
+    def parse(self):
+        if not self.tokens:
+            return And(())
+        node = self._parse_or()
+        if self.pos < len(self.tokens):
+            raise QuerySyntaxError(f"Paréntesis ')' sin abrir en la posición {self.pos + 1}")
+        return node if node is not None else And(())
+
+    def _peek(self) -> Optional[str]:
+        return self.tokens[self.pos][0] if self.pos < len(self.tokens) else None
+
+    def _parse_or(self):
+        children = [self._parse_and()]
+        while self._peek() == 'OR':
+            self.pos += 1
+            children.append(self._parse_and())
+        children = [child for child in children if child is not None]
+        if len(children) == 1:
+            return children[0]
+        return Or(tuple(children)) if children else None
+
+    def _parse_and(self):
+        children = []
+        consumed = False
+        while self._peek() not in (None, ')', 'OR'):
+            if self._peek() == 'AND':
+                self.pos += 1
+                continue
+            consumed = True
+            node = self._parse_unary()
+            if node is not None:
+                children.append(node)
+        if not consumed:
+            raise QuerySyntaxError("Falta un término (antes o después de OR, o entre paréntesis)")
+        if len(children) == 1:
+            return children[0]
+        return And(tuple(children)) if children else None
+
+    def _parse_unary(self):
+        kind, value = self.tokens[self.pos]
+        self.pos += 1
+        if kind == 'NOT':
+            if self._peek() in (None, ')', 'OR'):
+                raise QuerySyntaxError("Falta el término de NOT")
+            child = self._parse_unary()
+            return Not(child) if child is not None else None
+        if kind == '(':
+            node = self._parse_or()
+            if self._peek() != ')':
+                raise QuerySyntaxError("Falta cerrar un paréntesis")
+            self.pos += 1
+            return node
+        if kind == 'AND':
+            return None
+        return _parse_term(value)
+
+
+def _parse_term(raw: str):
+    """Un término: -filtro, campo:valor, campo>N, "frase" o palabra"""
+    negated = raw.startswith('-') and len(raw) > 1
+    body = raw[1:] if negated else raw
+
+    node = None
+    quoted = re.fullmatch(r'([^\s()"]*)"([^"]*)("?)', body)
+    if quoted:
+        prefix, value, closed = quoted.groups()
+        if not prefix:
+            # Frase sin cerrar: se está escribiendo, la última palabra es prefijo
+            words = words_of(value)
+            node = TextTerm(words, phrase=True, prefix=not closed) if words else None
+        elif prefix.endswith(':') and prefix[:-1].lower() in _FIELDS:
+            node = _field_term(prefix[:-1].lower(), value)
+        else:
+            node = _text_term(body)
+    else:
+        field = _FIELD_RE.fullmatch(body)
+        name = field.group(1).lower() if field else None
+        if field and field.group(2) == ':' and name in _FIELDS:
+            node = _field_term(name, field.group(3))
+        elif field and name in _COMPARE_FIELDS:
+            op = '=' if field.group(2) == ':' else field.group(2)
+            node = _compare_term(_COMPARE_FIELDS[name], op, field.group(3))
+        elif negated and body.lower() in _FLAGS:
+            node = FlagTerm(_FLAGS[body.lower()])
+        elif negated:
+            # "-la" en "ls -la" es texto: solo se niegan filtros (o NOT palabra)
+            return _text_term(raw)
+        else:
+            node = _text_term(body)
+
+    if node is None:
+        return None
+    return Not(node) if negated else node
+
+
+def _text_term(text: str) -> Optional[TextTerm]:
+    words = words_of(text)
+    if not words:
+        return None
+    # "docker-compose" son dos palabras seguidas, como en el índice
+    return TextTerm(words, phrase=len(words) > 1)
+
+
+def _field_term(field: str, value: str):
+    value = value.strip()
+    if not value:
+        raise QuerySyntaxError(f"Falta el valor de '{field}:'")
+    if field == 'tag':
+        return TagTerm(value)
+    if field == 'cat':
+        return CategoryTerm(value)
+    if field == 'type':
+        item_type = value.upper()
+        if item_type not in _ITEM_TYPES:
+            raise QuerySyntaxError(f"Tipo desconocido: '{value}' (text, url, code, path)")
+        return TypeTerm(item_type)
+    flag = _FLAGS.get(value.lower())
+    if flag is None:
+        raise QuerySyntaxError(f"Filtro desconocido: 'is:{value}' ({', '.join(sorted(set(_FLAGS.values())))})")
+    return FlagTerm(flag)
+
+
+def _compare_term(field: str, op: str, value: str):
+    value = value.strip()
+    if not value:
+        raise QuerySyntaxError(f"Falta el valor de la comparación '{field}{op}'")
+    if field == 'use_count':
+        if not value.isdigit():
+            raise QuerySyntaxError(f"Número inválido: '{value}'")
+        return CompareTerm(field, op, int(value))
+
+    relative = re.fullmatch(r'(\d+)([hdw])', value.lower())
+    if relative:
+        if op == '=':
+            raise QuerySyntaxError(f"Una antigüedad ('{value}') necesita <, <=, > o >=")
+        seconds = int(relative.group(1)) * _AGE_UNITS[relative.group(2)]
+        return CompareTerm(field, _AGE_OPS[op], Age(seconds))
+
+    try:
+        day = datetime.strptime(value, '%Y-%m-%d')
+    except ValueError:
+        raise QuerySyntaxError(f"Fecha inválida: '{value}' (YYYY-MM-DD o 7d, 12h, 2w)")
+    start = calendar.timegm(day.timetuple())
+    end = start + 86400
+    # Días completos: created>2025-01-01 empieza el día siguiente
+    if op == '=':
+        return And((CompareTerm(field, '>=', start), CompareTerm(field, '<', end)))
+    if op == '>':
+        return CompareTerm(field, '>=', end)
+    if op == '<=':
+        return CompareTerm(field, '<', end)
+    return CompareTerm(field, op, start)
+
+
+def iter_terms(node) -> Iterable[Tuple[Any, bool]]:
+    """Términos hoja del árbol y si están negados (número impar de NOT)"""
+    stack = [(node, False)]
+    while stack:
+        current, negated = stack.pop()
+        if isinstance(current, (And, Or)):
+            stack.extend((child, negated) for child in reversed(current.children))
+        elif isinstance(current, Not):
+            stack.append((current.child, not negated))
+        else:
+            yield current, negated
+
+
+# ========== COMPILADOR SQL ==========
+
+_FLAG_SQL = {
+    'fav': "i.is_favorite = 1",
+    'sensitive': "i.is_sensitive = 1",
+    'archived': "i.is_archived = 1",
+    'active': "i.is_active = 1",
+    'list': "i.is_list = 1",
+    'tagged': "EXISTS (SELECT 1 FROM item_tags it WHERE it.item_id = i.id)",
+    'used': "i.use_count > 0",
+}
+
+_COMPARE_COLUMNS = {
+    'use_count': "i.use_count",
+    'created_at': "i.created_at_ts",
+    'last_used': "i.last_used_ts",
+}
+
+_LIKE_TEXT_SQL = (
+    "(i.label LIKE ? OR (i.is_sensitive = 0 AND i.content LIKE ?)"
+    " OR i.description LIKE ? OR i.tags LIKE ? OR i.list_group LIKE ?)"
+)
+
+
+def _compile_sql(node, params: list, fts_enabled: bool) -> str:
+    """
+    Cláusula WHERE de un nodo (los parámetros se añaden a params)
+
+    Un valor NULL cuenta como falso en todo el árbol: NOT lo convierte con
+    COALESCE antes de negarlo, igual que el predicado en memoria.
+    """
+    if isinstance(node, And):
+        if not node.children:
+            return "1"
+        return "(" + " AND ".join(_compile_sql(child, params, fts_enabled) for child in node.children) + ")"
+    if isinstance(node, Or):
+        return "(" + " OR ".join(_compile_sql(child, params, fts_enabled) for child in node.children) + ")"
+    if isinstance(node, Not):
+        return f"NOT COALESCE({_compile_sql(node.child, params, fts_enabled)}, 0)"
+    if isinstance(node, TextTerm):
+        if fts_enabled:
+            params.append(fts_expression(node))
+            return "i.id IN (SELECT rowid FROM items_fts WHERE items_fts MATCH ?)"
+        pattern = f"%{' '.join(node.words)}%"
+        params.extend([pattern] * 5)
+        return _LIKE_TEXT_SQL
+    if isinstance(node, TagTerm):
+        params.append(node.name)
+        return ("i.id IN (SELECT it.item_id FROM item_tags it"
+                " JOIN tags t ON t.id = it.tag_id WHERE t.name = ?)")
+    if isinstance(node, TypeTerm):
+        params.append(node.value)
+        return "i.type = ?"
+    if isinstance(node, FlagTerm):
+        return _FLAG_SQL[node.flag]
+    if isinstance(node, CategoryTerm):
+        params.append(node.name)
+        return "i.category_id IN (SELECT id FROM categories WHERE name = ? COLLATE NOCASE)"
+    if isinstance(node, CompareTerm):
+        params.append(node.value)
+        return f"{_COMPARE_COLUMNS[node.field]} {node.op} ?"
+    raise TypeError(f"Nodo desconocido: {node!r}")
+
+
+def fts_expression(term: TextTerm) -> str:
+    """Expresión MATCH de FTS5 para un término de texto ("a b"* o "a b")"""
+    expression = '"' + ' '.join(term.words) + '"'
+    return expression + '*' if term.prefix else expression
+
+
+# ========== PREDICADO EN MEMORIA ==========
+
+def _tag_list(value) -> List[str]:
+    """Tags de un Item o fila: lista, JSON o CSV (formato antiguo)"""
+    if not value:
+        return []
+    if isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except json.JSONDecodeError:
+            return [tag.strip() for tag in value.split(',') if tag.strip()]
+    return list(value) if isinstance(value, (list, tuple)) else []
+
+
+class _Record:
+    """Vista uniforme de un Item o una fila dict; calcula las palabras una vez"""
+
+    __slots__ = ('record', 'is_dict', 'category_name', '_words')
+
+    def __init__(self, record, category_name: Optional[str] = None):
+        self.record = record
+        self.is_dict = isinstance(record, dict)
+        self.category_name = category_name
+        self._words = None
+
+    def get(self, name: str, default=None):
+        if self.is_dict:
+            return self.record.get(name, default)
+        return getattr(self.record, name, default)
+
+    def words(self) -> Tuple[Tuple[str, ...], ...]:
+        """Palabras de cada campo indexado (el contenido sensible no cuenta)"""
+        if self._words is None:
+            content = None if self.get('is_sensitive') else self.get('content')
+            self._words = tuple(
+                fields for fields in (
+                    words_of(self.get('label')),
+                    words_of(content) if isinstance(content, str) else (),
+                    words_of(self.get('description')),
+                    words_of(' '.join(_tag_list(self.get('tags')))),
+                    words_of(self.get('list_group')),
+                ) if fields
+            )
+        return self._words
+
+    def epoch(self, column: str) -> Optional[int]:
+        if self.is_dict:
+            ts = self.record.get(f"{column}_ts")
+            if ts is not None:
+                return ts
+            try:
+                value = row_datetime(self.record, column)
+            except ValueError:
+                return None
+        else:
+            value = getattr(self.record, column, None)
+        if not isinstance(value, datetime):
+            return None
+        # Naive = UTC, como las columnas de la base de datos
+        return calendar.timegm(value.utctimetuple())
+
+
+def _contains_words(fields: Tuple[Tuple[str, ...], ...], term: TextTerm) -> bool:
+    query = term.words
+    *head, last = query
+    for words in fields:
+        for start in range(len(words) - len(query) + 1):
+            if list(words[start:start + len(head)]) != head:
+                continue
+            word = words[start + len(head)]
+            if word == last or (term.prefix and word.startswith(last)):
+                return True
+    return False
+
+
+def _compare(value, op: str, target) -> bool:
+    if value is None:
+        return False
+    if op == '>':
+        return value > target
+    if op == '>=':
+        return value >= target
+    if op == '<':
+        return value < target
+    if op == '<=':
+        return value <= target
+    return value == target
+
+
+_FLAG_ATTRS = {
+    'fav': 'is_favorite',
+    'sensitive': 'is_sensitive',
+    'archived': 'is_archived',
+    'active': 'is_active',
+    'list': 'is_list',
+}
+
+
+def _compile_predicate(node) -> Callable[[_Record, float], bool]:
+    """Predicado (registro, ahora) -> bool equivalente a la cláusula SQL"""
+    if isinstance(node, And):
+        children = [_compile_predicate(child) for child in node.children]
+        return lambda record, now: all(child(record, now) for child in children)
+    if isinstance(node, Or):
+        children = [_compile_predicate(child) for child in node.children]
+        return lambda record, now: any(child(record, now) for child in children)
+    if isinstance(node, Not):
+        child = _compile_predicate(node.child)
+        return lambda record, now: not child(record, now)
+    if isinstance(node, TextTerm):
+        if len(node.words) == 1 and node.prefix:
+            word = node.words[0]
+            return lambda record, now: any(
+                candidate.startswith(word) for words in record.words() for candidate in words
+            )
+        return lambda record, now: _contains_words(record.words(), node)
+    if isinstance(node, TagTerm):
+        name = node.name.casefold()
+        return lambda record, now: any(
+            tag.casefold() == name for tag in _tag_list(record.get('tags'))
+        )
+    if isinstance(node, TypeTerm):
+        def match_type(record, now):
+            value = record.get('type')
+            value = getattr(value, 'value', value)
+            return isinstance(value, str) and value.upper() == node.value
+        return match_type
+    if isinstance(node, FlagTerm):
+        if node.flag == 'tagged':
+            return lambda record, now: bool(_tag_list(record.get('tags')))
+        if node.flag == 'used':
+            return lambda record, now: _compare(record.get('use_count'), '>', 0)
+        attr = _FLAG_ATTRS[node.flag]
+        return lambda record, now: bool(record.get(attr))
+    if isinstance(node, CategoryTerm):
+        name = node.name.casefold()
+
+        def match_category(record, now):
+            category = record.category_name or record.get('category_name')
+            return isinstance(category, str) and category.casefold() == name
+        return match_category
+    if isinstance(node, CompareTerm):
+        if node.field == 'use_count':
+            return lambda record, now: _compare(record.get('use_count'), node.op, node.value)
+        if isinstance(node.value, Age):
+            seconds = node.value.seconds
+            return lambda record, now: _compare(record.epoch(node.field), node.op, now - seconds)
+        return lambda record, now: _compare(record.epoch(node.field), node.op, node.value)
+    raise TypeError(f"Nodo desconocido: {node!r}")
+
+
+# ========== PLAN COMPILADO ==========
+
+class CompiledQuery:
+    """
+    Consulta analizada y compilada (inmutable, compartida por la caché)
+
+    where usa el alias i para items; los parámetros se obtienen con
+    bind_params() porque las antigüedades (7d) dependen de la hora actual.
+    """
+
+    def __init__(self, text: str, ast, fts_enabled: bool):
+        self.query = text
+        self.ast = ast
+        self.fts_enabled = fts_enabled
+        params = []
+        self.where = _compile_sql(ast, params, fts_enabled)
+        self._params = tuple(params)
+        self._predicate = _compile_predicate(ast)
+
+        # Texto para ordenar y resaltar resultados (palabras no negadas)
+        self.text = ' '.join(
+            word for term, negated in iter_terms(ast)
+            if isinstance(term, TextTerm) and not negated for word in term.words
+        )
+        # Solo palabras sueltas: los buscadores mantienen su búsqueda por subcadena
+        terms = ast.children if isinstance(ast, And) else (ast,)
+        self.is_plain_text = all(isinstance(term, TextTerm) and not term.phrase for term in terms)
+
+    def bind_params(self, now: Optional[float] = None) -> tuple:
+        """Parámetros de where, con las antigüedades resueltas respecto a now"""
+        if now is None:
+            now = time.time()
+        return tuple(
+            int(now) - param.seconds if isinstance(param, Age) else param
+            for param in self._params
+        )
+
+    def sql(self, columns: str = "i.*, c.name AS category_name",
+            order_by: str = "i.last_used DESC, i.created_at DESC",
+            limit: Optional[int] = None, now: Optional[float] = None) -> Tuple[str, tuple]:
+        """
+        Sentencia SELECT completa sobre items i JOIN categories c
+
+        Returns:
+            (sql, parámetros)
+        """
+        sql = (f"SELECT {columns} FROM items i"
+               f" JOIN categories c ON c.id = i.category_id"
+               f" WHERE {self.where} ORDER BY {order_by}")
+        params = self.bind_params(now)
+        if limit is not None:
+            sql += " LIMIT ?"
+            params += (limit,)
+        return sql, params
+
+    def matches(self, record, now: Optional[float] = None,
+                category_name: Optional[str] = None) -> bool:
+        """
+        Evaluar la consulta sobre un Item o una fila dict
+
+        Args:
+            record: Item o dict con las columnas de items
+            now: Hora actual (epoch) para las antigüedades
+            category_name: Nombre de categoría si el registro no lo incluye
+        """
+        return self._predicate(_Record(record, category_name), time.time() if now is None else now)
+
+    def filter(self, records: Iterable, now: Optional[float] = None,
+               category_name: Optional[str] = None) -> List:
+        """Registros que cumplen la consulta, en su orden (category_name: ver matches)"""
+        if now is None:
+            now = time.time()
+        predicate = self._predicate
+        return [record for record in records if predicate(_Record(record, category_name), now)]
+
+    def __repr__(self) -> str:
+        return f"CompiledQuery({self.query!r}, where={self.where!r})"
+
+
+@lru_cache(maxsize=PLAN_CACHE_SIZE)
+def compile_query(text: str, fts_enabled: bool = True) -> CompiledQuery:
+    """
+    Analizar y compilar una consulta (cacheado por texto)
+
+    Args:
+        text: Consulta escrita por el usuario
+        fts_enabled: Si la base de datos tiene items_fts (si no, LIKE)
+
+    Returns:
+        CompiledQuery
+
+    Raises:
+        QuerySyntaxError: Si la consulta no es válida (no se cachea)
+    """
+    plan = CompiledQuery(text, parse_query(text), fts_enabled)
+    logger.debug(f"Compiled query {text!r}: {plan.where}")
+    return plan
+
+
+def try_compile_query(text: str, fts_enabled: bool = True) -> Optional[CompiledQuery]:
+    """
+    Plan de una consulta estructurada, o None si es texto simple o no es válida
+
+    Para la barra de búsqueda: mientras se escribe "tag:" la consulta aún no
+    es válida y se busca como texto.
+    """
+    try:
+        plan = compile_query(text.strip(), fts_enabled)
+    except QuerySyntaxError:
+        return None
+    return None if plan.is_plain_text else plan
@@ -3,21 +3,45 @@ Search Engine for Widget Sidebar
 Provides filtering and searching functionality for items across categories
 """
 
-from typing import List, Optional
-import re
+from typing import Dict, List, Optional, Sequence, Union
 from models.item import Item
-from models.category import Category
+from models.category import Category, CategoryIndex
+from core.search_session import SearchSession
+from core.query_language import CompiledQuery, try_compile_query
+from utils.search_keys import fold, find_matches
 
 
 class SearchEngine:
     """
     Search engine for filtering items across categories
-    Performs case-insensitive search on item labels and content
+    Performs case- and accent-insensitive search on item labels and content
+
+    With a SearchRanker, results are ordered by match quality and frecency
+    instead of category/insertion order. With a FuzzyIndex, items whose
+    label, tags or list name match with typos ("dokcer") are appended
+    after the exact matches.
+
+    Exact matches go through a SearchSession: while typing, each query
+    only filters the results of the previous one.
+
+    Structured queries ("tag:git is:fav -archived used>5", see
+    core.query_language) are evaluated with their compiled plan instead
+    and ranked by their text words.
     """
 
-    def __init__(self):
-        """Initialize search engine"""
-        pass
+    def __init__(self, ranker=None, fuzzy_index=None):
+        """
+        Initialize search engine
+
+        Args:
+            ranker: SearchRanker used to order results (optional)
+            fuzzy_index: FuzzyIndex for typo-tolerant matches (optional)
+        """
+        self.ranker = ranker
+        self.fuzzy_index = fuzzy_index
+        self.session = SearchSession(self.match_items, key=lambda item: item.id)
+        # Item -> category of the searched categories (get_search_stats)
+        self.category_index = CategoryIndex()
 
     def search(self, query: str, categories: List[Category]) -> List[Item]:
         """
@@ -34,30 +58,19 @@ class SearchEngine:
             # Return all items if query is empty
             return self._get_all_items(categories)
 
-        query = query.strip().lower()
-        matching_items = []
+        plan = try_compile_query(query)
+        if plan is not None:
+            return self.search_plan(plan, categories)
 
+        query = fold(query.strip())
+        candidates = []
         for category in categories:
-            if not category.is_active:
-                continue
-
-            for item in category.items:
-                # Search in label, content, and tags
-                label_match = query in item.label.lower()
-                content_match = query in item.content.lower()
-
-                # Search in tags
-                tags_match = False
-                if item.tags:
-                    for tag in item.tags:
-                        if query in tag.lower():
-                            tags_match = True
-                            break
-
-                if label_match or content_match or tags_match:
-                    matching_items.append(item)
+            if category.is_active:
+                candidates.extend(category.items)
 
-        return matching_items
+        matching_items = self.session.search(query, candidates)
+        fuzzy_scores = self.add_fuzzy_matches(query, self.session.candidates_by_id(), matching_items)
+        return self.rank(matching_items, query, fuzzy_scores)
 
     def search_in_category(self, query: str, category: Category) -> List[Item]:
         """
@@ -73,27 +86,107 @@ class SearchEngine:
         if not query or not query.strip():
             return category.items
 
-        query = query.strip().lower()
+        plan = try_compile_query(query)
+        if plan is not None:
+            return self.search_plan(plan, [category], active_only=False)
+
+        query = fold(query.strip())
+        matching_items = self.session.search(query, category.items)
+        fuzzy_scores = self.add_fuzzy_matches(query, self.session.candidates_by_id(), matching_items)
+        return self.rank(matching_items, query, fuzzy_scores)
+
+    def search_plan(self, plan: CompiledQuery, categories: List[Category],
+                    active_only: bool = True) -> List[Item]:
+        """
+        Items matching a compiled structured query
+
+        Args:
+            plan: Compiled query (core.query_language.compile_query)
+            categories: Categories to search through (cat: matches their names)
+            active_only: Skip inactive categories
+
+        Returns:
+            Matching items, ranked by the query's text words
+        """
         matching_items = []
+        for category in categories:
+            if category.is_active or not active_only:
+                matching_items.extend(plan.filter(category.items, category_name=category.name))
+        return self.rank(matching_items, plan.text)
 
-        for item in category.items:
-            # Search in label, content, and tags
-            label_match = query in item.label.lower()
-            content_match = query in item.content.lower()
+    def match_items(self, query: str, items: Sequence[Item]) -> List[Item]:
+        """
+        Items whose label, content or tags contain query (in items order)
 
-            # Search in tags
-            tags_match = False
-            if item.tags:
-                for tag in item.tags:
-                    if query in tag.lower():
-                        tags_match = True
-                        break
+        Args:
+            query: Normalized search query (utils.search_keys.fold)
+            items: Items to search
 
-            if label_match or content_match or tags_match:
+        Returns:
+            List of matching items
+        """
+        matching_items = []
+        for item in items:
+            # Search in label, content, and tags (one precomputed key; sensitive
+            # content is never part of it, it stays sealed)
+            if query in item.search_text:
                 matching_items.append(item)
-
         return matching_items
 
+    def add_fuzzy_matches(self, query: str, candidates: Union[List[Item], Dict[int, Item]],
+                          matching_items: List[Item]) -> Dict[int, float]:
+        """
+        Append the candidates that only match with typos (best first)
+
+        Args:
+            query: Normalized search query
+            candidates: Items searched (or the same items by id)
+            matching_items: Exact matches, extended in place
+
+        Returns:
+            Dict[int, float]: Fuzzy score of each appended item id
+        """
+        if self.fuzzy_index is None or len(query) < 3:
+            return {}
+
+        if isinstance(candidates, dict):
+            by_id = candidates
+        else:
+            by_id = {}
+            for item in candidates:
+                try:
+                    by_id[int(item.id)] = item
+                except (TypeError, ValueError):
+                    continue
+        if not by_id:
+            return {}
+
+        matched_ids = {id(item) for item in matching_items}
+        fuzzy_scores = {}
+        for item_id, score in self.fuzzy_index.search(query, item_ids=by_id):
+            item = by_id[item_id]
+            if id(item) not in matched_ids:
+                fuzzy_scores[item_id] = score
+                matching_items.append(item)
+        return fuzzy_scores
+
+    def rank(self, items: List[Item], query: str,
+             fuzzy_scores: Optional[Dict[int, float]] = None) -> List[Item]:
+        """
+        Order search results best first (unchanged without a ranker)
+
+        Args:
+            items: Items matching the query
+            query: Search query string
+            fuzzy_scores: Scores of the items that only match with typos
+
+        Returns:
+            Items ordered by match quality and frecency
+        """
+        if self.ranker is None:
+            return items
+        return self.ranker.rank(items, query, fuzzy_scores)
+
     def highlight_matches(self, text: str, query: str) -> str:
         """
         Highlight matching text with HTML tags
@@ -108,16 +201,22 @@ class SearchEngine:
         if not query or not query.strip():
             return text
 
-        query = query.strip()
-
-        # Escape special regex characters
-        escaped_query = re.escape(query)
-
-        # Case-insensitive replacement with <mark> tags
-        pattern = re.compile(f'({escaped_query})', re.IGNORECASE)
-        highlighted = pattern.sub(r'<mark>\1</mark>', text)
-
-        return highlighted
+        # Structured queries highlight their text words, not the filters
+        plan = try_compile_query(query)
+        if plan is not None:
+            query = plan.text
+            if not query:
+                return text
+
+        # Accent-insensitive, marks the original text
+        result = []
+        last_pos = 0
+        for start, end in find_matches(text, fold(query.strip())):
+            result.append(text[last_pos:start])
+            result.append(f'<mark>{text[start:end]}</mark>')
+            last_pos = end
+        result.append(text[last_pos:])
+        return ''.join(result)
 
     def _get_all_items(self, categories: List[Category]) -> List[Item]:
         """
@@ -139,26 +238,42 @@ class SearchEngine:
         """
         Get statistics about search results
 
+        One pass over the results: the category of each item comes from the
+        reverse index (CategoryIndex), and the type and tag facets are
+        counted in the same loop.
+
         Args:
             query: Search query
             categories: List of categories to search
 
         Returns:
-            Dictionary with search statistics
+            Dictionary with search statistics: total, category breakdown
+            (by name) and type/tag facets (tags counted once per item)
         """
         results = self.search(query, categories)
 
-        # Count matches by category
-        category_counts = {}
+        self.category_index.sync(categories)
+        category_counts = [0] * len(categories)
+        type_counts = {}
+        tag_counts = {}
         for item in results:
-            # Find which category this item belongs to
-            for category in categories:
-                if item in category.items:
-                    category_counts[category.name] = category_counts.get(category.name, 0) + 1
-                    break
+            position = self.category_index.position_of(item)
+            if position is not None:
+                category_counts[position] += 1
+            type_counts[item.type.value] = type_counts.get(item.type.value, 0) + 1
+            for tag in set(item.tags):
+                tag_counts[tag] = tag_counts.get(tag, 0) + 1
+
+        # Several categories may share a name
+        category_breakdown = {}
+        for category, count in zip(categories, category_counts):
+            if count:
+                category_breakdown[category.name] = category_breakdown.get(category.name, 0) + count
 
         return {
             'total_results': len(results),
             'query': query,
-            'category_breakdown': category_counts
+            'category_breakdown': category_breakdown,
+            'type_breakdown': type_counts,
+            'tag_breakdown': dict(sorted(tag_counts.items(), key=lambda entry: (-entry[1], entry[0])))
         }
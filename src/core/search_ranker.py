@@ -0,0 +1,255 @@
+"""
+Search Ranker for Widget Sidebar
+Ordena resultados de búsqueda por calidad de coincidencia y frecencia
+
+La puntuación de un item combina:
+- Calidad de la coincidencia (sobre las claves normalizadas, sin acentos,
+  de utils.search_keys): label exacto > prefijo del label > inicio de
+  palabra del label > subcadena del label > tag > contenido/descripción >
+  coincidencia con errores (core/fuzzy_index)
+- Frecencia: usos con decaimiento exponencial (database/frecency), leída
+  de item_frecency y guardada en memoria
+
+La frecencia suma siempre menos de FRECENCY_WEIGHT (1.5 niveles de
+calidad): un item muy usado que coincide en una palabra del label puede
+adelantar a un prefijo que nunca se usó. El label exacto suma además
+FRECENCY_WEIGHT completo, así que ningún otro nivel lo alcanza por mucho
+que se use.
+
+Los scores se cargan una vez y se refrescan por item cuando el ChangeBus
+avisa de nuevos usos (item_frecency), así que ordenar no consulta la base
+de datos en cada pulsación.
+
+Uso:
+    ranker = get_search_ranker(config_manager.db)
+    results = ranker.rank(matching_items, query)
+"""
+
+import logging
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Set
+
+from database.change_bus import ALL_TABLES
+from database.frecency import decayed_frecency
+from utils.search_keys import fold
+
+logger = logging.getLogger(__name__)
+
+# Calidad de la coincidencia (niveles)
+EXACT_LABEL = 6.0
+LABEL_PREFIX = 5.0
+LABEL_WORD = 4.0
+LABEL_SUBSTRING = 3.0
+TAG_MATCH = 2.0
+CONTENT_MATCH = 1.0
+# Coincidencias con errores: FUZZY_MATCH * score del FuzzyIndex (0-1]
+FUZZY_MATCH = 0.9
+NO_MATCH = 0.0
+
+# Bonificación máxima por frecencia y usos decaídos que dan la mitad
+FRECENCY_WEIGHT = 1.5
+FRECENCY_HALF_SATURATION = 5.0
+
+
+def label_key_quality(label_key: str, query: str) -> float:
+    """
+    Calidad de la coincidencia de query en la clave de búsqueda de un label
+
+    Args:
+        label_key: Label normalizado (utils.search_keys.fold)
+        query: Consulta normalizada
+
+    Returns:
+        EXACT_LABEL, LABEL_PREFIX, LABEL_WORD, LABEL_SUBSTRING o NO_MATCH
+    """
+    index = label_key.find(query)
+    if index < 0:
+        return NO_MATCH
+    if index == 0:
+        return EXACT_LABEL if len(label_key) == len(query) else LABEL_PREFIX
+    while index >= 0:
+        if not label_key[index - 1].isalnum():
+            return LABEL_WORD
+        index = label_key.find(query, index + 1)
+    return LABEL_SUBSTRING
+
+
+def label_match_quality(label: str, query: str) -> float:
+    """Calidad de la coincidencia de query (normalizada) en un label sin normalizar"""
+    return label_key_quality(fold(label), query)
+
+
+def key_match_quality(query: str, label_key: str, tag_keys: Sequence[str] = (),
+                      content_key: Optional[str] = None, description_key: Optional[str] = None) -> float:
+    """
+    Calidad de la mejor coincidencia de query en las claves de búsqueda de un item
+
+    Todas las claves y la consulta ya normalizadas (utils.search_keys.fold).
+    El contenido de los items sensibles no debe pasarse (content_key=None).
+    """
+    quality = label_key_quality(label_key, query)
+    if quality:
+        return quality
+    if any(query in tag for tag in tag_keys):
+        return TAG_MATCH
+    if content_key and query in content_key:
+        return CONTENT_MATCH
+    if description_key and query in description_key:
+        return CONTENT_MATCH
+    return NO_MATCH
+
+
+def match_quality(query: str, label: str, tags: Sequence[str] = (),
+                  content: Optional[str] = None, description: Optional[str] = None) -> float:
+    """
+    Calidad de la mejor coincidencia de query (normalizada) en un item
+
+    El contenido de los items sensibles no debe pasarse (content=None).
+    """
+    return key_match_quality(query, fold(label), [fold(tag) for tag in tags or ()],
+                             fold(content), fold(description))
+
+
+class SearchRanker:
+    """
+    Ordenación de resultados con frecencia precalculada en memoria
+
+    Thread-safe: los avisos del ChangeBus pueden llegar desde el hilo de
+    volcado de UsageQueue.
+    """
+
+    def __init__(self, db_manager=None):
+        """
+        Args:
+            db_manager: DBManager del que leer item_frecency (None = solo
+                        calidad de coincidencia)
+        """
+        self.db = db_manager
+        self._scores: Dict[int, float] = {}
+        self._stale_ids: Set[int] = set()
+        self._needs_reload = db_manager is not None
+        self._lock = threading.Lock()
+
+        if db_manager is not None:
+            db_manager.changes.subscribe(self._on_db_change, tables=('item_frecency', 'items'))
+
+    def _on_db_change(self, event) -> None:
+        """Suscriptor del ChangeBus: marcar los scores a releer"""
+        with self._lock:
+            if event.table == ALL_TABLES or (event.table == 'item_frecency' and not event.ids):
+                self._needs_reload = True
+            elif event.table == 'item_frecency':
+                self._stale_ids.update(event.ids)
+            elif event.action == 'delete':
+                for item_id in event.ids:
+                    self._scores.pop(item_id, None)
+
+    def refresh(self) -> None:
+        """Releer solo los scores que cambiaron desde la última ordenación"""
+        if self.db is None:
+            return
+        with self._lock:
+            reload_all = self._needs_reload
+            stale_ids = self._stale_ids
+            self._needs_reload = False
+            self._stale_ids = set()
+        if not reload_all and not stale_ids:
+            return
+
+        try:
+            if reload_all:
+                scores = self.db.get_frecency_scores()
+                with self._lock:
+                    self._scores = scores
+                logger.debug(f"Frecency scores loaded: {len(scores)} items")
+            else:
+                scores = self.db.get_frecency_scores(list(stale_ids))
+                with self._lock:
+                    self._scores.update(scores)
+        except Exception as e:
+            logger.error(f"Error loading frecency scores: {e}")
+            with self._lock:
+                self._needs_reload = self._needs_reload or reload_all
+                self._stale_ids.update(stale_ids)
+
+    def frecency(self, item_id, now: Optional[float] = None) -> float:
+        """Usos decaídos de un item en el instante now (por defecto, ahora)"""
+        self.refresh()
+        return decayed_frecency(self._score_of(item_id), time.time() if now is None else now)
+
+    @staticmethod
+    def _item_key(item_id) -> Optional[int]:
+        try:
+            return int(item_id)
+        except (TypeError, ValueError):
+            return None
+
+    def _score_of(self, item_id) -> Optional[float]:
+        return self._scores.get(self._item_key(item_id))
+
+    def score(self, quality: float, item_id, now: float) -> float:
+        """Puntuación final: calidad de la coincidencia + bonificación por frecencia"""
+        frecency = decayed_frecency(self._score_of(item_id), now)
+        bonus = FRECENCY_WEIGHT * frecency / (frecency + FRECENCY_HALF_SATURATION)
+        if quality >= EXACT_LABEL:
+            # Por encima de cualquier prefijo con la bonificación máxima
+            bonus += FRECENCY_WEIGHT
+        return quality + bonus
+
+    def rank(self, items: Iterable, query: str,
+             fuzzy_scores: Optional[Dict[int, float]] = None) -> List:
+        """
+        Ordenar items (modelo Item) de mejor a peor resultado
+
+        Los items sin coincidencia se conservan al final; con query vacía
+        se ordenan solo por frecencia. El orden es estable ante empates.
+
+        Args:
+            items: Items ya filtrados por la búsqueda
+            query: Texto buscado
+            fuzzy_scores: Score difuso (item_id -> 0-1) de los items que solo
+                          coinciden con errores
+        """
+        fuzzy_scores = fuzzy_scores or {}
+        self.refresh()
+        query = fold((query or '').strip())
+        now = time.time()
+
+        def sort_key(item):
+            quality = NO_MATCH
+            if query:
+                # search_text holds label, tags and (non-sensitive) content: once
+                # label and tags are ruled out, a match in it is a content match
+                quality = key_match_quality(query, item.search_label, item.search_tags,
+                                            item.search_text, item.search_description)
+                if not quality:
+                    quality = FUZZY_MATCH * fuzzy_scores.get(self._item_key(item.id), 0.0)
+            return -self.score(quality, item.id, now)
+
+        return sorted(items, key=sort_key)
+
+
+_rankers: Dict[str, SearchRanker] = {}
+_rankers_lock = threading.Lock()
+
+
+def get_search_ranker(db_manager) -> SearchRanker:
+    """
+    Obtener el SearchRanker compartido del proceso para una base de datos
+
+    Todos los paneles de la misma base de datos comparten los scores. Las
+    bases de datos :memory: tienen un ranker propio.
+    """
+    if db_manager is None:
+        return SearchRanker()
+    if str(db_manager.db_path) == ":memory:":
+        return SearchRanker(db_manager)
+
+    key = str(Path(db_manager.db_path).resolve())
+    with _rankers_lock:
+        ranker = _rankers.get(key)
+        if ranker is None:
+            ranker = _rankers[key] = SearchRanker(db_manager)
+        return ranker
@@ -0,0 +1,144 @@
+"""
+Search Session for Widget Sidebar
+Búsqueda incremental mientras se escribe
+
+Al escribir "docker comp" cada pulsación volvía a recorrer todos los
+items. Una sesión (una por panel) recuerda los resultados de las últimas
+consultas sobre el mismo conjunto de candidatos:
+
+- si la consulta ya está en la caché (p. ej. al borrar con backspace) se
+  devuelven sus resultados
+- si contiene una consulta anterior ("docker" -> "docker c") solo se
+  filtran los resultados de esa consulta: la búsqueda es por subcadena,
+  así que todo lo que contiene "docker c" contiene "docker"
+- si no (se borró o cambió texto en medio) se recorren todos los
+  candidatos
+
+La caché se vacía cuando cambian los candidatos (otros items, filtros o
+datos recargados) o el contexto (p. ej. el alcance de la búsqueda).
+
+El matcher recibe (query, candidates) y devuelve los que coinciden en el
+orden de candidates; debe ser una búsqueda por subcadena (monótona).
+
+Uso:
+    session = SearchSession(matcher, key=lambda item: item.id)
+    results = session.search(query_lower, filtered_items)
+"""
+
+import logging
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+# Consultas recientes guardadas por sesión
+QUERY_CACHE_SIZE = 16
+
+
+class SearchSession:
+    """
+    Caché de resultados de una búsqueda incremental
+
+    No es thread-safe: cada panel usa la suya desde el hilo de la interfaz.
+    """
+
+    def __init__(self, matcher: Callable[[str, Sequence], List],
+                 key: Optional[Callable[[Any], Any]] = None,
+                 cache_size: int = QUERY_CACHE_SIZE):
+        """
+        Args:
+            matcher: Función (query, candidates) -> candidatos que coinciden
+            key: Id de item de un candidato, para candidates_by_id() (opcional)
+            cache_size: Número de consultas recientes a conservar
+        """
+        self.matcher = matcher
+        self.key = key
+        self.cache_size = cache_size
+        self._candidates: Optional[List] = None
+        self._identities: List[int] = []
+        self._context: Hashable = None
+        self._by_id: Optional[Dict[int, Any]] = None
+        self._results: "OrderedDict[str, List]" = OrderedDict()
+
+        # Contadores: consulta en caché, filtrada desde otra, recorrido completo
+        self.hits = 0
+        self.narrowed = 0
+        self.misses = 0
+
+    def reset(self) -> None:
+        """Olvidar candidatos y resultados (los datos cambiaron)"""
+        self._candidates = None
+        self._by_id = None
+        self._results.clear()
+
+    def search(self, query: str, candidates: Sequence, context: Hashable = None) -> List:
+        """
+        Candidatos que coinciden con query
+
+        Args:
+            query: Consulta ya normalizada (la clave de la caché)
+            candidates: Items donde buscar
+            context: Cualquier otro parámetro del matcher (se compara con ==)
+
+        Returns:
+            Lista nueva con los candidatos que coinciden, en su orden
+        """
+        # Comparar por identidad (Item.__eq__ compara ids): un item recargado
+        # es otro objeto. Los candidatos guardados siguen vivos, así que sus
+        # id() no pueden repetirse en objetos nuevos
+        identities = list(map(id, candidates))
+        if context != self._context or self._candidates is None or identities != self._identities:
+            self.reset()
+            self._candidates = list(candidates)
+            self._identities = identities
+            self._context = context
+
+        results = self._results.get(query)
+        if results is not None:
+            self.hits += 1
+            self._results.move_to_end(query)
+            return list(results)
+
+        base = self._narrowest_base(query)
+        if base is None:
+            self.misses += 1
+            logger.debug(f"Search session: full scan for '{query}' ({len(self._candidates)} candidates)")
+            results = self.matcher(query, self._candidates)
+        else:
+            self.narrowed += 1
+            results = self.matcher(query, base)
+
+        if query:
+            self._results[query] = results
+            if len(self._results) > self.cache_size:
+                self._results.popitem(last=False)
+        return list(results)
+
+    def _narrowest_base(self, query: str) -> Optional[List]:
+        """Resultados más pequeños de una consulta anterior contenida en query"""
+        base = None
+        for previous, results in self._results.items():
+            if previous in query and (base is None or len(results) < len(base)):
+                base = results
+        return base
+
+    def candidates_by_id(self) -> Dict[int, Any]:
+        """Candidatos actuales por id de item (se calcula una vez por conjunto)"""
+        if self._by_id is None:
+            by_id = {}
+            for candidate in self._candidates or ():
+                try:
+                    by_id[int(self.key(candidate))] = candidate
+                except (TypeError, ValueError):
+                    continue
+            self._by_id = by_id
+        return self._by_id
+
+    def stats(self) -> Dict[str, int]:
+        """Contadores de la sesión"""
+        return {
+            'hits': self.hits,
+            'narrowed': self.narrowed,
+            'misses': self.misses,
+            'cached_queries': len(self._results),
+        }
@@ -0,0 +1,239 @@
+"""
+Search Worker for Widget Sidebar
+Búsquedas fuera del hilo de la UI, con cancelación y resultados por lotes
+
+En la búsqueda global cada pulsación filtraba, buscaba, ordenaba y creaba
+todos los widgets de resultados en el hilo de la UI. Ahora:
+
+- cada búsqueda tiene un id creciente; al lanzar otra, la anterior queda
+  cancelada: si aún no empezó no se ejecuta, la función de búsqueda puede
+  consultar request.cancelled entre etapas, y sus resultados se descartan
+- los resultados llegan por lotes: primero una pantalla (FIRST_BATCH_SIZE)
+  y el resto en lotes sucesivos del bucle de eventos, así la ventana sigue
+  respondiendo mientras se crean los widgets
+- AdaptiveDebounce ajusta la espera del buscador al coste medido de las
+  búsquedas: rápido con pocos items, más paciente si buscar es caro
+
+Las búsquedas se ejecutan en un único hilo propio, en orden: el estado de
+búsqueda de un panel (SearchSession) solo se usa desde ese hilo.
+
+Uso desde la UI:
+    self.search_worker = SearchWorker(self)
+    self.search_worker.batch_ready.connect(self.on_search_batch)
+    self.search_worker.search_finished.connect(self.on_search_finished)
+    self.search_worker.submit(self._run_search, query, items)
+
+    def _run_search(self, request, query, items):
+        ...
+        if request.cancelled:
+            return None  # se descarta
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, List, Optional
+
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal, pyqtSlot
+
+logger = logging.getLogger(__name__)
+
+# Resultados del primer lote (una pantalla) y de los siguientes
+FIRST_BATCH_SIZE = 20
+BATCH_SIZE = 50
+
+# Espera del buscador (ms): mínimo, máximo y múltiplo del coste medido
+MIN_DEBOUNCE_MS = 80
+MAX_DEBOUNCE_MS = 400
+DEBOUNCE_COST_FACTOR = 2.0
+
+# Peso de la última medida en la media móvil del coste
+COST_SMOOTHING = 0.3
+
+
+class AdaptiveDebounce:
+    """
+    Espera entre la última pulsación y la búsqueda según su coste
+
+    Con búsquedas baratas la espera se queda en el mínimo (la lista
+    responde al escribir); si cada búsqueda cuesta más, se espera más para
+    no lanzar búsquedas que la siguiente pulsación va a cancelar.
+    """
+
+    def __init__(self, min_ms: int = MIN_DEBOUNCE_MS, max_ms: int = MAX_DEBOUNCE_MS,
+                 factor: float = DEBOUNCE_COST_FACTOR, smoothing: float = COST_SMOOTHING):
+        """
+        Args:
+            min_ms: Espera mínima
+            max_ms: Espera máxima
+            factor: Múltiplo del coste medio de una búsqueda
+            smoothing: Peso de cada medida nueva (media móvil exponencial)
+        """
+        self.min_ms = min_ms
+        self.max_ms = max_ms
+        self.factor = factor
+        self.smoothing = smoothing
+        self.average_cost_ms: Optional[float] = None
+
+    def record(self, cost_ms: float) -> int:
+        """
+        Registrar el coste de una búsqueda
+
+        Returns:
+            Nueva espera en ms
+        """
+        if self.average_cost_ms is None:
+            self.average_cost_ms = cost_ms
+        else:
+            self.average_cost_ms += self.smoothing * (cost_ms - self.average_cost_ms)
+        return self.interval()
+
+    def interval(self) -> int:
+        """Espera actual en ms"""
+        if self.average_cost_ms is None:
+            return self.min_ms
+        wait = int(self.average_cost_ms * self.factor)
+        return max(self.min_ms, min(self.max_ms, wait))
+
+
+class SearchRequest:
+    """Búsqueda en curso; cancelled pasa a True cuando se lanza otra"""
+
+    __slots__ = ('request_id', '_worker')
+
+    def __init__(self, request_id: int, worker: "SearchWorker"):
+        self.request_id = request_id
+        self._worker = worker
+
+    @property
+    def cancelled(self) -> bool:
+        return self.request_id != self._worker.current_request_id
+
+
+class SearchWorker(QObject):
+    """
+    Ejecuta búsquedas en un hilo propio y entrega los resultados por lotes
+
+    Signals:
+        batch_ready(int, list, bool): id de búsqueda, lote de resultados y
+            si es el primero (la vista debe vaciarse antes de añadirlo)
+        search_finished(int, int, float): id, total de resultados y coste
+            de la búsqueda en ms (sin contar la creación de widgets)
+        search_failed(int, str): id y error
+    """
+
+    batch_ready = pyqtSignal(int, list, bool)
+    search_finished = pyqtSignal(int, int, float)
+    search_failed = pyqtSignal(int, str)
+
+    # Señal interna emitida desde el hilo de búsqueda (conexión en cola)
+    _finished = pyqtSignal(int, object, object, float)
+
+    def __init__(self, parent: Optional[QObject] = None,
+                 first_batch_size: int = FIRST_BATCH_SIZE, batch_size: int = BATCH_SIZE):
+        """
+        Args:
+            parent: QObject padre
+            first_batch_size: Resultados del primer lote
+            batch_size: Resultados de cada lote siguiente
+        """
+        super().__init__(parent)
+        self.first_batch_size = first_batch_size
+        self.batch_size = batch_size
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="search")
+        self._id_lock = threading.Lock()
+        self._request_id = 0
+        self._future: Optional[Future] = None
+        self._pending: List[Any] = []
+        self._finished.connect(self._on_finished)
+
+    @property
+    def current_request_id(self) -> int:
+        """Id de la búsqueda más reciente (las anteriores están canceladas)"""
+        return self._request_id
+
+    def submit(self, fn: Callable, *args, **kwargs) -> int:
+        """
+        Lanzar fn(request, *args, **kwargs) en el hilo de búsqueda
+
+        fn devuelve la lista de resultados, o None si se canceló.
+
+        Returns:
+            Id de la búsqueda
+        """
+        with self._id_lock:
+            self._request_id += 1
+            request = SearchRequest(self._request_id, self)
+        if self._future is not None:
+            # Si aún no empezó, no llega a ejecutarse
+            self._future.cancel()
+        self._pending = []
+
+        future = self._executor.submit(self._run, request, fn, args, kwargs)
+        self._future = future
+        return request.request_id
+
+    def cancel(self) -> None:
+        """Cancelar la búsqueda en curso y los lotes pendientes"""
+        with self._id_lock:
+            self._request_id += 1
+        if self._future is not None:
+            self._future.cancel()
+            self._future = None
+        self._pending = []
+
+    def shutdown(self) -> None:
+        """Detener el hilo de búsqueda"""
+        self.cancel()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _run(self, request: SearchRequest, fn: Callable, args: tuple, kwargs: dict) -> None:
+        """Ejecutar la búsqueda (hilo de búsqueda)"""
+        if request.cancelled:
+            return
+        start = time.perf_counter()
+        try:
+            results, error = fn(request, *args, **kwargs), None
+        except Exception as e:
+            results, error = None, e
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        if request.cancelled or (results is None and error is None):
+            logger.debug(f"Search {request.request_id} cancelled")
+            return
+        try:
+            self._finished.emit(request.request_id, results, error, elapsed_ms)
+        except RuntimeError:
+            # El QObject ya fue destruido (ventana cerrada)
+            pass
+
+    @pyqtSlot(int, object, object, float)
+    def _on_finished(self, request_id: int, results: Any, error: Optional[Exception],
+                     elapsed_ms: float) -> None:
+        """Entregar los resultados en el hilo de la UI si siguen vigentes"""
+        if request_id != self._request_id:
+            logger.debug(f"Discarding stale search results ({request_id})")
+            return
+
+        self._future = None
+        if error is not None:
+            logger.error(f"Search {request_id} failed: {error}")
+            self.search_failed.emit(request_id, str(error))
+            return
+
+        results = list(results)
+        self.search_finished.emit(request_id, len(results), elapsed_ms)
+        self._pending = results[self.first_batch_size:]
+        self.batch_ready.emit(request_id, results[:self.first_batch_size], True)
+        if self._pending:
+            QTimer.singleShot(0, lambda: self._emit_next_batch(request_id))
+
+    def _emit_next_batch(self, request_id: int) -> None:
+        """Siguiente lote, en otra vuelta del bucle de eventos"""
+        if request_id != self._request_id or not self._pending:
+            return
+        batch = self._pending[:self.batch_size]
+        self._pending = self._pending[self.batch_size:]
+        self.batch_ready.emit(request_id, batch, False)
+        if self._pending:
+            QTimer.singleShot(0, lambda: self._emit_next_batch(request_id))
@@ -4,15 +4,49 @@ Fecha: 2025-11-05
 
 Este módulo maneja las operaciones CRUD para Smart Collections (colecciones inteligentes),
 que son filtros guardados con criterios múltiples para búsquedas dinámicas de items.
+
+Además de los filtros fijos, una colección puede guardar una consulta del
+lenguaje de búsqueda (columna query, ver core/query_language):
+'tag:git is:fav -archived used>5'. Se compila una vez y se combina con AND
+con el resto de filtros en la misma sentencia SQL.
+
+Los items de cada colección se guardan en collection_members (ver
+migrations/add_collection_members): abrir o contar una colección es una
+consulta por índice. Antes de leer se aplican las entradas nuevas de
+change_log, evaluando solo los items que cambiaron. Las colecciones cuya
+consulta depende del uso (used>5, is:used, lastused) o de la hora actual
+(created>7d) se ejecutan siempre en vivo: change_log no anota el uso y
+el paso del tiempo no genera entradas.
 """
 
+import json
 import sqlite3
 import logging
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterable, Set, Tuple
 from datetime import datetime
+from database.connection_pool import get_connection
+from database.migrations import (
+    add_change_log, add_collection_members, add_collection_query, add_items_fts
+)
+from core.query_language import (
+    Age, CategoryTerm, CompareTerm, FlagTerm, QuerySyntaxError, compile_query, iter_terms
+)
 
 logger = logging.getLogger(__name__)
 
+# Campos de una colección que deciden sus items (firma de collection_members_state)
+FILTER_FIELDS = (
+    'query', 'category_id', 'item_type', 'is_favorite', 'is_sensitive',
+    'is_active_filter', 'is_archived_filter', 'search_text',
+    'tags_include', 'tags_exclude', 'date_from', 'date_to',
+)
+
+# Items evaluados por sentencia (límite de variables de SQLite)
+MEMBER_BATCH_SIZE = 500
+
+# Con más items cambiados, recalcular la colección entera es más barato
+FULL_REBUILD_THRESHOLD = 5000
+
 
 class SmartCollectionsManager:
     """Gestor de Smart Collections (filtros guardados inteligentes)"""
@@ -25,19 +59,29 @@ class SmartCollectionsManager:
             db_path: Ruta al archivo de base de datos SQLite
         """
         self.db_path = db_path
+        self._fts_enabled = False
+        self._members_enabled = False
+        try:
+            conn = self._get_connection()
+            with conn:
+                # Bases de datos creadas antes de la columna query / collection_members
+                add_collection_query.upgrade(conn)
+                add_collection_members.upgrade(conn)
+            self._fts_enabled = add_items_fts.fts_table_exists(conn)
+            self._members_enabled = (add_collection_members.table_exists(conn)
+                                     and add_change_log.table_exists(conn))
+        except sqlite3.Error as e:
+            logger.error(f"Error preparing smart_collections: {e}")
         logger.info("SmartCollectionsManager initialized")
 
     def _get_connection(self) -> sqlite3.Connection:
         """
-        Obtener conexión a la base de datos
+        Obtener conexión a la base de datos (pool compartido, por hilo)
 
         Returns:
             Conexión SQLite
         """
-        conn = sqlite3.connect(self.db_path, check_same_thread=False)
-        conn.row_factory = sqlite3.Row
-        conn.execute("PRAGMA foreign_keys = ON")
-        return conn
+        return get_connection(self.db_path)
 
     # ========== CREATE ==========
 
@@ -58,7 +102,8 @@ class SmartCollectionsManager:
         search_text: Optional[str] = None,
         date_from: Optional[str] = None,
         date_to: Optional[str] = None,
-        is_active: bool = True
+        is_active: bool = True,
+        query: Optional[str] = None
     ) -> Optional[int]:
         """
         Crear una nueva Smart Collection
@@ -80,6 +125,7 @@ class SmartCollectionsManager:
             date_from: Fecha desde (formato ISO)
             date_to: Fecha hasta (formato ISO)
             is_active: Si la colección está activa (default: True)
+            query: Consulta del lenguaje de búsqueda (p. ej. 'tag:git is:fav used>5')
 
         Returns:
             ID de la colección creada, o None si falló
@@ -95,27 +141,30 @@ class SmartCollectionsManager:
                 logger.error(f"Invalid item_type: {item_type}")
                 return None
 
+            # Validar la consulta (los planes quedan cacheados para ejecutarla)
+            if query and not self._is_valid_query(query):
+                return None
+
             conn = self._get_connection()
-            cursor = conn.cursor()
+            with conn:
+                cursor = conn.cursor()
 
-            cursor.execute("""
-                INSERT INTO smart_collections (
-                    name, description, icon, color,
+                cursor.execute("""
+                    INSERT INTO smart_collections (
+                        name, description, icon, color,
+                        tags_include, tags_exclude, category_id, item_type,
+                        is_favorite, is_sensitive, is_active_filter, is_archived_filter,
+                        search_text, date_from, date_to, is_active, query
+                    )
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """, (
+                    name.strip(), description, icon, color,
                     tags_include, tags_exclude, category_id, item_type,
                     is_favorite, is_sensitive, is_active_filter, is_archived_filter,
-                    search_text, date_from, date_to, is_active
-                )
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                name.strip(), description, icon, color,
-                tags_include, tags_exclude, category_id, item_type,
-                is_favorite, is_sensitive, is_active_filter, is_archived_filter,
-                search_text, date_from, date_to, is_active
-            ))
-
-            collection_id = cursor.lastrowid
-            conn.commit()
-            conn.close()
+                    search_text, date_from, date_to, is_active, query or None
+                ))
+
+                collection_id = cursor.lastrowid
 
             logger.info(f"Smart collection created: {name} (ID: {collection_id})")
             return collection_id
@@ -294,7 +343,7 @@ class SmartCollectionsManager:
                 'name', 'description', 'icon', 'color',
                 'tags_include', 'tags_exclude', 'category_id', 'item_type',
                 'is_favorite', 'is_sensitive', 'is_active_filter', 'is_archived_filter',
-                'search_text', 'date_from', 'date_to', 'is_active'
+                'search_text', 'date_from', 'date_to', 'is_active', 'query'
             }
 
             # Filtrar solo campos permitidos
@@ -309,6 +358,9 @@ class SmartCollectionsManager:
                             logger.error(f"Invalid item_type: {value}")
                             return False
 
+                    if field == 'query' and value and not self._is_valid_query(value):
+                        return False
+
                     updates.append(f"{field} = ?")
                     params.append(value)
 
@@ -323,19 +375,18 @@ class SmartCollectionsManager:
             params.append(collection_id)
 
             conn = self._get_connection()
-            cursor = conn.cursor()
+            with conn:
+                cursor = conn.cursor()
 
-            query = f"""
-                UPDATE smart_collections
-                SET {', '.join(updates)}
-                WHERE id = ?
-            """
+                query = f"""
+                    UPDATE smart_collections
+                    SET {', '.join(updates)}
+                    WHERE id = ?
+                """
 
-            cursor.execute(query, params)
-            conn.commit()
+                cursor.execute(query, params)
 
             rows_affected = cursor.rowcount
-            conn.close()
 
             if rows_affected > 0:
                 logger.info(f"Smart collection updated: {collection_id}")
@@ -365,16 +416,16 @@ class SmartCollectionsManager:
         """
         try:
             conn = self._get_connection()
-            cursor = conn.cursor()
+            with conn:
+                cursor = conn.cursor()
 
-            cursor.execute("""
-                DELETE FROM smart_collections
-                WHERE id = ?
-            """, (collection_id,))
-
-            conn.commit()
-            rows_affected = cursor.rowcount
-            conn.close()
+                cursor.execute("""
+                    DELETE FROM smart_collections
+                    WHERE id = ?
+                """, (collection_id,))
+                rows_affected = cursor.rowcount
+                if self._members_enabled:
+                    self._drop_members(conn, collection_id)
 
             if rows_affected > 0:
                 logger.info(f"Smart collection deleted: {collection_id}")
@@ -417,6 +468,8 @@ class SmartCollectionsManager:
                 logger.error(f"Collection {collection_id} not found")
                 return []
 
+            if collection_id in self._sync_members([collection]):
+                return self._execute_members(collection)
             return self._execute_filters(collection)
 
         except Exception as e:
@@ -434,90 +487,15 @@ class SmartCollectionsManager:
             Lista de items que cumplen con los criterios
         """
         try:
-            conn = self._get_connection()
-            cursor = conn.cursor()
-
-            # Construir query dinámica basada en los filtros
-            where_clauses = []
-            params = []
-
-            # Filtro por categoría
-            if collection.get('category_id'):
-                where_clauses.append("category_id = ?")
-                params.append(collection['category_id'])
-
-            # Filtro por tipo de item
-            if collection.get('item_type'):
-                where_clauses.append("item_type = ?")
-                params.append(collection['item_type'])
-
-            # Filtro por favorito
-            if collection.get('is_favorite') is not None:
-                where_clauses.append("is_favorite = ?")
-                params.append(collection['is_favorite'])
-
-            # Filtro por sensible
-            if collection.get('is_sensitive') is not None:
-                where_clauses.append("is_sensitive = ?")
-                params.append(collection['is_sensitive'])
-
-            # Filtro por activo
-            if collection.get('is_active_filter') is not None:
-                where_clauses.append("is_active = ?")
-                params.append(collection['is_active_filter'])
-
-            # Filtro por archivado
-            if collection.get('is_archived_filter') is not None:
-                where_clauses.append("is_archived = ?")
-                params.append(collection['is_archived_filter'])
-
-            # Filtro por texto de búsqueda
-            if collection.get('search_text'):
-                search_pattern = f"%{collection['search_text']}%"
-                where_clauses.append("(label LIKE ? OR content LIKE ?)")
-                params.extend([search_pattern, search_pattern])
-
-            # Filtro por tags incluidos (debe tener al menos uno)
-            if collection.get('tags_include'):
-                tags_list = [tag.strip() for tag in collection['tags_include'].split(',')]
-                if tags_list:
-                    tag_conditions = []
-                    for tag in tags_list:
-                        tag_conditions.append("tags LIKE ?")
-                        params.append(f"%{tag}%")
-                    where_clauses.append(f"({' OR '.join(tag_conditions)})")
-
-            # Filtro por tags excluidos (no debe tener ninguno)
-            if collection.get('tags_exclude'):
-                tags_list = [tag.strip() for tag in collection['tags_exclude'].split(',')]
-                for tag in tags_list:
-                    where_clauses.append("(tags NOT LIKE ? OR tags IS NULL)")
-                    params.append(f"%{tag}%")
-
-            # Filtro por rango de fechas
-            if collection.get('date_from'):
-                where_clauses.append("created_at >= ?")
-                params.append(collection['date_from'])
-
-            if collection.get('date_to'):
-                where_clauses.append("created_at <= ?")
-                params.append(collection['date_to'])
-
-            # Construir query final
-            if where_clauses:
-                where_sql = "WHERE " + " AND ".join(where_clauses)
-            else:
-                where_sql = ""
-
+            where_sql, params = self._where_sql(collection)
             query = f"""
-                SELECT * FROM items
-                {where_sql}
-                ORDER BY last_used DESC, created_at DESC
+                SELECT i.* FROM items i
+                WHERE {where_sql}
+                ORDER BY i.last_used DESC, i.created_at DESC
             """
 
-            cursor.execute(query, params)
-            rows = cursor.fetchall()
-            conn.close()
+            with self._get_connection() as conn:
+                rows = conn.execute(query, params).fetchall()
 
             items = [dict(row) for row in rows]
             logger.debug(f"Collection '{collection['name']}' returned {len(items)} items")
@@ -527,6 +505,116 @@ class SmartCollectionsManager:
             logger.error(f"Error executing filters: {e}", exc_info=True)
             return []
 
+    def _where_sql(self, collection: Dict[str, Any]) -> Tuple[str, List[Any]]:
+        """
+        Cláusula WHERE (alias i para items) de los filtros de una colección
+
+        Args:
+            collection: Diccionario con los datos de la colección
+
+        Returns:
+            Tupla (condición SQL, parámetros); "1" si no hay filtros
+        """
+        where_clauses = []
+        params = []
+
+        # Consulta guardada (lenguaje de búsqueda), compilada y cacheada
+        if collection.get('query'):
+            plan = compile_query(collection['query'].strip(), self._fts_enabled)
+            where_clauses.append(plan.where)
+            params.extend(plan.bind_params())
+
+        # Filtro por categoría
+        if collection.get('category_id'):
+            where_clauses.append("i.category_id = ?")
+            params.append(collection['category_id'])
+
+        # Filtro por tipo de item (la columna de items es type)
+        if collection.get('item_type'):
+            where_clauses.append("i.type = ?")
+            params.append(collection['item_type'])
+
+        # Filtro por favorito
+        if collection.get('is_favorite') is not None:
+            where_clauses.append("i.is_favorite = ?")
+            params.append(collection['is_favorite'])
+
+        # Filtro por sensible
+        if collection.get('is_sensitive') is not None:
+            where_clauses.append("i.is_sensitive = ?")
+            params.append(collection['is_sensitive'])
+
+        # Filtro por activo
+        if collection.get('is_active_filter') is not None:
+            where_clauses.append("i.is_active = ?")
+            params.append(collection['is_active_filter'])
+
+        # Filtro por archivado
+        if collection.get('is_archived_filter') is not None:
+            where_clauses.append("i.is_archived = ?")
+            params.append(collection['is_archived_filter'])
+
+        # Filtro por texto de búsqueda
+        if collection.get('search_text'):
+            search_pattern = f"%{collection['search_text']}%"
+            where_clauses.append("(i.label LIKE ? OR i.content LIKE ?)")
+            params.extend([search_pattern, search_pattern])
+
+        # Filtro por tags incluidos (debe tener al menos uno)
+        # Match exacto sobre el índice item_tags (sin distinguir mayúsculas)
+        if collection.get('tags_include'):
+            tags_list = [tag.strip() for tag in collection['tags_include'].split(',') if tag.strip()]
+            if tags_list:
+                placeholders = ', '.join('?' for _ in tags_list)
+                where_clauses.append(f"""i.id IN (
+                    SELECT it.item_id FROM item_tags it
+                    JOIN tags t ON t.id = it.tag_id
+                    WHERE t.name IN ({placeholders})
+                )""")
+                params.extend(tags_list)
+
+        # Filtro por tags excluidos (no debe tener ninguno)
+        if collection.get('tags_exclude'):
+            tags_list = [tag.strip() for tag in collection['tags_exclude'].split(',') if tag.strip()]
+            if tags_list:
+                placeholders = ', '.join('?' for _ in tags_list)
+                where_clauses.append(f"""i.id NOT IN (
+                    SELECT it.item_id FROM item_tags it
+                    JOIN tags t ON t.id = it.tag_id
+                    WHERE t.name IN ({placeholders})
+                )""")
+                params.extend(tags_list)
+
+        # Filtro por rango de fechas
+        if collection.get('date_from'):
+            where_clauses.append("i.created_at >= ?")
+            params.append(collection['date_from'])
+
+        if collection.get('date_to'):
+            where_clauses.append("i.created_at <= ?")
+            params.append(collection['date_to'])
+
+        if not where_clauses:
+            return "1", params
+        return "(" + " AND ".join(where_clauses) + ")", params
+
+    def _is_valid_query(self, query: str) -> bool:
+        """
+        Verificar que una consulta del lenguaje de búsqueda es válida
+
+        Args:
+            query: Texto de la consulta
+
+        Returns:
+            True si se puede compilar
+        """
+        try:
+            compile_query(query.strip(), self._fts_enabled)
+            return True
+        except QuerySyntaxError as e:
+            logger.error(f"Invalid collection query '{query}': {e}")
+            return False
+
     def get_collection_count(self, collection_id: int) -> int:
         """
         Obtener el número de items que coinciden con una colección (sin cargar todos los items)
@@ -538,8 +626,20 @@ class SmartCollectionsManager:
             Número de items que cumplen con los criterios
         """
         try:
-            items = self.execute_collection(collection_id)
-            return len(items)
+            collection = self.get_collection(collection_id)
+            if not collection:
+                return 0
+
+            conn = self._get_connection()
+            if collection_id in self._sync_members([collection]):
+                row = conn.execute(
+                    "SELECT COUNT(*) FROM collection_members WHERE collection_id = ?",
+                    (collection_id,)
+                ).fetchone()
+            else:
+                where_sql, params = self._where_sql(collection)
+                row = conn.execute(f"SELECT COUNT(*) FROM items i WHERE {where_sql}", params).fetchone()
+            return row[0]
         except Exception as e:
             logger.error(f"Error getting collection count: {e}", exc_info=True)
             return 0
@@ -594,13 +694,309 @@ class SmartCollectionsManager:
         Returns:
             Lista de colecciones con campo 'item_count' agregado
         """
-        collections = self.get_all_collections()
+        return self.add_item_counts(self.get_all_collections())
+
+    def add_item_counts(self, collections: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Agregar 'item_count' a unas colecciones (p. ej. resultados de search_collections)
+
+        Args:
+            collections: Colecciones como diccionarios (se modifican)
+
+        Returns:
+            Las mismas colecciones
+        """
+        # Una sincronización y un GROUP BY para todas las materializadas
+        materialized = self._sync_members(collections)
+        counts = {}
+        if materialized:
+            try:
+                counts = dict(self._get_connection().execute("""
+                    SELECT collection_id, COUNT(*) FROM collection_members
+                    GROUP BY collection_id
+                """).fetchall())
+            except sqlite3.Error as e:
+                logger.error(f"Error counting collection members: {e}")
+                materialized = set()
 
         for collection in collections:
-            collection['item_count'] = self.get_collection_count(collection['id'])
+            if collection['id'] in materialized:
+                collection['item_count'] = counts.get(collection['id'], 0)
+            else:
+                collection['item_count'] = self.get_collection_count(collection['id'])
 
         return collections
 
+    # ========== MIEMBROS MATERIALIZADOS ==========
+
+    def _query_terms(self, collection: Dict[str, Any]) -> Optional[list]:
+        """Términos de la consulta guardada ([] sin consulta, None si no es válida)"""
+        if not collection.get('query'):
+            return []
+        try:
+            plan = compile_query(collection['query'].strip(), self._fts_enabled)
+        except QuerySyntaxError:
+            return None
+        return [term for term, _ in iter_terms(plan.ast)]
+
+    def _can_materialize(self, collection: Dict[str, Any]) -> bool:
+        """True si los items de la colección solo cambian cuando change_log lo anota"""
+        if not self._members_enabled:
+            return False
+        terms = self._query_terms(collection)
+        if terms is None:
+            return False
+        for term in terms:
+            if isinstance(term, FlagTerm) and term.flag == 'used':
+                return False
+            if isinstance(term, CompareTerm) and (term.field != 'created_at' or isinstance(term.value, Age)):
+                return False
+        return True
+
+    def _signature(self, collection: Dict[str, Any]) -> str:
+        """Definición de la colección con la que se calculan sus miembros"""
+        return json.dumps([collection.get(field) for field in FILTER_FIELDS] + [self._fts_enabled],
+                          default=str)
+
+    def _sync_members(self, collections: Iterable[Dict[str, Any]]) -> Set[int]:
+        """
+        Poner al día collection_members para estas colecciones
+
+        Las colecciones nuevas, editadas o que se quedaron atrás del change_log
+        (recortado) se recalculan enteras; el resto solo evalúa los items
+        anotados en change_log desde su synced_seq.
+
+        Args:
+            collections: Colecciones (diccionarios completos)
+
+        Returns:
+            IDs de las colecciones materializadas y al día (el resto se
+            ejecuta en vivo)
+        """
+        collections = list(collections)
+        if not self._members_enabled or not collections:
+            return set()
+
+        conn = self._get_connection()
+        try:
+            with conn:
+                # Leer la secuencia antes de evaluar: un cambio posterior vuelve a
+                # evaluarse en la próxima sincronización
+                current_seq = conn.execute("SELECT COALESCE(MAX(seq), 0) FROM change_log").fetchone()[0]
+                oldest_seq = conn.execute("SELECT MIN(seq) FROM change_log").fetchone()[0]
+                ids = [collection['id'] for collection in collections]
+                placeholders = ', '.join('?' for _ in ids)
+                states = {
+                    row['collection_id']: row for row in conn.execute(f"""
+                        SELECT collection_id, signature, synced_seq FROM collection_members_state
+                        WHERE collection_id IN ({placeholders})
+                    """, ids).fetchall()
+                }
+
+                materialized = set()
+                pending = []
+                for collection in collections:
+                    collection_id = collection['id']
+                    if not self._can_materialize(collection):
+                        if collection_id in states:
+                            self._drop_members(conn, collection_id)
+                        continue
+
+                    materialized.add(collection_id)
+                    state = states.get(collection_id)
+                    signature = self._signature(collection)
+                    if (state is None or state['signature'] != signature
+                            or state['synced_seq'] > current_seq
+                            or (oldest_seq is not None and oldest_seq > state['synced_seq'] + 1)):
+                        self._rebuild_members(conn, collection, signature, current_seq)
+                    elif state['synced_seq'] < current_seq:
+                        pending.append((collection, state['synced_seq']))
+
+                if pending:
+                    self._apply_changes(conn, pending, current_seq)
+                return materialized
+
+        except sqlite3.Error as e:
+            logger.warning(f"Could not sync collection members, running collections live: {e}")
+            return set()
+
+    def _apply_changes(self, conn: sqlite3.Connection, pending: List[Tuple[Dict[str, Any], int]],
+                       current_seq: int) -> None:
+        """Evaluar de nuevo los items anotados en change_log tras el synced_seq de cada colección"""
+        since_seq = min(synced_seq for _, synced_seq in pending)
+        changes = conn.execute("""
+            SELECT seq, entity, entity_id FROM change_log
+            WHERE seq > ? AND seq <= ?
+        """, (since_seq, current_seq)).fetchall()
+
+        for collection, synced_seq in pending:
+            item_ids = set()
+            category_ids = set()
+            for change in changes:
+                if change['seq'] <= synced_seq:
+                    continue
+                if change['entity'] == 'item':
+                    item_ids.add(change['entity_id'])
+                else:
+                    category_ids.add(change['entity_id'])
+
+            # cat:Nombre depende del nombre de la categoría: un cambio en ella
+            # afecta a todos sus items
+            if category_ids and any(isinstance(term, CategoryTerm)
+                                    for term in self._query_terms(collection)):
+                for batch in self._batches(sorted(category_ids)):
+                    placeholders = ', '.join('?' for _ in batch)
+                    item_ids.update(row[0] for row in conn.execute(
+                        f"SELECT id FROM items WHERE category_id IN ({placeholders})", batch))
+
+            signature = self._signature(collection)
+            if len(item_ids) > FULL_REBUILD_THRESHOLD:
+                self._rebuild_members(conn, collection, signature, current_seq)
+                continue
+
+            self._evaluate_items(conn, collection, sorted(item_ids))
+            conn.execute("""
+                UPDATE collection_members_state SET synced_seq = ?
+                WHERE collection_id = ?
+            """, (current_seq, collection['id']))
+            logger.debug(f"Collection '{collection['name']}': re-evaluated {len(item_ids)} items")
+
+    def _evaluate_items(self, conn: sqlite3.Connection, collection: Dict[str, Any],
+                        item_ids: List[int]) -> None:
+        """Recalcular la pertenencia de unos items (los borrados simplemente salen)"""
+        where_sql, params = self._where_sql(collection)
+        for batch in self._batches(item_ids):
+            placeholders = ', '.join('?' for _ in batch)
+            conn.execute(f"""
+                DELETE FROM collection_members
+                WHERE collection_id = ? AND item_id IN ({placeholders})
+            """, (collection['id'], *batch))
+            conn.execute(f"""
+                INSERT OR IGNORE INTO collection_members (collection_id, item_id)
+                SELECT ?, i.id FROM items i
+                WHERE {where_sql} AND i.id IN ({placeholders})
+            """, (collection['id'], *params, *batch))
+
+    def _rebuild_members(self, conn: sqlite3.Connection, collection: Dict[str, Any],
+                         signature: str, synced_seq: int) -> None:
+        """Recalcular todos los miembros de una colección"""
+        where_sql, params = self._where_sql(collection)
+        conn.execute("DELETE FROM collection_members WHERE collection_id = ?", (collection['id'],))
+        conn.execute(f"""
+            INSERT OR IGNORE INTO collection_members (collection_id, item_id)
+            SELECT ?, i.id FROM items i
+            WHERE {where_sql}
+        """, (collection['id'], *params))
+        conn.execute("""
+            INSERT OR REPLACE INTO collection_members_state (collection_id, signature, synced_seq)
+            VALUES (?, ?, ?)
+        """, (collection['id'], signature, synced_seq))
+        logger.debug(f"Collection '{collection['name']}': members rebuilt")
+
+    def _drop_members(self, conn: sqlite3.Connection, collection_id: int) -> None:
+        """Quitar los miembros guardados de una colección (sin commit)"""
+        conn.execute("DELETE FROM collection_members WHERE collection_id = ?", (collection_id,))
+        conn.execute("DELETE FROM collection_members_state WHERE collection_id = ?", (collection_id,))
+
+    @staticmethod
+    def _batches(values: List[Any]) -> Iterable[List[Any]]:
+        for start in range(0, len(values), MEMBER_BATCH_SIZE):
+            yield values[start:start + MEMBER_BATCH_SIZE]
+
+    def _execute_members(self, collection: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Items de una colección materializada (consulta por índice)"""
+        try:
+            conn = self._get_connection()
+            rows = conn.execute("""
+                SELECT i.* FROM collection_members m
+                JOIN items i ON i.id = m.item_id
+                WHERE m.collection_id = ?
+                ORDER BY i.last_used DESC, i.created_at DESC
+            """, (collection['id'],)).fetchall()
+
+            items = [dict(row) for row in rows]
+            logger.debug(f"Collection '{collection['name']}' returned {len(items)} items (materialized)")
+            return items
+
+        except Exception as e:
+            logger.error(f"Error reading collection members: {e}", exc_info=True)
+            return self._execute_filters(collection)
+
+    def rebuild_members(self, collection_id: Optional[int] = None) -> int:
+        """
+        Recalcular desde cero los miembros guardados
+
+        Args:
+            collection_id: Solo esta colección (None = todas)
+
+        Returns:
+            Número de colecciones materializadas
+        """
+        if not self._members_enabled:
+            return 0
+        try:
+            conn = self._get_connection()
+            with conn:
+                if collection_id is None:
+                    conn.execute("DELETE FROM collection_members_state")
+                    conn.execute("DELETE FROM collection_members")
+                else:
+                    self._drop_members(conn, collection_id)
+        except sqlite3.Error as e:
+            logger.error(f"Error clearing collection members: {e}")
+            return 0
+
+        if collection_id is None:
+            collections = self.get_all_collections()
+        else:
+            collection = self.get_collection(collection_id)
+            collections = [collection] if collection else []
+        materialized = self._sync_members(collections)
+        logger.info(f"Rebuilt members of {len(materialized)} smart collections")
+        return len(materialized)
+
+    def check_members(self, collection_id: Optional[int] = None,
+                      repair: bool = False) -> Dict[int, Dict[str, List[int]]]:
+        """
+        Comparar los miembros guardados con ejecutar los filtros en vivo
+
+        Args:
+            collection_id: Solo esta colección (None = todas)
+            repair: Recalcular las colecciones con diferencias
+
+        Returns:
+            {collection_id: {'missing': [...], 'extra': [...]}} solo con las
+            colecciones inconsistentes (vacío = todo correcto)
+        """
+        if collection_id is None:
+            collections = self.get_all_collections()
+        else:
+            collection = self.get_collection(collection_id)
+            collections = [collection] if collection else []
+
+        materialized = self._sync_members(collections)
+        conn = self._get_connection()
+        problems = {}
+        for collection in collections:
+            if collection['id'] not in materialized:
+                continue
+            stored = {row[0] for row in conn.execute(
+                "SELECT item_id FROM collection_members WHERE collection_id = ?", (collection['id'],))}
+            where_sql, params = self._where_sql(collection)
+            expected = {row[0] for row in conn.execute(f"SELECT i.id FROM items i WHERE {where_sql}", params)}
+            if stored != expected:
+                problems[collection['id']] = {
+                    'missing': sorted(expected - stored),
+                    'extra': sorted(stored - expected),
+                }
+                logger.warning(f"Collection '{collection['name']}' members out of sync: "
+                               f"{len(expected - stored)} missing, {len(stored - expected)} extra")
+
+        if repair:
+            for problem_id in problems:
+                self.rebuild_members(problem_id)
+        return problems
+
 
 if __name__ == "__main__":
     """
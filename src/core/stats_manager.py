@@ -8,6 +8,9 @@ import sqlite3
 import logging
 from pathlib import Path
 from typing import List, Dict, Optional
+from database.connection_pool import get_connection
+from database.usage_queue import flush_usage_queue
+from database.usage_rollups import USAGE_WINDOW_CTE, CATEGORY_WINDOW_CTE, ITEM_TOTALS_CTE
 
 logger = logging.getLogger(__name__)
 
@@ -24,10 +27,9 @@ class StatsManager:
             raise FileNotFoundError(f"Database not found: {self.db_path}")
 
     def _get_connection(self) -> sqlite3.Connection:
-        """Obtener conexión a la base de datos"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        return conn
+        """Obtener conexión (pool compartido), con los usos pendientes ya volcados"""
+        flush_usage_queue(self.db_path)
+        return get_connection(self.db_path)
 
     # ==================== Items Populares ====================
 
@@ -55,12 +57,15 @@ class StatsManager:
 
             if days:
                 # Uso reciente
-                cursor.execute("""
-                    SELECT i.*, COUNT(h.id) as recent_uses
+                cursor.execute(f"""
+                    WITH {USAGE_WINDOW_CTE},
+                    recent AS (
+                        SELECT item_id, SUM(executions) AS uses
+                        FROM usage_window GROUP BY item_id
+                    )
+                    SELECT i.*, COALESCE(r.uses, 0) as recent_uses
                     FROM items i
-                    LEFT JOIN item_usage_history h ON i.id = h.item_id
-                        AND h.used_at >= datetime('now', '-' || ? || ' days')
-                    GROUP BY i.id
+                    LEFT JOIN recent r ON r.item_id = i.id
                     ORDER BY recent_uses DESC, i.use_count DESC
                     LIMIT ?
                 """, (days, limit))
@@ -69,7 +74,7 @@ class StatsManager:
                 cursor.execute("""
                     SELECT * FROM items
                     WHERE use_count > 0
-                    ORDER BY use_count DESC, last_used DESC
+                    ORDER BY use_count DESC, last_used_ts DESC
                     LIMIT ?
                 """, (limit,))
 
@@ -89,20 +94,22 @@ class StatsManager:
             conn = self._get_connection()
             cursor = conn.cursor()
 
-            cursor.execute("""
+            cursor.execute(f"""
+                WITH {USAGE_WINDOW_CTE},
+                recent AS (
+                    SELECT item_id, SUM(executions) AS uses
+                    FROM usage_window GROUP BY item_id
+                )
                 SELECT i.*,
-                       COUNT(h.id) as recent_uses,
+                       r.uses as recent_uses,
                        CASE
                            WHEN i.use_count > 0
-                           THEN ROUND(100.0 * COUNT(h.id) / i.use_count, 2)
+                           THEN ROUND(100.0 * r.uses / i.use_count, 2)
                            ELSE 0
                        END as trend_percentage
                 FROM items i
-                LEFT JOIN item_usage_history h ON i.id = h.item_id
-                    AND h.used_at >= datetime('now', '-' || ? || ' days')
-                WHERE i.use_count > 0
-                GROUP BY i.id
-                HAVING recent_uses > 0
+                JOIN recent r ON r.item_id = i.id
+                WHERE i.use_count > 0 AND r.uses > 0
                 ORDER BY trend_percentage DESC, recent_uses DESC
                 LIMIT ?
             """, (days, limit))
@@ -126,7 +133,7 @@ class StatsManager:
             cursor.execute("""
                 SELECT * FROM items
                 WHERE category_id = ? AND use_count > 0
-                ORDER BY use_count DESC, last_used DESC
+                ORDER BY use_count DESC, last_used_ts DESC
                 LIMIT ?
             """, (category_id, limit))
 
@@ -152,8 +159,8 @@ class StatsManager:
                 SELECT *,
                        julianday('now') - julianday(created_at) as days_old
                 FROM items
-                WHERE use_count = 0 OR last_used IS NULL
-                ORDER BY created_at DESC
+                WHERE use_count = 0 OR last_used_ts IS NULL
+                ORDER BY created_at_ts DESC
             """)
 
             results = cursor.fetchall()
@@ -177,7 +184,7 @@ class StatsManager:
                        julianday('now') - julianday(last_used) as days_since_last_use
                 FROM items
                 WHERE use_count >= ?
-                  AND last_used < datetime('now', '-' || ? || ' days')
+                  AND last_used_ts < CAST(strftime('%s', 'now', '-' || ? || ' days') AS INTEGER)
                 ORDER BY days_since_last_use DESC
             """, (min_use_count, days_threshold))
 
@@ -200,7 +207,7 @@ class StatsManager:
             cursor.execute("""
                 SELECT * FROM items
                 WHERE use_count > 0
-                ORDER BY use_count ASC, created_at DESC
+                ORDER BY use_count ASC, created_at_ts DESC
                 LIMIT ?
             """, (limit,))
 
@@ -222,18 +229,21 @@ class StatsManager:
             conn = self._get_connection()
             cursor = conn.cursor()
 
-            cursor.execute("""
-                SELECT i.*, COUNT(h.id) as uses_last_30_days
+            cursor.execute(f"""
+                WITH {USAGE_WINDOW_CTE},
+                recent AS (
+                    SELECT item_id, SUM(executions) AS uses
+                    FROM usage_window GROUP BY item_id
+                )
+                SELECT i.*, r.uses as uses_last_30_days
                 FROM items i
-                LEFT JOIN item_usage_history h ON i.id = h.item_id
-                    AND h.used_at >= datetime('now', '-30 days')
+                JOIN recent r ON r.item_id = i.id
                 WHERE i.is_favorite = 0
                   AND i.use_count > 10
-                GROUP BY i.id
-                HAVING uses_last_30_days > 5
+                  AND r.uses > 5
                 ORDER BY uses_last_30_days DESC, i.use_count DESC
                 LIMIT ?
-            """, (limit,))
+            """, (30, limit))
 
             results = cursor.fetchall()
             conn.close()
@@ -256,7 +266,7 @@ class StatsManager:
                        julianday('now') - julianday(created_at) as days_old
                 FROM items
                 WHERE use_count = 0
-                  AND created_at < datetime('now', '-' || ? || ' days')
+                  AND created_at_ts < CAST(strftime('%s', 'now', '-' || ? || ' days') AS INTEGER)
                 ORDER BY days_old DESC
             """, (days_threshold,))
 
@@ -306,22 +316,28 @@ class StatsManager:
             cursor.execute("SELECT COUNT(*) as total FROM items")
             total_items = cursor.fetchone()['total']
 
-            # Total ejecuciones
-            cursor.execute("SELECT COUNT(*) as total FROM item_usage_history")
-            total_executions = cursor.fetchone()['total']
+            # Total ejecuciones y éxitos (agregados diarios)
+            cursor.execute("""
+                SELECT
+                    COALESCE(SUM(executions), 0) as total,
+                    COALESCE(SUM(successes), 0) as successful
+                FROM usage_daily_items
+            """)
+            result = cursor.fetchone()
+            total_executions = result['total']
 
             # Ejecuciones hoy
             cursor.execute("""
-                SELECT COUNT(*) as total FROM item_usage_history
-                WHERE date(used_at) = date('now')
+                SELECT COALESCE(SUM(executions), 0) as total FROM usage_daily_items
+                WHERE day = date('now')
             """)
             executions_today = cursor.fetchone()['total']
 
             # Ejecuciones esta semana
-            cursor.execute("""
-                SELECT COUNT(*) as total FROM item_usage_history
-                WHERE used_at >= datetime('now', '-7 days')
-            """)
+            cursor.execute(f"""
+                WITH {USAGE_WINDOW_CTE}
+                SELECT COALESCE(SUM(executions), 0) as total FROM usage_window
+            """, (7,))
             executions_week = cursor.fetchone()['total']
 
             # Favoritos
@@ -329,13 +345,6 @@ class StatsManager:
             favorites_count = cursor.fetchone()['total']
 
             # Tasa de éxito
-            cursor.execute("""
-                SELECT
-                    COUNT(*) as total,
-                    SUM(CASE WHEN success = 1 THEN 1 ELSE 0 END) as successful
-                FROM item_usage_history
-            """)
-            result = cursor.fetchone()
             success_rate = 100.0
             if result['total'] > 0:
                 success_rate = (result['successful'] / result['total']) * 100
@@ -368,34 +377,23 @@ class StatsManager:
             conn = self._get_connection()
             cursor = conn.cursor()
 
-            # Días con actividad
-            cursor.execute("""
-                SELECT COUNT(DISTINCT date(used_at)) as active_days
-                FROM item_usage_history
-                WHERE used_at >= datetime('now', '-' || ? || ' days')
-            """, (days,))
-            active_days = cursor.fetchone()['active_days']
-
-            # Total ejecuciones
-            cursor.execute("""
-                SELECT COUNT(*) as total
-                FROM item_usage_history
-                WHERE used_at >= datetime('now', '-' || ? || ' days')
+            # Días con actividad, total ejecuciones y tiempo (en segundos)
+            cursor.execute(f"""
+                WITH {USAGE_WINDOW_CTE}
+                SELECT
+                    COUNT(DISTINCT day) as active_days,
+                    COALESCE(SUM(executions), 0) as total,
+                    SUM(total_time_ms) / 1000.0 as total_time
+                FROM usage_window
             """, (days,))
-            total_executions = cursor.fetchone()['total']
+            result = cursor.fetchone()
+            active_days = result['active_days']
+            total_executions = result['total']
+            total_time = result['total_time'] if result['total_time'] else 0
 
             # Promedio por día
             avg_per_day = round(total_executions / days, 2) if days > 0 else 0
 
-            # Tiempo total ahorrado (estimado en segundos)
-            cursor.execute("""
-                SELECT SUM(execution_time_ms) / 1000.0 as total_time
-                FROM item_usage_history
-                WHERE used_at >= datetime('now', '-' || ? || ' days')
-            """, (days,))
-            result = cursor.fetchone()
-            total_time = result['total_time'] if result['total_time'] else 0
-
             conn.close()
 
             return {
@@ -442,6 +440,36 @@ class StatsManager:
             logger.error(f"Error getting usage by category: {e}")
             return []
 
+    def get_category_usage_by_day(self, days: int = 30) -> List[Dict]:
+        """Ejecuciones por categoría y día (últimos X días)"""
+        try:
+            conn = self._get_connection()
+            cursor = conn.cursor()
+
+            cursor.execute(f"""
+                WITH {CATEGORY_WINDOW_CTE}
+                SELECT
+                    w.day,
+                    c.name as category,
+                    c.badge,
+                    SUM(w.executions) as executions,
+                    SUM(w.successes) as successful,
+                    SUM(w.failures) as failed
+                FROM category_window w
+                JOIN categories c ON c.id = w.category_id
+                GROUP BY w.day, w.category_id
+                ORDER BY w.day DESC, executions DESC
+            """, (days,))
+
+            results = cursor.fetchall()
+            conn.close()
+
+            return [dict(row) for row in results]
+
+        except Exception as e:
+            logger.error(f"Error getting category usage by day: {e}")
+            return []
+
     # ==================== Análisis de Rendimiento ====================
 
     def get_slowest_items(self, limit: int = 10, min_executions: int = 5) -> List[Dict]:
@@ -450,15 +478,14 @@ class StatsManager:
             conn = self._get_connection()
             cursor = conn.cursor()
 
-            cursor.execute("""
+            cursor.execute(f"""
+                WITH {ITEM_TOTALS_CTE}
                 SELECT i.id, i.label, i.badge,
-                       COUNT(h.id) as executions,
-                       ROUND(AVG(h.execution_time_ms) / 1000.0, 2) as avg_time_seconds
+                       t.successes as executions,
+                       ROUND(CAST(t.success_time_ms AS REAL) / t.successes / 1000.0, 2) as avg_time_seconds
                 FROM items i
-                JOIN item_usage_history h ON i.id = h.item_id
-                WHERE h.success = 1
-                GROUP BY i.id
-                HAVING executions >= ?
+                JOIN usage_totals t ON t.item_id = i.id
+                WHERE t.successes > 0 AND t.successes >= ?
                 ORDER BY avg_time_seconds DESC
                 LIMIT ?
             """, (min_executions, limit))
@@ -479,15 +506,15 @@ class StatsManager:
             conn = self._get_connection()
             cursor = conn.cursor()
 
-            cursor.execute("""
+            cursor.execute(f"""
+                WITH {ITEM_TOTALS_CTE}
                 SELECT i.id, i.label, i.badge,
-                       COUNT(h.id) as total_executions,
-                       SUM(CASE WHEN h.success = 0 THEN 1 ELSE 0 END) as failures,
-                       ROUND(100.0 * SUM(CASE WHEN h.success = 0 THEN 1 ELSE 0 END) / COUNT(h.id), 2) as error_rate
+                       t.executions as total_executions,
+                       t.failures,
+                       ROUND(100.0 * t.failures / t.executions, 2) as error_rate
                 FROM items i
-                JOIN item_usage_history h ON i.id = h.item_id
-                GROUP BY i.id
-                HAVING total_executions >= ? AND error_rate > 5
+                JOIN usage_totals t ON t.item_id = i.id
+                WHERE t.executions >= ? AND ROUND(100.0 * t.failures / t.executions, 2) > 5
                 ORDER BY error_rate DESC, failures DESC
                 LIMIT ?
             """, (min_executions, limit))
@@ -515,7 +542,7 @@ class StatsManager:
             # Items activos (usados últimos 30 días)
             cursor.execute("""
                 SELECT COUNT(*) as active FROM items
-                WHERE last_used >= datetime('now', '-30 days')
+                WHERE last_used_ts >= CAST(strftime('%s', 'now', '-30 days') AS INTEGER)
             """)
             active_items = cursor.fetchone()['active']
 
@@ -523,36 +550,27 @@ class StatsManager:
             cursor.execute("SELECT COUNT(*) as favs FROM items WHERE is_favorite = 1")
             favorites = cursor.fetchone()['favs']
 
-            # Ejecuciones hoy
-            cursor.execute("""
-                SELECT COUNT(*) as total FROM item_usage_history
-                WHERE date(used_at) = date('now')
-            """)
-            executions_today = cursor.fetchone()['total']
-
-            # Tasa de éxito hoy
+            # Ejecuciones y tasa de éxito hoy
             cursor.execute("""
                 SELECT
-                    COUNT(*) as total,
-                    SUM(CASE WHEN success = 1 THEN 1 ELSE 0 END) as successful
-                FROM item_usage_history
-                WHERE date(used_at) = date('now')
+                    COALESCE(SUM(executions), 0) as total,
+                    COALESCE(SUM(successes), 0) as successful
+                FROM usage_daily_items
+                WHERE day = date('now')
             """)
             result = cursor.fetchone()
+            executions_today = result['total']
             success_rate_today = 100.0
             if result['total'] > 0:
                 success_rate_today = (result['successful'] / result['total']) * 100
 
             # Items problemáticos
-            cursor.execute("""
-                SELECT COUNT(DISTINCT item_id) as problematic
-                FROM (
-                    SELECT item_id,
-                           ROUND(100.0 * SUM(CASE WHEN success = 0 THEN 1 ELSE 0 END) / COUNT(*), 2) as error_rate
-                    FROM item_usage_history
-                    GROUP BY item_id
-                    HAVING COUNT(*) >= 5 AND error_rate > 10
-                )
+            cursor.execute(f"""
+                WITH {ITEM_TOTALS_CTE}
+                SELECT COUNT(*) as problematic
+                FROM usage_totals
+                WHERE executions >= 5
+                  AND ROUND(100.0 * failures / executions, 2) > 10
             """)
             problematic_items = cursor.fetchone()['problematic']
 
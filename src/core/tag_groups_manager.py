@@ -10,6 +10,7 @@ import sqlite3
 import logging
 from typing import Optional, List, Dict, Any
 from datetime import datetime
+from database.connection_pool import get_connection
 
 logger = logging.getLogger(__name__)
 
@@ -29,15 +30,12 @@ class TagGroupsManager:
 
     def _get_connection(self) -> sqlite3.Connection:
         """
-        Obtener conexión a la base de datos
+        Obtener conexión a la base de datos (pool compartido, por hilo)
 
         Returns:
             Conexión SQLite
         """
-        conn = sqlite3.connect(self.db_path, check_same_thread=False)
-        conn.row_factory = sqlite3.Row
-        conn.execute("PRAGMA foreign_keys = ON")
-        return conn
+        return get_connection(self.db_path)
 
     # ========== CREATE ==========
 
@@ -83,16 +81,15 @@ class TagGroupsManager:
             clean_tags = ','.join(tags_list)
 
             conn = self._get_connection()
-            cursor = conn.cursor()
+            with conn:
+                cursor = conn.cursor()
 
-            cursor.execute("""
-                INSERT INTO tag_groups (name, description, tags, color, icon, is_active)
-                VALUES (?, ?, ?, ?, ?, ?)
-            """, (name.strip(), description, clean_tags, color, icon, is_active))
+                cursor.execute("""
+                    INSERT INTO tag_groups (name, description, tags, color, icon, is_active)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                """, (name.strip(), description, clean_tags, color, icon, is_active))
 
-            group_id = cursor.lastrowid
-            conn.commit()
-            conn.close()
+                group_id = cursor.lastrowid
 
             logger.info(f"Tag group created: {name} (ID: {group_id})")
             return group_id
@@ -338,19 +335,18 @@ class TagGroupsManager:
             params.append(group_id)
 
             conn = self._get_connection()
-            cursor = conn.cursor()
+            with conn:
+                cursor = conn.cursor()
 
-            query = f"""
-                UPDATE tag_groups
-                SET {', '.join(updates)}
-                WHERE id = ?
-            """
+                query = f"""
+                    UPDATE tag_groups
+                    SET {', '.join(updates)}
+                    WHERE id = ?
+                """
 
-            cursor.execute(query, params)
-            conn.commit()
+                cursor.execute(query, params)
 
             rows_affected = cursor.rowcount
-            conn.close()
 
             if rows_affected > 0:
                 logger.info(f"Tag group updated: {group_id}")
@@ -380,16 +376,15 @@ class TagGroupsManager:
         """
         try:
             conn = self._get_connection()
-            cursor = conn.cursor()
+            with conn:
+                cursor = conn.cursor()
 
-            cursor.execute("""
-                DELETE FROM tag_groups
-                WHERE id = ?
-            """, (group_id,))
+                cursor.execute("""
+                    DELETE FROM tag_groups
+                    WHERE id = ?
+                """, (group_id,))
 
-            conn.commit()
             rows_affected = cursor.rowcount
-            conn.close()
 
             if rows_affected > 0:
                 logger.info(f"Tag group deleted: {group_id}")
@@ -438,24 +433,17 @@ class TagGroupsManager:
             conn = self._get_connection()
             cursor = conn.cursor()
 
-            # Construir condiciones de búsqueda para cada tag
-            # Buscamos items que contengan cualquiera de los tags del grupo
-            conditions = []
-            params = []
-
-            for tag in tags_list:
-                # Buscar el tag exacto en el campo tags
-                # El campo tags puede ser: "tag1,tag2,tag3"
-                conditions.append("tags LIKE ?")
-                params.append(f"%{tag}%")
-
+            # Items que tienen cualquiera de los tags del grupo (match exacto
+            # sobre el índice item_tags, sin distinguir mayúsculas)
+            placeholders = ', '.join('?' for _ in tags_list)
             query = f"""
-                SELECT COUNT(DISTINCT id) as count
-                FROM items
-                WHERE ({' OR '.join(conditions)})
+                SELECT COUNT(DISTINCT it.item_id) as count
+                FROM item_tags it
+                JOIN tags t ON t.id = it.tag_id
+                WHERE t.name IN ({placeholders})
             """
 
-            cursor.execute(query, params)
+            cursor.execute(query, tags_list)
             result = cursor.fetchone()
             conn.close()
 
@@ -0,0 +1,281 @@
+"""
+Unified Search for Widget Sidebar
+Una sola búsqueda sobre items, pestañas del bloc de notas, marcadores,
+historial del portapapeles y sesiones del navegador
+
+Cada entidad tenía su propia búsqueda (o ninguna). UnifiedSearch consulta
+dos índices FTS5 mantenidos por triggers en el mismo commit que cada
+escritura (ver migrations/add_items_fts y migrations/add_search_index):
+
+- items: items_fts, ordenados por bm25 (label > tags > lista > descripción)
+- el resto: search_index, filtrado por el tipo codificado en el rowid
+
+Cada tipo se ordena a su manera:
+
+- item, notebook_tab, bookmark, session: primero las coincidencias en el
+  título (label, title, name) por relevancia (bm25, calculado solo sobre
+  ellas) y después las del resto del texto, las más recientes primero
+- clipboard: lo copiado más recientemente primero
+
+Así cada tipo recorre el índice una o dos veces y solo puntúa las
+coincidencias en el título: buscar en todo cuesta unos ms por pulsación
+aunque la palabra aparezca en miles de filas.
+
+Las palabras se buscan por prefijo y sin acentos ("reu" encuentra
+"Reunión"). Mientras se escribe solo la última palabra es un prefijo:
+las anteriores ya están completas y se buscan enteras, que es mucho más
+barato que combinar todas las palabras que empiezan igual; un prefijo de
+una sola letra se ignora. Sin FTS5 se usa LIKE sobre las tablas de origen. Las
+consultas usan la conexión del pool del hilo que busca, así se puede
+llamar desde el hilo de búsqueda (core/search_worker).
+
+Uso:
+    search = UnifiedSearch(db.db_path)
+    results = search.search("docker")
+    for result in results[KIND_BOOKMARK]:
+        print(result.title, result.subtitle)
+"""
+
+import logging
+import sqlite3
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from core.query_language import words_of
+from database.connection_pool import get_connection
+from database.migrations import add_search_index
+from database.migrations.add_items_fts import FTS_TABLE as ITEMS_FTS_TABLE
+from database.migrations.add_search_index import INDEX_TABLE, KIND_BITS
+
+logger = logging.getLogger(__name__)
+
+# Tipos de resultado
+KIND_ITEM = 'item'
+KIND_NOTEBOOK_TAB = 'notebook_tab'
+KIND_BOOKMARK = 'bookmark'
+KIND_CLIPBOARD = 'clipboard'
+KIND_SESSION = 'session'
+
+KINDS = (KIND_ITEM, KIND_NOTEBOOK_TAB, KIND_BOOKMARK, KIND_CLIPBOARD, KIND_SESSION)
+
+# Resultados por tipo
+DEFAULT_LIMIT_PER_KIND = 8
+
+# Letras mínimas de un prefijo (uno de una letra combina medio índice)
+MIN_PREFIX_CHARS = 2
+
+# Caracteres de content devueltos por resultado (vista previa)
+PREVIEW_CHARS = 200
+
+# Tabla de origen y código en el rowid de search_index de cada tipo
+# (las sesiones necesitan además session_tabs)
+_SOURCE_TABLES = {
+    KIND_NOTEBOOK_TAB: ('notebook_tabs', add_search_index.NOTEBOOK_TAB),
+    KIND_BOOKMARK: ('bookmarks', add_search_index.BOOKMARK),
+    KIND_CLIPBOARD: ('clipboard_history', add_search_index.CLIPBOARD),
+    KIND_SESSION: ('browser_sessions', add_search_index.BROWSER_SESSION),
+}
+
+# Columnas (alias t), joins y condición de cada tipo
+_SELECT = {
+    KIND_ITEM: (
+        "t.id, t.label AS title, c.name AS subtitle,"
+        " CASE WHEN t.is_sensitive THEN NULL ELSE substr(t.content, 1, ?) END AS content",
+        "JOIN categories c ON c.id = t.category_id",
+        "t.is_active AND NOT COALESCE(t.is_archived, 0)",
+    ),
+    KIND_NOTEBOOK_TAB: (
+        "t.id, t.title, t.description AS subtitle,"
+        " CASE WHEN t.is_sensitive THEN NULL ELSE substr(t.content, 1, ?) END AS content",
+        "",
+        "1",
+    ),
+    KIND_BOOKMARK: (
+        "t.id, t.title, t.url AS subtitle, t.url AS content",
+        "",
+        "1",
+    ),
+    KIND_CLIPBOARD: (
+        "t.id, COALESCE(it.label, '') AS title, t.copied_at AS subtitle,"
+        " CASE WHEN it.is_sensitive THEN NULL ELSE substr(t.content, 1, ?) END AS content",
+        "LEFT JOIN items it ON it.id = t.item_id",
+        "1",
+    ),
+    KIND_SESSION: (
+        "t.id, t.name AS title,"
+        " (SELECT COUNT(*) FROM session_tabs WHERE session_id = t.id) || ' pestañas' AS subtitle,"
+        " NULL AS content",
+        "",
+        "NOT t.is_auto_save",
+    ),
+}
+
+# Columnas comparadas con LIKE cuando no hay índice FTS5 (la primera es el título)
+_LIKE_COLUMNS = {
+    KIND_ITEM: ("t.label", "t.tags", "t.description", "t.list_group",
+                "CASE WHEN t.is_sensitive THEN NULL ELSE t.content END"),
+    KIND_NOTEBOOK_TAB: ("t.title", "t.description", "t.tags",
+                        "CASE WHEN t.is_sensitive THEN NULL ELSE t.content END"),
+    KIND_BOOKMARK: ("t.title", "t.url", "t.folder"),
+    KIND_CLIPBOARD: ("it.label", "CASE WHEN it.is_sensitive THEN NULL ELSE t.content END"),
+    KIND_SESSION: ("t.name",
+                   "(SELECT group_concat(title || ' ' || url, ' ') FROM session_tabs WHERE session_id = t.id)"),
+}
+
+# Tipos ordenados solo por recencia (el resto: coincidencias en el título
+# por relevancia y después las demás, las más recientes primero)
+_RECENCY_KINDS = frozenset({KIND_CLIPBOARD})
+
+
+@dataclass(frozen=True)
+class SearchResult:
+    """
+    Resultado de la búsqueda común
+
+    Attributes:
+        kind: Tipo (KIND_*)
+        ref_id: Id en su tabla de origen
+        title: Título a mostrar
+        subtitle: Dato secundario (categoría, URL, fecha, nº de pestañas)
+        content: Texto a copiar al elegirlo (None si es sensible o no aplica)
+        rank: Posición dentro de su tipo (0 es el mejor)
+    """
+    kind: str
+    ref_id: int
+    title: str
+    subtitle: Optional[str]
+    content: Optional[str]
+    rank: int
+
+
+class UnifiedSearch:
+    """Búsqueda sobre todas las entidades con resultados por tipo"""
+
+    def __init__(self, db_path):
+        """
+        Args:
+            db_path: Ruta de la base de datos (ya migrada por DBManager)
+        """
+        self.db_path = Path(db_path)
+        conn = get_connection(self.db_path)
+        try:
+            self._items_fts = add_search_index.table_exists(conn, ITEMS_FTS_TABLE)
+            self._index_enabled = add_search_index.table_exists(conn, INDEX_TABLE)
+            # Tablas creadas por migraciones opcionales (bloc de notas, sesiones)
+            self._kinds = tuple(
+                kind for kind in KINDS
+                if kind == KIND_ITEM or (
+                    add_search_index.table_exists(conn, _SOURCE_TABLES[kind][0])
+                    and (kind != KIND_SESSION or add_search_index.table_exists(conn, 'session_tabs'))
+                )
+            )
+        finally:
+            conn.close()
+
+    @property
+    def kinds(self) -> Tuple[str, ...]:
+        """Tipos que existen en esta base de datos"""
+        return self._kinds
+
+    def search(self, query: str, limit_per_kind: int = DEFAULT_LIMIT_PER_KIND,
+               kinds: Optional[Iterable[str]] = None) -> Dict[str, List[SearchResult]]:
+        """
+        Buscar en todas las entidades
+
+        Args:
+            query: Texto escrito (todas las palabras; la última, si no
+                acaba en espacio, por prefijo)
+            limit_per_kind: Máximo de resultados de cada tipo
+            kinds: Solo estos tipos (None = todos)
+
+        Returns:
+            Dict[str, List[SearchResult]]: Resultados de cada tipo, mejor primero
+            (solo los tipos con algún resultado)
+        """
+        words = words_of(query)
+        terms = [(word, False) for word in words[:-1]]
+        if words:
+            terms.append((words[-1], not query[-1:].isspace()))
+        terms = [(word, prefix) for word, prefix in terms
+                 if not prefix or len(word) >= MIN_PREFIX_CHARS]
+        if not terms:
+            return {}
+        wanted = self._kinds if kinds is None else [kind for kind in self._kinds if kind in kinds]
+
+        conn = get_connection(self.db_path)
+        results = {}
+        try:
+            for kind in wanted:
+                try:
+                    rows = self._search_kind(conn, kind, terms, limit_per_kind)
+                except sqlite3.Error as e:
+                    logger.error(f"Unified search failed for {kind} '{query}': {e}")
+                    continue
+                if rows:
+                    results[kind] = [
+                        SearchResult(kind, row['id'], row['title'] or '', row['subtitle'],
+                                     row['content'], position)
+                        for position, row in enumerate(rows)
+                    ]
+        finally:
+            conn.close()
+        return results
+
+    def _search_kind(self, conn, kind: str, terms: List[Tuple[str, bool]], limit: int) -> list:
+        """Filas (id, title, subtitle, content) de un tipo, mejor primero"""
+        columns, joins, condition = _SELECT[kind]
+        select = f"SELECT {columns}"
+        preview = [PREVIEW_CHARS] if '?' in columns else []
+        match = ' '.join(f'"{word}"*' if prefix else f'"{word}"' for word, prefix in terms)
+
+        if kind == KIND_ITEM and self._items_fts:
+            fts = ITEMS_FTS_TABLE
+            source = f"FROM {fts} JOIN items t ON t.id = {fts}.rowid {joins} WHERE {fts} MATCH ? AND {condition}"
+            in_title = f"{{label}} : ({match})"
+            anywhere = f"({match})"
+            bm25 = f"bm25({fts}, 10.0, 1.0, 2.0, 5.0, 3.0)"
+        elif kind != KIND_ITEM and self._index_enabled:
+            fts = INDEX_TABLE
+            table, code = _SOURCE_TABLES[kind]
+            source = (f"FROM {fts} JOIN {table} t ON t.id = {fts}.rowid >> {KIND_BITS} {joins}"
+                      f" WHERE {fts} MATCH ? AND {condition}")
+            # La columna kind limita el recorrido a las filas de este tipo
+            in_title = f'kind : "{code}" AND {{title}} : ({match})'
+            anywhere = f'kind : "{code}" AND {{title body}} : ({match})'
+            bm25 = f"bm25({fts}, 0.0, 5.0, 1.0)"
+        else:
+            return self._like_kind(conn, kind, [word for word, _ in terms], limit, select, preview)
+
+        if kind in _RECENCY_KINDS:
+            return conn.execute(f"{select} {source} ORDER BY {fts}.rowid DESC LIMIT ?",
+                                preview + [anywhere, limit]).fetchall()
+
+        # Coincidencias en el título por relevancia (bm25 solo sobre ellas)...
+        rows = conn.execute(f"{select} {source} ORDER BY {bm25} LIMIT ?",
+                            preview + [in_title, limit]).fetchall()
+        if len(rows) < limit:
+            # ...y después el resto, recorriendo el índice del más reciente al más antiguo
+            rows += conn.execute(f"{select} {source} ORDER BY {fts}.rowid DESC LIMIT ?",
+                                 preview + [f"({anywhere}) NOT ({in_title})", limit - len(rows)]).fetchall()
+        return rows
+
+    def _like_kind(self, conn, kind: str, words: List[str], limit: int,
+                   select: str, preview: list) -> list:
+        """Búsqueda con LIKE (sin FTS5): mismo orden que con el índice"""
+        _, joins, condition = _SELECT[kind]
+        table = 'items' if kind == KIND_ITEM else _SOURCE_TABLES[kind][0]
+        title = _LIKE_COLUMNS[kind][0]
+        haystack = " || ' ' || ".join(f"COALESCE({column}, '')" for column in _LIKE_COLUMNS[kind])
+        patterns = [f"%{word}%" for word in words]
+
+        where = condition + "".join(f" AND {haystack} LIKE ?" for _ in words)
+        if kind in _RECENCY_KINDS:
+            order_by, order_params = "t.id DESC", []
+        else:
+            title_match = " AND ".join(f"{title} LIKE ?" for _ in words)
+            order_by, order_params = f"CASE WHEN {title_match} THEN 0 ELSE 1 END, t.id DESC", patterns
+        return conn.execute(
+            f"{select} FROM {table} t {joins} WHERE {where} ORDER BY {order_by} LIMIT ?",
+            preview + patterns + order_params + [limit]
+        ).fetchall()
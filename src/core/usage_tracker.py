@@ -10,6 +10,9 @@ import time
 from pathlib import Path
 from typing import List, Dict, Optional
 from datetime import datetime, timedelta
+from database.connection_pool import get_connection
+from database.usage_queue import get_usage_queue, flush_usage_queue
+from database.usage_rollups import USAGE_WINDOW_CTE, HOURLY_WINDOW_CTE
 
 logger = logging.getLogger(__name__)
 
@@ -26,38 +29,28 @@ class UsageTracker:
             raise FileNotFoundError(f"Database not found: {self.db_path}")
 
     def _get_connection(self) -> sqlite3.Connection:
-        """Obtener conexión a la base de datos"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        return conn
+        """
+        Obtener conexión a la base de datos (pool compartido, por hilo)
+
+        Antes se vuelcan los usos pendientes para que las consultas los vean.
+        """
+        flush_usage_queue(self.db_path)
+        return get_connection(self.db_path)
 
     # ==================== Registro de Uso ====================
 
     def track_usage(self, item_id: int, execution_time_ms: int = 0,
                     success: bool = True, error_message: Optional[str] = None) -> bool:
-        """Registrar uso de un item"""
-        try:
-            conn = self._get_connection()
-            cursor = conn.cursor()
-
-            # 1. Incrementar use_count y actualizar last_used en items
-            cursor.execute("""
-                UPDATE items
-                SET use_count = use_count + 1,
-                    last_used = datetime('now'),
-                    updated_at = datetime('now')
-                WHERE id = ?
-            """, (item_id,))
+        """
+        Registrar uso de un item
 
-            # 2. Insertar registro en item_usage_history
-            cursor.execute("""
-                INSERT INTO item_usage_history
-                (item_id, used_at, execution_time_ms, success, error_message)
-                VALUES (?, datetime('now'), ?, ?, ?)
-            """, (item_id, execution_time_ms, 1 if success else 0, error_message))
-
-            conn.commit()
-            conn.close()
+        Write-behind: el uso se encola (y se anota en el journal) y la cola lo
+        escribe por lotes junto con otros usos, fuera del hilo de la UI.
+        """
+        try:
+            get_usage_queue(self.db_path).record_use(
+                item_id, execution_time_ms, success, error_message
+            )
 
             logger.info(f"Tracked usage for item {item_id}: success={success}, time={execution_time_ms}ms")
             return True
@@ -129,7 +122,7 @@ class UsageTracker:
             cursor.execute("""
                 SELECT * FROM item_usage_history
                 WHERE item_id = ?
-                ORDER BY used_at DESC
+                ORDER BY used_at_ts DESC
                 LIMIT ?
             """, (item_id, limit))
 
@@ -153,8 +146,8 @@ class UsageTracker:
                 SELECT h.*, i.label, i.badge
                 FROM item_usage_history h
                 JOIN items i ON h.item_id = i.id
-                WHERE h.used_at >= datetime('now', '-' || ? || ' days')
-                ORDER BY h.used_at DESC
+                WHERE h.used_at_ts >= CAST(strftime('%s', 'now', '-' || ? || ' days') AS INTEGER)
+                ORDER BY h.used_at_ts DESC
                 LIMIT ?
             """, (days, limit))
 
@@ -178,8 +171,9 @@ class UsageTracker:
                 SELECT h.*, i.label, i.badge
                 FROM item_usage_history h
                 JOIN items i ON h.item_id = i.id
-                WHERE date(h.used_at) = date('now')
-                ORDER BY h.used_at DESC
+                WHERE h.used_at_ts >= CAST(strftime('%s', 'now', 'start of day') AS INTEGER)
+                  AND h.used_at_ts < CAST(strftime('%s', 'now', 'start of day', '+1 day') AS INTEGER)
+                ORDER BY h.used_at_ts DESC
             """)
 
             results = cursor.fetchall()
@@ -201,7 +195,7 @@ class UsageTracker:
             cursor = conn.cursor()
 
             cursor.execute("""
-                SELECT COUNT(*) as total FROM item_usage_history
+                SELECT COALESCE(SUM(executions), 0) as total FROM usage_daily_items
             """)
 
             result = cursor.fetchone()
@@ -220,9 +214,9 @@ class UsageTracker:
             cursor = conn.cursor()
 
             cursor.execute("""
-                SELECT COUNT(*) as total
-                FROM item_usage_history
-                WHERE date(used_at) = date('now')
+                SELECT COALESCE(SUM(executions), 0) as total
+                FROM usage_daily_items
+                WHERE day = date('now')
             """)
 
             result = cursor.fetchone()
@@ -240,11 +234,11 @@ class UsageTracker:
             conn = self._get_connection()
             cursor = conn.cursor()
 
-            cursor.execute("""
-                SELECT COUNT(*) as total
-                FROM item_usage_history
-                WHERE used_at >= datetime('now', '-7 days')
-            """)
+            cursor.execute(f"""
+                WITH {USAGE_WINDOW_CTE}
+                SELECT COALESCE(SUM(executions), 0) as total
+                FROM usage_window
+            """, (7,))
 
             result = cursor.fetchone()
             conn.close()
@@ -262,9 +256,9 @@ class UsageTracker:
             cursor = conn.cursor()
 
             cursor.execute("""
-                SELECT AVG(execution_time_ms) as avg_time
-                FROM item_usage_history
-                WHERE item_id = ? AND success = 1
+                SELECT CAST(SUM(success_time_ms) AS REAL) / SUM(successes) as avg_time
+                FROM usage_daily_items
+                WHERE item_id = ?
             """, (item_id,))
 
             result = cursor.fetchone()
@@ -286,9 +280,9 @@ class UsageTracker:
 
             cursor.execute("""
                 SELECT
-                    COUNT(*) as total,
-                    SUM(CASE WHEN success = 1 THEN 1 ELSE 0 END) as successful
-                FROM item_usage_history
+                    COALESCE(SUM(executions), 0) as total,
+                    SUM(successes) as successful
+                FROM usage_daily_items
                 WHERE item_id = ?
             """, (item_id,))
 
@@ -310,9 +304,9 @@ class UsageTracker:
             cursor = conn.cursor()
 
             cursor.execute("""
-                SELECT COUNT(*) as errors
-                FROM item_usage_history
-                WHERE item_id = ? AND success = 0
+                SELECT COALESCE(SUM(failures), 0) as errors
+                FROM usage_daily_items
+                WHERE item_id = ?
             """, (item_id,))
 
             result = cursor.fetchone()
@@ -333,7 +327,7 @@ class UsageTracker:
             cursor.execute("""
                 SELECT * FROM item_usage_history
                 WHERE item_id = ? AND success = 0
-                ORDER BY used_at DESC
+                ORDER BY used_at_ts DESC
                 LIMIT 1
             """, (item_id,))
 
@@ -354,13 +348,13 @@ class UsageTracker:
             conn = self._get_connection()
             cursor = conn.cursor()
 
-            cursor.execute("""
+            cursor.execute(f"""
+                WITH {HOURLY_WINDOW_CTE}
                 SELECT
-                    strftime('%H', used_at) as hour,
-                    COUNT(*) as executions,
-                    ROUND(AVG(execution_time_ms) / 1000.0, 2) as avg_time_seconds
-                FROM item_usage_history
-                WHERE used_at >= datetime('now', '-' || ? || ' days')
+                    hour,
+                    SUM(executions) as executions,
+                    ROUND(CAST(SUM(total_time_ms) AS REAL) / SUM(executions) / 1000.0, 2) as avg_time_seconds
+                FROM hourly_window
                 GROUP BY hour
                 ORDER BY hour
             """, (days,))
@@ -380,15 +374,15 @@ class UsageTracker:
             conn = self._get_connection()
             cursor = conn.cursor()
 
-            cursor.execute("""
+            cursor.execute(f"""
+                WITH {USAGE_WINDOW_CTE}
                 SELECT
-                    date(used_at) as day,
-                    COUNT(*) as executions,
+                    day,
+                    SUM(executions) as executions,
                     COUNT(DISTINCT item_id) as unique_items,
-                    SUM(CASE WHEN success = 1 THEN 1 ELSE 0 END) as successful,
-                    SUM(CASE WHEN success = 0 THEN 1 ELSE 0 END) as failed
-                FROM item_usage_history
-                WHERE used_at >= datetime('now', '-' || ? || ' days')
+                    SUM(successes) as successful,
+                    SUM(failures) as failed
+                FROM usage_window
                 GROUP BY day
                 ORDER BY day DESC
             """, (days,))
@@ -408,25 +402,23 @@ class UsageTracker:
         """Limpiar historial antiguo (retorna registros eliminados)"""
         try:
             conn = self._get_connection()
-            cursor = conn.cursor()
-
-            # Contar antes de eliminar
-            cursor.execute("""
-                SELECT COUNT(*) as count
-                FROM item_usage_history
-                WHERE used_at < datetime('now', '-' || ? || ' days')
-            """, (days,))
-
-            count = cursor.fetchone()['count']
-
-            # Eliminar registros antiguos
-            cursor.execute("""
-                DELETE FROM item_usage_history
-                WHERE used_at < datetime('now', '-' || ? || ' days')
-            """, (days,))
-
-            conn.commit()
-            conn.close()
+            with conn:
+                cursor = conn.cursor()
+
+                # Contar antes de eliminar
+                cursor.execute("""
+                    SELECT COUNT(*) as count
+                    FROM item_usage_history
+                    WHERE used_at_ts < CAST(strftime('%s', 'now', '-' || ? || ' days') AS INTEGER)
+                """, (days,))
+
+                count = cursor.fetchone()['count']
+
+                # Eliminar registros antiguos
+                cursor.execute("""
+                    DELETE FROM item_usage_history
+                    WHERE used_at_ts < CAST(strftime('%s', 'now', '-' || ? || ' days') AS INTEGER)
+                """, (days,))
 
             logger.info(f"Cleaned up {count} old history records")
             return count
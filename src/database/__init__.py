@@ -4,5 +4,6 @@ Provides SQLite database management functionality
 """
 
 from .db_manager import DBManager
+from .connection_pool import get_connection, close_all_connections
 
-__all__ = ['DBManager']
+__all__ = ['DBManager', 'get_connection', 'close_all_connections']
@@ -0,0 +1,263 @@
+"""
+Change Bus for Widget Sidebar
+Versiones de datos y eventos de cambio para invalidar cachés
+
+Cada manager con caché (ConfigManager, DashboardManager,
+CategoryFilterEngine) se vaciaba a mano desde las vistas después de cada
+escritura, y lo que otro módulo o proceso escribía no se veía nunca.
+
+Ahora las escrituras de DBManager (y los volcados de UsageQueue) publican
+un ChangeEvent con la tabla, la acción y los ids afectados. El bus:
+- incrementa un contador de versión por tabla y por categoría
+- avisa a los suscriptores, que invalidan solo lo que cambió
+
+Escrituras hechas fuera del bus (otras conexiones del pool, otro proceso)
+se detectan con PRAGMA data_version sobre una conexión propia: si el
+valor cambió desde la última publicación, poll_external() emite un evento
+'external' y los suscriptores recargan todo. data_version sube una sola vez
+aunque haya varios commits entre dos lecturas, así que quien escribe llama
+a poll_external() antes de su commit: lo ajeno se notifica primero y
+publish() solo da por visto el salto de su propio commit.
+
+Uso:
+    bus = get_change_bus(db_path)
+    bus.subscribe(self._on_change, tables=('items', 'categories'))
+    ...
+    bus.poll_external()  # antes de servir desde caché
+"""
+
+import logging
+import sqlite3
+import threading
+import weakref
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+# Tabla comodín de los eventos 'external' (puede haber cambiado cualquiera)
+ALL_TABLES = '*'
+
+# Columnas que solo cambian al usar un item (UsageQueue)
+USAGE_COLUMNS = ('use_count', 'last_used', 'last_used_ts', 'updated_at')
+
+
+@dataclass(frozen=True)
+class ChangeEvent:
+    """
+    Cambio confirmado (commit) en la base de datos
+
+    Attributes:
+        table: Tabla modificada (ALL_TABLES para cambios externos)
+        action: 'insert', 'update', 'delete' o 'external'
+        ids: Filas afectadas (vacío = no se conocen)
+        category_ids: Categorías afectadas (vacío = no se conocen)
+        columns: Columnas modificadas en un 'update' (vacío = no se conocen)
+    """
+    table: str
+    action: str
+    ids: Tuple[int, ...] = ()
+    category_ids: Tuple[int, ...] = ()
+    columns: Tuple[str, ...] = ()
+
+    @property
+    def is_external(self) -> bool:
+        """True si el cambio no se publicó por el bus (recargar todo)"""
+        return self.action == 'external'
+
+    @property
+    def usage_only(self) -> bool:
+        """True si solo cambiaron contadores de uso (use_count, last_used)"""
+        return bool(self.columns) and set(self.columns) <= set(USAGE_COLUMNS)
+
+
+class ChangeBus:
+    """
+    Contadores de versión y suscriptores de cambios de una base de datos
+
+    Thread-safe. Los suscriptores se llaman en el hilo que publica, después
+    del commit, así que deben limitarse a marcar su caché como obsoleta.
+    Se guardan con referencias débiles: un manager destruido deja de
+    recibir eventos sin tener que llamar a unsubscribe().
+    """
+
+    def __init__(self, db_path: Union[str, Path, None]):
+        """
+        Args:
+            db_path: Ruta de la base de datos (None = sin detección externa,
+                     p. ej. para :memory:)
+        """
+        self.db_path = Path(db_path) if db_path is not None else None
+        self._lock = threading.Lock()
+        self._versions: Dict[str, int] = {}
+        self._category_versions: Dict[int, int] = {}
+        self._external_count = 0
+        self._subscribers: List[Tuple[Callable[[], Optional[Callable]], Optional[frozenset]]] = []
+
+        self._poll_conn: Optional[sqlite3.Connection] = None
+        self._data_version = self._read_data_version()
+
+    # ==================== Suscripciones ====================
+
+    def subscribe(self, callback: Callable[[ChangeEvent], None],
+                  tables: Optional[Iterable[str]] = None) -> None:
+        """
+        Recibir los eventos de cambio
+
+        Args:
+            callback: Función llamada con cada ChangeEvent
+            tables: Tablas de interés (None = todas). Los eventos externos
+                    se entregan siempre.
+        """
+        if hasattr(callback, '__self__') and hasattr(callback, '__func__'):
+            ref = weakref.WeakMethod(callback)
+        else:
+            ref = lambda: callback  # noqa: E731 - funciones sueltas: referencia fuerte
+        with self._lock:
+            self._subscribers.append((ref, frozenset(tables) if tables is not None else None))
+
+    def unsubscribe(self, callback: Callable[[ChangeEvent], None]) -> None:
+        """Dejar de recibir eventos"""
+        with self._lock:
+            self._subscribers = [(ref, tables) for ref, tables in self._subscribers
+                                 if ref() not in (None, callback)]
+
+    # ==================== Publicación ====================
+
+    def publish(self, table: str, action: str, ids: Iterable[int] = (),
+                category_ids: Iterable[int] = (), columns: Iterable[str] = ()) -> ChangeEvent:
+        """
+        Publicar un cambio ya confirmado (llamar después del commit)
+
+        Antes del commit hay que llamar a poll_external(); si aun así
+        data_version avanzó más de lo que explica este commit, los cambios
+        ajenos se publican como 'external' antes que este evento.
+
+        Args:
+            table: Tabla modificada
+            action: 'insert', 'update' o 'delete'
+            ids: Filas afectadas, si se conocen
+            category_ids: Categorías afectadas, si se conocen
+            columns: Columnas modificadas, si se conocen
+
+        Returns:
+            ChangeEvent: El evento entregado a los suscriptores
+        """
+        event = ChangeEvent(
+            table=table,
+            action=action,
+            ids=tuple(ids),
+            category_ids=tuple(sorted({cid for cid in category_ids if cid is not None})),
+            columns=tuple(columns),
+        )
+        with self._lock:
+            self._versions[table] = self._versions.get(table, 0) + 1
+            for category_id in event.category_ids:
+                self._category_versions[category_id] = self._category_versions.get(category_id, 0) + 1
+            # Se espera el valor anterior + 1 (este commit) o el mismo (varios
+            # eventos del mismo commit); un salto mayor incluye escrituras ajenas
+            version = self._read_data_version()
+            external = (version is not None and self._data_version is not None
+                        and version > self._data_version + 1)
+            if external:
+                self._external_count += 1
+            if version is not None:
+                self._data_version = version
+        if external:
+            logger.debug(f"External database change detected: {self.db_path}")
+            self._dispatch(ChangeEvent(table=ALL_TABLES, action='external'))
+        self._dispatch(event)
+        return event
+
+    def poll_external(self) -> bool:
+        """
+        Detectar escrituras que no pasaron por el bus (PRAGMA data_version)
+
+        Returns:
+            bool: True si hubo cambios externos (se publicó un evento 'external')
+        """
+        with self._lock:
+            version = self._read_data_version()
+            if version is None or version == self._data_version:
+                return False
+            self._data_version = version
+            self._external_count += 1
+        logger.debug(f"External database change detected: {self.db_path}")
+        self._dispatch(ChangeEvent(table=ALL_TABLES, action='external'))
+        return True
+
+    def _dispatch(self, event: ChangeEvent) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers)
+
+        dead = False
+        for ref, tables in subscribers:
+            callback = ref()
+            if callback is None:
+                dead = True
+                continue
+            if tables is not None and not event.is_external and event.table not in tables:
+                continue
+            try:
+                callback(event)
+            except Exception as e:
+                logger.error(f"Change subscriber failed for {event}: {e}", exc_info=True)
+
+        if dead:
+            with self._lock:
+                self._subscribers = [(ref, tables) for ref, tables in self._subscribers
+                                     if ref() is not None]
+
+    # ==================== Versiones ====================
+
+    def version(self, table: str) -> int:
+        """Versión actual de una tabla (crece con cada cambio, también externo)"""
+        with self._lock:
+            return self._versions.get(table, 0) + self._external_count
+
+    def category_version(self, category_id: int) -> int:
+        """Versión actual de una categoría (sus datos o sus items)"""
+        with self._lock:
+            return self._category_versions.get(category_id, 0) + self._external_count
+
+    def _read_data_version(self) -> Optional[int]:
+        """PRAGMA data_version en la conexión propia (llamar con self._lock)"""
+        if self.db_path is None:
+            return None
+        try:
+            if self._poll_conn is None:
+                self._poll_conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            return self._poll_conn.execute("PRAGMA data_version").fetchone()[0]
+        except sqlite3.Error as e:
+            logger.warning(f"Could not read data_version for {self.db_path}: {e}")
+            return None
+
+    def close(self) -> None:
+        """Cerrar la conexión de sondeo"""
+        with self._lock:
+            if self._poll_conn is not None:
+                self._poll_conn.close()
+                self._poll_conn = None
+
+
+_buses: Dict[str, ChangeBus] = {}
+_buses_lock = threading.Lock()
+
+
+def get_change_bus(db_path: Union[str, Path]) -> ChangeBus:
+    """
+    Obtener el ChangeBus compartido del proceso para una base de datos
+
+    Las bases de datos :memory: no se comparten entre conexiones, así que
+    cada llamada devuelve un bus propio sin detección externa.
+    """
+    if str(db_path) == ":memory:":
+        return ChangeBus(None)
+
+    key = str(Path(db_path).resolve())
+    with _buses_lock:
+        bus = _buses.get(key)
+        if bus is None:
+            bus = _buses[key] = ChangeBus(key)
+        return bus
@@ -0,0 +1,158 @@
+"""
+Connection Pool for Widget Sidebar
+Proveedor central de conexiones SQLite: una conexión por hilo y por base de datos
+
+Todas las conexiones se abren con el mismo ajuste:
+- journal_mode=WAL: los lectores (stats, filtros) no bloquean las escrituras de la UI
+- synchronous=NORMAL: seguro con WAL y sin fsync en cada commit
+- mmap_size / cache_size: lecturas desde memoria para consultas frecuentes
+- busy_timeout: esperar en vez de fallar con "database is locked"
+
+Las escrituras de los gestores van en un bloque `with conn:`: confirma si
+el bloque termina bien y, si lanza, revierte la transacción. Como la conexión
+del hilo se reutiliza, una transacción que quedara abierta tras un error
+mantendría el bloqueo de escritura de WAL y acabaría confirmándose con el
+siguiente commit. conn.close() en una conexión del pool solo descarta la
+transacción pendiente.
+"""
+
+import sqlite3
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+# Ajustes de rendimiento aplicados a cada conexión
+BUSY_TIMEOUT_MS = 5000
+CACHE_SIZE_KB = 16 * 1024          # 16 MB de page cache por conexión
+MMAP_SIZE_BYTES = 256 * 1024 * 1024  # 256 MB mapeados en memoria
+
+
+class PooledConnection(sqlite3.Connection):
+    """
+    Conexión reutilizable del pool
+
+    close() no cierra la conexión: revierte cualquier transacción sin
+    confirmar (igual que haría cerrarla) y la deja lista para el siguiente uso.
+    """
+
+    def close(self):
+        if self.in_transaction:
+            self.rollback()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """
+        Salir de `with conn:`: commit si no hubo excepción, rollback si la hubo
+
+        Si el propio commit falla tampoco queda la transacción abierta.
+        """
+        try:
+            return super().__exit__(exc_type, exc_value, traceback)
+        finally:
+            self.close()
+
+    def close_connection(self):
+        """Cerrar realmente la conexión (usado por el pool)"""
+        super().close()
+
+
+def configure_connection(conn: sqlite3.Connection, is_memory: bool = False) -> sqlite3.Connection:
+    """
+    Aplicar los PRAGMAs de rendimiento a una conexión
+
+    Args:
+        conn: Conexión SQLite
+        is_memory: True para bases de datos :memory: (sin WAL ni mmap)
+
+    Returns:
+        sqlite3.Connection: La misma conexión
+    """
+    conn.execute(f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}")
+    if not is_memory:
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute(f"PRAGMA mmap_size = {MMAP_SIZE_BYTES}")
+    conn.execute("PRAGMA synchronous = NORMAL")
+    conn.execute(f"PRAGMA cache_size = -{CACHE_SIZE_KB}")
+    conn.execute("PRAGMA temp_store = MEMORY")
+    conn.execute("PRAGMA foreign_keys = ON")
+    return conn
+
+
+class ConnectionPool:
+    """
+    Pool de conexiones SQLite por hilo
+
+    Cada hilo obtiene su propia conexión por base de datos (las conexiones
+    SQLite no deben compartirse entre hilos sin sincronización).
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        # (db_path, thread id) -> conexión, para poder cerrarlas todas
+        self._connections: Dict[Tuple[str, int], PooledConnection] = {}
+
+    def get_connection(self, db_path: Union[str, Path]) -> sqlite3.Connection:
+        """
+        Obtener la conexión del hilo actual para una base de datos
+
+        Args:
+            db_path: Ruta de la base de datos
+
+        Returns:
+            sqlite3.Connection: Conexión configurada (row_factory = sqlite3.Row)
+        """
+        key = str(Path(db_path).resolve())
+        connections = getattr(self._local, 'connections', None)
+        if connections is None:
+            connections = self._local.connections = {}
+
+        conn = connections.get(key)
+        # Reabrir si close_all() la cerró desde otro hilo
+        if conn is None or (key, threading.get_ident()) not in self._connections:
+            conn = sqlite3.connect(key, factory=PooledConnection, check_same_thread=False)
+            configure_connection(conn)
+            connections[key] = conn
+            with self._lock:
+                self._connections[(key, threading.get_ident())] = conn
+            logger.debug(f"New pooled connection for {key} (thread {threading.get_ident()})")
+
+        # Los gestores esperan filas tipo dict; sqlite3.Row también admite row[0]
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def close_all(self, db_path: Union[str, Path, None] = None) -> None:
+        """
+        Cerrar las conexiones del pool
+
+        Args:
+            db_path: Solo las de esta base de datos (None = todas)
+        """
+        key = str(Path(db_path).resolve()) if db_path is not None else None
+        with self._lock:
+            targets = [k for k in self._connections if key is None or k[0] == key]
+            for target in targets:
+                try:
+                    self._connections.pop(target).close_connection()
+                except sqlite3.Error as e:
+                    logger.warning(f"Error closing pooled connection: {e}")
+
+        connections = getattr(self._local, 'connections', {})
+        for path in [p for p in connections if key is None or p == key]:
+            del connections[path]
+
+
+# Pool compartido por todos los gestores del proceso
+_pool = ConnectionPool()
+
+
+def get_connection(db_path: Union[str, Path]) -> sqlite3.Connection:
+    """Obtener una conexión del pool compartido para el hilo actual"""
+    return _pool.get_connection(db_path)
+
+
+def close_all_connections(db_path: Union[str, Path, None] = None) -> None:
+    """Cerrar las conexiones del pool compartido"""
+    _pool.close_all(db_path)
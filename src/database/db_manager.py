@@ -6,11 +6,19 @@ Manages SQLite database operations for settings, categories, items, and clipboar
 import sqlite3
 import json
 import logging
+import re
+import threading
+import time
 from pathlib import Path
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from contextlib import contextmanager
 
+from .connection_pool import configure_connection, get_connection
+from .usage_queue import get_usage_queue, flush_usage_queue
+from .change_bus import get_change_bus
+from .frecency import add_visits
+
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -29,7 +37,14 @@ class DBManager:
         """
         self.db_path = Path(db_path)
         self.connection = None
+        # self.connection belongs to the creating (GUI) thread; see connect()
+        self._owner_thread = threading.get_ident()
+        self._fts_enabled = False
         self._ensure_database()
+        self._apply_migrations()
+        # Versiones y eventos de cambio compartidos por todos los DBManager
+        # de esta base de datos (ver change_bus)
+        self.changes = get_change_bus(self.db_path)
         logger.info(f"Database initialized at: {self.db_path}")
 
     def _ensure_database(self):
@@ -42,30 +57,81 @@ class DBManager:
         else:
             logger.info("Database already exists")
 
+    def _apply_migrations(self):
+        """Apply idempotent schema upgrades (indexes, triggers) to new and existing databases"""
+        from .migrations import (
+            add_items_fts, add_item_tags, add_usage_history, add_usage_rollups, add_epoch_timestamps,
+            add_change_log, add_item_frecency, add_collection_query, add_search_index,
+            add_collection_members
+        )
+
+        conn = self.connect()
+        try:
+            self._fts_enabled = add_items_fts.upgrade(conn)
+            add_item_tags.upgrade(conn)
+            add_usage_history.upgrade(conn)
+            add_usage_rollups.upgrade(conn)
+            add_epoch_timestamps.upgrade(conn)
+            add_change_log.upgrade(conn)
+            add_item_frecency.upgrade(conn)
+            add_collection_query.upgrade(conn)
+            add_search_index.upgrade(conn)
+            add_collection_members.upgrade(conn)
+            # Columnas de items añadidas por cualquier migración anterior
+            add_change_log.sync_items_update_trigger(conn)
+            conn.commit()
+        except sqlite3.Error as e:
+            conn.rollback()
+            logger.error(f"Schema upgrade failed: {e}")
+
     def connect(self) -> sqlite3.Connection:
         """
         Establish connection to the database
 
+        Other threads (DBWorker/AsyncLoader jobs) get their own pooled
+        connection: sharing self.connection would let them see the owning
+        thread's uncommitted writes, and sqlite3 connections are not
+        thread-safe. :memory: databases always share the one connection.
+
         Returns:
             sqlite3.Connection: Database connection
         """
+        if threading.get_ident() != self._owner_thread and not self._is_memory_db():
+            return get_connection(self.db_path)
         if self.connection is None:
             self.connection = sqlite3.connect(
                 self.db_path,
                 check_same_thread=False
             )
             self.connection.row_factory = sqlite3.Row
-            # Enable foreign keys
-            self.connection.execute("PRAGMA foreign_keys = ON")
+            # WAL, synchronous=NORMAL, cache/mmap, busy timeout and foreign keys
+            configure_connection(self.connection, is_memory=str(self.db_path) == ":memory:")
         return self.connection
 
     def close(self):
-        """Close database connection"""
+        """Close database connection (pending usage events are flushed first)"""
+        if not self._is_memory_db():
+            flush_usage_queue(self.db_path)
         if self.connection:
             self.connection.close()
             self.connection = None
             logger.info("Database connection closed")
 
+    def _is_memory_db(self) -> bool:
+        """True for :memory: databases (no usage queue: it needs its own connection)"""
+        return str(self.db_path) == ":memory:"
+
+    def flush_usage(self) -> int:
+        """
+        Write pending usage events (last_used, history) to the database now
+
+        Returns:
+            int: Number of events flushed
+        """
+        if self._is_memory_db():
+            return 0
+        return flush_usage_queue(self.db_path)
+
     @contextmanager
     def transaction(self):
         """
@@ -76,6 +142,8 @@ class DBManager:
                 conn.execute(...)
         """
         conn = self.connect()
+        # Lo escrito fuera del bus hasta ahora se notifica antes que este commit
+        self.changes.poll_external()
         try:
             yield conn
             conn.commit()
@@ -268,36 +336,42 @@ class DBManager:
             logger.error(f"Params: {params}")
             raise
 
-    def execute_update(self, query: str, params: tuple = ()) -> int:
+    def execute_update(self, query: str, params: tuple = (), publish: bool = True) -> int:
         """
         Execute INSERT/UPDATE/DELETE query
 
         Args:
             query: SQL query string
             params: Query parameters tuple
+            publish: Publish a table-level change event after the commit
+                     (False when the caller publishes a finer-grained one)
 
         Returns:
             int: Last row ID for INSERT, or number of affected rows
         """
         try:
             conn = self.connect()
+            self.changes.poll_external()
             cursor = conn.cursor()
             cursor.execute(query, params)
             conn.commit()
-            return cursor.lastrowid
         except sqlite3.Error as e:
             logger.error(f"Update execution failed: {e}")
             logger.error(f"Query: {query}")
             logger.error(f"Params: {params}")
             raise
+        if publish:
+            self._publish_statement(query)
+        return cursor.lastrowid
 
-    def execute_many(self, query: str, params_list: List[tuple]) -> None:
+    def execute_many(self, query: str, params_list: List[tuple], publish: bool = True) -> None:
         """
         Execute multiple INSERT queries in a single transaction
 
         Args:
             query: SQL query string
             params_list: List of parameter tuples
+            publish: Publish a table-level change event after the commit
         """
         try:
             with self.transaction() as conn:
@@ -307,6 +381,22 @@ class DBManager:
         except sqlite3.Error as e:
             logger.error(f"Batch execution failed: {e}")
             raise
+        if publish:
+            self._publish_statement(query)
+
+    _WRITE_STATEMENT = re.compile(
+        r'^\s*(INSERT|REPLACE|UPDATE|DELETE)\b(?:\s+OR\s+\w+)?(?:\s+INTO|\s+FROM)?\s+(\w+)',
+        re.IGNORECASE
+    )
+
+    def _publish_statement(self, query: str) -> None:
+        """Publish a coarse change event (table and action only) for a write statement"""
+        match = self._WRITE_STATEMENT.match(query)
+        if not match:
+            return
+        verb = match.group(1).upper()
+        action = {'INSERT': 'insert', 'REPLACE': 'insert', 'UPDATE': 'update'}.get(verb, 'delete')
+        self.changes.publish(match.group(2).lower(), action)
 
     # ========== SETTINGS ==========
 
@@ -425,7 +515,8 @@ class DBManager:
             INSERT INTO categories (name, icon, order_index, is_predefined, updated_at)
             VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
         """
-        category_id = self.execute_update(query, (name, icon, order_index, is_predefined))
+        category_id = self.execute_update(query, (name, icon, order_index, is_predefined), publish=False)
+        self.changes.publish('categories', 'insert', ids=(category_id,), category_ids=(category_id,))
         logger.info(f"Category added: {name} (ID: {category_id}, order_index: {order_index})")
         return category_id
 
@@ -459,10 +550,13 @@ class DBManager:
             params.append(is_active)
 
         if updates:
+            columns = [update.split(' = ')[0] for update in updates]
             updates.append("updated_at = CURRENT_TIMESTAMP")
             params.append(category_id)
             query = f"UPDATE categories SET {', '.join(updates)} WHERE id = ?"
-            self.execute_update(query, tuple(params))
+            self.execute_update(query, tuple(params), publish=False)
+            self.changes.publish('categories', 'update', ids=(category_id,),
+                                 category_ids=(category_id,), columns=columns)
             logger.info(f"Category updated: ID {category_id}")
 
     def delete_category(self, category_id: int) -> None:
@@ -473,7 +567,10 @@ class DBManager:
             category_id: Category ID to delete
         """
         query = "DELETE FROM categories WHERE id = ?"
-        self.execute_update(query, (category_id,))
+        self.execute_update(query, (category_id,), publish=False)
+        self.changes.publish('categories', 'delete', ids=(category_id,), category_ids=(category_id,))
+        # Its items were removed by the foreign key cascade
+        self.changes.publish('items', 'delete', category_ids=(category_id,))
         logger.info(f"Category deleted: ID {category_id}")
 
     def reorder_categories(self, category_ids: List[int]) -> None:
@@ -485,7 +582,9 @@ class DBManager:
         """
         updates = [(i, cat_id) for i, cat_id in enumerate(category_ids)]
         query = "UPDATE categories SET order_index = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?"
-        self.execute_many(query, updates)
+        self.execute_many(query, updates, publish=False)
+        self.changes.publish('categories', 'update', ids=category_ids,
+                             category_ids=category_ids, columns=('order_index',))
         logger.info(f"Categories reordered: {len(category_ids)} items")
 
     # ========== ITEMS ==========
@@ -498,7 +597,7 @@ class DBManager:
             category_id: Category ID
 
         Returns:
-            List[Dict]: List of item dictionaries (content decrypted if sensitive)
+            List[Dict]: List of item dictionaries (sensitive content as SealedContent)
         """
         query = """
             SELECT * FROM items
@@ -507,11 +606,9 @@ class DBManager:
         """
         results = self.execute_query(query, (category_id,))
 
-        # Initialize encryption manager for decrypting sensitive items
-        from core.encryption_manager import EncryptionManager
-        encryption_manager = EncryptionManager()
+        from core.encryption_manager import SealedContent
 
-        # Parse tags and decrypt sensitive content
+        # Parse tags and seal sensitive content (decrypted on demand)
         for item in results:
             # Parse tags from JSON or CSV format
             if item['tags']:
@@ -527,17 +624,152 @@ class DBManager:
             else:
                 item['tags'] = []
 
-            # Decrypt sensitive content
+            # Seal sensitive content: decrypted only when copied/revealed/executed
             if item.get('is_sensitive') and item.get('content'):
-                try:
-                    item['content'] = encryption_manager.decrypt(item['content'])
-                    logger.debug(f"Content decrypted for item ID: {item['id']}")
-                except Exception as e:
-                    logger.error(f"Failed to decrypt item {item['id']}: {e}")
-                    item['content'] = "[DECRYPTION ERROR]"
+                item['content'] = SealedContent(item['content'])
 
         return results
 
+    def get_items_by_ids(self, item_ids: List[int]) -> List[Dict]:
+        """
+        Get the current rows of some items (used to patch open views)
+
+        Args:
+            item_ids: Item IDs; IDs that no longer exist are skipped
+
+        Returns:
+            List[Dict]: Item dictionaries ordered by created_at, same format
+                as get_items_by_category() (sensitive content as SealedContent)
+        """
+        if not item_ids:
+            return []
+
+        placeholders = ", ".join("?" for _ in item_ids)
+        query = f"SELECT * FROM items WHERE id IN ({placeholders}) ORDER BY created_at, id"
+        results = self.execute_query(query, tuple(item_ids))
+
+        from core.encryption_manager import SealedContent
+        from .migrations.add_item_tags import parse_legacy_tags
+
+        for item in results:
+            item['tags'] = parse_legacy_tags(item['tags'])
+            # Seal sensitive content: decrypted only when copied/revealed/executed
+            if item.get('is_sensitive') and item.get('content'):
+                item['content'] = SealedContent(item['content'])
+
+        return results
+
+    def get_item_search_fields(self, item_ids: Optional[List[int]] = None) -> List[Dict]:
+        """
+        Get the searchable text fields of items (used to build search indexes)
+
+        Args:
+            item_ids: Only these items (None = all items)
+
+        Returns:
+            List[Dict]: {'id', 'category_id', 'label', 'tags' (list), 'list_group'}
+                ordered by id; content is not read (nor decrypted)
+        """
+        query = "SELECT id, category_id, label, tags, list_group FROM items"
+        params = ()
+        if item_ids is not None:
+            if not item_ids:
+                return []
+            query += f" WHERE id IN ({', '.join('?' for _ in item_ids)})"
+            params = tuple(item_ids)
+        results = self.execute_query(query + " ORDER BY id", params)
+
+        from .migrations.add_item_tags import parse_legacy_tags
+
+        for item in results:
+            item['tags'] = parse_legacy_tags(item['tags'])
+        return results
+
+    def get_categories_with_items(self, include_inactive: bool = False,
+                                  category_ids: Optional[List[int]] = None) -> List[Dict]:
+        """
+        Get all categories with their items using two streamed queries
+
+        Replaces the N+1 pattern of calling get_items_by_category() once per
+        category: categories are read once, items are read in a single query
+        ordered by category and grouped in one pass.
+
+        Args:
+            include_inactive: Include inactive categories (and their items)
+            category_ids: Only load these categories (used to refresh the
+                categories named by a change event); None loads all
+
+        Returns:
+            List[Dict]: Category dictionaries ordered by order_index, each with an
+                'items' list ordered by created_at (sensitive content as SealedContent)
+        """
+        categories = self.get_categories(include_inactive=include_inactive)
+        if category_ids is not None:
+            wanted = set(category_ids)
+            categories = [category for category in categories if category['id'] in wanted]
+        items_by_category = {}
+        for category in categories:
+            category['items'] = []
+            items_by_category[category['id']] = category['items']
+
+        if not categories:
+            return categories
+
+        # Full scan ordered by creation date; rows are bucketed by category in
+        # Python, which keeps each bucket ordered by created_at. Items whose
+        # category was filtered out (inactive) have no bucket and are skipped.
+        query = "SELECT * FROM items ORDER BY created_at, id"
+        params = ()
+        if category_ids is not None:
+            placeholders = ", ".join("?" for _ in items_by_category)
+            query = f"SELECT * FROM items WHERE category_id IN ({placeholders}) ORDER BY created_at, id"
+            params = tuple(items_by_category)
+
+        from core.encryption_manager import SealedContent
+
+        parsed_tags = {}  # Raw tags string -> parsed list (many items share tags)
+        conn = self.connect()
+        cursor = conn.cursor()
+        # Plain tuples + zip() are much cheaper than sqlite3.Row -> dict
+        cursor.row_factory = None
+        try:
+            cursor.execute(query, params)
+            columns = [column[0] for column in cursor.description]
+            for row in cursor:
+                item = dict(zip(columns, row))
+                bucket = items_by_category.get(item['category_id'])
+                if bucket is None:
+                    continue
+
+                # Parse tags from JSON or CSV format
+                raw_tags = item['tags']
+                if raw_tags:
+                    tags = parsed_tags.get(raw_tags)
+                    if tags is None:
+                        try:
+                            tags = json.loads(raw_tags)
+                        except json.JSONDecodeError:
+                            if isinstance(raw_tags, str):
+                                tags = [tag.strip() for tag in raw_tags.split(',') if tag.strip()]
+                            else:
+                                tags = []
+                        parsed_tags[raw_tags] = tags
+                    item['tags'] = list(tags)
+                else:
+                    item['tags'] = []
+
+                # Seal sensitive content: decrypted only when copied/revealed/executed
+                if item.get('is_sensitive') and item.get('content'):
+                    item['content'] = SealedContent(item['content'])
+
+                bucket.append(item)
+        except sqlite3.Error as e:
+            logger.error(f"Bulk structure load failed: {e}")
+            raise
+
+        logger.debug(f"Loaded {len(categories)} categories with items in bulk")
+        return categories
+
     def get_item(self, item_id: int) -> Optional[Dict]:
         """
         Get item by ID
@@ -568,8 +800,8 @@ class DBManager:
 
             # Decrypt sensitive content
             if item.get('is_sensitive') and item.get('content'):
-                from core.encryption_manager import EncryptionManager
-                encryption_manager = EncryptionManager()
+                from core.encryption_manager import get_encryption_manager
+                encryption_manager = get_encryption_manager()
                 try:
                     item['content'] = encryption_manager.decrypt(item['content'])
                     logger.debug(f"Content decrypted for item ID: {item_id}")
@@ -589,7 +821,7 @@ class DBManager:
             include_archived: If True, include archived items (default: True)
 
         Returns:
-            List[Dict]: List of all item dictionaries (content decrypted if sensitive)
+            List[Dict]: List of all item dictionaries (sensitive content as SealedContent)
         """
         # Build query based on filters
         conditions = []
@@ -615,11 +847,9 @@ class DBManager:
 
         results = self.execute_query(query, tuple(params)) if params else self.execute_query(query)
 
-        # Initialize encryption manager for decrypting sensitive items
-        from core.encryption_manager import EncryptionManager
-        encryption_manager = EncryptionManager()
+        from core.encryption_manager import SealedContent
 
-        # Parse tags and decrypt sensitive content
+        # Parse tags and seal sensitive content (decrypted on demand)
         for item in results:
             # Parse tags from JSON or CSV format
             if item['tags']:
@@ -635,14 +865,9 @@ class DBManager:
             else:
                 item['tags'] = []
 
-            # Decrypt sensitive content
+            # Seal sensitive content: decrypted only when copied/revealed/executed
             if item.get('is_sensitive') and item.get('content'):
-                try:
-                    item['content'] = encryption_manager.decrypt(item['content'])
-                    logger.debug(f"Content decrypted for item ID: {item['id']}")
-                except Exception as e:
-                    logger.error(f"Failed to decrypt item {item['id']}: {e}")
-                    item['content'] = "[DECRYPTION ERROR]"
+                item['content'] = SealedContent(item['content'])
 
         logger.debug(f"Retrieved {len(results)} items")
         return results
@@ -683,9 +908,8 @@ class DBManager:
         """
         # Encrypt content if sensitive
         if is_sensitive and content:
-            from core.encryption_manager import EncryptionManager
-            encryption_manager = EncryptionManager()
-            content = encryption_manager.encrypt(content)
+            from core.encryption_manager import get_encryption_manager, reveal_content
+            content = get_encryption_manager().encrypt(reveal_content(content))
             logger.info(f"Content encrypted for sensitive item: {label}")
 
         tags_json = json.dumps(tags or [])
@@ -694,14 +918,149 @@ class DBManager:
             (category_id, label, content, type, icon, is_sensitive, is_favorite, tags, description, working_dir, color, badge, is_active, is_archived, is_list, list_group, orden_lista, updated_at)
             VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
         """
-        item_id = self.execute_update(
-            query,
-            (category_id, label, content, item_type, icon, is_sensitive, is_favorite, tags_json, description, working_dir, color, badge, is_active, is_archived, is_list, list_group, orden_lista)
-        )
+        # Insert item and its normalized tags in the same transaction
+        with self.transaction() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                query,
+                (category_id, label, content, item_type, icon, is_sensitive, is_favorite, tags_json, description, working_dir, color, badge, is_active, is_archived, is_list, list_group, orden_lista)
+            )
+            item_id = cursor.lastrowid
+            self._sync_item_tags(conn, item_id, tags or [])
+        self.changes.publish('items', 'insert', ids=(item_id,), category_ids=(category_id,))
         list_info = f", List: {list_group}[{orden_lista}]" if is_list else ""
         logger.info(f"Item added: {label} (ID: {item_id}, Sensitive: {is_sensitive}, Favorite: {is_favorite}, Active: {is_active}, Archived: {is_archived}{list_info})")
         return item_id
 
+    def add_items_bulk(self, items: List[Dict[str, Any]]) -> Tuple[List[Optional[int]], List[Tuple[int, str]]]:
+        """
+        Add many items in a single transaction
+
+        Tags are serialized and sensitive content is encrypted (in parallel)
+        before touching the database; rows are then inserted with one
+        executemany and their item_tags links in bulk. Invalid rows are
+        reported and skipped without aborting the rest of the batch.
+
+        Args:
+            items: Item dicts with the same keys as add_item() arguments
+                   (category_id, label, content, item_type, tags, ...)
+
+        Returns:
+            Tuple: (item_ids, errors). item_ids is aligned with the input
+            (None for rows that failed); errors is a list of (index, message)
+        """
+        from core.encryption_manager import get_encryption_manager, reveal_content
+        from .migrations.add_item_tags import parse_legacy_tags
+
+        item_ids: List[Optional[int]] = [None] * len(items)
+        errors: List[Tuple[int, str]] = []
+        if not items:
+            return item_ids, errors
+
+        category_ids = {row['id'] for row in self.execute_query("SELECT id FROM categories")}
+        valid_types = ('TEXT', 'URL', 'CODE', 'PATH')
+
+        # 1. Validate and normalize rows
+        prepared = []  # (input index, item dict, clean tags)
+        for index, item in enumerate(items):
+            label = item.get('label')
+            content = reveal_content(item.get('content'))
+            item_type = (item.get('item_type') or 'TEXT').upper()
+            if item.get('category_id') not in category_ids:
+                errors.append((index, f"Category {item.get('category_id')} does not exist"))
+            elif not label:
+                errors.append((index, "Label is required"))
+            elif content is None:
+                errors.append((index, "Content is required"))
+            elif item_type not in valid_types:
+                errors.append((index, f"Invalid item type: {item_type}"))
+            else:
+                prepared.append((index, dict(item, content=content, item_type=item_type),
+                                 parse_legacy_tags(item.get('tags'))))
+
+        # 2. Encrypt sensitive content in one batch
+        sensitive = [entry for entry in prepared if entry[1].get('is_sensitive') and entry[1]['content']]
+        if sensitive:
+            encrypted = get_encryption_manager().encrypt_many([entry[1]['content'] for entry in sensitive])
+            for entry, token in zip(sensitive, encrypted):
+                entry[1]['content'] = token
+
+        rows = [(
+            item['category_id'], item['label'], item['content'], item['item_type'],
+            item.get('icon'), bool(item.get('is_sensitive', False)), bool(item.get('is_favorite', False)),
+            json.dumps(tags), item.get('description'), item.get('working_dir'), item.get('color'),
+            item.get('badge'), bool(item.get('is_active', True)), bool(item.get('is_archived', False)),
+            bool(item.get('is_list', False)), item.get('list_group'), item.get('orden_lista', 0)
+        ) for _, item, tags in prepared]
+
+        query = """
+            INSERT INTO items
+            (category_id, label, content, type, icon, is_sensitive, is_favorite, tags, description, working_dir, color, badge, is_active, is_archived, is_list, list_group, orden_lista, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+        """
+
+        # 3. Insert everything in one transaction
+        conn = self.connect()
+        self.changes.poll_external()
+        try:
+            inserted = []  # (input index, new id, tags)
+            if not conn.in_transaction:
+                conn.execute("BEGIN")
+            # Savepoint: a failed batch is undone without touching whatever
+            # the caller already wrote in its open transaction
+            conn.execute("SAVEPOINT add_items_bulk")
+            try:
+                conn.executemany(query, rows)
+                # AUTOINCREMENT ids are consecutive inside a single transaction
+                last_id = conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+                first_id = last_id - len(rows) + 1
+                inserted = [(index, first_id + offset, tags)
+                            for offset, (index, _, tags) in enumerate(prepared)]
+            except sqlite3.Error as e:
+                # A row failed a constraint: redo the batch row by row so the
+                # rest is still inserted (same transaction, single commit)
+                logger.warning(f"Bulk insert failed ({e}), retrying row by row")
+                conn.execute("ROLLBACK TO SAVEPOINT add_items_bulk")
+                for (index, _, tags), row in zip(prepared, rows):
+                    try:
+                        cursor = conn.execute(query, row)
+                        inserted.append((index, cursor.lastrowid, tags))
+                    except sqlite3.Error as row_error:
+                        errors.append((index, str(row_error)))
+            conn.execute("RELEASE SAVEPOINT add_items_bulk")
+
+            # Normalized tags for all inserted rows
+            all_tags = {tag.lower(): tag for _, _, tags in inserted for tag in tags}
+            if all_tags:
+                conn.executemany("INSERT OR IGNORE INTO tags (name) VALUES (?)",
+                                 [(tag,) for tag in all_tags.values()])
+                tag_ids = {name.lower(): tag_id
+                           for tag_id, name in conn.execute("SELECT id, name FROM tags").fetchall()}
+                conn.executemany(
+                    "INSERT OR IGNORE INTO item_tags (item_id, tag_id) VALUES (?, ?)",
+                    [(item_id, tag_ids[tag.lower()]) for _, item_id, tags in inserted for tag in tags]
+                )
+
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            logger.error(f"Bulk item insert failed: {e}")
+            raise
+
+        for index, item_id, _ in inserted:
+            item_ids[index] = item_id
+
+        if inserted:
+            self.changes.publish(
+                'items', 'insert',
+                ids=[item_id for _, item_id, _ in inserted],
+                category_ids={items[index]['category_id'] for index, _, _ in inserted}
+            )
+
+        errors.sort()
+        logger.info(f"Bulk insert: {len(inserted)} items added, {len(errors)} failed")
+        return item_ids, errors
+
     def update_item(self, item_id: int, **kwargs) -> None:
         """
         Update item fields
@@ -710,18 +1069,20 @@ class DBManager:
             item_id: Item ID to update
             **kwargs: Fields to update (label, content, type, icon, is_sensitive, is_favorite, tags, description, working_dir, color, badge, is_active, is_archived, is_list, list_group, orden_lista)
         """
+        from core.encryption_manager import SealedContent, get_encryption_manager
+
         allowed_fields = ['label', 'content', 'type', 'icon', 'is_sensitive', 'is_favorite', 'tags', 'description', 'working_dir', 'color', 'badge', 'is_active', 'is_archived', 'is_list', 'list_group', 'orden_lista']
         updates = []
         params = []
 
-        # Get current item to check if it's sensitive
-        current_item = self.get_item(item_id)
+        # Check current sensitivity without loading (and decrypting) the item
+        current_item = self.execute_query("SELECT is_sensitive, category_id FROM items WHERE id = ?", (item_id,))
         if not current_item:
             logger.warning(f"Item not found for update: ID {item_id}")
             return
 
         # Check if item is being marked as sensitive or if it's already sensitive
-        is_currently_sensitive = current_item.get('is_sensitive', False)
+        is_currently_sensitive = current_item[0].get('is_sensitive', False)
         will_be_sensitive = kwargs.get('is_sensitive', is_currently_sensitive)
 
         for field, value in kwargs.items():
@@ -729,10 +1090,12 @@ class DBManager:
                 # Handle tags serialization
                 if field == 'tags':
                     value = json.dumps(value)
+                # Unchanged sealed content: keep the stored token as-is
+                elif field == 'content' and isinstance(value, SealedContent):
+                    value = value.token if will_be_sensitive else value.reveal()
                 # Handle content encryption for sensitive items
                 elif field == 'content' and will_be_sensitive and value:
-                    from core.encryption_manager import EncryptionManager
-                    encryption_manager = EncryptionManager()
+                    encryption_manager = get_encryption_manager()
                     # Only encrypt if not already encrypted
                     if not encryption_manager.is_encrypted(value):
                         value = encryption_manager.encrypt(value)
@@ -745,9 +1108,65 @@ class DBManager:
             updates.append("updated_at = CURRENT_TIMESTAMP")
             params.append(item_id)
             query = f"UPDATE items SET {', '.join(updates)} WHERE id = ?"
-            self.execute_update(query, tuple(params))
+            with self.transaction() as conn:
+                conn.execute(query, tuple(params))
+                if 'tags' in kwargs:
+                    self._sync_item_tags(conn, item_id, kwargs['tags'] or [])
+            self.changes.publish('items', 'update', ids=(item_id,),
+                                 category_ids=(current_item[0]['category_id'],),
+                                 columns=[field for field in kwargs if field in allowed_fields])
             logger.info(f"Item updated: ID {item_id}")
 
+    def _sync_item_tags(self, conn: sqlite3.Connection, item_id: int, tags: List[str]) -> None:
+        """
+        Replace the normalized tag links (item_tags) of an item
+
+        Runs inside the caller's transaction; does not commit.
+
+        Args:
+            conn: Open connection (inside a transaction)
+            item_id: Item ID
+            tags: New list of tags for the item
+        """
+        from .migrations.add_item_tags import parse_legacy_tags
+
+        conn.execute("DELETE FROM item_tags WHERE item_id = ?", (item_id,))
+        clean_tags = parse_legacy_tags(tags)
+        if not clean_tags:
+            return
+
+        conn.executemany(
+            "INSERT OR IGNORE INTO tags (name) VALUES (?)",
+            [(tag,) for tag in clean_tags]
+        )
+        placeholders = ", ".join("?" for _ in clean_tags)
+        conn.execute(f"""
+            INSERT OR IGNORE INTO item_tags (item_id, tag_id)
+            SELECT ?, id FROM tags WHERE name IN ({placeholders})
+        """, (item_id, *clean_tags))
+
+    def get_tag_counts(self, include_inactive: bool = False) -> List[tuple]:
+        """
+        Count items per tag using the normalized item_tags index
+
+        Args:
+            include_inactive: Include items from inactive categories
+
+        Returns:
+            List[tuple]: (tag, count) tuples sorted by count desc
+        """
+        query = """
+            SELECT t.name as tag, COUNT(*) as count
+            FROM item_tags it
+            JOIN tags t ON t.id = it.tag_id
+            JOIN items i ON i.id = it.item_id
+            JOIN categories c ON c.id = i.category_id
+            WHERE c.is_active = 1 OR ? = 1
+            GROUP BY t.id
+            ORDER BY count DESC, t.name
+        """
+        return [(row['tag'], row['count']) for row in self.execute_query(query, (include_inactive,))]
+
     def delete_item(self, item_id: int) -> None:
         """
         Delete item
@@ -755,8 +1174,11 @@ class DBManager:
         Args:
             item_id: Item ID to delete
         """
+        row = self.execute_query("SELECT category_id FROM items WHERE id = ?", (item_id,))
         query = "DELETE FROM items WHERE id = ?"
-        self.execute_update(query, (item_id,))
+        self.execute_update(query, (item_id,), publish=False)
+        self.changes.publish('items', 'delete', ids=(item_id,),
+                             category_ids=(row[0]['category_id'],) if row else ())
         logger.info(f"Item deleted: ID {item_id}")
 
     def update_last_used(self, item_id: int) -> None:
@@ -766,8 +1188,16 @@ class DBManager:
         Args:
             item_id: Item ID
         """
-        query = "UPDATE items SET last_used = CURRENT_TIMESTAMP WHERE id = ?"
-        self.execute_update(query, (item_id,))
+        if self._is_memory_db():
+            query = "UPDATE items SET last_used = CURRENT_TIMESTAMP WHERE id = ?"
+            self.execute_update(query, (item_id,), publish=False)
+            add_visits(self.connect(), [(item_id, time.time())])
+            self.connect().commit()
+            self.changes.publish('items', 'update', ids=(item_id,), columns=('last_used',))
+            self.changes.publish('item_frecency', 'update', ids=(item_id,))
+        else:
+            # Write-behind: se agrupa con otros usos y se escribe por lotes
+            get_usage_queue(self.db_path).record_last_used(item_id)
         logger.debug(f"Last used updated: ID {item_id}")
 
     def get_all_items(self, include_inactive: bool = False) -> List[Dict]:
@@ -794,11 +1224,9 @@ class DBManager:
         """
         results = self.execute_query(query, (include_inactive,))
 
-        # Initialize encryption manager for decrypting sensitive items
-        from core.encryption_manager import EncryptionManager
-        encryption_manager = EncryptionManager()
+        from core.encryption_manager import SealedContent
 
-        # Parse tags and decrypt sensitive content
+        # Parse tags and seal sensitive content (decrypted on demand)
         for item in results:
             # Parse tags from JSON or CSV format
             if item['tags']:
@@ -814,20 +1242,19 @@ class DBManager:
             else:
                 item['tags'] = []
 
-            # Decrypt sensitive content
+            # Seal sensitive content: decrypted only when copied/revealed/executed
             if item.get('is_sensitive') and item.get('content'):
-                try:
-                    item['content'] = encryption_manager.decrypt(item['content'])
-                    logger.debug(f"Content decrypted for item ID: {item['id']}")
-                except Exception as e:
-                    logger.error(f"Failed to decrypt item {item['id']}: {e}")
-                    item['content'] = "[DECRYPTION ERROR]"
+                item['content'] = SealedContent(item['content'])
 
         return results
 
     def search_items(self, search_query: str, limit: int = 50) -> List[Dict]:
         """
-        Search items by label or content
+        Search items by label, content or exact tag name
+
+        Tags are matched through the normalized item_tags index, so "git"
+        does not match an item tagged "github". Label matches come first (exact, then prefix, then anywhere), each
+        group ordered by frecency (see item_frecency).
 
         Args:
             search_query: Search text
@@ -840,14 +1267,25 @@ class DBManager:
             SELECT i.*, c.name as category_name
             FROM items i
             JOIN categories c ON i.category_id = c.id
-            WHERE i.label LIKE ? OR i.content LIKE ? OR i.tags LIKE ?
-            ORDER BY i.last_used DESC
+            LEFT JOIN item_frecency f ON f.item_id = i.id
+            WHERE i.label LIKE ? OR i.content LIKE ?
+               OR i.id IN (SELECT it.item_id FROM item_tags it
+                           JOIN tags t ON t.id = it.tag_id
+                           WHERE t.name = ?)
+            ORDER BY CASE
+                         WHEN i.label LIKE ? THEN 0
+                         WHEN i.label LIKE ? THEN 1
+                         WHEN i.label LIKE ? THEN 2
+                         ELSE 3
+                     END,
+                     f.score IS NULL, f.score DESC, i.last_used DESC
             LIMIT ?
         """
         search_pattern = f"%{search_query}%"
         results = self.execute_query(
             query,
-            (search_pattern, search_pattern, search_pattern, limit)
+            (search_pattern, search_pattern, search_query.strip(),
+             search_query, f"{search_query}%", search_pattern, limit)
         )
 
         # Parse tags
@@ -867,6 +1305,145 @@ class DBManager:
 
         return results
 
+    def get_frecency_scores(self, item_ids: Optional[List[int]] = None) -> Dict[int, float]:
+        """
+        Get precomputed frecency scores (see database/frecency)
+
+        Args:
+            item_ids: Only these items (None = all items ever used)
+
+        Returns:
+            Dict[int, float]: item_id -> log score (higher is more frecent);
+            items never used are missing
+        """
+        if item_ids is None:
+            rows = self.execute_query("SELECT item_id, score FROM item_frecency")
+        else:
+            if not item_ids:
+                return {}
+            placeholders = ','.join('?' * len(item_ids))
+            rows = self.execute_query(
+                f"SELECT item_id, score FROM item_frecency WHERE item_id IN ({placeholders})",
+                tuple(item_ids)
+            )
+        return {row['item_id']: row['score'] for row in rows}
+
+    @staticmethod
+    def _build_fts_query(search_query: str) -> str:
+        """
+        Convert free text into an FTS5 MATCH expression
+
+        Every word becomes a quoted prefix term and all terms must match,
+        so "dock comp" matches "docker compose up".
+
+        Args:
+            search_query: Raw search text
+
+        Returns:
+            str: FTS5 query, or empty string if the text has no searchable words
+        """
+        terms = re.findall(r"\w+", search_query, re.UNICODE)
+        return " ".join(f'"{term}"*' for term in terms)
+
+    def search_items_ranked(self, search_query: str, limit: int = 50,
+                            category_id: Optional[int] = None) -> List[Dict]:
+        """
+        Full-text search over items ranked by relevance (FTS5 bm25)
+
+        Matches label, content, description, tags and list_group. Label
+        matches weigh most, then tags, list_group, description and content.
+        Sensitive items are only indexed by their non-content fields. Falls
+        back to search_items() when SQLite lacks FTS5.
+
+        Args:
+            search_query: Search text
+            limit: Maximum results
+            category_id: Restrict results to this category (optional)
+
+        Returns:
+            List[Dict]: Matching items with category name and 'rank' (lower is better)
+        """
+        if not self._fts_enabled:
+            results = self.search_items(search_query, limit)
+            if category_id is not None:
+                results = [item for item in results if item['category_id'] == category_id]
+            return results
+
+        fts_query = self._build_fts_query(search_query)
+        if not fts_query:
+            return []
+
+        category_clause = "AND i.category_id = ?" if category_id is not None else ""
+        query = f"""
+            SELECT i.*, c.name as category_name,
+                   bm25(items_fts, 10.0, 1.0, 2.0, 5.0, 3.0) as rank
+            FROM items_fts
+            JOIN items i ON i.id = items_fts.rowid
+            JOIN categories c ON i.category_id = c.id
+            WHERE items_fts MATCH ? {category_clause}
+            ORDER BY rank
+            LIMIT ?
+        """
+        params = [fts_query]
+        if category_id is not None:
+            params.append(category_id)
+        params.append(limit)
+        results = self.execute_query(query, tuple(params))
+
+        # Parse tags
+        for item in results:
+            if item['tags']:
+                try:
+                    item['tags'] = json.loads(item['tags'])
+                except json.JSONDecodeError:
+                    if isinstance(item['tags'], str):
+                        item['tags'] = [tag.strip() for tag in item['tags'].split(',') if tag.strip()]
+                    else:
+                        item['tags'] = []
+            else:
+                item['tags'] = []
+
+        return results
+
+    def query_items(self, query_text: str, limit: Optional[int] = None) -> List[Dict]:
+        """
+        Items matching a structured search query (see core/query_language)
+
+        The query ("tag:git is:fav -archived used>5 docker") is compiled
+        once (cached by text) into a single parameterized statement; text
+        terms go through items_fts when available.
+
+        Args:
+            query_text: Query in the search language
+            limit: Maximum results (optional)
+
+        Returns:
+            List[Dict]: Matching items with category name, most recently used first
+
+        Raises:
+            QuerySyntaxError: If the query is not valid
+        """
+        from core.query_language import compile_query
+
+        plan = compile_query(query_text.strip(), self._fts_enabled)
+        query, params = plan.sql(limit=limit)
+        results = self.execute_query(query, params)
+
+        # Parse tags
+        for item in results:
+            if item['tags']:
+                try:
+                    item['tags'] = json.loads(item['tags'])
+                except json.JSONDecodeError:
+                    if isinstance(item['tags'], str):
+                        item['tags'] = [tag.strip() for tag in item['tags'].split(',') if tag.strip()]
+                    else:
+                        item['tags'] = []
+            else:
+                item['tags'] = []
+
+        return results
+
     # ========== LISTAS AVANZADAS ==========
 
     def create_list(self, category_id: int, list_name: str, items_data: List[Dict[str, Any]]) -> List[int]:
@@ -982,9 +1559,9 @@ class DBManager:
         """
         results = self.execute_query(query, (category_id, list_group))
 
-        # Desencriptar y parsear tags (mismo proceso que en get_items_by_category)
-        from core.encryption_manager import EncryptionManager
-        encryption_manager = EncryptionManager()
+        # Desencriptar y parsear tags. Las listas se copian/ejecutan completas,
+        # así que el contenido sensible se descifra en un solo lote.
+        from core.encryption_manager import SealedContent, reveal_all
 
         for item in results:
             # Parse tags
@@ -999,14 +1576,13 @@ class DBManager:
             else:
                 item['tags'] = []
 
-            # Decrypt sensitive content
             if item.get('is_sensitive') and item.get('content'):
-                try:
-                    item['content'] = encryption_manager.decrypt(item['content'])
-                    logger.debug(f"Content decrypted for item ID: {item['id']}")
-                except Exception as e:
-                    logger.error(f"Failed to decrypt item {item['id']}: {e}")
-                    item['content'] = "[DECRYPTION ERROR]"
+                item['content'] = SealedContent(item['content'])
+
+        reveal_all(item['content'] for item in results)
+        for item in results:
+            if isinstance(item['content'], SealedContent):
+                item['content'] = item['content'].reveal()
 
         logger.debug(f"Obtenidos {len(results)} items de lista '{list_group}'")
         return results
@@ -1073,7 +1649,9 @@ class DBManager:
                 """, (new_orden, item_id))
 
                 logger.info(f"Item {item_id} reordenado de posición {old_orden} a {new_orden} en lista '{list_group}'")
-                return True
+
+            self.changes.publish('items', 'update', category_ids=(category_id,), columns=('orden_lista',))
+            return True
 
         except Exception as e:
             logger.error(f"Error al reordenar item {item_id}: {e}")
@@ -1103,7 +1681,9 @@ class DBManager:
                 deleted_count = cursor.rowcount
 
                 logger.info(f"Lista '{list_group}' eliminada ({deleted_count} items) de categoría {category_id}")
-                return True
+
+            self.changes.publish('items', 'delete', category_ids=(category_id,))
+            return True
 
         except Exception as e:
             logger.error(f"Error al eliminar lista '{list_group}': {e}")
@@ -1127,6 +1707,7 @@ class DBManager:
         Returns:
             bool: True si se actualizó exitosamente
         """
+        renamed = False
         try:
             with self.transaction() as conn:
                 # Caso 1: Solo renombrar
@@ -1145,6 +1726,7 @@ class DBManager:
                     """, (new_list_group, category_id, old_list_group))
 
                     logger.info(f"Lista renombrada: '{old_list_group}' → '{new_list_group}'")
+                    renamed = True
 
                 # Caso 2: Actualizar items de la lista
                 if items_data is not None:
@@ -1157,7 +1739,10 @@ class DBManager:
 
                     logger.info(f"Lista '{final_list_name}' actualizada con {len(items_data)} items")
 
-                return True
+            # delete_list()/create_list() publican sus propios cambios
+            if renamed:
+                self.changes.publish('items', 'update', category_ids=(category_id,), columns=('list_group',))
+            return True
 
         except Exception as e:
             logger.error(f"Error al actualizar lista '{old_list_group}': {e}")
@@ -1227,6 +1812,24 @@ class DBManager:
 
         return history_id
 
+    def queue_history_entry(self, item_id: Optional[int], content: str) -> None:
+        """
+        Add entry to clipboard history with write-behind batching
+
+        Unlike add_to_history() the row is written (and the history trimmed)
+        by the usage queue in a batched transaction, so no ID is returned.
+
+        Args:
+            item_id: Associated item ID (optional)
+            content: Copied content
+        """
+        if self._is_memory_db():
+            self.add_to_history(item_id, content)
+            return
+
+        max_history = self.get_setting('max_history', 20)
+        get_usage_queue(self.db_path).record_history(item_id, content, keep_latest=max_history)
+
     def get_history(self, limit: int = 20) -> List[Dict]:
         """
         Get recent clipboard history
@@ -1244,6 +1847,7 @@ class DBManager:
             ORDER BY h.copied_at DESC
             LIMIT ?
         """
+        self.flush_usage()
         return self.execute_query(query, (limit,))
 
     def clear_history(self) -> None:
@@ -1270,6 +1874,47 @@ class DBManager:
         self.execute_update(query, (keep_latest,))
         logger.debug(f"History trimmed to {keep_latest} entries")
 
+    # ========== CHANGE LOG ==========
+
+    def get_change_log_seq(self) -> int:
+        """
+        Get the sequence number of the latest change_log entry
+
+        Returns:
+            int: Latest seq (0 if nothing was logged yet)
+        """
+        result = self.execute_query("SELECT MAX(seq) AS seq FROM change_log")
+        return result[0]['seq'] or 0
+
+    def get_changes_since(self, since_seq: int, limit: int = 1000) -> Optional[List[Dict]]:
+        """
+        Get item/category changes logged after a sequence number
+
+        Args:
+            since_seq: Last seq already applied by the caller
+            limit: Maximum number of entries to return
+
+        Returns:
+            List of change dicts (seq, entity, entity_id, op, category_id,
+            changed_at) in seq order, or None if entries after since_seq
+            were already trimmed or there are more than limit of them: the
+            caller should reload everything and continue from get_change_log_seq()
+        """
+        oldest = self.execute_query("SELECT MIN(seq) AS seq FROM change_log")[0]['seq']
+        if oldest is not None and oldest > since_seq + 1:
+            return None
+
+        changes = self.execute_query("""
+            SELECT seq, entity, entity_id, op, category_id, changed_at
+            FROM change_log
+            WHERE seq > ?
+            ORDER BY seq
+            LIMIT ?
+        """, (since_seq, limit + 1))
+        if len(changes) > limit:
+            return None
+        return changes
+
     # ========== PINNED PANELS ==========
 
     def save_pinned_panel(self, category_id: int, x_pos: int, y_pos: int,
@@ -2428,6 +3073,7 @@ class DBManager:
                         "UPDATE notebook_tabs SET position = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?",
                         (position, tab_id)
                     )
+            self.changes.publish('notebook_tabs', 'update', ids=tab_ids_in_order, columns=('position',))
             logger.info(f"Notebook tabs reordered: {len(tab_ids_in_order)} tabs")
             return True
         except Exception as e:
@@ -2495,6 +3141,8 @@ class DBManager:
                     (count, category_id)
                 )
 
+            self.changes.publish('categories', 'update', ids=(category_id,),
+                                 category_ids=(category_id,), columns=('item_count',))
             logger.info(f"Updated item_count for category {category_id}: {count} items")
 
         except Exception as e:
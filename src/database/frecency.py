@@ -0,0 +1,106 @@
+"""
+Frecency for Widget Sidebar
+Puntuación de uso con decaimiento exponencial (migrations/add_item_frecency)
+
+Cada uso de un item aporta 1 punto que se reduce a la mitad cada
+HALF_LIFE_DAYS. En lugar de guardar la suma decaída (que habría que
+recalcular para todos los items cada vez que pasa el tiempo), se guarda su
+logaritmo referido al instante 0:
+
+    score = ln(Σ peso · e^(λ·t_uso))
+    frecencia(ahora) = e^(score - λ·ahora)
+
+Así un uso nuevo solo actualiza la fila de su item (score = logaddexp), y
+ordenar por score equivale a ordenar por frecencia en cualquier instante.
+SQLite no trae exp/ln en todas las compilaciones, por eso los cálculos se
+hacen en Python dentro de la transacción de quien escribe (UsageQueue).
+"""
+
+import math
+from typing import Dict, Iterable, List, Optional, Tuple
+
+HALF_LIFE_DAYS = 14
+DECAY_RATE = math.log(2) / (HALF_LIFE_DAYS * 86400)
+
+
+def visit_score(timestamp: float, weight: float = 1.0) -> float:
+    """Score (logarítmico) de `weight` usos en el instante `timestamp` (epoch)"""
+    return math.log(weight) + DECAY_RATE * timestamp
+
+
+def combine_scores(a: Optional[float], b: Optional[float]) -> Optional[float]:
+    """Sumar dos scores logarítmicos (logaddexp, None = sin usos)"""
+    if a is None:
+        return b
+    if b is None:
+        return a
+    high, low = max(a, b), min(a, b)
+    return high + math.log1p(math.exp(low - high))
+
+
+def decayed_frecency(score: Optional[float], now: float) -> float:
+    """Usos decaídos en el instante `now` (0.0 si el item nunca se usó)"""
+    if score is None:
+        return 0.0
+    return math.exp(min(score - DECAY_RATE * now, 700.0))
+
+
+def add_visits(conn, visits: Iterable[Tuple[int, float]]) -> Dict[int, float]:
+    """
+    Sumar usos (item_id, timestamp) a item_frecency
+
+    Debe llamarse dentro de la transacción que registra los usos; el commit
+    lo hace quien llama. Los items que ya no existen se ignoran.
+
+    Returns:
+        Dict[int, float]: Nuevo score de cada item actualizado
+    """
+    batch: Dict[int, float] = {}
+    for item_id, timestamp in visits:
+        batch[item_id] = combine_scores(batch.get(item_id), visit_score(timestamp))
+    if not batch:
+        return {}
+
+    placeholders = ','.join('?' * len(batch))
+    current = dict(conn.execute(
+        f"SELECT item_id, score FROM item_frecency WHERE item_id IN ({placeholders})",
+        tuple(batch)
+    ).fetchall())
+
+    scores = {item_id: combine_scores(current.get(item_id), score)
+              for item_id, score in batch.items()}
+    conn.executemany("""
+        INSERT INTO item_frecency (item_id, score)
+        SELECT id, ? FROM items WHERE id = ?
+        ON CONFLICT(item_id) DO UPDATE SET score = excluded.score
+    """, [(score, item_id) for item_id, score in scores.items()])
+    return scores
+
+
+def backfill_scores(conn) -> List[Tuple[float, int]]:
+    """
+    Calcular el score de todos los items a partir del historial de uso
+
+    Items con historial: un punto por fila de item_usage_history. Items sin
+    historial pero usados (use_count/last_used): use_count puntos en last_used.
+
+    Returns:
+        List[Tuple[float, int]]: Filas (score, item_id)
+    """
+    scores: Dict[int, float] = {}
+    rows = conn.execute("""
+        SELECT item_id, used_at_ts FROM item_usage_history
+        WHERE used_at_ts IS NOT NULL
+    """)
+    for item_id, used_at_ts in rows:
+        scores[item_id] = combine_scores(scores.get(item_id), visit_score(used_at_ts))
+
+    rows = conn.execute("""
+        SELECT id, use_count, last_used_ts FROM items
+        WHERE last_used_ts IS NOT NULL
+    """).fetchall()
+    for item_id, use_count, last_used_ts in rows:
+        if item_id not in scores:
+            scores[item_id] = visit_score(last_used_ts, max(use_count or 0, 1))
+
+    return [(score, item_id) for item_id, score in scores.items()]
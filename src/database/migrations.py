@@ -106,23 +106,11 @@ def migrate_json_to_sqlite(
                 )
                 stats['categories'] += 1
 
-                # Add items for this category
+                # Add items for this category (single transaction)
                 items = cat_data.get('items', [])
-                for item_data in items:
-                    # Determine item type
-                    content = item_data['content']
-                    item_type = _determine_item_type(content)
-
-                    db.add_item(
-                        category_id=cat_id,
-                        label=item_data['label'],
-                        content=content,
-                        item_type=item_type,
-                        icon=item_data.get('icon'),
-                        is_sensitive=item_data.get('is_sensitive', False),
-                        tags=item_data.get('tags', [])
-                    )
-                    stats['items'] += 1
+                item_ids, errors = db.add_items_bulk(_to_bulk_rows(cat_id, items))
+                stats['items'] += len(items) - len(errors)
+                _report_item_errors(items, errors)
 
                 print(f"   ✓ {cat_data['name']}: {len(items)} items")
 
@@ -145,22 +133,11 @@ def migrate_json_to_sqlite(
                 )
                 stats['categories'] += 1
 
-                # Add items
+                # Add items (single transaction)
                 items = cat_data.get('items', [])
-                for item_data in items:
-                    content = item_data['content']
-                    item_type = _determine_item_type(content)
-
-                    db.add_item(
-                        category_id=cat_id,
-                        label=item_data['label'],
-                        content=content,
-                        item_type=item_type,
-                        icon=item_data.get('icon'),
-                        is_sensitive=item_data.get('is_sensitive', False),
-                        tags=item_data.get('tags', [])
-                    )
-                    custom_items_count += 1
+                item_ids, errors = db.add_items_bulk(_to_bulk_rows(cat_id, items))
+                custom_items_count += len(items) - len(errors)
+                _report_item_errors(items, errors)
 
                 print(f"   ✓ {cat_data['name']}: {len(items)} items")
 
@@ -216,6 +193,39 @@ def migrate_json_to_sqlite(
         raise
 
 
+def _to_bulk_rows(category_id: int, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Convert JSON items of a category to DBManager.add_items_bulk rows
+
+    Args:
+        category_id: Target category ID
+        items: Items as stored in the JSON files
+
+    Returns:
+        List of item dicts for add_items_bulk
+    """
+    return [
+        {
+            'category_id': category_id,
+            'label': item_data.get('label'),
+            'content': item_data.get('content'),
+            'item_type': _determine_item_type(item_data.get('content') or ''),
+            'icon': item_data.get('icon'),
+            'is_sensitive': item_data.get('is_sensitive', False),
+            'tags': item_data.get('tags', [])
+        }
+        for item_data in items
+    ]
+
+
+def _report_item_errors(items: List[Dict[str, Any]], errors: List[tuple]) -> None:
+    """Print items that could not be migrated"""
+    for index, error in errors:
+        label = items[index].get('label', f'#{index}')
+        logger.error(f"Item '{label}' not migrated: {error}")
+        print(f"   ⚠️  Item '{label}' no migrado: {error}")
+
+
 def _determine_item_type(content: str) -> str:
     """
     Determine item type based on content
@@ -0,0 +1,166 @@
+"""
+Migración: Registro de cambios (change_log)
+Fecha: 2025-11-10
+Versión: 1.0
+
+Los paneles flotantes, los paneles anclados y el dashboard recargaban la
+categoría (o el árbol) completa cuando cambiaba un solo item. Los triggers
+de esta migración anotan cada cambio de items y categorías en change_log
+con un número de secuencia creciente; las vistas piden los cambios desde
+su última secuencia (DBManager.get_changes_since) y actualizan solo esas
+filas.
+
+Tabla change_log:
+- seq: secuencia (AUTOINCREMENT, sin huecos salvo por el recorte)
+- entity: 'item' o 'category'
+- entity_id: id del item o categoría
+- op: 'insert', 'update' o 'delete'
+- category_id: categoría afectada (en un item movido se anotan ambas)
+- changed_at: segundos Unix
+
+Las columnas de uso (use_count, last_used, updated_at, *_ts) no se anotan:
+cambian en cada clic y ninguna vista las muestra. Se conservan las últimas
+CHANGE_LOG_RETENTION filas; un lector que se queda atrás recarga todo.
+
+El trigger de UPDATE fija su lista de columnas (UPDATE OF ...) al crearse;
+sync_items_update_trigger lo vuelve a crear cuando items tiene columnas
+nuevas. DBManager la ejecuta tras todas las migraciones: una migración que
+añade una columna a items no tiene que tocar el trigger (si la columna es
+de uso o derivada, se añade a IGNORED_ITEM_COLUMNS).
+
+La migración es idempotente: si la tabla ya existe no hace nada.
+"""
+
+import logging
+import re
+from typing import List
+
+logger = logging.getLogger(__name__)
+
+CHANGE_LOG_RETENTION = 10000
+
+# Columnas de items que no generan entradas (uso y columnas derivadas)
+IGNORED_ITEM_COLUMNS = ('use_count', 'last_used', 'updated_at', 'created_at_ts', 'last_used_ts')
+
+TRIGGERS = (
+    'change_log_items_ai', 'change_log_items_au', 'change_log_items_ad',
+    'change_log_categories_ai', 'change_log_categories_au', 'change_log_categories_ad',
+    'change_log_trim',
+)
+
+
+def table_exists(conn) -> bool:
+    """Verificar si la tabla change_log ya existe"""
+    row = conn.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'change_log'"
+    ).fetchone()
+    return row is not None
+
+
+def item_update_columns(conn) -> List[str]:
+    """Columnas de items cuyos cambios se anotan (todas salvo id y las ignoradas)"""
+    return [row[1] for row in conn.execute("PRAGMA table_info(items)").fetchall()
+            if row[1] not in IGNORED_ITEM_COLUMNS and row[1] != 'id']
+
+
+def sync_items_update_trigger(conn) -> bool:
+    """
+    (Re)crear change_log_items_au con las columnas actuales de items
+
+    Returns:
+        True si se creó o recreó el trigger, False si ya estaba al día
+        (o no hay change_log)
+    """
+    if not table_exists(conn):
+        return False
+
+    columns = item_update_columns(conn)
+    row = conn.execute(
+        "SELECT sql FROM sqlite_master WHERE type = 'trigger' AND name = 'change_log_items_au'"
+    ).fetchone()
+    if row is not None:
+        match = re.search(r'UPDATE OF (.*?) ON items', row[0], re.S)
+        if match and [column.strip() for column in match.group(1).split(',')] == columns:
+            return False
+        conn.execute("DROP TRIGGER change_log_items_au")
+        logger.info("Recreating change_log_items_au for the current items columns")
+
+    conn.execute(f"""
+        CREATE TRIGGER change_log_items_au
+        AFTER UPDATE OF {', '.join(columns)} ON items BEGIN
+            INSERT INTO change_log (entity, entity_id, op, category_id)
+            VALUES ('item', new.id, 'update', new.category_id);
+            -- Item movido: la categoría de origen también cambia
+            INSERT INTO change_log (entity, entity_id, op, category_id)
+            SELECT 'item', new.id, 'update', old.category_id
+            WHERE old.category_id IS NOT new.category_id;
+        END
+    """)
+    return True
+
+
+def upgrade(conn) -> bool:
+    """
+    Crear change_log y sus triggers
+
+    Returns:
+        True si se aplicó la migración, False si ya existía
+    """
+    if table_exists(conn):
+        return False
+
+    logger.info("Creating change_log table")
+
+    conn.execute("""
+        CREATE TABLE change_log (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            entity TEXT NOT NULL,
+            entity_id INTEGER NOT NULL,
+            op TEXT NOT NULL,
+            category_id INTEGER,
+            changed_at INTEGER NOT NULL DEFAULT (CAST(strftime('%s', 'now') AS INTEGER))
+        )
+    """)
+
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS change_log_items_ai AFTER INSERT ON items BEGIN
+            INSERT INTO change_log (entity, entity_id, op, category_id)
+            VALUES ('item', new.id, 'insert', new.category_id);
+        END
+    """)
+    sync_items_update_trigger(conn)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS change_log_items_ad AFTER DELETE ON items BEGIN
+            INSERT INTO change_log (entity, entity_id, op, category_id)
+            VALUES ('item', old.id, 'delete', old.category_id);
+        END
+    """)
+
+    for action, row in (('ai', 'new'), ('au', 'new'), ('ad', 'old')):
+        event = {'ai': 'INSERT', 'au': 'UPDATE', 'ad': 'DELETE'}[action]
+        op = event.lower()
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS change_log_categories_{action}
+            AFTER {event} ON categories BEGIN
+                INSERT INTO change_log (entity, entity_id, op, category_id)
+                VALUES ('category', {row}.id, '{op}', {row}.id);
+            END
+        """)
+
+    # Recortar cada 1000 entradas, dejando las últimas CHANGE_LOG_RETENTION
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS change_log_trim AFTER INSERT ON change_log
+        WHEN new.seq % 1000 = 0 BEGIN
+            DELETE FROM change_log WHERE seq <= new.seq - {CHANGE_LOG_RETENTION};
+        END
+    """)
+
+    return True
+
+
+def downgrade(conn):
+    """Revertir migración"""
+    for trigger in TRIGGERS:
+        conn.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+    conn.execute("DROP TABLE IF EXISTS change_log")
+    logger.info("change_log table dropped")
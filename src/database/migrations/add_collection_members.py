@@ -0,0 +1,84 @@
+"""
+Migración: Miembros materializados de Smart Collections (collection_members)
+Fecha: 2025-11-12
+Versión: 1.0
+
+Abrir una colección ejecutaba su consulta sobre toda la tabla items, y el
+diálogo de colecciones lo hacía una vez por colección solo para contar.
+Ahora SmartCollectionsManager guarda qué items pertenecen a cada colección
+y lo mantiene al día con change_log: solo se vuelven a evaluar los items
+que cambiaron desde la última sincronización.
+
+Tabla collection_members:
+- (collection_id, item_id): clave primaria, sin rowid (abrir o contar una
+  colección es un rango del índice)
+- idx_collection_members_item: borrar las filas de un item
+
+Tabla collection_members_state (una fila por colección materializada):
+- signature: definición de la colección con la que se calcularon los
+  miembros (si se edita la colección, se reconstruye)
+- synced_seq: último change_log.seq aplicado
+
+La tabla smart_collections la crea add_tag_groups_and_collections; si aún
+no existe no se hace nada. La migración es idempotente.
+"""
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def table_exists(conn) -> bool:
+    """Verificar si la tabla collection_members ya existe"""
+    row = conn.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'collection_members'"
+    ).fetchone()
+    return row is not None
+
+
+def _collections_exist(conn) -> bool:
+    row = conn.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'smart_collections'"
+    ).fetchone()
+    return row is not None
+
+
+def upgrade(conn) -> bool:
+    """
+    Crear collection_members y collection_members_state
+
+    Returns:
+        True si se aplicó la migración, False si ya existía o no hay smart_collections
+    """
+    if table_exists(conn) or not _collections_exist(conn):
+        return False
+
+    logger.info("Creating collection_members tables")
+
+    conn.execute("""
+        CREATE TABLE collection_members (
+            collection_id INTEGER NOT NULL REFERENCES smart_collections(id) ON DELETE CASCADE,
+            item_id INTEGER NOT NULL,
+            PRIMARY KEY (collection_id, item_id)
+        ) WITHOUT ROWID
+    """)
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_collection_members_item
+        ON collection_members(item_id)
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS collection_members_state (
+            collection_id INTEGER PRIMARY KEY REFERENCES smart_collections(id) ON DELETE CASCADE,
+            signature TEXT NOT NULL,
+            synced_seq INTEGER NOT NULL DEFAULT 0
+        )
+    """)
+
+    return True
+
+
+def downgrade(conn):
+    """Revertir migración"""
+    conn.execute("DROP TABLE IF EXISTS collection_members_state")
+    conn.execute("DROP TABLE IF EXISTS collection_members")
+    logger.info("collection_members tables dropped")
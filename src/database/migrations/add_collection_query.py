@@ -0,0 +1,46 @@
+"""
+Migración: Consulta guardada en Smart Collections (smart_collections.query)
+Fecha: 2025-11-10
+Versión: 1.0
+
+Las colecciones solo podían guardar los filtros fijos de la tabla
+(tags_include, item_type, is_favorite...). La columna query guarda una
+consulta del lenguaje de búsqueda (core/query_language), p. ej.
+'tag:git is:fav -archived used>5', que se combina con AND con esos filtros.
+
+La tabla smart_collections la crea add_tag_groups_and_collections; si aún
+no existe no se hace nada. La migración es idempotente.
+"""
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def needs_column(conn) -> bool:
+    """True si smart_collections existe y no tiene la columna query"""
+    columns = [row[1] for row in conn.execute("PRAGMA table_info(smart_collections)").fetchall()]
+    return bool(columns) and 'query' not in columns
+
+
+def upgrade(conn) -> bool:
+    """
+    Añadir smart_collections.query
+
+    Returns:
+        True si se añadió la columna, False si ya existía o no hay tabla
+    """
+    if not needs_column(conn):
+        return False
+
+    logger.info("Adding smart_collections.query column")
+    conn.execute("ALTER TABLE smart_collections ADD COLUMN query TEXT")
+    return True
+
+
+def downgrade(conn):
+    """Revertir migración (SQLite >= 3.35)"""
+    columns = [row[1] for row in conn.execute("PRAGMA table_info(smart_collections)").fetchall()]
+    if 'query' in columns:
+        conn.execute("ALTER TABLE smart_collections DROP COLUMN query")
+        logger.info("smart_collections.query column dropped")
@@ -0,0 +1,121 @@
+"""
+Migración: Timestamps enteros (epoch) e índices cubrientes
+Fecha: 2025-11-10
+Versión: 1.0
+
+Los timestamps se guardan como texto ('YYYY-MM-DD HH:MM:SS', UTC). Las
+consultas de historial filtraban con used_at >= datetime('now', ...) sin un
+índice compuesto, y las vistas parseaban el texto con strptime por item.
+
+Columnas añadidas (segundos Unix, UTC), junto a las de texto:
+- items.created_at_ts, items.last_used_ts
+- item_usage_history.used_at_ts
+
+Los triggers rellenan las columnas *_ts cuando un INSERT/UPDATE solo trae
+el texto, así que el código existente sigue funcionando sin cambios; los
+escritores que ya conocen el epoch (UsageQueue) lo insertan directamente.
+
+Índices:
+- idx_usage_item_ts (item_id, used_at_ts, success, execution_time_ms):
+  cubre historial por item, último error y tiempos sin leer la tabla
+- idx_usage_ts (used_at_ts): ventanas por fecha de todo el historial
+- idx_items_last_used_ts (last_used_ts): items activos/abandonados
+- idx_items_use_count (use_count, last_used_ts): rankings por uso
+- idx_items_favorite (parcial, is_favorite = 1): conteos del dashboard
+
+La migración es idempotente: si las columnas ya existen no hace nada.
+"""
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+# (tabla, columna epoch, columna de texto)
+EPOCH_COLUMNS = (
+    ('items', 'created_at_ts', 'created_at'),
+    ('items', 'last_used_ts', 'last_used'),
+    ('item_usage_history', 'used_at_ts', 'used_at'),
+)
+
+
+def to_epoch_sql(column: str) -> str:
+    """Expresión SQL que convierte un timestamp de texto a segundos Unix"""
+    return f"CAST(strftime('%s', {column}) AS INTEGER)"
+
+
+def columns_exist(conn) -> bool:
+    """Verificar si las columnas epoch ya existen"""
+    for table, epoch_column, _ in EPOCH_COLUMNS:
+        columns = [row[1] for row in conn.execute(f"PRAGMA table_info({table})").fetchall()]
+        if epoch_column not in columns:
+            return False
+    return True
+
+
+def upgrade(conn) -> bool:
+    """
+    Añadir las columnas epoch, sus triggers e índices, y rellenarlas
+
+    Returns:
+        True si se aplicó la migración, False si ya existía
+    """
+    if columns_exist(conn):
+        return False
+
+    logger.info("Adding epoch timestamp columns")
+
+    for table, epoch_column, text_column in EPOCH_COLUMNS:
+        columns = [row[1] for row in conn.execute(f"PRAGMA table_info({table})").fetchall()]
+        if epoch_column not in columns:
+            conn.execute(f"ALTER TABLE {table} ADD COLUMN {epoch_column} INTEGER")
+
+        conn.execute(f"""
+            UPDATE {table} SET {epoch_column} = {to_epoch_sql(text_column)}
+            WHERE {text_column} IS NOT NULL
+        """)
+
+        # Rellenar el epoch si el INSERT no lo trae
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {table}_{epoch_column}_ai
+            AFTER INSERT ON {table}
+            WHEN new.{epoch_column} IS NULL AND new.{text_column} IS NOT NULL BEGIN
+                UPDATE {table} SET {epoch_column} = {to_epoch_sql('new.' + text_column)}
+                WHERE rowid = new.rowid;
+            END
+        """)
+
+        # Mantenerlo al actualizar el texto (sin tocar el epoch a la vez)
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {table}_{epoch_column}_au
+            AFTER UPDATE OF {text_column} ON {table}
+            WHEN new.{epoch_column} IS old.{epoch_column} BEGIN
+                UPDATE {table} SET {epoch_column} = {to_epoch_sql('new.' + text_column)}
+                WHERE rowid = new.rowid;
+            END
+        """)
+
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_usage_item_ts
+        ON item_usage_history(item_id, used_at_ts, success, execution_time_ms)
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_usage_ts ON item_usage_history(used_at_ts)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_items_last_used_ts ON items(last_used_ts)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_items_use_count ON items(use_count, last_used_ts)")
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_items_favorite
+        ON items(is_favorite) WHERE is_favorite = 1
+    """)
+
+    return True
+
+
+def downgrade(conn):
+    """Revertir migración (las columnas de texto conservan los datos)"""
+    for index in ('idx_usage_item_ts', 'idx_usage_ts', 'idx_items_last_used_ts',
+                  'idx_items_use_count', 'idx_items_favorite'):
+        conn.execute(f"DROP INDEX IF EXISTS {index}")
+    for table, epoch_column, _ in EPOCH_COLUMNS:
+        conn.execute(f"DROP TRIGGER IF EXISTS {table}_{epoch_column}_ai")
+        conn.execute(f"DROP TRIGGER IF EXISTS {table}_{epoch_column}_au")
+        conn.execute(f"ALTER TABLE {table} DROP COLUMN {epoch_column}")
+    logger.info("Epoch timestamp columns dropped")
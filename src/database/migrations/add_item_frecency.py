@@ -0,0 +1,71 @@
+"""
+Migración: Frecencia precalculada por item (item_frecency)
+Fecha: 2025-11-10
+Versión: 1.0
+
+Los resultados de búsqueda se ordenaban por last_used o en orden de
+inserción. El ranking (core/search_ranker) combina la calidad de la
+coincidencia con la frecencia de cada item; para no consultar el
+historial en cada pulsación, la frecencia se guarda precalculada:
+
+Tabla item_frecency:
+- item_id: id del item (PRIMARY KEY)
+- score: logaritmo de la suma decaída de usos (ver database/frecency)
+
+UsageQueue la actualiza en la misma transacción que registra los usos; un
+trigger borra la fila cuando se elimina el item.
+
+La migración es idempotente: si la tabla ya existe no hace nada; si se
+crea, se rellena a partir de item_usage_history y use_count/last_used.
+"""
+
+import logging
+
+from ..frecency import backfill_scores
+
+logger = logging.getLogger(__name__)
+
+
+def table_exists(conn) -> bool:
+    """Verificar si la tabla item_frecency ya existe"""
+    row = conn.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'item_frecency'"
+    ).fetchone()
+    return row is not None
+
+
+def upgrade(conn) -> bool:
+    """
+    Crear item_frecency, su trigger y rellenarla
+
+    Returns:
+        True si se creó y rellenó la tabla, False si ya existía
+    """
+    if table_exists(conn):
+        return False
+
+    logger.info("Creating item_frecency table")
+
+    conn.execute("""
+        CREATE TABLE item_frecency (
+            item_id INTEGER PRIMARY KEY,
+            score REAL NOT NULL
+        )
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS item_frecency_item_ad AFTER DELETE ON items BEGIN
+            DELETE FROM item_frecency WHERE item_id = old.id;
+        END
+    """)
+
+    rows = backfill_scores(conn)
+    conn.executemany("INSERT INTO item_frecency (score, item_id) VALUES (?, ?)", rows)
+    logger.info(f"item_frecency backfilled for {len(rows)} items")
+    return True
+
+
+def downgrade(conn):
+    """Revertir migración"""
+    conn.execute("DROP TRIGGER IF EXISTS item_frecency_item_ad")
+    conn.execute("DROP TABLE IF EXISTS item_frecency")
+    logger.info("item_frecency table dropped")
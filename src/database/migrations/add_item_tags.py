@@ -0,0 +1,136 @@
+"""
+Migración: Tabla normalizada de tags (tags + item_tags)
+Fecha: 2025-11-10
+Versión: 1.0
+
+Crea el diccionario de tags y la tabla puente item_tags(item_id, tag_id)
+con índices compuestos en ambos sentidos, para que los filtros por tag,
+los conteos de tag groups y la nube de tags sean joins indexados en lugar
+de `tags LIKE '%tag%'` (que además daba falsos positivos: "git" ~ "github").
+
+items.tags (JSON) se mantiene como copia desnormalizada para lectura.
+Los nombres de tag no distinguen mayúsculas (COLLATE NOCASE).
+
+La migración es idempotente: si las tablas ya existen no hace nada; si se
+crean, migra los tags existentes desde los formatos JSON y CSV (legacy).
+"""
+
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def parse_legacy_tags(raw_tags) -> list:
+    """
+    Parsear el campo items.tags en formato JSON o CSV (legacy)
+
+    Returns:
+        Lista de tags limpios y sin duplicados (sin distinguir mayúsculas)
+    """
+    if not raw_tags:
+        return []
+
+    tags = None
+    if isinstance(raw_tags, str):
+        try:
+            tags = json.loads(raw_tags)
+        except json.JSONDecodeError:
+            tags = raw_tags.split(',')
+    elif isinstance(raw_tags, list):
+        tags = raw_tags
+
+    if not isinstance(tags, list):
+        return []
+
+    clean_tags = []
+    seen = set()
+    for tag in tags:
+        if not isinstance(tag, str):
+            continue
+        tag = tag.strip()
+        if tag and tag.lower() not in seen:
+            seen.add(tag.lower())
+            clean_tags.append(tag)
+    return clean_tags
+
+
+def tables_exist(conn) -> bool:
+    """Verificar si tags e item_tags ya existen"""
+    rows = conn.execute("""
+        SELECT name FROM sqlite_master
+        WHERE type = 'table' AND name IN ('tags', 'item_tags')
+    """).fetchall()
+    return len(rows) == 2
+
+
+def upgrade(conn) -> bool:
+    """
+    Crear tags/item_tags y migrar los tags existentes
+
+    Returns:
+        True si se creó y rellenó el esquema, False si ya existía
+    """
+    if tables_exist(conn):
+        return False
+
+    logger.info("Creating tables: tags, item_tags")
+
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS tags (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL UNIQUE COLLATE NOCASE
+        )
+    """)
+
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS item_tags (
+            item_id INTEGER NOT NULL,
+            tag_id INTEGER NOT NULL,
+            PRIMARY KEY (item_id, tag_id),
+            FOREIGN KEY (item_id) REFERENCES items(id) ON DELETE CASCADE,
+            FOREIGN KEY (tag_id) REFERENCES tags(id) ON DELETE CASCADE
+        ) WITHOUT ROWID
+    """)
+
+    # (item_id, tag_id) lo cubre la PK; este índice sirve "items con tag X"
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_item_tags_tag
+        ON item_tags(tag_id, item_id)
+    """)
+
+    # Otros gestores abren conexiones sin PRAGMA foreign_keys, así que el
+    # borrado en cascada se garantiza también con un trigger
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS items_tags_ad AFTER DELETE ON items BEGIN
+            DELETE FROM item_tags WHERE item_id = old.id;
+        END
+    """)
+
+    # Migrar tags existentes
+    tag_ids = {}
+    links = []
+    for item_id, raw_tags in conn.execute("SELECT id, tags FROM items").fetchall():
+        for tag in parse_legacy_tags(raw_tags):
+            key = tag.lower()
+            if key not in tag_ids:
+                cursor = conn.execute("INSERT INTO tags (name) VALUES (?)", (tag,))
+                tag_ids[key] = cursor.lastrowid
+            links.append((item_id, tag_ids[key]))
+
+    conn.executemany(
+        "INSERT OR IGNORE INTO item_tags (item_id, tag_id) VALUES (?, ?)",
+        links
+    )
+
+    logger.info(f"Tags migrated: {len(tag_ids)} unique tags, {len(links)} item-tag links")
+    return True
+
+
+def downgrade(conn):
+    """Revertir migración (items.tags conserva los datos)"""
+    conn.execute("DROP TRIGGER IF EXISTS items_tags_ad")
+    conn.execute("DROP INDEX IF EXISTS idx_item_tags_tag")
+    conn.execute("DROP TABLE IF EXISTS item_tags")
+    conn.execute("DROP TABLE IF EXISTS tags")
+    logger.info("Tables tags, item_tags dropped")
@@ -0,0 +1,118 @@
+"""
+Migración: Índice de texto completo (FTS5) para items
+Fecha: 2025-11-10
+Versión: 1.0
+
+Crea la tabla virtual items_fts (FTS5, external content sobre items) con
+las columnas label, content, description, tags y list_group, junto con los
+triggers que la mantienen sincronizada en INSERT/UPDATE/DELETE.
+
+Los items sensibles se indexan solo por label/tags/description/list_group:
+su contenido (cifrado en la BD) nunca entra al índice.
+
+La migración es idempotente: si la tabla ya existe no hace nada; si se
+crea, rellena el índice con los items existentes.
+"""
+
+import sqlite3
+import logging
+
+logger = logging.getLogger(__name__)
+
+FTS_TABLE = "items_fts"
+
+# Contenido indexable: vacío para items sensibles
+_INDEXED_CONTENT_NEW = "CASE WHEN new.is_sensitive THEN NULL ELSE new.content END"
+_INDEXED_CONTENT_OLD = "CASE WHEN old.is_sensitive THEN NULL ELSE old.content END"
+
+
+def is_fts5_available(conn) -> bool:
+    """Verificar si el SQLite enlazado soporta FTS5"""
+    try:
+        conn.execute("CREATE VIRTUAL TABLE IF NOT EXISTS temp._fts5_probe USING fts5(x)")
+        conn.execute("DROP TABLE IF EXISTS temp._fts5_probe")
+        return True
+    except sqlite3.OperationalError:
+        return False
+
+
+def fts_table_exists(conn) -> bool:
+    """Verificar si items_fts ya existe"""
+    row = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+        (FTS_TABLE,)
+    ).fetchone()
+    return row is not None
+
+
+def upgrade(conn) -> bool:
+    """
+    Crear items_fts, triggers de sincronización y rellenar el índice
+
+    Returns:
+        True si el índice FTS está disponible tras la migración
+    """
+    if fts_table_exists(conn):
+        return True
+
+    if not is_fts5_available(conn):
+        logger.warning("SQLite sin soporte FTS5: se usará búsqueda LIKE")
+        return False
+
+    logger.info("Creating FTS5 index: items_fts")
+
+    conn.execute(f"""
+        CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(
+            label, content, description, tags, list_group,
+            content='items', content_rowid='id',
+            prefix='2 3'
+        )
+    """)
+
+    # Triggers de sincronización. El UPDATE solo se dispara cuando cambian
+    # columnas indexadas, así use_count/last_used no reindexan el item.
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS items_fts_ai AFTER INSERT ON items BEGIN
+            INSERT INTO {FTS_TABLE}(rowid, label, content, description, tags, list_group)
+            VALUES (new.id, new.label, {_INDEXED_CONTENT_NEW}, new.description, new.tags, new.list_group);
+        END
+    """)
+
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS items_fts_ad AFTER DELETE ON items BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, label, content, description, tags, list_group)
+            VALUES ('delete', old.id, old.label, {_INDEXED_CONTENT_OLD}, old.description, old.tags, old.list_group);
+        END
+    """)
+
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS items_fts_au
+        AFTER UPDATE OF label, content, description, tags, list_group, is_sensitive ON items BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, label, content, description, tags, list_group)
+            VALUES ('delete', old.id, old.label, {_INDEXED_CONTENT_OLD}, old.description, old.tags, old.list_group);
+            INSERT INTO {FTS_TABLE}(rowid, label, content, description, tags, list_group)
+            VALUES (new.id, new.label, {_INDEXED_CONTENT_NEW}, new.description, new.tags, new.list_group);
+        END
+    """)
+
+    # Backfill de items existentes
+    conn.execute(f"""
+        INSERT INTO {FTS_TABLE}(rowid, label, content, description, tags, list_group)
+        SELECT id, label,
+               CASE WHEN is_sensitive THEN NULL ELSE content END,
+               description, tags, list_group
+        FROM items
+    """)
+
+    count = conn.execute("SELECT COUNT(*) FROM items").fetchone()[0]
+    logger.info(f"FTS5 index created and backfilled with {count} items")
+    return True
+
+
+def downgrade(conn):
+    """Revertir migración"""
+    conn.execute("DROP TRIGGER IF EXISTS items_fts_ai")
+    conn.execute("DROP TRIGGER IF EXISTS items_fts_ad")
+    conn.execute("DROP TRIGGER IF EXISTS items_fts_au")
+    conn.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+    logger.info("FTS5 index items_fts dropped")
@@ -0,0 +1,199 @@
+"""
+Migración: Índice de búsqueda común (search_index, FTS5)
+Fecha: 2025-11-10
+Versión: 1.0
+
+Los items tienen items_fts, pero las pestañas del bloc de notas, los
+marcadores, el historial del portapapeles y las sesiones del navegador no
+se podían buscar (o solo por separado, con LIKE). search_index es una
+tabla FTS5 con una fila por entidad:
+
+- rowid: ref_id * 8 + código del tipo (ver SOURCES), así borrar o
+  reemplazar la fila de una entidad es una búsqueda por rowid
+- kind: código del tipo como término ("kind:2 AND ..." solo recorre y
+  puntúa las filas de ese tipo)
+- title: título (peso mayor en bm25)
+- body: resto del texto indexado
+
+Triggers en cada tabla de origen mantienen el índice en el mismo commit
+que la escritura, venga de DBManager, de UsageQueue o de otra conexión:
+- notebook_tabs: title; content (si no es sensible), descripción y tags
+- bookmarks: title; url y carpeta
+- clipboard_history: label del item; content (nunca el de items sensibles)
+- browser_sessions: name; títulos y URLs de sus session_tabs (las
+  sesiones de auto-guardado no se indexan)
+
+Algunas tablas se crean con migraciones aparte (notebook_tabs,
+browser_sessions): la migración es idempotente y en cada arranque indexa
+las tablas que aún no tienen sus triggers.
+"""
+
+import logging
+
+from .add_items_fts import is_fts5_available
+
+logger = logging.getLogger(__name__)
+
+INDEX_TABLE = "search_index"
+
+# Código de tipo en el rowid (0 queda libre: los items usan items_fts)
+KIND_BITS = 3
+NOTEBOOK_TAB = 1
+BOOKMARK = 2
+CLIPBOARD = 3
+BROWSER_SESSION = 4
+
+# Por tabla de origen: código, columnas cuyo cambio reindexa, expresiones
+# title/body sobre la fila {row} (new) y condición para indexarla
+SOURCES = {
+    'notebook_tabs': {
+        'kind': NOTEBOOK_TAB,
+        'columns': 'title, content, description, tags, is_sensitive',
+        'title': "{row}.title",
+        'body': ("CASE WHEN {row}.is_sensitive THEN '' ELSE COALESCE({row}.content, '') END"
+                 " || ' ' || COALESCE({row}.description, '') || ' ' || COALESCE({row}.tags, '')"),
+        'where': "1",
+    },
+    'bookmarks': {
+        'kind': BOOKMARK,
+        'columns': 'title, url, folder',
+        'title': "{row}.title",
+        'body': "COALESCE({row}.url, '') || ' ' || COALESCE({row}.folder, '')",
+        'where': "1",
+    },
+    'clipboard_history': {
+        'kind': CLIPBOARD,
+        'columns': 'item_id, content',
+        'title': "COALESCE((SELECT label FROM items WHERE id = {row}.item_id), '')",
+        'body': ("CASE WHEN EXISTS (SELECT 1 FROM items WHERE id = {row}.item_id AND is_sensitive)"
+                 " THEN '' ELSE {row}.content END"),
+        'where': "1",
+    },
+    'browser_sessions': {
+        'kind': BROWSER_SESSION,
+        'columns': 'name, is_auto_save',
+        'title': "{row}.name",
+        'body': ("COALESCE((SELECT group_concat(COALESCE(title, '') || ' ' || COALESCE(url, ''), ' ')"
+                 " FROM session_tabs WHERE session_id = {row}.id), '')"),
+        'where': "NOT {row}.is_auto_save",
+    },
+}
+
+
+def encode_rowid(kind: int, ref_id: int) -> int:
+    """rowid de search_index para una entidad"""
+    return (ref_id << KIND_BITS) | kind
+
+
+def decode_rowid(rowid: int):
+    """(código de tipo, id en su tabla) de un rowid de search_index"""
+    return rowid & ((1 << KIND_BITS) - 1), rowid >> KIND_BITS
+
+
+def table_exists(conn, name: str) -> bool:
+    row = conn.execute(
+        "SELECT name FROM sqlite_master WHERE type IN ('table', 'view') AND name = ?", (name,)
+    ).fetchone()
+    return row is not None
+
+
+def trigger_exists(conn, name: str) -> bool:
+    row = conn.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'trigger' AND name = ?", (name,)
+    ).fetchone()
+    return row is not None
+
+
+def _select_row(source: dict, row: str) -> str:
+    """SELECT (rowid, kind, title, body) de la fila row si se indexa"""
+    rowid = f"({row}.id << {KIND_BITS}) | {source['kind']}"
+    return (f"SELECT {rowid}, {source['kind']}, {source['title'].format(row=row)},"
+            f" {source['body'].format(row=row)} WHERE {source['where'].format(row=row)}")
+
+
+def _index_source(conn, table: str, source: dict) -> int:
+    """Crear los triggers de una tabla de origen y rellenar el índice"""
+    delete_old = f"DELETE FROM {INDEX_TABLE} WHERE rowid = (old.id << {KIND_BITS}) | {source['kind']};"
+    insert_new = f"INSERT INTO {INDEX_TABLE}(rowid, kind, title, body) {_select_row(source, 'new')};"
+
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS {INDEX_TABLE}_{table}_ai AFTER INSERT ON {table} BEGIN
+            {insert_new}
+        END
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS {INDEX_TABLE}_{table}_ad AFTER DELETE ON {table} BEGIN
+            {delete_old}
+        END
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS {INDEX_TABLE}_{table}_au
+        AFTER UPDATE OF {source['columns']} ON {table} BEGIN
+            {delete_old}
+            {insert_new}
+        END
+    """)
+
+    if table == 'browser_sessions':
+        # Las pestañas se guardan después de la sesión: reindexarla con cada cambio
+        for event, row in (('INSERT', 'new'), ('DELETE', 'old'), ('UPDATE', 'new')):
+            conn.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS {INDEX_TABLE}_session_tabs_{event.lower()}
+                AFTER {event} ON session_tabs BEGIN
+                    DELETE FROM {INDEX_TABLE}
+                    WHERE rowid = ({row}.session_id << {KIND_BITS}) | {BROWSER_SESSION};
+                    INSERT INTO {INDEX_TABLE}(rowid, kind, title, body)
+                    SELECT (s.id << {KIND_BITS}) | {BROWSER_SESSION}, {BROWSER_SESSION},
+                           {source['title'].format(row='s')}, {source['body'].format(row='s')}
+                    FROM browser_sessions s
+                    WHERE s.id = {row}.session_id AND {source['where'].format(row='s')};
+                END
+            """)
+
+    cursor = conn.execute(
+        f"INSERT INTO {INDEX_TABLE}(rowid, kind, title, body)"
+        f" SELECT (t.id << {KIND_BITS}) | {source['kind']}, {source['kind']},"
+        f" {source['title'].format(row='t')}, {source['body'].format(row='t')}"
+        f" FROM {table} t WHERE {source['where'].format(row='t')}"
+    )
+    return cursor.rowcount
+
+
+def upgrade(conn) -> bool:
+    """
+    Crear search_index e indexar las tablas de origen que existan
+
+    Returns:
+        True si el índice está disponible (False sin soporte FTS5)
+    """
+    if not table_exists(conn, INDEX_TABLE):
+        if not is_fts5_available(conn):
+            logger.warning("SQLite sin soporte FTS5: la búsqueda común usará LIKE")
+            return False
+        logger.info(f"Creating FTS5 index: {INDEX_TABLE}")
+        conn.execute(f"""
+            CREATE VIRTUAL TABLE {INDEX_TABLE} USING fts5(
+                kind, title, body,
+                prefix='2 3'
+            )
+        """)
+
+    for table, source in SOURCES.items():
+        if not table_exists(conn, table) or trigger_exists(conn, f"{INDEX_TABLE}_{table}_ai"):
+            continue
+        if table == 'browser_sessions' and not table_exists(conn, 'session_tabs'):
+            continue
+        count = _index_source(conn, table, source)
+        logger.info(f"{INDEX_TABLE}: indexed {count} rows of {table}")
+    return True
+
+
+def downgrade(conn):
+    """Revertir migración"""
+    for table in SOURCES:
+        for suffix in ('ai', 'ad', 'au'):
+            conn.execute(f"DROP TRIGGER IF EXISTS {INDEX_TABLE}_{table}_{suffix}")
+    for event in ('insert', 'delete', 'update'):
+        conn.execute(f"DROP TRIGGER IF EXISTS {INDEX_TABLE}_session_tabs_{event}")
+    conn.execute(f"DROP TABLE IF EXISTS {INDEX_TABLE}")
+    logger.info(f"{INDEX_TABLE} dropped")
@@ -83,6 +83,7 @@ def migrate_add_tag_groups_and_collections(db_path: str) -> bool:
                 search_text TEXT,
                 date_from TEXT,
                 date_to TEXT,
+                query TEXT,
 
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                 updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
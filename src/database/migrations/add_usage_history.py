@@ -0,0 +1,61 @@
+"""
+Migración: Tabla item_usage_history
+Fecha: 2025-11-10
+Versión: 1.0
+
+UsageTracker y StatsManager registran cada uso de un item en
+item_usage_history, pero la tabla solo existía en bases de datos creadas
+con scripts antiguos. Esta migración la crea (con el esquema documentado en
+util/DATABASE_SCHEMA.md) si falta.
+
+La migración es idempotente: si la tabla ya existe no hace nada.
+"""
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def table_exists(conn) -> bool:
+    """Verificar si item_usage_history ya existe"""
+    row = conn.execute("""
+        SELECT name FROM sqlite_master
+        WHERE type = 'table' AND name = 'item_usage_history'
+    """).fetchone()
+    return row is not None
+
+
+def upgrade(conn) -> bool:
+    """
+    Crear item_usage_history y sus índices
+
+    Returns:
+        True si se creó la tabla, False si ya existía
+    """
+    if table_exists(conn):
+        return False
+
+    logger.info("Creating table: item_usage_history")
+
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS item_usage_history (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            item_id INTEGER NOT NULL,
+            used_at TEXT NOT NULL DEFAULT (datetime('now')),
+            execution_time_ms INTEGER DEFAULT 0,
+            success INTEGER DEFAULT 1,
+            error_message TEXT,
+            FOREIGN KEY (item_id) REFERENCES items(id) ON DELETE CASCADE
+        )
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_usage_item_id ON item_usage_history(item_id)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_usage_date ON item_usage_history(used_at)")
+    return True
+
+
+def downgrade(conn):
+    """Revertir migración"""
+    conn.execute("DROP INDEX IF EXISTS idx_usage_date")
+    conn.execute("DROP INDEX IF EXISTS idx_usage_item_id")
+    conn.execute("DROP TABLE IF EXISTS item_usage_history")
+    logger.info("Table item_usage_history dropped")
@@ -0,0 +1,253 @@
+"""
+Migración: Tablas de agregados de uso (rollups)
+Fecha: 2025-11-10
+Versión: 1.0
+
+Las estadísticas (StatsManager, UsageTracker, NotificationManager)
+agregaban item_usage_history completo con expresiones como date(used_at),
+que ningún índice puede servir: el coste crecía con el historial.
+
+Tablas creadas (mantenidas por triggers sobre item_usage_history):
+- usage_daily_items(day, item_id): usos, éxitos, fallos y tiempos por item y día
+- usage_hourly(day, hour): usos y tiempo por día y hora del día
+- usage_daily_categories(day, category_id): usos por categoría y día
+
+Los triggers de INSERT/DELETE en item_usage_history mantienen los tres
+agregados (también cleanup_old_history y el borrado en cascada). El
+agregado por categoría sigue la categoría actual del item: si un item
+cambia de categoría o se elimina, sus días se mueven/restan.
+
+La migración es idempotente: si las tablas ya existen no hace nada; si se
+crean, se rellenan a partir del historial existente.
+"""
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+ROLLUP_TABLES = ('usage_daily_items', 'usage_hourly', 'usage_daily_categories')
+
+# Restar los días de un item (old) del agregado por categoría
+_SUBTRACT_ITEM_FROM_CATEGORY = """
+    UPDATE usage_daily_categories
+    SET executions = executions - COALESCE((SELECT d.executions FROM usage_daily_items d
+                                            WHERE d.item_id = old.id AND d.day = usage_daily_categories.day), 0),
+        successes = successes - COALESCE((SELECT d.successes FROM usage_daily_items d
+                                          WHERE d.item_id = old.id AND d.day = usage_daily_categories.day), 0),
+        failures = failures - COALESCE((SELECT d.failures FROM usage_daily_items d
+                                        WHERE d.item_id = old.id AND d.day = usage_daily_categories.day), 0),
+        total_time_ms = total_time_ms - COALESCE((SELECT d.total_time_ms FROM usage_daily_items d
+                                                  WHERE d.item_id = old.id AND d.day = usage_daily_categories.day), 0)
+    WHERE category_id = old.category_id
+      AND day IN (SELECT day FROM usage_daily_items WHERE item_id = old.id);
+    DELETE FROM usage_daily_categories
+    WHERE category_id = old.category_id AND executions <= 0;
+"""
+
+
+def tables_exist(conn) -> bool:
+    """Verificar si las tablas de agregados ya existen"""
+    rows = conn.execute(f"""
+        SELECT name FROM sqlite_master
+        WHERE type = 'table' AND name IN ({','.join('?' * len(ROLLUP_TABLES))})
+    """, ROLLUP_TABLES).fetchall()
+    return len(rows) == len(ROLLUP_TABLES)
+
+
+def upgrade(conn) -> bool:
+    """
+    Crear las tablas de agregados, sus triggers y rellenarlas
+
+    Returns:
+        True si se creó y rellenó el esquema, False si ya existía
+    """
+    if tables_exist(conn):
+        return False
+
+    logger.info("Creating usage rollup tables")
+
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS usage_daily_items (
+            day TEXT NOT NULL,
+            item_id INTEGER NOT NULL,
+            executions INTEGER NOT NULL DEFAULT 0,
+            successes INTEGER NOT NULL DEFAULT 0,
+            failures INTEGER NOT NULL DEFAULT 0,
+            total_time_ms INTEGER NOT NULL DEFAULT 0,
+            success_time_ms INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (day, item_id)
+        ) WITHOUT ROWID
+    """)
+    # (day, item_id) sirve los rangos de fechas; este índice los totales por item
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_usage_daily_items_item
+        ON usage_daily_items(item_id, day)
+    """)
+
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS usage_hourly (
+            day TEXT NOT NULL,
+            hour TEXT NOT NULL,
+            executions INTEGER NOT NULL DEFAULT 0,
+            total_time_ms INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (day, hour)
+        ) WITHOUT ROWID
+    """)
+
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS usage_daily_categories (
+            day TEXT NOT NULL,
+            category_id INTEGER NOT NULL,
+            executions INTEGER NOT NULL DEFAULT 0,
+            successes INTEGER NOT NULL DEFAULT 0,
+            failures INTEGER NOT NULL DEFAULT 0,
+            total_time_ms INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (day, category_id)
+        ) WITHOUT ROWID
+    """)
+
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS usage_rollup_ai AFTER INSERT ON item_usage_history BEGIN
+            INSERT INTO usage_daily_items
+                (day, item_id, executions, successes, failures, total_time_ms, success_time_ms)
+            VALUES (date(new.used_at), new.item_id, 1,
+                    new.success = 1, new.success = 0,
+                    COALESCE(new.execution_time_ms, 0),
+                    CASE WHEN new.success = 1 THEN COALESCE(new.execution_time_ms, 0) ELSE 0 END)
+            ON CONFLICT(day, item_id) DO UPDATE SET
+                executions = executions + excluded.executions,
+                successes = successes + excluded.successes,
+                failures = failures + excluded.failures,
+                total_time_ms = total_time_ms + excluded.total_time_ms,
+                success_time_ms = success_time_ms + excluded.success_time_ms;
+
+            INSERT INTO usage_hourly (day, hour, executions, total_time_ms)
+            VALUES (date(new.used_at), strftime('%H', new.used_at), 1,
+                    COALESCE(new.execution_time_ms, 0))
+            ON CONFLICT(day, hour) DO UPDATE SET
+                executions = executions + excluded.executions,
+                total_time_ms = total_time_ms + excluded.total_time_ms;
+
+            INSERT INTO usage_daily_categories
+                (day, category_id, executions, successes, failures, total_time_ms)
+            SELECT date(new.used_at), category_id, 1,
+                   new.success = 1, new.success = 0, COALESCE(new.execution_time_ms, 0)
+            FROM items WHERE id = new.item_id AND category_id IS NOT NULL
+            ON CONFLICT(day, category_id) DO UPDATE SET
+                executions = executions + excluded.executions,
+                successes = successes + excluded.successes,
+                failures = failures + excluded.failures,
+                total_time_ms = total_time_ms + excluded.total_time_ms;
+        END
+    """)
+
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS usage_rollup_ad AFTER DELETE ON item_usage_history BEGIN
+            UPDATE usage_daily_items SET
+                executions = executions - 1,
+                successes = successes - (old.success = 1),
+                failures = failures - (old.success = 0),
+                total_time_ms = total_time_ms - COALESCE(old.execution_time_ms, 0),
+                success_time_ms = success_time_ms -
+                    CASE WHEN old.success = 1 THEN COALESCE(old.execution_time_ms, 0) ELSE 0 END
+            WHERE day = date(old.used_at) AND item_id = old.item_id;
+            DELETE FROM usage_daily_items
+            WHERE day = date(old.used_at) AND item_id = old.item_id AND executions <= 0;
+
+            UPDATE usage_hourly SET
+                executions = executions - 1,
+                total_time_ms = total_time_ms - COALESCE(old.execution_time_ms, 0)
+            WHERE day = date(old.used_at) AND hour = strftime('%H', old.used_at);
+            DELETE FROM usage_hourly
+            WHERE day = date(old.used_at) AND hour = strftime('%H', old.used_at) AND executions <= 0;
+
+            -- Si el item ya no existe (borrado en cascada) su categoría ya
+            -- se restó en usage_rollup_item_bd
+            UPDATE usage_daily_categories SET
+                executions = executions - 1,
+                successes = successes - (old.success = 1),
+                failures = failures - (old.success = 0),
+                total_time_ms = total_time_ms - COALESCE(old.execution_time_ms, 0)
+            WHERE day = date(old.used_at)
+              AND category_id = (SELECT category_id FROM items WHERE id = old.item_id);
+            DELETE FROM usage_daily_categories
+            WHERE day = date(old.used_at) AND executions <= 0;
+        END
+    """)
+
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS usage_rollup_item_bd BEFORE DELETE ON items BEGIN
+            {_SUBTRACT_ITEM_FROM_CATEGORY}
+        END
+    """)
+
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS usage_rollup_item_category
+        AFTER UPDATE OF category_id ON items
+        WHEN old.category_id IS NOT new.category_id BEGIN
+            {_SUBTRACT_ITEM_FROM_CATEGORY}
+            INSERT INTO usage_daily_categories
+                (day, category_id, executions, successes, failures, total_time_ms)
+            SELECT day, new.category_id, executions, successes, failures, total_time_ms
+            FROM usage_daily_items WHERE item_id = new.id AND new.category_id IS NOT NULL
+            ON CONFLICT(day, category_id) DO UPDATE SET
+                executions = executions + excluded.executions,
+                successes = successes + excluded.successes,
+                failures = failures + excluded.failures,
+                total_time_ms = total_time_ms + excluded.total_time_ms;
+        END
+    """)
+
+    backfill(conn)
+    return True
+
+
+def backfill(conn) -> None:
+    """Recalcular los agregados a partir de item_usage_history"""
+    for table in ROLLUP_TABLES:
+        conn.execute(f"DELETE FROM {table}")
+
+    conn.execute("""
+        INSERT INTO usage_daily_items
+            (day, item_id, executions, successes, failures, total_time_ms, success_time_ms)
+        SELECT date(used_at), item_id, COUNT(*),
+               SUM(success = 1), SUM(success = 0),
+               COALESCE(SUM(execution_time_ms), 0),
+               COALESCE(SUM(CASE WHEN success = 1 THEN execution_time_ms ELSE 0 END), 0)
+        FROM item_usage_history
+        GROUP BY date(used_at), item_id
+    """)
+
+    conn.execute("""
+        INSERT INTO usage_hourly (day, hour, executions, total_time_ms)
+        SELECT date(used_at), strftime('%H', used_at), COUNT(*),
+               COALESCE(SUM(execution_time_ms), 0)
+        FROM item_usage_history
+        GROUP BY date(used_at), strftime('%H', used_at)
+    """)
+
+    conn.execute("""
+        INSERT INTO usage_daily_categories
+            (day, category_id, executions, successes, failures, total_time_ms)
+        SELECT date(h.used_at), i.category_id, COUNT(*),
+               SUM(h.success = 1), SUM(h.success = 0),
+               COALESCE(SUM(h.execution_time_ms), 0)
+        FROM item_usage_history h
+        JOIN items i ON i.id = h.item_id
+        WHERE i.category_id IS NOT NULL
+        GROUP BY date(h.used_at), i.category_id
+    """)
+
+    total = conn.execute("SELECT COALESCE(SUM(executions), 0) FROM usage_daily_items").fetchone()[0]
+    logger.info(f"Usage rollups backfilled from {total} history rows")
+
+
+def downgrade(conn):
+    """Revertir migración (item_usage_history conserva los datos)"""
+    for trigger in ('usage_rollup_ai', 'usage_rollup_ad',
+                    'usage_rollup_item_bd', 'usage_rollup_item_category'):
+        conn.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+    conn.execute("DROP INDEX IF EXISTS idx_usage_daily_items_item")
+    for table in ROLLUP_TABLES:
+        conn.execute(f"DROP TABLE IF EXISTS {table}")
+    logger.info("Usage rollup tables dropped")
@@ -0,0 +1,442 @@
+"""
+Usage Queue for Widget Sidebar
+Escritura diferida (write-behind) de los contadores de uso
+
+Cada clic en un item hacía UPDATE items + INSERT item_usage_history + commit
+en el hilo de la UI. Ahora los eventos de uso se encolan en memoria y se
+vuelcan en una sola transacción:
+
+- Los incrementos de use_count se agrupan por item (N clics = 1 UPDATE)
+- last_used se queda con el instante más reciente de cada item
+- Las filas de historial (item_usage_history, clipboard_history) se insertan
+  con executemany y clipboard_history se recorta una vez por volcado
+- La frecencia de los items usados (item_frecency) se actualiza en la
+  misma transacción
+
+El volcado ocurre cuando se cumple lo primero de:
+- flush_interval_ms desde el evento más antiguo pendiente (latencia máxima)
+- idle_ms sin eventos nuevos (ráfaga terminada)
+- max_pending eventos en cola
+- flush()/close() explícitos (al salir de la aplicación, o antes de leer)
+
+Tras cada volcado se publican los cambios en el ChangeBus (items con
+columns=USAGE_COLUMNS), para que las cachés no los confundan con escrituras
+externas.
+
+Seguridad ante cierres inesperados: cada evento se añade a un journal
+(JSON por línea) junto a la base de datos antes de encolarse. El último
+número de secuencia volcado se guarda en settings dentro de la misma
+transacción; al arrancar se reaplican solo los eventos posteriores.
+"""
+
+import atexit
+import calendar
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+from .connection_pool import get_connection
+from .change_bus import USAGE_COLUMNS, get_change_bus
+from .frecency import add_visits
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FLUSH_INTERVAL_MS = 2000
+DEFAULT_IDLE_MS = 500
+DEFAULT_MAX_PENDING = 200
+
+JOURNAL_SUFFIX = "-usage.journal"
+JOURNAL_SEQ_KEY = "usage_journal_seq"
+
+
+def _utc_now() -> str:
+    """Instante actual en el formato de datetime('now') de SQLite"""
+    return datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
+
+
+def _to_epoch(timestamp: str) -> int:
+    """Timestamp de _utc_now() a segundos Unix (columnas *_ts)"""
+    return calendar.timegm(time.strptime(timestamp, '%Y-%m-%d %H:%M:%S'))
+
+
+class UsageQueue:
+    """
+    Cola de eventos de uso con volcado por lotes a SQLite
+
+    Thread-safe: los record_*() solo añaden al journal y a la cola; el
+    volcado lo hace un hilo en segundo plano (o quien llame a flush()).
+    """
+
+    def __init__(self, db_path: Union[str, Path],
+                 flush_interval_ms: int = DEFAULT_FLUSH_INTERVAL_MS,
+                 idle_ms: int = DEFAULT_IDLE_MS,
+                 max_pending: int = DEFAULT_MAX_PENDING,
+                 journal_path: Union[str, Path, None] = None):
+        """
+        Args:
+            db_path: Ruta de la base de datos
+            flush_interval_ms: Latencia máxima de un evento antes de volcarse
+            idle_ms: Volcar tras este tiempo sin eventos nuevos
+            max_pending: Volcar en cuanto haya este número de eventos
+            journal_path: Ruta del journal (por defecto <db_path>-usage.journal)
+        """
+        self.db_path = Path(db_path)
+        self.journal_path = Path(journal_path) if journal_path else \
+            Path(str(self.db_path) + JOURNAL_SUFFIX)
+
+        self._cond = threading.Condition()
+        # Serializa los volcados (hilo de fondo vs flush() explícito)
+        self._flush_lock = threading.Lock()
+        self._pending: List[Dict] = []
+        self._first_event_at = 0.0
+        self._last_event_at = 0.0
+        self._seq = 0
+        self._closed = False
+
+        self.configure(flush_interval_ms, idle_ms, max_pending)
+        self._recover_journal()
+
+        self._thread = threading.Thread(target=self._run, name="usage-flusher", daemon=True)
+        self._thread.start()
+
+    # ==================== Configuración ====================
+
+    def configure(self, flush_interval_ms: Optional[int] = None,
+                  idle_ms: Optional[int] = None,
+                  max_pending: Optional[int] = None) -> None:
+        """Cambiar la latencia de volcado (los valores None no se modifican)"""
+        with self._cond:
+            if flush_interval_ms is not None:
+                self.flush_interval_ms = max(0, int(flush_interval_ms))
+            if idle_ms is not None:
+                self.idle_ms = max(0, int(idle_ms))
+            if max_pending is not None:
+                self.max_pending = max(1, int(max_pending))
+            self._cond.notify()
+
+    @property
+    def pending_count(self) -> int:
+        """Número de eventos aún no volcados"""
+        with self._cond:
+            return len(self._pending)
+
+    # ==================== Registro de eventos ====================
+
+    def record_use(self, item_id: int, execution_time_ms: int = 0,
+                   success: bool = True, error_message: Optional[str] = None) -> None:
+        """Registrar un uso: use_count+1, last_used e item_usage_history"""
+        self._enqueue({
+            'kind': 'use',
+            'item_id': item_id,
+            'at': _utc_now(),
+            'ms': int(execution_time_ms or 0),
+            'ok': 1 if success else 0,
+            'error': error_message,
+        })
+
+    def record_last_used(self, item_id: int) -> None:
+        """Registrar solo la actualización de last_used"""
+        self._enqueue({'kind': 'last_used', 'item_id': item_id, 'at': _utc_now()})
+
+    def record_history(self, item_id: Optional[int], content: str, keep_latest: int = 20) -> None:
+        """Registrar una entrada de clipboard_history (recortada a keep_latest)"""
+        self._enqueue({
+            'kind': 'history',
+            'item_id': item_id,
+            'at': _utc_now(),
+            'content': content,
+            'keep': int(keep_latest),
+        })
+
+    def _enqueue(self, event: Dict) -> None:
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("UsageQueue is closed")
+
+            self._seq += 1
+            event['seq'] = self._seq
+            self._append_journal(event)
+
+            now = time.monotonic()
+            if not self._pending:
+                self._first_event_at = now
+            self._last_event_at = now
+            self._pending.append(event)
+            self._cond.notify()
+
+    # ==================== Volcado ====================
+
+    def flush(self) -> int:
+        """
+        Volcar ahora todos los eventos pendientes (en el hilo que llama)
+
+        Returns:
+            int: Número de eventos volcados
+        """
+        with self._flush_lock:
+            with self._cond:
+                batch = self._pending
+                self._pending = []
+            if not batch:
+                return 0
+
+            try:
+                self._write_batch(batch)
+            except sqlite3.Error as e:
+                # Devolver el lote a la cola; el journal sigue teniéndolo
+                logger.error(f"Usage flush failed ({len(batch)} events): {e}")
+                with self._cond:
+                    self._pending = batch + self._pending
+                    self._first_event_at = time.monotonic()
+                return 0
+
+            with self._cond:
+                self._rewrite_journal()
+            logger.debug(f"Usage flushed: {len(batch)} events")
+            return len(batch)
+
+    def _write_batch(self, batch: List[Dict]) -> None:
+        """Aplicar un lote de eventos en una única transacción"""
+        use_counts: Dict[int, int] = {}
+        last_used: Dict[int, str] = {}
+        usage_rows = []
+        visits = []
+        history_rows = []
+        keep_latest = None
+
+        for event in batch:
+            item_id = event['item_id']
+            if event['kind'] == 'history':
+                history_rows.append((item_id, event['content'], event['at']))
+                keep_latest = event['keep']
+                continue
+
+            if item_id is None:
+                continue
+            if event['at'] > last_used.get(item_id, ''):
+                last_used[item_id] = event['at']
+            visits.append((item_id, _to_epoch(event['at'])))
+            if event['kind'] == 'use':
+                use_counts[item_id] = use_counts.get(item_id, 0) + 1
+                usage_rows.append((item_id, event['at'], event['ms'], event['ok'], event['error']))
+
+        changes = get_change_bus(self.db_path)
+        changes.poll_external()
+        conn = get_connection(self.db_path)
+        with conn:
+            conn.executemany("""
+                UPDATE items
+                SET use_count = COALESCE(use_count, 0) + ?,
+                    updated_at = datetime('now')
+                WHERE id = ?
+            """, [(count, item_id) for item_id, count in use_counts.items()])
+
+            conn.executemany("""
+                UPDATE items
+                SET last_used = ?, last_used_ts = ?
+                WHERE id = ? AND (last_used IS NULL OR last_used < ?)
+            """, [(at, _to_epoch(at), item_id, at) for item_id, at in last_used.items()])
+
+            # Un item borrado mientras el evento esperaba no debe hacer
+            # fallar (por la foreign key) el lote completo
+            if usage_rows:
+                conn.executemany("""
+                    INSERT INTO item_usage_history
+                    (item_id, used_at, used_at_ts, execution_time_ms, success, error_message)
+                    SELECT id, ?, ?, ?, ?, ? FROM items WHERE id = ?
+                """, [(at, _to_epoch(at), ms, ok, error, item_id)
+                      for item_id, at, ms, ok, error in usage_rows])
+
+            add_visits(conn, visits)
+
+            if history_rows:
+                conn.executemany("""
+                    INSERT INTO clipboard_history (item_id, content, copied_at)
+                    VALUES ((SELECT id FROM items WHERE id = ?), ?, ?)
+                """, history_rows)
+                conn.execute("""
+                    DELETE FROM clipboard_history
+                    WHERE id NOT IN (
+                        SELECT id FROM clipboard_history
+                        ORDER BY copied_at DESC, id DESC
+                        LIMIT ?
+                    )
+                """, (keep_latest,))
+
+            # Checkpoint del journal en la misma transacción
+            conn.execute("""
+                INSERT INTO settings (key, value, updated_at)
+                VALUES (?, ?, CURRENT_TIMESTAMP)
+                ON CONFLICT(key) DO UPDATE SET
+                    value = excluded.value,
+                    updated_at = CURRENT_TIMESTAMP
+            """, (JOURNAL_SEQ_KEY, json.dumps(batch[-1]['seq'])))
+
+        if last_used:
+            changes.publish('items', 'update', ids=list(last_used), columns=USAGE_COLUMNS)
+        if usage_rows:
+            changes.publish('item_usage_history', 'insert')
+        if visits:
+            changes.publish('item_frecency', 'update', ids=list(last_used))
+        if history_rows:
+            changes.publish('clipboard_history', 'insert')
+
+    def _run(self) -> None:
+        """Hilo de fondo: esperar al siguiente plazo de volcado"""
+        while True:
+            with self._cond:
+                while not self._closed:
+                    if self._pending:
+                        if len(self._pending) >= self.max_pending:
+                            break
+                        now = time.monotonic()
+                        deadline = min(self._first_event_at + self.flush_interval_ms / 1000,
+                                       self._last_event_at + self.idle_ms / 1000)
+                        if now >= deadline:
+                            break
+                        self._cond.wait(deadline - now)
+                    else:
+                        self._cond.wait()
+                if self._closed:
+                    return
+
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Usage flusher error: {e}")
+                time.sleep(self.flush_interval_ms / 1000 or 0.1)
+
+    def close(self) -> None:
+        """Volcar lo pendiente y detener el hilo de fondo"""
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify()
+        self._thread.join(timeout=5)
+        self.flush()
+
+    # ==================== Journal ====================
+
+    def _append_journal(self, event: Dict) -> None:
+        """Añadir un evento al journal (llamar con self._cond adquirido)"""
+        try:
+            new_file = not self.journal_path.exists()
+            with open(self.journal_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(event) + '\n')
+            if new_file:
+                # Puede contener contenido copiado al portapapeles
+                os.chmod(self.journal_path, 0o600)
+        except OSError as e:
+            logger.warning(f"Could not append to usage journal: {e}")
+
+    def _rewrite_journal(self) -> None:
+        """Dejar en el journal solo los eventos pendientes (con self._cond adquirido)"""
+        try:
+            if not self._pending:
+                self.journal_path.unlink(missing_ok=True)
+                return
+            tmp_path = self.journal_path.with_name(self.journal_path.name + '.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                for event in self._pending:
+                    f.write(json.dumps(event) + '\n')
+            os.chmod(tmp_path, 0o600)
+            os.replace(tmp_path, self.journal_path)
+        except OSError as e:
+            logger.warning(f"Could not rewrite usage journal: {e}")
+
+    def _recover_journal(self) -> None:
+        """Reencolar los eventos del journal que no llegaron a volcarse"""
+        # El checkpoint se lee siempre: tras un cierre limpio no hay journal,
+        # pero la numeración debe seguir por encima de él o la siguiente
+        # recuperación descartaría los eventos nuevos (seq <= checkpoint)
+        checkpoint = 0
+        try:
+            row = get_connection(self.db_path).execute(
+                "SELECT value FROM settings WHERE key = ?", (JOURNAL_SEQ_KEY,)
+            ).fetchone()
+            if row:
+                checkpoint = int(json.loads(row[0]))
+        except (sqlite3.Error, ValueError, TypeError) as e:
+            logger.warning(f"Could not read usage journal checkpoint: {e}")
+        self._seq = max(self._seq, checkpoint)
+
+        if not self.journal_path.exists():
+            return
+
+        events = []
+        try:
+            with open(self.journal_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        events.append(json.loads(line))
+                    except json.JSONDecodeError:
+                        # Última línea a medio escribir
+                        logger.warning("Skipping truncated usage journal entry")
+        except OSError as e:
+            logger.warning(f"Could not read usage journal: {e}")
+            return
+
+        self._seq = max([checkpoint] + [e.get('seq', 0) for e in events])
+        self._pending = [e for e in events if e.get('seq', 0) > checkpoint]
+        if self._pending:
+            self._first_event_at = self._last_event_at = time.monotonic()
+            logger.info(f"Recovered {len(self._pending)} usage events from journal")
+            self.flush()
+        else:
+            self._rewrite_journal()
+
+
+_queues: Dict[str, UsageQueue] = {}
+_queues_lock = threading.Lock()
+
+
+def get_usage_queue(db_path: Union[str, Path], create: bool = True) -> Optional[UsageQueue]:
+    """
+    Obtener la UsageQueue compartida del proceso para una base de datos
+
+    Args:
+        db_path: Ruta de la base de datos
+        create: Crearla si aún no existe (False = devolver None)
+    """
+    key = str(Path(db_path).resolve())
+    with _queues_lock:
+        queue = _queues.get(key)
+        if queue is None and create:
+            queue = _queues[key] = UsageQueue(key)
+        return queue
+
+
+def flush_usage_queue(db_path: Union[str, Path]) -> int:
+    """Volcar los eventos pendientes de una base de datos (si tiene cola)"""
+    queue = get_usage_queue(db_path, create=False)
+    return queue.flush() if queue is not None else 0
+
+
+def flush_usage_queues() -> None:
+    """Volcar los eventos pendientes de todas las colas"""
+    with _queues_lock:
+        queues = list(_queues.values())
+    for queue in queues:
+        queue.flush()
+
+
+def close_usage_queues() -> None:
+    """Volcar y cerrar todas las colas (al salir de la aplicación)"""
+    with _queues_lock:
+        queues = list(_queues.values())
+        _queues.clear()
+    for queue in queues:
+        try:
+            queue.close()
+        except Exception as e:
+            logger.error(f"Error closing usage queue for {queue.db_path}: {e}")
+
+
+atexit.register(close_usage_queues)
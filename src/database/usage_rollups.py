@@ -0,0 +1,91 @@
+"""
+Usage Rollups for Widget Sidebar
+Fragmentos SQL para consultar los agregados de uso (migrations/add_usage_rollups)
+
+Las ventanas "últimos N días" usan used_at >= datetime('now', '-N days'),
+un corte a mitad de día. Para dar exactamente los mismos resultados que
+agregando item_usage_history, cada ventana combina:
+- los días completos desde los agregados (usage_daily_items / usage_hourly)
+- las filas del día del corte desde item_usage_history (rango en idx_usage_ts)
+
+Uso (los CTE de ventana reciben un único parámetro: days):
+    cursor.execute(f'''
+        WITH {USAGE_WINDOW_CTE}
+        SELECT SUM(executions) FROM usage_window
+    ''', (days,))
+"""
+
+# Corte de la ventana y primer día completo posterior (texto y epoch)
+_BOUNDS_CTE = """
+    usage_bounds AS (
+        SELECT first_full_day,
+               CAST(strftime('%s', cutoff) AS INTEGER) AS cutoff_ts,
+               CAST(strftime('%s', first_full_day) AS INTEGER) AS first_full_day_ts
+        FROM (SELECT cutoff, date(cutoff, '+1 day') AS first_full_day
+              FROM (SELECT datetime('now', '-' || ? || ' days') AS cutoff))
+    )"""
+
+# usage_window(day, item_id, executions, successes, failures, total_time_ms, success_time_ms)
+USAGE_WINDOW_CTE = _BOUNDS_CTE + """,
+    usage_window AS (
+        SELECT d.day, d.item_id, d.executions, d.successes, d.failures,
+               d.total_time_ms, d.success_time_ms
+        FROM usage_bounds b
+        JOIN usage_daily_items d ON d.day >= b.first_full_day
+        UNION ALL
+        SELECT date(h.used_at), h.item_id, COUNT(*),
+               SUM(h.success = 1), SUM(h.success = 0),
+               COALESCE(SUM(h.execution_time_ms), 0),
+               COALESCE(SUM(CASE WHEN h.success = 1 THEN h.execution_time_ms ELSE 0 END), 0)
+        FROM usage_bounds b
+        JOIN item_usage_history h
+          ON h.used_at_ts >= b.cutoff_ts AND h.used_at_ts < b.first_full_day_ts
+        GROUP BY date(h.used_at), h.item_id
+    )"""
+
+# hourly_window(hour, executions, total_time_ms)
+HOURLY_WINDOW_CTE = _BOUNDS_CTE + """,
+    hourly_window AS (
+        SELECT u.hour, u.executions, u.total_time_ms
+        FROM usage_bounds b
+        JOIN usage_hourly u ON u.day >= b.first_full_day
+        UNION ALL
+        SELECT strftime('%H', h.used_at), COUNT(*),
+               COALESCE(SUM(h.execution_time_ms), 0)
+        FROM usage_bounds b
+        JOIN item_usage_history h
+          ON h.used_at_ts >= b.cutoff_ts AND h.used_at_ts < b.first_full_day_ts
+        GROUP BY strftime('%H', h.used_at)
+    )"""
+
+# category_window(day, category_id, executions, successes, failures, total_time_ms)
+CATEGORY_WINDOW_CTE = _BOUNDS_CTE + """,
+    category_window AS (
+        SELECT c.day, c.category_id, c.executions, c.successes, c.failures, c.total_time_ms
+        FROM usage_bounds b
+        JOIN usage_daily_categories c ON c.day >= b.first_full_day
+        UNION ALL
+        SELECT date(h.used_at), i.category_id, COUNT(*),
+               SUM(h.success = 1), SUM(h.success = 0),
+               COALESCE(SUM(h.execution_time_ms), 0)
+        FROM usage_bounds b
+        JOIN item_usage_history h
+          ON h.used_at_ts >= b.cutoff_ts AND h.used_at_ts < b.first_full_day_ts
+        JOIN items i ON i.id = h.item_id
+        WHERE i.category_id IS NOT NULL
+        GROUP BY date(h.used_at), i.category_id
+    )"""
+
+# usage_totals(item_id, executions, successes, failures, total_time_ms, success_time_ms)
+# Totales históricos por item (sin parámetros)
+ITEM_TOTALS_CTE = """
+    usage_totals AS (
+        SELECT item_id,
+               SUM(executions) AS executions,
+               SUM(successes) AS successes,
+               SUM(failures) AS failures,
+               SUM(total_time_ms) AS total_time_ms,
+               SUM(success_time_ms) AS success_time_ms
+        FROM usage_daily_items
+        GROUP BY item_id
+    )"""
@@ -1,7 +1,7 @@
 """
 Category Model
 """
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Sequence, Tuple
 from .item import Item
 
 
@@ -121,3 +121,65 @@ class Category:
 
     def __repr__(self) -> str:
         return f"Category(id={self.id}, name={self.name}, items={len(self.items)})"
+
+
+class CategoryIndex:
+    """
+    Reverse index item -> category for a list of categories
+
+    Maps each Item object to the position of its category, so finding the
+    category of many items is one dict lookup per item instead of scanning
+    every category's items (Item.__eq__ comparisons).
+
+    The index is rebuilt when the categories or their item lists change
+    (different list object or length), and at most once per sync() when an
+    item is not found, so lists replaced or mutated in place stay correct.
+    """
+
+    def __init__(self):
+        self._categories: Tuple[Category, ...] = ()
+        self._signature: Tuple = ()
+        # id(item) -> (item, category position); the item keeps its id valid
+        self._positions: Dict[int, Tuple[Item, int]] = {}
+        # True if the index was rebuilt since the last sync()
+        self._fresh = False
+
+    @staticmethod
+    def _signature_of(categories: Sequence[Category]) -> Tuple:
+        return tuple((id(category), id(category.items), len(category.items)) for category in categories)
+
+    def _rebuild(self, categories: Sequence[Category], signature: Tuple) -> None:
+        self._categories = tuple(categories)
+        self._signature = signature
+        self._positions = {
+            id(item): (item, position)
+            for position, category in enumerate(self._categories)
+            for item in category.items
+        }
+        self._fresh = True
+
+    def sync(self, categories: Sequence[Category]) -> None:
+        """Rebuild the index if the categories changed since the last call"""
+        signature = self._signature_of(categories)
+        self._fresh = False
+        if signature != self._signature:
+            self._rebuild(categories, signature)
+
+    @property
+    def categories(self) -> Tuple['Category', ...]:
+        """Indexed categories (positions refer to this tuple)"""
+        return self._categories
+
+    def position_of(self, item: Item) -> Optional[int]:
+        """
+        Position of the item's category (after sync), or None if it is in none
+
+        An item not found rebuilds the index once (item list changed in place).
+        """
+        entry = self._positions.get(id(item))
+        if (entry is None or entry[0] is not item) and not self._fresh:
+            self._rebuild(self._categories, self._signature_of(self._categories))
+            entry = self._positions.get(id(item))
+        if entry is None or entry[0] is not item:
+            return None
+        return entry[1]
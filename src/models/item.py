@@ -4,6 +4,18 @@ Item Model
 from typing import Dict, Any, Optional
 from datetime import datetime
 from enum import Enum
+from core.encryption_manager import SealedContent
+from utils.search_keys import fold, FIELD_SEPARATOR
+
+# Atributo de origen -> claves de búsqueda precalculadas que invalida al asignarse
+_SEARCH_KEY_ATTRS = {
+    'label': ('_search_label', '_search_text'),
+    'tags': ('_search_tags', '_search_text'),
+    '_content': ('_search_text',),
+    'is_sensitive': ('_search_text',),
+    'description': ('_search_description',),
+    'list_group': ('_search_list_group',),
+}
 
 
 class ItemType(Enum):
@@ -57,6 +69,86 @@ class Item:
         self.created_at = datetime.now()
         self.last_used = datetime.now()
 
+    @property
+    def content(self) -> str:
+        """Item content; sealed (sensitive) content is decrypted on first access"""
+        if isinstance(self._content, SealedContent):
+            return self._content.reveal()
+        return self._content
+
+    @content.setter
+    def content(self, value) -> None:
+        self._content = value
+
+    @property
+    def is_content_sealed(self) -> bool:
+        """True if the content is still encrypted (never accessed)"""
+        return isinstance(self._content, SealedContent) and not self._content.is_revealed
+
+    def __setattr__(self, name, value) -> None:
+        super().__setattr__(name, value)
+        for key_attr in _SEARCH_KEY_ATTRS.get(name, ()):
+            self.__dict__.pop(key_attr, None)
+
+    # Claves de búsqueda (utils.search_keys.fold): se calculan la primera vez
+    # que se buscan y se descartan al asignar el atributo de origen. Los tags
+    # deben reasignarse (item.tags = [...]), no modificarse en su sitio.
+    @property
+    def search_label(self) -> str:
+        """Label normalizado (minúsculas, sin acentos)"""
+        key = self.__dict__.get('_search_label')
+        if key is None:
+            key = self.__dict__['_search_label'] = fold(self.label)
+        return key
+
+    @property
+    def search_tags(self) -> tuple:
+        """Tags normalizados"""
+        key = self.__dict__.get('_search_tags')
+        if key is None:
+            key = self.__dict__['_search_tags'] = tuple(fold(tag) for tag in self.tags)
+        return key
+
+    @property
+    def search_description(self) -> str:
+        """Descripción normalizada ('' si no tiene)"""
+        key = self.__dict__.get('_search_description')
+        if key is None:
+            key = self.__dict__['_search_description'] = fold(self.description)
+        return key
+
+    @property
+    def search_list_group(self) -> str:
+        """Nombre de la lista normalizado ('' si no tiene)"""
+        key = self.__dict__.get('_search_list_group')
+        if key is None:
+            key = self.__dict__['_search_list_group'] = fold(self.list_group)
+        return key
+
+    @property
+    def search_text(self) -> str:
+        """
+        Label, tags y contenido normalizados en una sola clave
+
+        Un solo `query in item.search_text` sustituye a las comprobaciones
+        por campo. El contenido de los items sensibles no se incluye (ni se
+        descifra).
+        """
+        key = self.__dict__.get('_search_text')
+        if key is None:
+            fields = [self.search_label, *self.search_tags]
+            if not self.is_sensitive:
+                content = self.content
+                fields.append(fold(content if isinstance(content, str) else None))
+            key = self.__dict__['_search_text'] = FIELD_SEPARATOR.join(fields)
+        return key
+
+    def build_search_keys(self) -> None:
+        """Calcular ya las claves de búsqueda (p. ej. en el hilo de carga)"""
+        self.search_text
+        self.search_description
+        self.search_list_group
+
     def update_last_used(self) -> None:
         """Update the last used timestamp"""
         self.last_used = datetime.now()
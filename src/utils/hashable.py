@@ -0,0 +1,21 @@
+"""
+Hashable utilities
+Claves de caché a partir de valores con dicts y listas anidados
+"""
+
+from typing import Any, Hashable
+
+
+def freeze(value: Any) -> Hashable:
+    """Versión hashable de un valor de filtro (dicts y listas anidados)"""
+    if isinstance(value, dict):
+        return frozenset((key, freeze(item)) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(freeze(item) for item in value)
+    try:
+        hash(value)
+    except TypeError:
+        return repr(value)
+    return value
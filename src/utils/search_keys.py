@@ -0,0 +1,97 @@
+"""
+Search key utilities
+Normalización de textos para búsquedas: minúsculas (casefold) y sin acentos
+
+"Reunión" y "reunion" tienen la misma clave ("reunion"), así que una
+consulta sin acentos encuentra el texto acentuado y al revés. Las claves
+se calculan una vez por item (Item.search_label, 'search_label' en la
+estructura del dashboard) y los buscadores comparan la consulta
+normalizada con ellas, sin volver a pasar a minúsculas en cada pulsación.
+"""
+
+import re
+import unicodedata
+from typing import List, Optional, Tuple
+
+# Marcas diacríticas combinables (lo que NFKD separa de "é", "ñ", "ü"...)
+_COMBINING_RE = re.compile('[\u0300-\u036f\u1ab0-\u1aff\u1dc0-\u1dff\u20d0-\u20ff\ufe20-\ufe2f]+')
+
+
+def _decomposes_to_ascii(char: str) -> bool:
+    """True si char es ASCII más marcas combinables tras NFKD"""
+    decomposed = unicodedata.normalize('NFKD', char)
+    return decomposed.encode('ascii', 'ignore').decode('ascii') == _COMBINING_RE.sub('', decomposed)
+
+
+# Caracteres latinos que quedan en ASCII al quitar las marcas (á, ñ, ü...);
+# "ø" o "ł" no se descomponen y van por la regex
+_ASCII_FOLDABLE = frozenset(
+    chr(code) for code in (*range(0x80), *range(0xc0, 0x250), *range(0x1e00, 0x1f00))
+    if _decomposes_to_ascii(chr(code))
+)
+
+# Separador entre campos de una clave combinada (Item.search_text): una
+# consulta escrita nunca lo contiene, así que no coincide a caballo de dos campos
+FIELD_SEPARATOR = '\x1f'
+
+
+def fold(text: Optional[str]) -> str:
+    """
+    Clave de búsqueda de un texto: casefold y sin marcas diacríticas
+
+    Para texto ASCII equivale a text.lower(). Si el texto ya está
+    normalizado se devuelve el mismo objeto (no duplica memoria).
+    """
+    if not text:
+        return ''
+    if text.isascii():
+        folded = text.lower()
+    else:
+        casefolded = text.casefold()
+        decomposed = unicodedata.normalize('NFKD', casefolded)
+        if _ASCII_FOLDABLE.issuperset(casefolded):
+            # Texto latino: quitar las marcas al codificar es más rápido que la regex
+            folded = decomposed.encode('ascii', 'ignore').decode('ascii')
+        else:
+            folded = _COMBINING_RE.sub('', decomposed)
+    return text if folded == text else folded
+
+
+def fold_with_offsets(text: str) -> Tuple[str, Optional[List[int]]]:
+    """
+    Clave de búsqueda y, por cada carácter de la clave, su posición en text
+
+    Returns:
+        (clave, posiciones); posiciones es None si coinciden una a una
+    """
+    if text.isascii():
+        return text.lower(), None
+    pieces = []
+    offsets = []
+    for index, char in enumerate(text):
+        piece = fold(char)
+        pieces.append(piece)
+        offsets.extend([index] * len(piece))
+    return ''.join(pieces), offsets
+
+
+def find_matches(text: str, query_key: str) -> List[Tuple[int, int]]:
+    """
+    Tramos (inicio, fin) de text donde aparece la clave query_key
+
+    Sirve para resaltar coincidencias sin acentos sobre el texto original.
+    """
+    if not text or not query_key:
+        return []
+    folded, offsets = fold_with_offsets(text)
+    spans = []
+    pos = folded.find(query_key)
+    while pos != -1:
+        end = pos + len(query_key)
+        if offsets is None:
+            spans.append((pos, end))
+        else:
+            # El fin incluye las marcas que la clave eliminó ("e" + acento)
+            spans.append((offsets[pos], offsets[end] if end < len(offsets) else len(text)))
+        pos = folded.find(query_key, end)
+    return spans
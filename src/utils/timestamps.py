@@ -0,0 +1,44 @@
+"""
+Timestamp utilities
+Conversión de las columnas epoch (*_ts) de la base de datos
+"""
+
+from datetime import datetime, timezone
+from typing import Any, Mapping, Optional
+
+
+def epoch_to_datetime(ts: int) -> datetime:
+    """
+    Convertir segundos Unix a datetime naive en UTC
+
+    Devuelve lo mismo que parsear el texto 'YYYY-MM-DD HH:MM:SS' que guarda
+    SQLite, sin el coste de strptime.
+    """
+    return datetime.fromtimestamp(ts, timezone.utc).replace(tzinfo=None)
+
+
+def row_datetime(row: Mapping[str, Any], column: str) -> Optional[datetime]:
+    """
+    Leer un timestamp de una fila de BD, usando <column>_ts si existe
+
+    Args:
+        row: Fila (dict) de la base de datos
+        column: Columna de texto ('created_at', 'last_used', 'used_at')
+
+    Returns:
+        datetime o None si la fila no tiene valor
+
+    Raises:
+        ValueError: Si solo hay texto y no tiene un formato reconocido
+    """
+    ts = row.get(f"{column}_ts")
+    if ts is not None:
+        return epoch_to_datetime(ts)
+
+    value = row.get(column)
+    if not value:
+        return None
+    if 'T' in value:
+        # ISO format
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+    return datetime.strptime(value, '%Y-%m-%d %H:%M:%S')
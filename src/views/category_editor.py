@@ -264,9 +264,6 @@ class CategoryEditor(QWidget):
         # Do NOT use controller.get_categories() because it might return filtered categories
         # without items loaded (from CategoryFilterEngine)
         if hasattr(self.controller, 'config_manager'):
-            # Clear cache to force fresh reload from database
-            self.controller.config_manager._categories_cache = None
-
             # Load ALL categories with ALL items directly from database
             self.categories = self.controller.config_manager.get_categories()
             logger.info(f"[LOAD_CATEGORIES] ✅ Loaded {len(self.categories)} categories from database")
@@ -431,10 +428,6 @@ class CategoryEditor(QWidget):
                 f"Ahora puedes agregar items a esta categoría."
             )
 
-            # Invalidate filter cache
-            if hasattr(self.controller, 'invalidate_filter_cache'):
-                self.controller.invalidate_filter_cache()
-
             self.data_changed.emit()
             logger.info("[ADD_CATEGORY] Category creation completed successfully")
 
@@ -8,6 +8,9 @@ from PyQt6.QtCore import Qt, QRect
 from PyQt6.QtGui import QPalette, QTextDocument, QAbstractTextDocumentLayout, QPainter
 import logging
 
+from utils.search_keys import fold, find_matches
+from core.query_language import try_compile_query
+
 logger = logging.getLogger(__name__)
 
 
@@ -21,7 +24,9 @@ class HighlightDelegate(QStyledItemDelegate):
 
     def set_search_query(self, query: str):
         """Set the search query to highlight"""
-        self.search_query = query.lower() if query else ""
+        # Structured queries (tag:git is:fav docker) highlight their text words
+        plan = try_compile_query(query) if query else None
+        self.search_query = fold(plan.text if plan is not None else query)
         logger.debug(f"Highlight delegate search query set to: '{self.search_query}'")
 
     def paint(self, painter, option, index):
@@ -37,9 +42,9 @@ class HighlightDelegate(QStyledItemDelegate):
             super().paint(painter, option, index)
             return
 
-        # Check if text contains search query
-        text_lower = text.lower()
-        if self.search_query not in text_lower:
+        # Check if text contains search query (case/accent-insensitive)
+        spans = find_matches(text, self.search_query)
+        if not spans:
             # No match, use default painting
             super().paint(painter, option, index)
             return
@@ -56,7 +61,7 @@ class HighlightDelegate(QStyledItemDelegate):
             painter.fillRect(option.rect, option.palette.base())
 
         # Create HTML with highlighted text
-        html_text = self._create_highlighted_html(text, self.search_query)
+        html_text = self._create_highlighted_html(text, spans)
 
         # Create text document for rich text rendering
         doc = QTextDocument()
@@ -90,44 +95,34 @@ class HighlightDelegate(QStyledItemDelegate):
         # Restore painter state
         painter.restore()
 
-    def _create_highlighted_html(self, text: str, query: str) -> str:
+    def _create_highlighted_html(self, text: str, spans: list) -> str:
         """
         Create HTML with highlighted query matches
 
         Args:
             text: Original text
-            query: Search query to highlight
+            spans: (start, end) of each match in text (utils.search_keys.find_matches)
 
         Returns:
             HTML string with highlighted matches
         """
-        if not query:
-            return text
-
-        # Escape HTML special characters in text
-        text_escaped = text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+        def escape(fragment: str) -> str:
+            # Escape HTML special characters in text
+            return fragment.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
 
-        # Find all matches (case-insensitive)
         result = []
-        text_lower = text_escaped.lower()
-        query_lower = query.lower()
-
         last_pos = 0
-        pos = text_lower.find(query_lower)
-
-        while pos != -1:
+        for start, end in spans:
             # Add text before match
-            result.append(text_escaped[last_pos:pos])
+            result.append(escape(text[last_pos:start]))
 
             # Add highlighted match
-            match_text = text_escaped[pos:pos + len(query)]
-            result.append(f'<span style="background-color: {self.highlight_color}; color: #000000; font-weight: bold;">{match_text}</span>')
-
-            last_pos = pos + len(query)
-            pos = text_lower.find(query_lower, last_pos)
+            result.append(f'<span style="background-color: {self.highlight_color}; color: #000000; '
+                          f'font-weight: bold;">{escape(text[start:end])}</span>')
+            last_pos = end
 
         # Add remaining text
-        result.append(text_escaped[last_pos:])
+        result.append(escape(text[last_pos:]))
 
         return ''.join(result)
 
@@ -12,6 +12,8 @@ from PyQt6.QtGui import QFont, QIcon, QBrush, QColor, QShortcut, QKeySequence
 import logging
 
 from core.dashboard_manager import DashboardManager
+from core.db_worker import AsyncLoader
+from core.encryption_manager import reveal_content
 from views.dashboard.search_bar_widget import SearchBarWidget
 from views.dashboard.highlight_delegate import HighlightDelegate
 from views.dashboard.action_bar_widget import ActionBarWidget
@@ -59,6 +61,15 @@ class StructureDashboard(QDialog):
         self.active_type_filters = set()  # Set of active item types ('URL', 'CODE', 'PATH', 'TEXT')
         self.type_filter_buttons = {}  # Referencias a los botones de filtro de tipo
 
+        # Carga de la estructura fuera del hilo de la UI
+        self.structure_loader = AsyncLoader(self)
+        self.structure_loader.loaded.connect(self.on_structure_loaded)
+        self.structure_loader.failed.connect(self.on_structure_load_failed)
+
+        # Incremental updates from the change log (see apply_changes)
+        self.patch_loader = AsyncLoader(self)
+        self.patch_loader.loaded.connect(self.on_structure_patched)
+
         self.init_ui()
         self.setup_shortcuts()
         self.load_data()
@@ -400,6 +411,12 @@ class StructureDashboard(QDialog):
         row2_layout.addWidget(self.text_type_btn)
         self.type_filter_buttons['TEXT'] = self.text_type_btn
 
+        # Base texts of the toggles (update_toggle_counts appends live counts)
+        self._toggle_labels = {
+            name: button.text()
+            for name, button in {**self.filter_buttons, **self.type_filter_buttons}.items()
+        }
+
         # Separador visual
         row2_layout.addSpacing(15)
 
@@ -508,12 +525,17 @@ class StructureDashboard(QDialog):
         return footer
 
     def load_data(self):
-        """Load data from database and populate tree"""
+        """Load data from database (off the UI thread) and populate tree"""
         logger.info("Loading dashboard data...")
+        self.stats_label.setText("🔄 Cargando datos...")
 
+        # Supersedes any load still in progress
+        self.structure_loader.load(self.dashboard_manager.get_full_structure)
+
+    def on_structure_loaded(self, structure: dict):
+        """Populate tree with the structure loaded in background"""
         try:
-            # Get structure
-            self.structure = self.dashboard_manager.get_full_structure()
+            self.structure = structure
 
             # Clear tree
             self.tree_widget.clear()
@@ -530,6 +552,11 @@ class StructureDashboard(QDialog):
             logger.error(f"Error loading dashboard data: {e}", exc_info=True)
             self.stats_label.setText("❌ Error al cargar datos")
 
+    def on_structure_load_failed(self, error: str):
+        """Handle background load error"""
+        logger.error(f"Error loading dashboard data: {error}")
+        self.stats_label.setText("❌ Error al cargar datos")
+
     def populate_tree(self, structure: dict):
         """
         Populate tree widget with structure data
@@ -543,176 +570,189 @@ class StructureDashboard(QDialog):
 
         for category in categories:
             # Create category item (Level 1)
-            category_item = QTreeWidgetItem(self.tree_widget)
+            category_item = self._create_checkable_row()
+            self.tree_widget.addTopLevelItem(category_item)
+            self._fill_category_row(category_item, category)
 
-            # Column 0: Checkbox
-            category_item.setFlags(category_item.flags() | Qt.ItemFlag.ItemIsUserCheckable)
-            category_item.setCheckState(0, Qt.CheckState.Unchecked)
+            # Add items under this category (Level 2)
+            for item in category['items']:
+                item_widget = self._create_checkable_row()
+                category_item.addChild(item_widget)
+                self._fill_item_row(item_widget, item)
 
-            # Column 1: Name with icon and item count
-            status_indicator = ""
-            if not category.get('is_active', 1):  # Si is_active es 0 o False
-                status_indicator = "🚫 "  # Icono que coincide con el botón Desactivar
-            category_name = f"{status_indicator}{category['icon']} {category['name']} ({len(category['items'])} items)"
-            category_item.setText(1, category_name)
-            category_item.setFont(1, self.get_bold_font())
+        logger.info("Tree populated successfully")
 
-            # Aplicar estilo visual adicional para categorías desactivadas
+    def _create_checkable_row(self) -> QTreeWidgetItem:
+        """Create a tree row with an unchecked checkbox in column 0"""
+        row = QTreeWidgetItem()
+        row.setFlags(row.flags() | Qt.ItemFlag.ItemIsUserCheckable)
+        row.setCheckState(0, Qt.CheckState.Unchecked)
+        return row
+
+    def _fill_category_row(self, row: QTreeWidgetItem, category: dict):
+        """Set texts, style, tooltip and user data of a category row"""
+        # Column 1: Name with icon and item count
+        status_indicator = ""
+        if not category.get('is_active', 1):  # Si is_active es 0 o False
+            status_indicator = "🚫 "  # Icono que coincide con el botón Desactivar
+        category_name = f"{status_indicator}{category['icon']} {category['name']} ({len(category['items'])} items)"
+        row.setText(1, category_name)
+        row.setFont(1, self.get_bold_font())
+
+        # Aplicar estilo visual adicional para categorías desactivadas
+        for col in range(4):
             if not category.get('is_active', 1):
                 # Cambiar el color del texto para categorías desactivadas
-                for col in range(4):
-                    category_item.setForeground(col, QBrush(QColor('#888888')))  # Texto gris
+                row.setForeground(col, QBrush(QColor('#888888')))  # Texto gris
+            else:
+                row.setData(col, Qt.ItemDataRole.ForegroundRole, None)
 
-            # Column 2: Type
-            category_item.setText(2, "Categoría")
+        # Column 2: Type
+        row.setText(2, "Categoría")
 
-            # Column 3: Tags
-            if category['tags']:
-                tags_str = ", ".join([f"#{tag}" for tag in category['tags']])
-                category_item.setText(3, tags_str)
+        # Column 3: Tags
+        if category['tags']:
+            tags_str = ", ".join([f"#{tag}" for tag in category['tags']])
+            row.setText(3, tags_str)
+        else:
+            row.setText(3, "")
+
+        # Build tooltip for category
+        category_tooltip_parts = []
+        category_tooltip_parts.append(f"<b>{category['name']}</b>")
+        category_tooltip_parts.append(f"<b>Items:</b> {len(category['items'])}")
+
+        # Mostrar estado de categoría
+        if not category.get('is_active', 1):
+            category_tooltip_parts.append("🚫 <b><span style='color: #f44336;'>CATEGORÍA DESACTIVADA</span></b>")
+
+        if category['tags']:
+            tags_str = ", ".join([f"#{tag}" for tag in category['tags']])
+            category_tooltip_parts.append(f"<b>Tags:</b> {tags_str}")
+
+        if category.get('is_predefined'):
+            category_tooltip_parts.append("📌 <b>Categoría predefinida</b>")
+
+        category_tooltip_parts.append("<br><i>Click para expandir/colapsar | Click derecho para opciones</i>")
+
+        category_tooltip_html = "<br>".join(category_tooltip_parts)
+        row.setToolTip(1, category_tooltip_html)
+        row.setToolTip(2, category_tooltip_html)
+        row.setToolTip(3, category_tooltip_html)
+
+        # Store category ID in user data (column 0 for identification)
+        row.setData(0, Qt.ItemDataRole.UserRole, {
+            'type': 'category',
+            'id': category['id']
+        })
+
+    def _fill_item_row(self, row: QTreeWidgetItem, item: dict):
+        """Set texts, style, tooltip and user data of an item row"""
+        # Column 1: Item name with indicators
+        indicators = ""
+        # Estado de archivo/activo (primero para mayor visibilidad)
+        if item.get('is_archived'):
+            indicators += "📦 "  # Icono que coincide con el botón Archivar
+        if not item.get('is_active', 1):  # Si is_active es 0 o False
+            indicators += "🚫 "  # Icono que coincide con el botón Desactivar
+        # Otros indicadores
+        if item.get('is_list'):
+            indicators += "📝 "
+        if item['is_favorite']:
+            indicators += "⭐ "
+        if item['is_sensitive']:
+            indicators += "🔒 "
+
+        item_name = f"{indicators}{item['label']}"
+        row.setText(1, item_name)
+
+        # Aplicar estilo visual adicional para items desactivados o archivados
+        for col in range(4):
+            if item.get('is_archived') or not item.get('is_active', 1):
+                # Cambiar el color del texto para items desactivados/archivados
+                row.setForeground(col, QBrush(QColor('#888888')))  # Texto gris
+            else:
+                row.setData(col, Qt.ItemDataRole.ForegroundRole, None)
+
+        # Column 2: Item type
+        type_icons = {
+            'CODE': '💻',
+            'URL': '🔗',
+            'PATH': '📂',
+            'TEXT': '📝'
+        }
+        type_icon = type_icons.get(item['type'], '📄')
+        row.setText(2, f"{type_icon} {item['type']}")
 
-            # Build tooltip for category
-            category_tooltip_parts = []
-            category_tooltip_parts.append(f"<b>{category['name']}</b>")
-            category_tooltip_parts.append(f"<b>Items:</b> {len(category['items'])}")
+        # Column 3: Tags + list_group + preview
+        info_parts = []
 
-            # Mostrar estado de categoría
-            if not category.get('is_active', 1):
-                category_tooltip_parts.append("🚫 <b><span style='color: #f44336;'>CATEGORÍA DESACTIVADA</span></b>")
+        # List group (if is_list)
+        if item.get('is_list') and item.get('list_group'):
+            info_parts.append(f"📝 Lista: {item['list_group']}")
 
-            if category['tags']:
-                tags_str = ", ".join([f"#{tag}" for tag in category['tags']])
-                category_tooltip_parts.append(f"<b>Tags:</b> {tags_str}")
+        # Tags
+        if item['tags']:
+            tags_str = ", ".join([f"#{tag}" for tag in item['tags']])
+            info_parts.append(tags_str)
 
-            if category.get('is_predefined'):
-                category_tooltip_parts.append("📌 <b>Categoría predefinida</b>")
+        # Content preview (first 50 chars)
+        if not item['is_sensitive'] and item['content']:
+            preview = item['content'][:50]
+            if len(item['content']) > 50:
+                preview += "..."
+            info_parts.append(f"Preview: {preview}")
 
-            category_tooltip_parts.append("<br><i>Click para expandir/colapsar | Click derecho para opciones</i>")
+        row.setText(3, " | ".join(info_parts))
 
-            category_tooltip_html = "<br>".join(category_tooltip_parts)
-            category_item.setToolTip(1, category_tooltip_html)
-            category_item.setToolTip(2, category_tooltip_html)
-            category_item.setToolTip(3, category_tooltip_html)
+        # Build tooltip with detailed information
+        tooltip_parts = []
+        tooltip_parts.append(f"<b>{item['label']}</b>")
+        tooltip_parts.append(f"<b>Tipo:</b> {item['type']}")
 
-            # Store category ID in user data (column 0 for identification)
-            category_item.setData(0, Qt.ItemDataRole.UserRole, {
-                'type': 'category',
-                'id': category['id']
-            })
+        # Mostrar estado de archivo/activo
+        if item.get('is_archived'):
+            tooltip_parts.append("📦 <b><span style='color: #ff9800;'>ARCHIVADO</span></b>")
+        if not item.get('is_active', 1):
+            tooltip_parts.append("🚫 <b><span style='color: #f44336;'>DESACTIVADO</span></b>")
 
-            # Add items under this category (Level 2)
-            for item in category['items']:
-                item_widget = QTreeWidgetItem(category_item)
-
-                # Column 0: Checkbox
-                item_widget.setFlags(item_widget.flags() | Qt.ItemFlag.ItemIsUserCheckable)
-                item_widget.setCheckState(0, Qt.CheckState.Unchecked)
-
-                # Column 1: Item name with indicators
-                indicators = ""
-                # Estado de archivo/activo (primero para mayor visibilidad)
-                if item.get('is_archived'):
-                    indicators += "📦 "  # Icono que coincide con el botón Archivar
-                if not item.get('is_active', 1):  # Si is_active es 0 o False
-                    indicators += "🚫 "  # Icono que coincide con el botón Desactivar
-                # Otros indicadores
-                if item.get('is_list'):
-                    indicators += "📝 "
-                if item['is_favorite']:
-                    indicators += "⭐ "
-                if item['is_sensitive']:
-                    indicators += "🔒 "
-
-                item_name = f"{indicators}{item['label']}"
-                item_widget.setText(1, item_name)
-
-                # Aplicar estilo visual adicional para items desactivados o archivados
-                if item.get('is_archived') or not item.get('is_active', 1):
-                    # Cambiar el color del texto para items desactivados/archivados
-                    for col in range(4):
-                        item_widget.setForeground(col, QBrush(QColor('#888888')))  # Texto gris
-
-                # Column 2: Item type
-                type_icons = {
-                    'CODE': '💻',
-                    'URL': '🔗',
-                    'PATH': '📂',
-                    'TEXT': '📝'
-                }
-                type_icon = type_icons.get(item['type'], '📄')
-                item_widget.setText(2, f"{type_icon} {item['type']}")
-
-                # Column 3: Tags + list_group + preview
-                info_parts = []
-
-                # List group (if is_list)
-                if item.get('is_list') and item.get('list_group'):
-                    info_parts.append(f"📝 Lista: {item['list_group']}")
-
-                # Tags
-                if item['tags']:
-                    tags_str = ", ".join([f"#{tag}" for tag in item['tags']])
-                    info_parts.append(tags_str)
-
-                # Content preview (first 50 chars)
-                if not item['is_sensitive'] and item['content']:
-                    preview = item['content'][:50]
-                    if len(item['content']) > 50:
-                        preview += "..."
-                    info_parts.append(f"Preview: {preview}")
-
-                item_widget.setText(3, " | ".join(info_parts))
-
-                # Build tooltip with detailed information
-                tooltip_parts = []
-                tooltip_parts.append(f"<b>{item['label']}</b>")
-                tooltip_parts.append(f"<b>Tipo:</b> {item['type']}")
-
-                # Mostrar estado de archivo/activo
-                if item.get('is_archived'):
-                    tooltip_parts.append("📦 <b><span style='color: #ff9800;'>ARCHIVADO</span></b>")
-                if not item.get('is_active', 1):
-                    tooltip_parts.append("🚫 <b><span style='color: #f44336;'>DESACTIVADO</span></b>")
-
-                if item['description']:
-                    tooltip_parts.append(f"<b>Descripción:</b> {item['description']}")
-
-                if item.get('is_list') and item.get('list_group'):
-                    tooltip_parts.append(f"📝 <b>Pertenece a la lista:</b> {item['list_group']}")
-
-                if item['tags']:
-                    tags_str = ", ".join([f"#{tag}" for tag in item['tags']])
-                    tooltip_parts.append(f"<b>Tags:</b> {tags_str}")
-
-                if item['is_favorite']:
-                    tooltip_parts.append("⭐ <b>Favorito</b>")
-
-                if item['is_sensitive']:
-                    tooltip_parts.append("🔒 <b>Contenido sensible (encriptado)</b>")
-                else:
-                    # Show content preview for non-sensitive items
-                    if item['content']:
-                        content_preview = item['content'][:100]
-                        if len(item['content']) > 100:
-                            content_preview += "..."
-                        tooltip_parts.append(f"<b>Contenido:</b><br><code>{content_preview}</code>")
-
-                tooltip_parts.append("<br><i>Doble click para copiar | Click derecho para más opciones</i>")
-
-                tooltip_html = "<br>".join(tooltip_parts)
-                item_widget.setToolTip(1, tooltip_html)
-                item_widget.setToolTip(2, tooltip_html)
-                item_widget.setToolTip(3, tooltip_html)
-
-                # Store item data (column 0 for identification)
-                item_widget.setData(0, Qt.ItemDataRole.UserRole, {
-                    'type': 'item',
-                    'id': item['id'],
-                    'content': item['content'],
-                    'item_type': item['type']
-                })
+        if item['description']:
+            tooltip_parts.append(f"<b>Descripción:</b> {item['description']}")
 
-        logger.info("Tree populated successfully")
+        if item.get('is_list') and item.get('list_group'):
+            tooltip_parts.append(f"📝 <b>Pertenece a la lista:</b> {item['list_group']}")
+
+        if item['tags']:
+            tags_str = ", ".join([f"#{tag}" for tag in item['tags']])
+            tooltip_parts.append(f"<b>Tags:</b> {tags_str}")
+
+        if item['is_favorite']:
+            tooltip_parts.append("⭐ <b>Favorito</b>")
+
+        if item['is_sensitive']:
+            tooltip_parts.append("🔒 <b>Contenido sensible (encriptado)</b>")
+        else:
+            # Show content preview for non-sensitive items
+            if item['content']:
+                content_preview = item['content'][:100]
+                if len(item['content']) > 100:
+                    content_preview += "..."
+                tooltip_parts.append(f"<b>Contenido:</b><br><code>{content_preview}</code>")
+
+        tooltip_parts.append("<br><i>Doble click para copiar | Click derecho para más opciones</i>")
+
+        tooltip_html = "<br>".join(tooltip_parts)
+        row.setToolTip(1, tooltip_html)
+        row.setToolTip(2, tooltip_html)
+        row.setToolTip(3, tooltip_html)
+
+        # Store item data (column 0 for identification)
+        row.setData(0, Qt.ItemDataRole.UserRole, {
+            'type': 'item',
+            'id': item['id'],
+            'content': item['content'],
+            'item_type': item['type']
+        })
 
     def update_statistics(self):
         """Update statistics label"""
@@ -746,6 +786,7 @@ class StructureDashboard(QDialog):
 
         stats_text = " | ".join(stats_parts)
         self.stats_label.setText(stats_text)
+        self.update_toggle_counts()
 
     def get_bold_font(self) -> QFont:
         """Get bold font for categories"""
@@ -763,7 +804,7 @@ class StructureDashboard(QDialog):
 
         if data['type'] == 'item':
             # Copy item content to clipboard
-            content = data.get('content', '')
+            content = reveal_content(data.get('content', ''))
             if content:
                 clipboard = QApplication.clipboard()
                 clipboard.setText(content)
@@ -1579,24 +1620,10 @@ class StructureDashboard(QDialog):
         # Actualizar estado de filtro
         self.set_active_filter('favorites')
 
-        # Filtrar estructura
-        import copy
-        filtered_structure = copy.deepcopy(self.structure)
-
-        # Filter favorite items
-        for category in filtered_structure['categories']:
-            category['items'] = [
-                item for item in category['items']
-                if item.get('is_favorite', False)
-            ]
-
-        # Also apply type filters if active
-        if self.active_type_filters:
-            for category in filtered_structure['categories']:
-                category['items'] = [
-                    item for item in category['items']
-                    if item.get('type') in self.active_type_filters
-                ]
+        # Filter favorite items (and the active type filters) with the flag bitmaps
+        filtered_structure = self.dashboard_manager.filter_items(
+            self.structure, 'favorites', self.active_type_filters
+        )
 
         self.tree_widget.clear()
         self.populate_tree(filtered_structure)
@@ -1615,25 +1642,10 @@ class StructureDashboard(QDialog):
         # Actualizar estado de filtro
         self.set_active_filter('inactive')
 
-        # Filtrar estructura manualmente
-        import copy
-        filtered_structure = copy.deepcopy(self.structure)
-
-        # Filtrar categorías y items inactivos
-        for category in filtered_structure['categories']:
-            # Filtrar items inactivos en esta categoría
-            category['items'] = [
-                item for item in category['items']
-                if not item.get('is_active', 1)  # Solo items con is_active=0
-            ]
-
-        # Also apply type filters if active
-        if self.active_type_filters:
-            for category in filtered_structure['categories']:
-                category['items'] = [
-                    item for item in category['items']
-                    if item.get('type') in self.active_type_filters
-                ]
+        # Filtrar items inactivos (y los tipos activos) con los bitmaps de flags
+        filtered_structure = self.dashboard_manager.filter_items(
+            self.structure, 'inactive', self.active_type_filters
+        )
 
         self.tree_widget.clear()
         self.populate_tree(filtered_structure)
@@ -1652,24 +1664,10 @@ class StructureDashboard(QDialog):
         # Actualizar estado de filtro
         self.set_active_filter('archived')
 
-        # Filtrar estructura manualmente
-        import copy
-        filtered_structure = copy.deepcopy(self.structure)
-
-        # Filtrar items archivados
-        for category in filtered_structure['categories']:
-            category['items'] = [
-                item for item in category['items']
-                if item.get('is_archived', False)  # Solo items con is_archived=True
-            ]
-
-        # Also apply type filters if active
-        if self.active_type_filters:
-            for category in filtered_structure['categories']:
-                category['items'] = [
-                    item for item in category['items']
-                    if item.get('type') in self.active_type_filters
-                ]
+        # Filtrar items archivados (y los tipos activos) con los bitmaps de flags
+        filtered_structure = self.dashboard_manager.filter_items(
+            self.structure, 'archived', self.active_type_filters
+        )
 
         self.tree_widget.clear()
         self.populate_tree(filtered_structure)
@@ -1697,8 +1695,19 @@ class StructureDashboard(QDialog):
             self.filter_buttons[filter_name].setChecked(True)
 
         self.active_filter = filter_name
+        self.update_toggle_counts()
         logger.info(f"Active filter set to: {filter_name}")
 
+    def update_toggle_counts(self):
+        """Show on each state/type toggle how many items it would show"""
+        if not self.structure:
+            return
+        counts = self.dashboard_manager.toggle_counts(
+            self.structure, self.active_filter, self.active_type_filters
+        )
+        for name, button in {**self.filter_buttons, **self.type_filter_buttons}.items():
+            button.setText(f"{self._toggle_labels[name]} ({counts.get(name, 0)})")
+
     def sort_by_items(self):
         """Sort by item count descending"""
         logger.info("Sorting by items count...")
@@ -1730,6 +1739,7 @@ class StructureDashboard(QDialog):
 
         # Apply filters
         self.apply_type_filters()
+        self.update_toggle_counts()
 
     def apply_type_filters(self):
         """Apply active type filters to the tree"""
@@ -1750,36 +1760,10 @@ class StructureDashboard(QDialog):
                 self.update_statistics()
             return
 
-        # Filter structure by types
-        import copy
-        filtered_structure = copy.deepcopy(self.structure)
-
-        # Filter items by type
-        for category in filtered_structure['categories']:
-            category['items'] = [
-                item for item in category['items']
-                if item.get('type') in self.active_type_filters
-            ]
-
-        # Also apply state filter if active
-        if self.active_filter == 'favorites':
-            for category in filtered_structure['categories']:
-                category['items'] = [
-                    item for item in category['items']
-                    if item.get('is_favorite', False)
-                ]
-        elif self.active_filter == 'inactive':
-            for category in filtered_structure['categories']:
-                category['items'] = [
-                    item for item in category['items']
-                    if not item.get('is_active', 1)
-                ]
-        elif self.active_filter == 'archived':
-            for category in filtered_structure['categories']:
-                category['items'] = [
-                    item for item in category['items']
-                    if item.get('is_archived', False)
-                ]
+        # Filter structure by types (and the active state filter) with the flag bitmaps
+        filtered_structure = self.dashboard_manager.filter_items(
+            self.structure, self.active_filter, self.active_type_filters
+        )
 
         self.tree_widget.clear()
         self.populate_tree(filtered_structure)
@@ -1809,6 +1793,87 @@ class StructureDashboard(QDialog):
         self.populate_tree(self.structure)
         self.update_statistics()
 
+    def apply_changes(self, change_set):
+        """
+        Update the tree with a ChangeSet from the change log watcher
+
+        The DashboardManager cache reloads only the changed categories; the
+        tree then updates just the affected rows, keeping checks and expansion.
+        """
+        if self.structure is None or self.structure_loader.is_loading:
+            return
+        if change_set.structure_changed:
+            # Categories created or deleted
+            self.refresh_data()
+            return
+        if not change_set.category_ids:
+            return
+
+        self.patch_loader.load(self._fetch_patch, set(change_set.category_ids), change_set.item_ids)
+
+    def _fetch_patch(self, category_ids: set, item_ids: set) -> dict:
+        """Get the updated structure (runs on a DB reader thread)"""
+        return {
+            'structure': self.dashboard_manager.get_full_structure(),
+            'category_ids': category_ids,
+            'item_ids': item_ids
+        }
+
+    def on_structure_patched(self, data: dict):
+        """Patch the rows of the changed categories and items"""
+        try:
+            self.structure = data['structure']
+            categories = {category['id']: category for category in self.structure.get('categories', [])}
+            rows = {}
+            for index in range(self.tree_widget.topLevelItemCount()):
+                row = self.tree_widget.topLevelItem(index)
+                rows[row.data(0, Qt.ItemDataRole.UserRole)['id']] = row
+
+            filters_active = bool(self.active_filter or self.active_type_filters or self.current_matches)
+            if filters_active or any((category_id in categories) != (category_id in rows)
+                                     for category_id in data['category_ids']):
+                # Filtered view or a category appeared/disappeared: rebuild from memory
+                self.on_structure_loaded(self.structure)
+                return
+
+            for category_id in data['category_ids']:
+                if category_id in rows:
+                    self._patch_category_rows(rows[category_id], categories[category_id], data['item_ids'])
+
+            self.update_statistics()
+            logger.info(f"Dashboard patched: {len(data['category_ids'])} categories, "
+                        f"{len(data['item_ids'])} items changed")
+
+        except Exception as e:
+            logger.error(f"Error patching dashboard: {e}", exc_info=True)
+
+    def _patch_category_rows(self, category_row: QTreeWidgetItem, category: dict, item_ids: set):
+        """Update a category row and insert/update/remove its changed item rows"""
+        self._fill_category_row(category_row, category)
+
+        fresh_ids = {item['id'] for item in category['items']}
+        children = {}
+        for index in reversed(range(category_row.childCount())):
+            child = category_row.child(index)
+            child_id = child.data(0, Qt.ItemDataRole.UserRole)['id']
+            if child_id in item_ids and child_id not in fresh_ids:
+                category_row.removeChild(child)
+                self.selected_items['items'] = [
+                    entry for entry in self.selected_items['items'] if entry[1] != child_id
+                ]
+            else:
+                children[child_id] = child
+
+        # Children keep the items order (created_at), so new rows go at their index
+        for index, item in enumerate(category['items']):
+            child = children.get(item['id'])
+            if child is None:
+                child = self._create_checkable_row()
+                category_row.insertChild(index, child)
+                self._fill_item_row(child, item)
+            elif item['id'] in item_ids:
+                self._fill_item_row(child, item)
+
     def refresh_data(self):
         """Refresh data from database"""
         logger.info("Refreshing dashboard data...")
@@ -2073,7 +2138,7 @@ class StructureDashboard(QDialog):
 
     def copy_item_content(self, data: dict):
         """Copy item content to clipboard"""
-        content = data.get('content', '')
+        content = reveal_content(data.get('content', ''))
         if content:
             clipboard = QApplication.clipboard()
             clipboard.setText(content)
@@ -2097,7 +2162,7 @@ class StructureDashboard(QDialog):
         details.append(f"<b>Nombre:</b> {item_name}")
 
         # Content preview
-        content = data.get('content', '')
+        content = reveal_content(data.get('content', ''))
         if content:
             preview = content[:200]
             if len(content) > 200:
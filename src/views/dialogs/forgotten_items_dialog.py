@@ -15,6 +15,7 @@ from datetime import datetime
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from core.stats_manager import StatsManager
+from utils.timestamps import row_datetime
 import logging
 
 logger = logging.getLogger(__name__)
@@ -206,15 +207,13 @@ class ForgottenItemsDialog(QDialog):
             info_parts = []
 
             if kwargs.get('show_created_date'):
-                created = item.get('created_at', '')
-                if created:
-                    days_ago = self.calculate_days_ago(created)
+                if item.get('created_at'):
+                    days_ago = self.calculate_days_ago(item, 'created_at')
                     info_parts.append(f"Creado hace {days_ago} días")
 
             if kwargs.get('show_last_used'):
-                last_used = item.get('last_used', '')
-                if last_used:
-                    days_ago = self.calculate_days_ago(last_used)
+                if item.get('last_used'):
+                    days_ago = self.calculate_days_ago(item, 'last_used')
                     info_parts.append(f"Último uso hace {days_ago} días")
                 use_count = item.get('use_count', 0)
                 if use_count:
@@ -223,9 +222,8 @@ class ForgottenItemsDialog(QDialog):
             if kwargs.get('show_use_count'):
                 use_count = item.get('use_count', 0)
                 info_parts.append(f"{use_count} usos")
-                last_used = item.get('last_used', '')
-                if last_used:
-                    days_ago = self.calculate_days_ago(last_used)
+                if item.get('last_used'):
+                    days_ago = self.calculate_days_ago(item, 'last_used')
                     info_parts.append(f"hace {days_ago} días")
 
             text += " | ".join(info_parts)
@@ -235,16 +233,16 @@ class ForgottenItemsDialog(QDialog):
             list_item.setData(Qt.ItemDataRole.UserRole, item['id'])
             list_widget.addItem(list_item)
 
-    def calculate_days_ago(self, timestamp: str) -> int:
-        """Calcular días desde timestamp"""
+    def calculate_days_ago(self, item: dict, column: str) -> int:
+        """Calcular días desde el timestamp de una columna del item"""
         try:
-            # Parse SQLite datetime format
-            dt = datetime.strptime(timestamp, "%Y-%m-%d %H:%M:%S")
+            # Columna epoch (<column>_ts) o texto en formato SQLite
+            dt = row_datetime(item, column)
             now = datetime.now()
             delta = now - dt
             return delta.days
         except Exception as e:
-            logger.debug(f"Error parsing timestamp {timestamp}: {e}")
+            logger.debug(f"Error parsing timestamp {item.get(column)}: {e}")
             return 0
 
     def select_all_current_tab(self):
@@ -291,18 +289,16 @@ class ForgottenItemsDialog(QDialog):
         if reply == QMessageBox.StandardButton.Yes:
             # Eliminar items de la base de datos
             try:
-                import sqlite3
-                conn = sqlite3.connect("widget_sidebar.db")
-                cursor = conn.cursor()
-
-                for item_id in selected_ids:
-                    # Eliminar de item_usage_history primero (foreign key)
-                    cursor.execute("DELETE FROM item_usage_history WHERE item_id = ?", (item_id,))
-                    # Eliminar item
-                    cursor.execute("DELETE FROM items WHERE id = ?", (item_id,))
-
-                conn.commit()
-                conn.close()
+                from database.connection_pool import get_connection
+                conn = get_connection("widget_sidebar.db")
+                with conn:
+                    cursor = conn.cursor()
+
+                    for item_id in selected_ids:
+                        # Eliminar de item_usage_history primero (foreign key)
+                        cursor.execute("DELETE FROM item_usage_history WHERE item_id = ?", (item_id,))
+                        # Eliminar item
+                        cursor.execute("DELETE FROM items WHERE id = ?", (item_id,))
 
                 logger.info(f"Deleted {len(selected_ids)} items")
 
@@ -13,6 +13,7 @@ from pathlib import Path
 import logging
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+from core.db_worker import AsyncLoader
 from core.smart_collections_manager import SmartCollectionsManager
 
 logger = logging.getLogger(__name__)
@@ -209,6 +210,15 @@ class SmartCollectionsDialog(QDialog):
         super().__init__(parent)
         self.db_path = self.get_db_path()
         self.manager = SmartCollectionsManager(self.db_path)
+
+        # Contar/verificar sincroniza collection_members (escribe): hilo escritor
+        self.collections_loader = AsyncLoader(self, write=True)
+        self.collections_loader.loaded.connect(self.on_collections_loaded)
+        self.collections_loader.failed.connect(self.on_collections_load_failed)
+        self.check_loader = AsyncLoader(self, write=True)
+        self.check_loader.loaded.connect(self.on_members_checked)
+        self.check_loader.failed.connect(self.on_members_check_failed)
+
         self.init_ui()
         self.load_collections()
 
@@ -353,6 +363,11 @@ class SmartCollectionsDialog(QDialog):
         buttons_layout = QHBoxLayout()
         buttons_layout.addStretch()
 
+        check_btn = QPushButton("🧰 Verificar")
+        check_btn.setToolTip("Comprobar (y reparar) los items guardados de cada colección")
+        check_btn.clicked.connect(self.check_collection_members)
+        buttons_layout.addWidget(check_btn)
+
         refresh_btn = QPushButton("🔄 Actualizar")
         refresh_btn.clicked.connect(self.load_collections)
         buttons_layout.addWidget(refresh_btn)
@@ -364,7 +379,30 @@ class SmartCollectionsDialog(QDialog):
         main_layout.addLayout(buttons_layout)
 
     def load_collections(self, search_query: str = ""):
-        """Cargar y mostrar colecciones"""
+        """Cargar colecciones en segundo plano (on_collections_loaded las muestra)"""
+        self.collections_loader.load(self._fetch_collections, search_query)
+
+    def _fetch_collections(self, search_query: str) -> dict:
+        """
+        Obtener colecciones con conteo de items y estadísticas
+
+        Se ejecuta en el hilo escritor del DBWorker: el conteo pone al día
+        collection_members.
+        """
+        if search_query:
+            collections = self.manager.add_item_counts(
+                self.manager.search_collections(search_query)
+            )
+        else:
+            collections = self.manager.get_all_collections_with_count()
+
+        return {
+            'collections': collections,
+            'stats': self.manager.get_statistics()
+        }
+
+    def on_collections_loaded(self, data: dict):
+        """Mostrar las colecciones cargadas en segundo plano"""
         try:
             # Limpiar container
             while self.collections_layout.count():
@@ -372,16 +410,8 @@ class SmartCollectionsDialog(QDialog):
                 if child.widget():
                     child.widget().deleteLater()
 
-            # Obtener colecciones con conteo de items
-            if search_query:
-                collections = self.manager.search_collections(search_query)
-                # Agregar item_count para cada colección
-                for collection in collections:
-                    collection['item_count'] = self.manager.get_collection_count(collection['id'])
-            else:
-                collections = self.manager.get_all_collections_with_count()
-
             # Crear cards
+            collections = data['collections']
             if collections:
                 for collection in collections:
                     card = SmartCollectionCard(collection, self)
@@ -404,29 +434,50 @@ class SmartCollectionsDialog(QDialog):
             self.collections_layout.addStretch()
 
             # Actualizar estadísticas
-            self.update_statistics()
+            self.update_statistics(data['stats'])
 
         except Exception as e:
             logger.error(f"Error loading smart collections: {e}", exc_info=True)
             QMessageBox.critical(self, "Error", f"Error al cargar colecciones:\n{str(e)}")
 
+    def on_collections_load_failed(self, error: str):
+        """Error al cargar colecciones en segundo plano"""
+        logger.error(f"Error loading smart collections: {error}")
+        QMessageBox.critical(self, "Error", f"Error al cargar colecciones:\n{error}")
+
+    def check_collection_members(self):
+        """Comprobar los miembros materializados y recalcular los que no coincidan"""
+        self.check_loader.load(self.manager.check_members, repair=True)
+
+    def on_members_checked(self, problems: dict):
+        """Informar del resultado de la verificación y recargar"""
+        if problems:
+            QMessageBox.warning(
+                self,
+                "Colecciones reparadas",
+                f"Se recalcularon {len(problems)} colecciones con items desactualizados."
+            )
+        else:
+            QMessageBox.information(self, "Colecciones", "Todas las colecciones están al día.")
+        self.load_collections(self.search_input.text().strip())
+
+    def on_members_check_failed(self, error: str):
+        """Error al verificar colecciones en segundo plano"""
+        logger.error(f"Error checking smart collections: {error}")
+        QMessageBox.critical(self, "Error", f"Error al verificar colecciones:\n{error}")
+
     def filter_collections(self):
         """Filtrar colecciones según el texto de búsqueda"""
         search_query = self.search_input.text().strip()
         self.load_collections(search_query)
 
-    def update_statistics(self):
+    def update_statistics(self, stats: dict):
         """Actualizar estadísticas generales"""
-        try:
-            stats = self.manager.get_statistics()
-            stats_text = (
-                f"📊 Total: {stats['total_collections']} colecciones | "
-                f"✅ Activas: {stats['active_collections']}"
-            )
-            self.stats_label.setText(stats_text)
-        except Exception as e:
-            logger.error(f"Error updating statistics: {e}")
-            self.stats_label.setText("📊 Estadísticas no disponibles")
+        stats_text = (
+            f"📊 Total: {stats['total_collections']} colecciones | "
+            f"✅ Activas: {stats['active_collections']}"
+        )
+        self.stats_label.setText(stats_text)
 
     def create_new_collection(self):
         """Abrir diálogo para crear nueva colección"""
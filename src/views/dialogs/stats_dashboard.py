@@ -22,6 +22,7 @@ import matplotlib.pyplot as plt
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from core.stats_manager import StatsManager
 from core.favorites_manager import FavoritesManager
+from core.db_worker import AsyncLoader
 import logging
 
 logger = logging.getLogger(__name__)
@@ -37,6 +38,14 @@ class StatsDashboard(QDialog):
         super().__init__(parent)
         self.stats_manager = StatsManager()
         self.favorites_manager = FavoritesManager()
+
+        # Consultas de estadísticas fuera del hilo de la UI
+        self.data_loader = AsyncLoader(self)
+        self.data_loader.loaded.connect(self.on_data_loaded)
+        self.data_loader.failed.connect(self.on_data_load_failed)
+        self.usage_loader = AsyncLoader(self)
+        self.usage_loader.loaded.connect(self.on_usage_data_loaded)
+
         self.init_ui()
         self.load_data()
 
@@ -370,24 +379,57 @@ class StatsDashboard(QDialog):
         return card
 
     def load_data(self):
-        """Cargar todos los datos"""
-        try:
-            logger.info("Loading dashboard data...")
-            self.load_summary_data()
-            self.load_usage_data()
-            self.load_categories_data()
-            self.load_performance_data()
-            self.load_health_data()
-            logger.info("Dashboard data loaded successfully")
-        except Exception as e:
-            logger.error(f"Error loading dashboard data: {e}")
-            QMessageBox.critical(self, "Error", f"Error al cargar datos:\n{str(e)}")
-
-    def load_summary_data(self):
-        """Cargar datos del resumen"""
+        """Cargar todos los datos (en segundo plano)"""
+        logger.info("Loading dashboard data...")
+        self.data_loader.load(self._fetch_all_data, self._selected_days())
+
+    def _selected_days(self) -> int:
+        """Días del período seleccionado"""
+        period_text = self.period_combo.currentText()
+        if "7" in period_text:
+            return 7
+        elif "30" in period_text:
+            return 30
+        return 90
+
+    def _fetch_usage_data(self, days: int) -> dict:
+        """Consultar datos de uso (se ejecuta en un hilo lector)"""
+        return {
+            'days': days,
+            'usage_by_day': self.stats_manager.get_usage_by_day(days=days),
+            'usage_by_hour': self.stats_manager.get_usage_by_hour(days=7)
+        }
+
+    def _fetch_all_data(self, days: int) -> dict:
+        """Consultar todos los datos del dashboard (se ejecuta en un hilo lector)"""
+        data = self._fetch_usage_data(days)
+        data.update({
+            'stats': self.stats_manager.get_dashboard_stats(),
+            'most_used': self.stats_manager.get_most_used_items(limit=10),
+            'usage_by_category': self.stats_manager.get_usage_by_category(),
+            'slow_items': self.stats_manager.get_slowest_items(limit=10, min_executions=5),
+            'failing_items': self.stats_manager.get_most_failing_items(limit=10, min_executions=5),
+            'health_report': self.stats_manager.get_health_report()
+        })
+        return data
+
+    def on_data_loaded(self, data: dict):
+        """Mostrar los datos cargados en segundo plano"""
+        self.load_summary_data(data['stats'], data['most_used'])
+        self.on_usage_data_loaded(data)
+        self.load_categories_data(data['usage_by_category'])
+        self.load_performance_data(data['slow_items'], data['failing_items'])
+        self.load_health_data(data['health_report'])
+        logger.info("Dashboard data loaded successfully")
+
+    def on_data_load_failed(self, error: str):
+        """Error al cargar datos en segundo plano"""
+        logger.error(f"Error loading dashboard data: {error}")
+        QMessageBox.critical(self, "Error", f"Error al cargar datos:\n{error}")
+
+    def load_summary_data(self, stats: dict, most_used: list):
+        """Mostrar datos del resumen"""
         try:
-            stats = self.stats_manager.get_dashboard_stats()
-
             # Actualizar cards
             self.update_metric_card(self.total_executions_card, str(stats.get('total_executions', 0)))
             self.update_metric_card(self.week_executions_card, str(stats.get('executions_week', 0)))
@@ -395,7 +437,6 @@ class StatsDashboard(QDialog):
             self.update_metric_card(self.success_rate_card, f"{stats.get('success_rate', 0):.1f}%")
 
             # Gráfico top 10
-            most_used = self.stats_manager.get_most_used_items(limit=10)
             self.plot_top_items(most_used)
 
         except Exception as e:
@@ -448,24 +489,17 @@ class StatsDashboard(QDialog):
             value_label.setText(value)
 
     def load_usage_data(self):
-        """Cargar datos de uso en el tiempo"""
-        try:
-            # Obtener días según selector
-            period_text = self.period_combo.currentText()
-            if "7" in period_text:
-                days = 7
-            elif "30" in period_text:
-                days = 30
-            else:
-                days = 90
+        """Cargar datos de uso en el tiempo (en segundo plano)"""
+        self.usage_loader.load(self._fetch_usage_data, self._selected_days())
 
+    def on_usage_data_loaded(self, data: dict):
+        """Mostrar datos de uso en el tiempo"""
+        try:
             # Uso por día
-            usage_by_day = self.stats_manager.get_usage_by_day(days=days)
-            self.plot_usage_timeline(usage_by_day, days)
+            self.plot_usage_timeline(data['usage_by_day'], data['days'])
 
             # Uso por hora
-            usage_by_hour = self.stats_manager.get_usage_by_hour(days=7)
-            self.plot_usage_by_hour(usage_by_hour)
+            self.plot_usage_by_hour(data['usage_by_hour'])
 
         except Exception as e:
             logger.error(f"Error loading usage data: {e}")
@@ -529,10 +563,9 @@ class StatsDashboard(QDialog):
         """Actualizar gráfico de uso al cambiar período"""
         self.load_usage_data()
 
-    def load_categories_data(self):
-        """Cargar datos de categorías"""
+    def load_categories_data(self, usage_by_category: list):
+        """Mostrar datos de categorías"""
         try:
-            usage_by_category = self.stats_manager.get_usage_by_category()
             self.plot_categories_pie(usage_by_category)
             self.populate_categories_table(usage_by_category)
 
@@ -597,15 +630,13 @@ class StatsDashboard(QDialog):
             percentage = (item['total_uses'] / total_uses * 100) if total_uses > 0 else 0
             self.categories_table.setItem(row, 3, QTableWidgetItem(f"{percentage:.1f}%"))
 
-    def load_performance_data(self):
-        """Cargar datos de rendimiento"""
+    def load_performance_data(self, slow_items: list, failing_items: list):
+        """Mostrar datos de rendimiento"""
         try:
             # Items lentos
-            slow_items = self.stats_manager.get_slowest_items(limit=10, min_executions=5)
             self.populate_slow_items_table(slow_items)
 
             # Items con errores
-            failing_items = self.stats_manager.get_most_failing_items(limit=10, min_executions=5)
             self.populate_error_items_table(failing_items)
 
         except Exception as e:
@@ -652,10 +683,9 @@ class StatsDashboard(QDialog):
             error_rate = item.get('error_rate', 0)
             self.error_items_table.setItem(row, 3, QTableWidgetItem(f"{error_rate:.1f}%"))
 
-    def load_health_data(self):
-        """Cargar datos de salud"""
+    def load_health_data(self, health_report: dict):
+        """Mostrar datos de salud"""
         try:
-            health_report = self.stats_manager.get_health_report()
             self.display_health_report(health_report)
 
         except Exception as e:
@@ -722,18 +752,16 @@ class StatsDashboard(QDialog):
     def optimize_database(self):
         """Optimizar base de datos"""
         try:
-            import sqlite3
-            conn = sqlite3.connect("widget_sidebar.db")
-            cursor = conn.cursor()
-
-            # VACUUM para optimizar
-            cursor.execute("VACUUM")
+            from database.connection_pool import get_connection
+            conn = get_connection("widget_sidebar.db")
+            with conn:
+                cursor = conn.cursor()
 
-            # Analizar para actualizar estadísticas
-            cursor.execute("ANALYZE")
+                # VACUUM para optimizar
+                cursor.execute("VACUUM")
 
-            conn.commit()
-            conn.close()
+                # Analizar para actualizar estadísticas
+                cursor.execute("ANALYZE")
 
             QMessageBox.information(
                 self,
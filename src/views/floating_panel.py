@@ -18,7 +18,12 @@ from views.advanced_filters_window import AdvancedFiltersWindow
 from views.dialogs.list_creator_dialog import ListCreatorDialog
 from views.dialogs.list_editor_dialog import ListEditorDialog
 from core.search_engine import SearchEngine
+from core.search_ranker import get_search_ranker
+from core.fuzzy_index import get_fuzzy_index
 from core.advanced_filter_engine import AdvancedFilterEngine
+from core.flag_index import FlagIndex
+from core.db_worker import AsyncLoader
+from utils.search_keys import fold
 from styles.futuristic_theme import get_theme
 from styles.animations import AnimationSystem, AnimationDurations
 from styles.effects import ParticleEffect, ScanLineEffect
@@ -50,9 +55,17 @@ class FloatingPanel(QWidget):
         self.current_category = None
         self.config_manager = config_manager
         self.list_controller = list_controller  # Controlador de listas
-        self.search_engine = SearchEngine()
+        # Resultados ordenados por calidad de coincidencia y frecencia,
+        # más las coincidencias con errores de escritura
+        self.search_engine = SearchEngine(
+            ranker=get_search_ranker(config_manager.db) if config_manager else None,
+            fuzzy_index=get_fuzzy_index(config_manager.db) if config_manager else None
+        )
         self.filter_engine = AdvancedFilterEngine()  # Motor de filtrado avanzado
         self.all_items = []  # Store all items before filtering
+        self._loaded_filters = None  # Filtros con los que se cargó all_items desde la BD (None = todos)
+        self._flag_index = FlagIndex()  # Bitmaps de flags de all_items (ver _items_flag_index)
+        self._flag_index_items = None  # Lista indexada en _flag_index
         self.all_lists = []  # Store all lists before filtering
         self.current_filters = {}  # Filtros activos actuales
         self.current_state_filter = "normal"  # Filtro de estado actual: normal, archived, inactive, all
@@ -90,6 +103,16 @@ class FloatingPanel(QWidget):
         self.update_timer.timeout.connect(self._save_panel_state_to_db)
         self.update_delay_ms = 1000  # 1 second delay after move/resize
 
+        # Category reloads run off the UI thread
+        self.reload_loader = AsyncLoader(self)
+        self.reload_loader.loaded.connect(self.on_category_reloaded)
+
+        # Incremental updates from the change log (only the changed items)
+        self.patch_loader = AsyncLoader(self)
+        self.patch_loader.loaded.connect(self.on_items_patched)
+        self._item_buttons = {}  # item id -> ItemButton shown in the items section
+        self._items_header = None
+
         self.init_ui()
 
     def init_ui(self):
@@ -417,10 +440,14 @@ class FloatingPanel(QWidget):
         """Load and display items and lists from a category"""
         logger.info(f"Loading category: {category.name} with {len(category.items)} items")
 
+        # Discard any reload still pending for the previous category
+        self.reload_loader.cancel()
+        self.patch_loader.cancel()
         self.current_category = category
 
         # Separar items normales de items de listas
         self.all_items = [item for item in category.items if not item.is_list_item()]
+        self._loaded_filters = None
 
         # Obtener listas si tenemos ListController
         self.all_lists = []
@@ -470,9 +497,7 @@ class FloatingPanel(QWidget):
         # Add items
         for idx, item in enumerate(items):
             logger.debug(f"Creating button {idx+1}/{len(items)}: {item.label}")
-            item_button = ItemButton(item)
-            item_button.item_clicked.connect(self.on_item_clicked)
-            item_button.url_open_requested.connect(self.on_url_open_requested)
+            item_button = self._create_item_button(item)
             self.items_layout.insertWidget(self.items_layout.count() - 1, item_button)
 
         logger.info(f"Successfully added {len(items)} item buttons to layout")
@@ -504,13 +529,12 @@ class FloatingPanel(QWidget):
                 }
             """)
             self.items_layout.insertWidget(self.items_layout.count() - 1, items_header)
+            self._items_header = items_header
 
             # Add items
             for idx, item in enumerate(items):
                 logger.debug(f"Creating item button {idx+1}/{len(items)}: {item.label}")
-                item_button = ItemButton(item)
-                item_button.item_clicked.connect(self.on_item_clicked)
-                item_button.url_open_requested.connect(self.on_url_open_requested)
+                item_button = self._create_item_button(item)
                 self.items_layout.insertWidget(self.items_layout.count() - 1, item_button)
 
         # === SECCIÓN DE LISTAS ===
@@ -568,11 +592,21 @@ class FloatingPanel(QWidget):
 
     def clear_items(self):
         """Clear all item buttons"""
+        self._item_buttons = {}
+        self._items_header = None
         while self.items_layout.count() > 1:  # Keep the stretch at the end
             item = self.items_layout.takeAt(0)
             if item.widget():
                 item.widget().deleteLater()
 
+    def _create_item_button(self, item: Item) -> ItemButton:
+        """Create an ItemButton with its signals connected and track it by item id"""
+        item_button = ItemButton(item)
+        item_button.item_clicked.connect(self.on_item_clicked)
+        item_button.url_open_requested.connect(self.on_url_open_requested)
+        self._item_buttons[int(item.id)] = item_button
+        return item_button
+
     def on_item_clicked(self, item: Item):
         """Handle item click"""
         # Emit signal to parent
@@ -776,41 +810,186 @@ class FloatingPanel(QWidget):
             logger.warning("Cannot reload: no current category or config manager")
             return
 
-        try:
-            # Obtener items actualizados desde DB
-            if hasattr(self.current_category, 'id'):
-                category_id = int(self.current_category.id)
+        # Obtener items actualizados desde DB (en segundo plano)
+        if hasattr(self.current_category, 'id') and hasattr(self.config_manager, 'db'):
+            category_id = int(self.current_category.id)
+            self.reload_loader.load(self._fetch_category_data, category_id, dict(self.current_filters))
+
+    def _fetch_category_data(self, category_id: int, filters: dict = None) -> dict:
+        """
+        Query items and lists of a category (runs on a DB reader thread)
 
-                # Obtener items desde config_manager
-                if hasattr(self.config_manager, 'db'):
-                    all_items_from_db = self.config_manager.db.get_items_by_category(category_id)
+        With advanced filters, the matching ids are queried first (SQL
+        push-down) and only those rows are loaded; 'filters' in the result
+        tells which filters the items were loaded with (None = all items).
+        """
+        db = self.config_manager.db
+        item_ids = None
+        if filters:
+            item_ids = self.filter_engine.filter_item_ids(db, filters, category_id=category_id,
+                                                          exclude_lists=True)
+        if item_ids is None:
+            filters = None
+            rows = db.get_items_by_category(category_id)
+        else:
+            rows_by_id = {row['id']: row for row in db.get_items_by_ids(item_ids)}
+            rows = [rows_by_id[item_id] for item_id in item_ids if item_id in rows_by_id]
+        lists = self.list_controller.get_lists(category_id) if self.list_controller else None
+        return {
+            'category_id': category_id,
+            'items': [Item.from_dict(item_dict) for item_dict in rows],
+            'lists': lists,
+            'filters': filters
+        }
+
+    def on_category_reloaded(self, data: dict):
+        """Re-render the category with the data loaded in background"""
+        try:
+            # Descartar si el panel ya muestra otra categoría
+            if not self.current_category or int(self.current_category.id) != data['category_id']:
+                return
 
-                    # Actualizar items en la categoría
-                    from models.item import Item
-                    self.current_category.items = [Item.from_dict(item_dict) for item_dict in all_items_from_db]
+            # Actualizar items en la categoría (solo si se cargaron todos)
+            self._loaded_filters = data['filters']
+            if self._loaded_filters is None:
+                self.current_category.items = data['items']
 
-                    # Separar items normales
-                    self.all_items = [item for item in self.current_category.items if not item.is_list_item()]
+            # Separar items normales
+            self.all_items = [item for item in data['items'] if not item.is_list_item()]
 
-                    # Recargar listas
-                    if self.list_controller:
-                        self.all_lists = self.list_controller.get_lists(category_id)
+            # Recargar listas
+            if data['lists'] is not None:
+                self.all_lists = data['lists']
 
-                    # Re-renderizar
-                    self.display_items_and_lists(self.all_items, self.all_lists)
+            # Re-renderizar con la búsqueda y los filtros activos
+            self.on_search_changed(self.search_bar.search_input.text())
 
-                    logger.info(f"Category reloaded successfully: {len(self.all_items)} items, {len(self.all_lists)} lists")
+            logger.info(f"Category reloaded successfully: {len(self.all_items)} items, {len(self.all_lists)} lists")
 
         except Exception as e:
             logger.error(f"Error reloading category: {e}", exc_info=True)
 
+    def apply_changes(self, change_set):
+        """
+        Update the panel with a ChangeSet from the change log watcher
+
+        Only the changed items are fetched (in background) and only their
+        buttons are replaced; lists are still reloaded as a whole.
+        """
+        if not self.current_category or not self.config_manager:
+            return
+        try:
+            category_id = int(self.current_category.id)
+        except (TypeError, ValueError):
+            return
+
+        shown_ids = [int(item.id) for item in self.current_category.items]
+        item_ids = change_set.item_ids_for(category_id, shown_ids)
+        category_changed = category_id in change_set.changed_categories
+        if not item_ids and not category_changed:
+            return
+
+        logger.debug(f"Patching {len(item_ids)} changed items in category {category_id}")
+        self.patch_loader.load(self._fetch_changed_items, category_id, sorted(item_ids), category_changed)
+
+    def _fetch_changed_items(self, category_id: int, item_ids: list, category_changed: bool) -> dict:
+        """Query the current rows of the changed items (runs on a DB reader thread)"""
+        rows = self.config_manager.db.get_items_by_ids(item_ids)
+        return {
+            'category_id': category_id,
+            'item_ids': set(item_ids),
+            'items': [self.config_manager._dict_to_item(row) for row in rows
+                      if row['category_id'] == category_id],
+            'category': self.config_manager.db.get_category(category_id) if category_changed else None
+        }
+
+    def on_items_patched(self, data: dict):
+        """Merge the changed items into the panel without rebuilding the others"""
+        try:
+            # Descartar si el panel ya muestra otra categoría
+            if not self.current_category or int(self.current_category.id) != data['category_id']:
+                return
+
+            if data['category']:
+                self.current_category.name = data['category']['name']
+                self.current_category.icon = data['category'].get('icon')
+                self.update_header_title()
+
+            changed_ids = data['item_ids']
+            if not changed_ids:
+                return
+
+            fresh = {int(item.id): item for item in data['items']}
+            old_items = {int(item.id): item for item in self.current_category.items
+                         if int(item.id) in changed_ids}
+
+            # Merge: replace or drop changed items, append new ones (created last)
+            items = []
+            for item in self.current_category.items:
+                item_id = int(item.id)
+                if item_id not in changed_ids:
+                    items.append(item)
+                elif item_id in fresh:
+                    items.append(fresh.pop(item_id))
+            items.extend(fresh.values())
+            self.current_category.items = items
+            self.all_items = [item for item in items if not item.is_list_item()]
+            self._loaded_filters = None
+
+            changed_items = list(old_items.values()) + data['items']
+            if any(item.is_list_item() for item in changed_items):
+                # List steps changed: reload items and list widgets
+                self.reload_current_category()
+            elif self.current_filters or self.search_bar.search_input.text().strip():
+                # Re-apply the active search/filters to the in-memory items
+                self.on_search_changed(self.search_bar.search_input.text())
+            else:
+                self._patch_item_buttons(changed_ids)
+
+            logger.info(f"Panel patched: {len(changed_ids)} items changed")
+
+        except Exception as e:
+            logger.error(f"Error patching category items: {e}", exc_info=True)
+
+    def _patch_item_buttons(self, changed_ids: set):
+        """Replace, remove or insert the buttons of the changed items in place"""
+        if self._items_header is None:
+            # No items section yet: build it from the in-memory items
+            self.display_items_and_lists(self.filter_items_by_state(self.all_items), self.all_lists)
+            return
+
+        for item_id in changed_ids:
+            button = self._item_buttons.pop(item_id, None)
+            if button is not None:
+                self.items_layout.removeWidget(button)
+                button.deleteLater()
+
+        visible_changed = {int(item.id) for item in self.filter_items_by_state(
+            [item for item in self.all_items if int(item.id) in changed_ids])}
+
+        # Walk the items in display order to find each insert position
+        index = self.items_layout.indexOf(self._items_header) + 1
+        for item in self.all_items:
+            item_id = int(item.id)
+            if item_id in visible_changed:
+                self.items_layout.insertWidget(index, self._create_item_button(item))
+            elif item_id not in self._item_buttons:
+                continue
+            index += 1
+
+        if not self._item_buttons:
+            # Last item gone: drop the empty section header
+            self.display_items_and_lists([], self.all_lists)
+            return
+        self._items_header.setText(f"━━━ Items ({len(self._item_buttons)}) ━━━")
+
     def on_search_changed(self, query: str):
         """Handle search query change with filtering"""
         if not self.current_category:
             return
 
         # Aplicar filtros avanzados primero a items
-        filtered_items = self.filter_engine.apply_filters(self.all_items, self.current_filters)
+        filtered_items = self._apply_advanced_filters(self.all_items)
 
         # Aplicar filtro de estado (is_active, is_archived)
         filtered_items = self.filter_items_by_state(filtered_items)
@@ -832,22 +1011,50 @@ class FloatingPanel(QWidget):
             filtered_items = self.search_engine.search_in_category(query, temp_category)
 
             # Buscar en nombres de listas
-            query_lower = query.lower()
+            query_key = fold(query)
             filtered_lists = [
                 list_data for list_data in filtered_lists
-                if query_lower in list_data.get('list_group', '').lower()
+                if query_key in fold(list_data.get('list_group', ''))
             ]
 
         self.display_items_and_lists(filtered_items, filtered_lists)
 
+    def _apply_advanced_filters(self, items: list) -> list:
+        """
+        Apply the advanced filters with the compiled in-memory plan
+
+        Items loaded with the same filters (see _fetch_category_data) already
+        match; filtering them again keeps their order and is cheap.
+        """
+        if not self.current_filters:
+            return items
+        return self.filter_engine.apply_filters(items, self.current_filters,
+                                                flag_index=self._items_flag_index(items))
+
+    def _reapply_filters(self):
+        """Re-apply search and filters after current_filters changed"""
+        if self._loaded_filters is not None and self._loaded_filters != self.current_filters:
+            # all_items only holds the rows that matched the previous filters
+            self.reload_current_category()
+        else:
+            self.on_search_changed(self.search_bar.search_input.text())
+
+    def _items_flag_index(self, items):
+        """FlagIndex of items if it is all_items (rebuilt when the list is replaced), else None"""
+        if items is not self.all_items:
+            return None
+        if self._flag_index_items is not items:
+            self._flag_index.rebuild(items)
+            self._flag_index_items = items
+        return self._flag_index
+
     def on_filters_changed(self, filters: dict):
         """Handle cuando cambian los filtros avanzados"""
         logger.info(f"Filters changed: {filters}")
         self.current_filters = filters
 
         # Re-aplicar búsqueda y filtros
-        current_query = self.search_bar.search_input.text()
-        self.on_search_changed(current_query)
+        self._reapply_filters()
 
         # AUTO-UPDATE: Trigger panel state save with new filters
         if self.is_pinned and self.panel_id and self.config_manager:
@@ -860,8 +1067,7 @@ class FloatingPanel(QWidget):
         self.current_filters = {}
 
         # Re-aplicar búsqueda sin filtros
-        current_query = self.search_bar.search_input.text()
-        self.on_search_changed(current_query)
+        self._reapply_filters()
 
         # AUTO-UPDATE: Trigger panel state save with cleared filters
         if self.is_pinned and self.panel_id and self.config_manager:
@@ -892,20 +1098,29 @@ class FloatingPanel(QWidget):
         Returns:
             Lista de items filtrados según el estado actual
         """
-        if self.current_state_filter == "all":
-            # Mostrar todos los items
+        if self.current_state_filter not in ("normal", "archived", "inactive"):
+            # "all": mostrar todos los items
             return items
-        elif self.current_state_filter == "normal":
+
+        index = self._items_flag_index(items)
+        if index is not None:
+            # Bitmaps de all_items: una operación por filtro, no una comprobación por item
+            state_bits = {
+                "normal": index.active & ~index.archived,
+                "archived": index.archived,
+                "inactive": ~index.active,
+            }[self.current_state_filter]
+            return index.select(state_bits)
+
+        if self.current_state_filter == "normal":
             # Mostrar solo items activos y NO archivados
             return [item for item in items if getattr(item, 'is_active', True) and not getattr(item, 'is_archived', False)]
         elif self.current_state_filter == "archived":
             # Mostrar solo items archivados (independiente de si están activos)
             return [item for item in items if getattr(item, 'is_archived', False)]
-        elif self.current_state_filter == "inactive":
+        else:
             # Mostrar solo items inactivos
             return [item for item in items if not getattr(item, 'is_active', True)]
-        else:
-            return items
 
     def apply_filter_config(self, filter_config: dict):
         """Apply saved filter configuration to panel
@@ -953,8 +1168,7 @@ class FloatingPanel(QWidget):
                     logger.debug(f"Applied search text: {search_text}")
 
             # Trigger filter application
-            current_query = self.search_bar.search_input.text()
-            self.on_search_changed(current_query)
+            self._reapply_filters()
 
             logger.info("Filter configuration applied successfully")
         except Exception as e:
@@ -30,16 +30,18 @@ class GeneralSettings(QWidget):
     # Signal emitted when settings change
     settings_changed = pyqtSignal()
 
-    def __init__(self, config_manager=None, parent=None):
+    def __init__(self, config_manager=None, controller=None, parent=None):
         """
         Initialize general settings
 
         Args:
             config_manager: ConfigManager instance
+            controller: MainController instance (for cache statistics)
             parent: Parent widget
         """
         super().__init__(parent)
         self.config_manager = config_manager
+        self.controller = controller
 
         self.init_ui()
         self.load_settings()
@@ -139,6 +141,30 @@ class GeneralSettings(QWidget):
         io_group.setLayout(io_layout)
         main_layout.addWidget(io_group)
 
+        # Category filter cache group
+        cache_group = QGroupBox("Caché de filtros de categorías")
+        cache_group.setStyleSheet(behavior_group.styleSheet())
+        cache_layout = QVBoxLayout()
+        cache_layout.setSpacing(10)
+
+        self.cache_stats_label = QLabel()
+        self.cache_stats_label.setStyleSheet("font-size: 10pt;")
+        cache_layout.addWidget(self.cache_stats_label)
+
+        cache_buttons_layout = QHBoxLayout()
+        cache_buttons_layout.addStretch()
+        self.refresh_cache_button = QPushButton("Actualizar")
+        self.refresh_cache_button.clicked.connect(self.update_cache_stats)
+        cache_buttons_layout.addWidget(self.refresh_cache_button)
+        self.clear_cache_button = QPushButton("Vaciar caché")
+        self.clear_cache_button.clicked.connect(self.clear_filter_cache)
+        cache_buttons_layout.addWidget(self.clear_cache_button)
+        cache_layout.addLayout(cache_buttons_layout)
+
+        cache_group.setLayout(cache_layout)
+        main_layout.addWidget(cache_group)
+        self.update_cache_stats()
+
         # About group
         about_group = QGroupBox("Acerca de")
         about_group.setStyleSheet(behavior_group.styleSheet())
@@ -226,6 +252,39 @@ class GeneralSettings(QWidget):
         max_history = self.config_manager.get_setting("max_history", 20)
         self.max_history_spin.setValue(max_history)
 
+    def _filter_engine(self):
+        """CategoryFilterEngine of the controller, if any"""
+        return getattr(self.controller, 'category_filter_engine', None)
+
+    def update_cache_stats(self):
+        """Show hit/miss/eviction metrics of the category filter cache"""
+        engine = self._filter_engine()
+        if engine is None:
+            self.cache_stats_label.setText("No disponible")
+            self.refresh_cache_button.setEnabled(False)
+            self.clear_cache_button.setEnabled(False)
+            return
+
+        stats = engine.get_cache_stats()
+        if not stats['cache_enabled']:
+            self.cache_stats_label.setText("Caché desactivada")
+            return
+        self.cache_stats_label.setText(
+            f"Entradas: {stats['cache_size']}/{stats['cache_max_size']} "
+            f"({stats['cached_categories']}/{stats['cache_max_categories']} categorías)<br>"
+            f"Aciertos: {stats['cache_hits']} · Fallos: {stats['cache_misses']} "
+            f"({stats['hit_rate']:.1f}% aciertos)<br>"
+            f"Expulsadas (LRU): {stats['cache_evictions']} · "
+            f"Invalidadas por cambios: {stats['cache_invalidations']}"
+        )
+
+    def clear_filter_cache(self):
+        """Clear the category filter cache and its metrics"""
+        engine = self._filter_engine()
+        if engine is not None:
+            engine.clear_cache()
+        self.update_cache_stats()
+
     def export_config(self):
         """Export configuration to JSON file"""
         if not self.config_manager:
@@ -1,7 +1,7 @@
 """
 Global Search Panel Window - Independent window for searching all items across all categories
 """
-from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QScrollArea, QPushButton
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QScrollArea, QPushButton, QApplication
 from PyQt6.QtCore import Qt, pyqtSignal, QPoint, QEvent
 from PyQt6.QtGui import QFont, QCursor
 import sys
@@ -12,9 +12,19 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from models.item import Item, ItemType
 from views.widgets.item_widget import ItemButton
 from views.widgets.search_bar import SearchBar
+from views.widgets.search_result_widget import SearchResultButton
 from views.advanced_filters_window import AdvancedFiltersWindow
 from core.search_engine import SearchEngine
+from core.search_ranker import get_search_ranker
+from core.fuzzy_index import get_fuzzy_index
+from core.search_session import SearchSession
+from core.query_language import try_compile_query
 from core.advanced_filter_engine import AdvancedFilterEngine
+from core.db_worker import AsyncLoader
+from core.search_worker import AdaptiveDebounce, SearchWorker
+from core.unified_search import KIND_ITEM, SearchResult, UnifiedSearch
+from utils.timestamps import row_datetime
+from utils.search_keys import fold
 
 # Get logger
 logger = logging.getLogger(__name__)
@@ -26,6 +36,10 @@ class GlobalSearchPanel(QWidget):
     # Signal emitted when an item is clicked
     item_clicked = pyqtSignal(object)
 
+    # Signal emitted when a non-item result (notebook tab, bookmark,
+    # clipboard history entry, browser session) is clicked
+    result_clicked = pyqtSignal(object)
+
     # Signal emitted when window is closed
     window_closed = pyqtSignal()
 
@@ -33,8 +47,18 @@ class GlobalSearchPanel(QWidget):
         super().__init__(parent)
         self.db_manager = db_manager
         self.config_manager = config_manager
-        self.search_engine = SearchEngine()
+        # Resultados ordenados por calidad de coincidencia y frecencia,
+        # más las coincidencias con errores de escritura
+        self.search_engine = SearchEngine(
+            ranker=get_search_ranker(db_manager),
+            fuzzy_index=get_fuzzy_index(db_manager) if db_manager else None
+        )
+        # Mientras se escribe, cada consulta filtra los resultados de la anterior
+        # (la sesión solo se usa desde el hilo de búsqueda)
+        self.search_session = SearchSession(self._match_items, key=lambda item: item.id)
         self.filter_engine = AdvancedFilterEngine()  # Motor de filtrado avanzado
+        # Pestañas del bloc de notas, marcadores, historial y sesiones (search_index)
+        self.unified_search = UnifiedSearch(db_manager.db_path) if db_manager else None
         self.all_items = []  # Store all items before filtering
         self.current_filters = {}  # Filtros activos actuales
 
@@ -50,7 +74,19 @@ class GlobalSearchPanel(QWidget):
         self.resize_start_width = 0
         self.resize_edge_width = 15  # Width of the resize edge in pixels (increased)
 
+        # Items are loaded off the UI thread
+        self.items_loader = AsyncLoader(self)
+        self.items_loader.loaded.connect(self.on_items_loaded)
+
+        # Searches run off the UI thread; results arrive in batches and a
+        # newer query cancels the previous one
+        self.search_worker = SearchWorker(self)
+        self.search_worker.batch_ready.connect(self.on_search_batch)
+        self.search_worker.search_finished.connect(self.on_search_finished)
+        self.debounce = AdaptiveDebounce()
+
         self.init_ui()
+        self.search_bar.set_debounce_interval(self.debounce.interval())
 
     def init_ui(self):
         """Initialize the floating panel UI"""
@@ -252,18 +288,30 @@ class GlobalSearchPanel(QWidget):
         main_layout.addWidget(scroll_area)
 
     def load_all_items(self):
-        """Load and display ALL items from ALL categories"""
+        """Show the window and load ALL items from ALL categories in background"""
         if not self.db_manager:
             logger.error("No database manager available")
             return
 
         logger.info("Loading all items for global search")
+        self.items_loader.load(self._fetch_all_items)
+
+        # Show the window
+        self.show()
+        self.raise_()
+        self.activateWindow()
 
+    def _fetch_all_items(self) -> list:
+        """Query all items and convert them to Item objects (runs on a DB reader thread)"""
         # Get all items from database
         items_data = self.db_manager.get_all_items(include_inactive=False)
 
+        # Update the fuzzy index here instead of on the first keystroke
+        if self.search_engine.fuzzy_index:
+            self.search_engine.fuzzy_index.sync()
+
         # Convert dict items to Item objects
-        self.all_items = []
+        all_items = []
         for item_dict in items_data:
             try:
                 # Convert type string to ItemType enum (handle both uppercase and lowercase)
@@ -279,7 +327,11 @@ class GlobalSearchPanel(QWidget):
                     is_sensitive=bool(item_dict.get('is_sensitive', False)),
                     is_favorite=bool(item_dict.get('is_favorite', False)),
                     tags=item_dict.get('tags', []),
-                    description=item_dict.get('description')
+                    description=item_dict.get('description'),
+                    is_active=bool(item_dict.get('is_active', True)),
+                    is_archived=bool(item_dict.get('is_archived', False)),
+                    is_list=bool(item_dict.get('is_list', False)),
+                    list_group=item_dict.get('list_group')
                 )
 
                 # Store category info for display
@@ -287,63 +339,51 @@ class GlobalSearchPanel(QWidget):
                 item.category_icon = item_dict.get('category_icon', '')
                 item.category_color = item_dict.get('category_color', '')
 
-                # Parse date fields from database (SQLite returns strings)
+                # Parse date fields from database (epoch *_ts columns, text as fallback)
                 from datetime import datetime
-                if item_dict.get('created_at'):
-                    try:
-                        # SQLite datetime format: 'YYYY-MM-DD HH:MM:SS' or ISO format
-                        created_at_str = item_dict['created_at']
-                        if 'T' in created_at_str:
-                            # ISO format
-                            item.created_at = datetime.fromisoformat(created_at_str.replace('Z', '+00:00'))
-                        else:
-                            # SQLite format
-                            item.created_at = datetime.strptime(created_at_str, '%Y-%m-%d %H:%M:%S')
-                        logger.debug(f"Parsed created_at for '{item.label}': {item.created_at}")
-                    except (ValueError, TypeError) as e:
-                        logger.warning(f"Could not parse created_at '{item_dict.get('created_at')}': {e}")
-                        item.created_at = datetime.now()
-                else:
-                    logger.debug(f"Item '{item.label}' has no created_at in database")
-
-                if item_dict.get('last_used'):
-                    try:
-                        last_used_str = item_dict['last_used']
-                        if 'T' in last_used_str:
-                            # ISO format
-                            item.last_used = datetime.fromisoformat(last_used_str.replace('Z', '+00:00'))
-                        else:
-                            # SQLite format
-                            item.last_used = datetime.strptime(last_used_str, '%Y-%m-%d %H:%M:%S')
-                    except (ValueError, TypeError) as e:
-                        logger.debug(f"Could not parse last_used '{item_dict.get('last_used')}': {e}")
-                        item.last_used = datetime.now()
+                try:
+                    created_at = row_datetime(item_dict, 'created_at')
+                    if created_at is not None:
+                        item.created_at = created_at
+                    else:
+                        logger.debug(f"Item '{item.label}' has no created_at in database")
+                except (ValueError, TypeError) as e:
+                    logger.warning(f"Could not parse created_at '{item_dict.get('created_at')}': {e}")
+                    item.created_at = datetime.now()
+
+                try:
+                    last_used = row_datetime(item_dict, 'last_used')
+                    if last_used is not None:
+                        item.last_used = last_used
+                except (ValueError, TypeError) as e:
+                    logger.debug(f"Could not parse last_used '{item_dict.get('last_used')}': {e}")
+                    item.last_used = datetime.now()
 
                 # Parse use_count
                 item.use_count = item_dict.get('use_count', 0)
 
-                self.all_items.append(item)
+                # Search keys are built here, not on the first keystroke
+                item.build_search_keys()
+
+                all_items.append(item)
             except Exception as e:
                 logger.error(f"Error converting item {item_dict.get('id')}: {e}")
                 continue
 
+        return all_items
+
+    def on_items_loaded(self, items: list):
+        """Display the items loaded in background"""
+        self.all_items = items
         logger.info(f"Loaded {len(self.all_items)} items from database")
 
         # Update available tags in filters window
         self.filters_window.update_available_tags(self.all_items)
         logger.debug(f"Updated available tags from {len(self.all_items)} items")
 
-        # Clear search bar
+        # Clear search bar: the empty query displays all items (in batches)
         self.search_bar.clear_search()
 
-        # Display all items initially
-        self.display_items(self.all_items)
-
-        # Show the window
-        self.show()
-        self.raise_()
-        self.activateWindow()
-
     def display_items(self, items):
         """Display a list of items"""
         logger.info(f"Displaying {len(items)} items")
@@ -372,46 +412,92 @@ class GlobalSearchPanel(QWidget):
         # Emit signal to parent
         self.item_clicked.emit(item)
 
+    def on_result_clicked(self, result: SearchResult):
+        """Handle click on a non-item result: copy its content (if any)"""
+        if result.content:
+            QApplication.clipboard().setText(result.content)
+        self.result_clicked.emit(result)
+
     def on_search_changed(self, query: str):
-        """Handle search query change with filtering"""
+        """Handle search query change: filter and search on the search thread"""
         logger.debug(f"on_search_changed called with query='{query}'")
-        logger.debug(f"Total items before filter: {len(self.all_items)}")
-        logger.debug(f"Current filters: {self.current_filters}")
+        request_id = self.search_worker.submit(
+            self._run_search, query, self.all_items, dict(self.current_filters)
+        )
+        logger.debug(f"Search {request_id} submitted ({len(self.all_items)} items, "
+                     f"filters: {self.current_filters})")
 
+    def _run_search(self, request, query: str, items: list, filters: dict):
+        """
+        Apply filters and search (runs on the search thread)
+
+        Returns:
+            Matching items best first, or None if a newer search superseded this one
+        """
         # Aplicar filtros avanzados primero
-        filtered_items = self.filter_engine.apply_filters(self.all_items, self.current_filters)
+        filtered_items = self.filter_engine.apply_filters(items, filters)
         logger.debug(f"Items after advanced filters: {len(filtered_items)}")
+        if request.cancelled:
+            return None
 
         # Luego aplicar búsqueda si hay query
-        if query and query.strip():
-            # Search in labels, content, and tags
-            search_results = []
-            query_lower = query.lower()
-
-            for item in filtered_items:
-                # Search in label
-                if query_lower in item.label.lower():
-                    search_results.append(item)
-                    continue
-
-                # Search in content (if not sensitive)
-                if not item.is_sensitive and query_lower in item.content.lower():
-                    search_results.append(item)
-                    continue
-
-                # Search in tags
-                if any(query_lower in tag.lower() for tag in item.tags):
-                    search_results.append(item)
-                    continue
-
-                # Search in description
-                if item.description and query_lower in item.description.lower():
-                    search_results.append(item)
-                    continue
+        plan = try_compile_query(query) if query else None
+        if plan is not None:
+            # Consulta estructurada (tag:git is:fav used>5...): plan compilado y cacheado
+            filtered_items = self.search_engine.rank(plan.filter(filtered_items), plan.text)
+        elif query and query.strip():
+            # Search in labels, content, tags and description (case/accent-insensitive)
+            query_key = fold(query)
+            search_results = self.search_session.search(query_key, filtered_items)
+            logger.debug(f"Search session: {self.search_session.stats()}")
+            if request.cancelled:
+                return None
+
+            fuzzy_scores = self.search_engine.add_fuzzy_matches(
+                query_key.strip(), self.search_session.candidates_by_id(), search_results
+            )
+            if request.cancelled:
+                return None
+            filtered_items = self.search_engine.rank(search_results, query, fuzzy_scores)
+
+            # El resto de entidades, tras los items; los filtros avanzados solo aplican a items
+            if self.unified_search and not filters:
+                if request.cancelled:
+                    return None
+                results = self.unified_search.search(
+                    query, kinds=[kind for kind in self.unified_search.kinds if kind != KIND_ITEM]
+                )
+                filtered_items = filtered_items + [result for kind_results in results.values()
+                                                   for result in kind_results]
+
+        return filtered_items
+
+    def on_search_batch(self, request_id: int, items: list, first: bool):
+        """Show a batch of results (the first one replaces the previous results)"""
+        if first:
+            self.clear_items()
+        for item in items:
+            if isinstance(item, SearchResult):
+                result_button = SearchResultButton(item)
+                result_button.result_clicked.connect(self.on_result_clicked)
+                self.items_layout.insertWidget(self.items_layout.count() - 1, result_button)
+                continue
+            item_button = ItemButton(item, show_category=True)  # show_category=True for global search
+            item_button.item_clicked.connect(self.on_item_clicked)
+            self.items_layout.insertWidget(self.items_layout.count() - 1, item_button)
 
-            filtered_items = search_results
+    def on_search_finished(self, request_id: int, total: int, elapsed_ms: float):
+        """Adapt the search bar debounce to the measured search cost"""
+        interval = self.debounce.record(elapsed_ms)
+        self.search_bar.set_debounce_interval(interval)
+        logger.debug(f"Search {request_id}: {total} results in {elapsed_ms:.1f} ms "
+                     f"(debounce {interval} ms)")
 
-        self.display_items(filtered_items)
+    def _match_items(self, query_key: str, items: list) -> list:
+        """Items whose label, content, tags or description contain the query"""
+        # Label, tags and content (not sensitive) share one precomputed key
+        return [item for item in items
+                if query_key in item.search_text or query_key in item.search_description]
 
     def on_filters_changed(self, filters: dict):
         """Handle cuando cambian los filtros avanzados"""
@@ -527,5 +613,8 @@ class GlobalSearchPanel(QWidget):
         if self.filters_window.isVisible():
             self.filters_window.close()
 
+        # Descartar la búsqueda en curso y los lotes pendientes
+        self.search_worker.cancel()
+
         self.window_closed.emit()
         event.accept()
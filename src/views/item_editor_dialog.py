@@ -658,9 +658,6 @@ class ItemEditorDialog(QDialog):
                     "Éxito",
                     f"El item '{item_data['label']}' se actualizó correctamente."
                 )
-                # Invalidate filter cache
-                if hasattr(self.controller, 'invalidate_filter_cache'):
-                    self.controller.invalidate_filter_cache()
                 self.accept()
 
             else:
@@ -699,9 +696,6 @@ class ItemEditorDialog(QDialog):
                         "Éxito",
                         f"El item '{item_data['label']}' se guardó correctamente."
                     )
-                    # Invalidate filter cache
-                    if hasattr(self.controller, 'invalidate_filter_cache'):
-                        self.controller.invalidate_filter_cache()
                     self.accept()
                 else:
                     logger.error(f"[ItemEditorDialog] Failed to add item")
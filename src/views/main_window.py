@@ -30,6 +30,7 @@ from core.hotkey_manager import HotkeyManager
 from core.tray_manager import TrayManager
 from core.session_manager import SessionManager
 from core.notification_manager import NotificationManager
+from core.change_watcher import ChangeLogWatcher
 
 # Get logger
 logger = logging.getLogger(__name__)
@@ -103,6 +104,14 @@ class MainWindow(QMainWindow):
         # AUTO-RESTORE: Restore pinned panels from database on startup
         self.restore_pinned_panels_on_startup()
 
+        # Incremental refresh of open panels and dashboard (change_log)
+        self.change_watcher = None
+        if self.config_manager:
+            self.change_watcher = ChangeLogWatcher(self.config_manager.db, parent=self)
+            self.change_watcher.changes_detected.connect(self.on_db_changes)
+            self.change_watcher.reload_required.connect(self.on_db_reload_required)
+            self.change_watcher.start()
+
     def init_ui(self):
         """Initialize the user interface"""
         # Window properties
@@ -620,6 +629,27 @@ class MainWindow(QMainWindow):
                 f"Error al abrir navegador:\n{str(e)}"
             )
 
+    def get_open_category_panels(self) -> list:
+        """Floating panel plus pinned panels currently showing a category"""
+        panels = list(self.pinned_panels)
+        if self.floating_panel and self.floating_panel not in panels:
+            panels.append(self.floating_panel)
+        return [panel for panel in panels if panel.current_category]
+
+    def on_db_changes(self, change_set):
+        """Patch open panels and the dashboard with the changed rows only"""
+        for panel in self.get_open_category_panels():
+            panel.apply_changes(change_set)
+        if self.structure_dashboard and self.structure_dashboard.isVisible():
+            self.structure_dashboard.apply_changes(change_set)
+
+    def on_db_reload_required(self):
+        """Change log gap: reload open panels and the dashboard completely"""
+        for panel in self.get_open_category_panels():
+            panel.reload_current_category()
+        if self.structure_dashboard and self.structure_dashboard.isVisible():
+            self.structure_dashboard.refresh_data()
+
     def open_structure_dashboard(self):
         """Open the structure dashboard"""
         try:
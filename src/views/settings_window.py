@@ -131,7 +131,8 @@ class SettingsWindow(QDialog):
         self.hotkey_settings = HotkeySettings(config_manager=self.config_manager)
         self.browser_settings = BrowserSettings(controller=self.controller)
         self.organization_settings = OrganizationSettings(config_manager=self.config_manager)
-        self.general_settings = GeneralSettings(config_manager=self.config_manager)
+        self.general_settings = GeneralSettings(config_manager=self.config_manager,
+                                                controller=self.controller)
 
         # Add tabs
         self.tab_widget.addTab(self.category_editor, "Categorías")
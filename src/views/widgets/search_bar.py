@@ -12,6 +12,7 @@ class SearchBar(QWidget):
     """
     Search bar widget with debouncing
     Emits search_changed signal after 300ms of user inactivity
+    (see set_debounce_interval)
     """
 
     search_changed = pyqtSignal(str)  # Emits search query
@@ -133,6 +134,15 @@ class SearchBar(QWidget):
         """Emit search_changed signal after debounce delay"""
         self.search_changed.emit(self.current_query)
 
+    def set_debounce_interval(self, interval_ms: int):
+        """
+        Change the debounce delay (e.g. adapted to the measured search cost)
+
+        Args:
+            interval_ms: Delay in milliseconds
+        """
+        self.debounce_timer.setInterval(interval_ms)
+
     def clear_search(self):
         """Clear search input and emit empty query"""
         self.search_input.clear()
@@ -0,0 +1,125 @@
+"""
+Search Result Widget
+Fila de la búsqueda global para resultados que no son items (pestañas del
+bloc de notas, marcadores, historial del portapapeles, sesiones)
+"""
+from PyQt6.QtWidgets import QFrame, QHBoxLayout, QVBoxLayout, QLabel
+from PyQt6.QtCore import Qt, pyqtSignal, QTimer
+from PyQt6.QtGui import QFont
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+from core.unified_search import (
+    SearchResult, KIND_BOOKMARK, KIND_CLIPBOARD, KIND_NOTEBOOK_TAB, KIND_SESSION
+)
+
+# Insignia de cada tipo de resultado
+KIND_BADGES = {
+    KIND_NOTEBOOK_TAB: "📝 Bloc de notas",
+    KIND_BOOKMARK: "🔖 Marcador",
+    KIND_CLIPBOARD: "📋 Historial",
+    KIND_SESSION: "🌐 Sesión",
+}
+
+NORMAL_STYLE = """
+    QFrame {
+        background-color: #2d2d2d;
+        border: none;
+        border-bottom: 1px solid #1e1e1e;
+    }
+    QFrame:hover {
+        background-color: #3d3d3d;
+    }
+    QLabel {
+        color: #cccccc;
+        background-color: transparent;
+        border: none;
+    }
+"""
+
+COPIED_STYLE = """
+    QFrame {
+        background-color: #007acc;
+        border: none;
+        border-bottom: 1px solid #005a9e;
+    }
+    QLabel {
+        color: #ffffff;
+        background-color: transparent;
+        border: none;
+        font-weight: bold;
+    }
+"""
+
+
+class SearchResultButton(QFrame):
+    """Resultado de la búsqueda común: título, tipo y dato secundario"""
+
+    # Signals
+    result_clicked = pyqtSignal(object)
+
+    def __init__(self, result: SearchResult, parent=None):
+        super().__init__(parent)
+        self.result = result
+        self.init_ui()
+
+    def init_ui(self):
+        """Initialize row UI"""
+        self.setMinimumHeight(44)
+        self.setCursor(Qt.CursorShape.PointingHandCursor)
+        if self.result.content:
+            preview = self.result.content[:100]
+            if len(self.result.content) > 100:
+                preview += "..."
+            self.setToolTip(preview)
+
+        main_layout = QHBoxLayout(self)
+        main_layout.setContentsMargins(15, 6, 15, 6)
+        main_layout.setSpacing(10)
+
+        text_layout = QVBoxLayout()
+        text_layout.setSpacing(2)
+
+        title_label = QLabel(self.result.title or "(sin título)")
+        title_font = QFont()
+        title_font.setPointSize(10)
+        title_label.setFont(title_font)
+        title_label.setWordWrap(True)
+        text_layout.addWidget(title_label)
+
+        if self.result.subtitle:
+            subtitle_label = QLabel(self.result.subtitle)
+            subtitle_label.setStyleSheet("QLabel { color: #888888; font-size: 8pt; }")
+            text_layout.addWidget(subtitle_label)
+
+        main_layout.addLayout(text_layout, 1)
+
+        badge_label = QLabel(KIND_BADGES.get(self.result.kind, self.result.kind))
+        badge_label.setStyleSheet("""
+            QLabel {
+                background-color: #3d3d3d;
+                color: #f093fb;
+                border-radius: 3px;
+                padding: 2px 8px;
+                font-size: 8pt;
+                font-weight: bold;
+            }
+        """)
+        main_layout.addWidget(badge_label, 0, Qt.AlignmentFlag.AlignTop)
+
+        self.setStyleSheet(NORMAL_STYLE)
+
+    def mousePressEvent(self, event):
+        """Handle mouse press event"""
+        if event.button() == Qt.MouseButton.LeftButton:
+            self.result_clicked.emit(self.result)
+            if self.result.content:
+                # Show copied feedback
+                self.setStyleSheet(COPIED_STYLE)
+                QTimer.singleShot(500, self.reset_style)
+        super().mousePressEvent(event)
+
+    def reset_style(self):
+        """Reset row style to normal"""
+        self.setStyleSheet(NORMAL_STYLE)
@@ -0,0 +1,290 @@
+"""
+Script de testing para AdvancedFilterEngine (core/advanced_filter_engine)
+Prueba que el predicado compilado en una sola pasada devuelve lo mismo
+que aplicar cada filtro por separado (orden y top N incluidos), que los
+planes compilados se reutilizan por su hash canónico y que la traducción a
+SQL devuelve los mismos items que el filtrado en memoria
+"""
+
+import random
+import sys
+import tempfile
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+import logging
+
+# Agregar src al path
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir / 'src'))
+
+from core.advanced_filter_engine import AdvancedFilterEngine, PLAN_CACHE_SIZE, register_sql_functions
+from database.db_manager import DBManager
+from models.item import Item, ItemType
+from utils.timestamps import row_datetime
+
+# Configurar logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+
+TAGS = ['git', 'docker', 'python', 'ops']
+NOW = datetime.now()
+UTC_NOW = datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _items(count: int, rng: random.Random) -> list:
+    items = []
+    for n in range(count):
+        item = Item(
+            item_id=str(n),
+            label=f"{rng.choice(['Deploy', 'build', 'Test', 'lint'])} {rng.randint(0, 50)}",
+            content="comando",
+            item_type=rng.choice(list(ItemType)),
+            is_sensitive=rng.random() < 0.2,
+            is_favorite=rng.random() < 0.3,
+            tags=rng.sample(TAGS, rng.randint(0, 3)),
+            is_list=rng.random() < 0.1,
+        )
+        item.use_count = rng.randint(0, 10)
+        item.created_at = NOW - timedelta(days=rng.randint(0, 60), hours=rng.randint(0, 23))
+        item.last_used = NOW - timedelta(days=rng.randint(0, 120))
+        items.append(item)
+    return items
+
+
+def _reference(items: list, filters: dict) -> list:
+    """Filtros aplicados uno a uno, como hacía el motor antes de compilarlos"""
+    if not filters:
+        return items
+    result = list(items)
+    if filters.get('type'):
+        result = [i for i in result if i.type.value.upper() in [t.upper() for t in filters['type']]]
+    for flag, value_of in (('is_favorite', lambda i: i.is_favorite),
+                           ('is_sensitive', lambda i: i.is_sensitive),
+                           ('has_tags', lambda i: bool(i.tags)),
+                           ('is_list', lambda i: i.is_list_item())):
+        if filters.get(flag) is not None:
+            result = [i for i in result if value_of(i) == filters[flag]]
+    if filters.get('tags'):
+        values = filters['tags']['values']
+        match = all if filters['tags'].get('mode', 'OR').upper() == 'AND' else any
+        result = [i for i in result if i.tags and match(t in i.tags for t in values)]
+    if filters.get('use_count'):
+        operator, value = filters['use_count']['operator'], filters['use_count']['value']
+        compare = {'>': lambda a: a > value, '>=': lambda a: a >= value, '<': lambda a: a < value,
+                   '<=': lambda a: a <= value, '=': lambda a: a == value}.get(operator, lambda a: False)
+        result = [i for i in result if compare(i.use_count)]
+    if filters.get('last_used'):
+        preset = filters['last_used']['preset']
+        if preset == 'never':
+            result = [i for i in result if i.use_count == 0]
+        elif preset in ('last_7_days', 'last_30_days'):
+            start = datetime.now() - timedelta(days=int(preset.split('_')[1]))
+            result = [i for i in result if i.last_used >= start]
+    if filters.get('created_at'):
+        date_filter = filters['created_at']
+        if 'preset' in date_filter:
+            start = datetime.now() - timedelta(days=7)
+            result = [i for i in result if i.created_at >= start]
+        else:
+            result = [i for i in result
+                      if date_filter['custom_from'] <= i.created_at <= date_filter['custom_to']]
+    sort_keys = {
+        'use_count_desc': (lambda x: x.use_count, True),
+        'use_count_asc': (lambda x: x.use_count, False),
+        'recent': (lambda x: x.last_used, True),
+        'oldest': (lambda x: x.created_at, False),
+        'label_asc': (lambda x: x.label.lower(), False),
+        'label_desc': (lambda x: x.label.lower(), True),
+    }
+    if filters.get('sort_by') in sort_keys:
+        key, reverse = sort_keys[filters['sort_by']]
+        result = sorted(result, key=key, reverse=reverse)
+    if filters.get('top_n'):
+        result = result[:filters['top_n']]
+    return result
+
+
+def _random_filters(rng: random.Random) -> dict:
+    filters = {}
+    if rng.random() < 0.4:
+        filters['type'] = [t.value.lower() for t in rng.sample(list(ItemType), 2)]
+    for flag in ('is_favorite', 'is_sensitive', 'has_tags', 'is_list'):
+        if rng.random() < 0.2:
+            filters[flag] = rng.choice([True, False])
+    if rng.random() < 0.4:
+        filters['tags'] = {'values': rng.sample(TAGS, rng.randint(1, 2)), 'mode': rng.choice(['AND', 'OR'])}
+    if rng.random() < 0.4:
+        filters['use_count'] = {'operator': rng.choice(['>', '>=', '<', '<=', '=', '!=']),
+                                'value': rng.randint(0, 10)}
+    if rng.random() < 0.3:
+        filters['last_used'] = {'preset': rng.choice(['last_7_days', 'last_30_days', 'never', 'unknown'])}
+    if rng.random() < 0.3:
+        filters['created_at'] = rng.choice([
+            {'preset': 'last_7_days'},
+            {'custom_from': NOW - timedelta(days=30), 'custom_to': NOW - timedelta(days=10)},
+        ])
+    if rng.random() < 0.5:
+        filters['sort_by'] = rng.choice(['use_count_desc', 'use_count_asc', 'recent',
+                                         'oldest', 'label_asc', 'label_desc', 'unknown'])
+    if rng.random() < 0.4:
+        filters['top_n'] = rng.choice([1, 5, 20, 1000])
+    return filters
+
+
+def test_compiled_matches_sequential():
+    """Test: el predicado fusionado equivale a los filtros aplicados uno a uno"""
+    print("\n" + "="*60)
+    print("TEST 1: UNA PASADA == FILTROS SECUENCIALES")
+    print("="*60)
+
+    rng = random.Random(21)
+    items = _items(400, rng)
+    engine = AdvancedFilterEngine()
+
+    assert engine.apply_filters(items, {}) is items
+    for _ in range(500):
+        filters = _random_filters(rng)
+        expected = _reference(items, filters)
+        assert engine.apply_filters(items, filters) == expected, filters
+    print("  ✓ Mismos items y en el mismo orden (también empates con top N)")
+
+    # Fechas de creación guardadas como texto
+    dated = _items(50, rng)
+    for item in dated[::2]:
+        item.created_at = item.created_at.strftime('%Y-%m-%d %H:%M:%S')
+    date_range = {'created_at': {'custom_from': NOW - timedelta(days=20), 'custom_to': NOW}}
+    filtered = engine.apply_filters(dated, date_range)
+    assert filtered == [item for item in dated
+                        if NOW - timedelta(days=20) <= (
+                            datetime.strptime(item.created_at, '%Y-%m-%d %H:%M:%S')
+                            if isinstance(item.created_at, str) else item.created_at) <= NOW]
+    print("  ✓ created_at en texto convertido en el rango personalizado")
+
+
+def test_plan_cache():
+    """Test: planes compilados reutilizados por forma canónica (LRU)"""
+    print("\n" + "="*60)
+    print("TEST 2: CACHÉ DE PLANES COMPILADOS")
+    print("="*60)
+
+    engine = AdvancedFilterEngine()
+    first = engine.compile({'type': ['TEXT'], 'tags': {'mode': 'OR', 'values': ['git']}})
+    second = engine.compile({'tags': {'values': ['git'], 'mode': 'OR'}, 'type': ['TEXT']})
+    assert first is second and len(engine.cache) == 1
+    print("  ✓ Mismo plan para el mismo filtro con otro orden de claves")
+
+    # Presets relativos: se resuelven al aplicar, no al compilar
+    item = _items(1, random.Random(1))[0]
+    item.last_used = NOW - timedelta(days=6, hours=23)
+    filters = {'last_used': {'preset': 'last_7_days'}}
+    plan = engine.compile(filters)
+    assert plan.apply([item]) == [item]
+    assert plan.apply([item], now=NOW + timedelta(days=1)) == []
+    print("  ✓ Presets de fecha evaluados con la fecha de cada aplicación")
+
+    for value in range(PLAN_CACHE_SIZE + 10):
+        engine.compile({'use_count': {'operator': '>', 'value': value}})
+        # Usado en cada vuelta: nunca es el que se descarta
+        assert engine.compile(filters) is plan
+    assert len(engine.cache) == PLAN_CACHE_SIZE
+    assert engine.compile({'use_count': {'operator': '>', 'value': PLAN_CACHE_SIZE + 9}}) is \
+        engine.cache[next(reversed(engine.cache))]
+    assert first is not engine.compile({'type': ['TEXT'], 'tags': {'mode': 'OR', 'values': ['git']}})
+    print(f"  ✓ Caché LRU acotada a {PLAN_CACHE_SIZE} planes")
+
+
+def _populate(db: DBManager, rng: random.Random) -> list:
+    """Items aleatorios en dos categorías (uso y fechas en UTC, como la app)"""
+    category_ids = [db.add_category("DevOps"), db.add_category("Notas")]
+    labels = ['Deploy', 'deploy', 'Índice', 'árbol', 'Zeta', 'zeta', 'Build']
+    for n in range(300):
+        item_id = db.add_item(
+            rng.choice(category_ids), f"{rng.choice(labels)} {rng.randint(0, 9)}", f"contenido {n}",
+            item_type=rng.choice(['TEXT', 'URL', 'CODE', 'PATH']),
+            is_sensitive=rng.random() < 0.2, is_favorite=rng.random() < 0.3,
+            tags=rng.sample(TAGS + ['Git'], rng.randint(0, 3)),
+            is_list=rng.random() < 0.1,
+        )
+        # Fechas en días completos: muchos empates en el orden
+        created = UTC_NOW - timedelta(days=rng.randint(0, 60))
+        last_used = None if rng.random() < 0.2 else UTC_NOW - timedelta(days=rng.randint(0, 120))
+        db.execute_update(
+            "UPDATE items SET use_count = ?, created_at = ?, last_used = ? WHERE id = ?",
+            (rng.randint(0, 10), created.strftime('%Y-%m-%d 00:00:00'),
+             last_used.strftime('%Y-%m-%d %H:%M:%S') if last_used else None, item_id),
+        )
+    # Tags en CSV (formato antiguo)
+    db.execute_update("UPDATE items SET tags = 'git, docker' WHERE id IN (3, 4)")
+    db.execute_update("UPDATE items SET tags = '' WHERE id = 5")
+    return category_ids
+
+
+def _row_items(db: DBManager, category_id: int) -> list:
+    """Items con los valores de cada fila, en el orden de carga"""
+    items = []
+    rows = sorted(db.get_items_by_category(category_id), key=lambda row: (row['created_at'], row['id']))
+    for row in rows:
+        item = Item(
+            item_id=str(row['id']), label=row['label'], content="",
+            item_type=ItemType(row['type'].lower()),
+            is_sensitive=bool(row['is_sensitive']), is_favorite=bool(row['is_favorite']),
+            tags=row['tags'], is_list=row['is_list'],
+        )
+        item.use_count = row['use_count'] or 0
+        item.created_at = row_datetime(row, 'created_at')
+        item.last_used = row_datetime(row, 'last_used')
+        items.append(item)
+    return items
+
+
+def test_sql_matches_memory():
+    """Test: filtros en SQL == filtros en memoria (combinaciones aleatorias)"""
+    print("\n" + "="*60)
+    print("TEST 3: SQL == EN MEMORIA")
+    print("="*60)
+
+    rng = random.Random(22)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db = DBManager(str(Path(tmp_dir) / "filters_test.db"))
+        category_ids = _populate(db, rng)
+        items = {category_id: _row_items(db, category_id) for category_id in category_ids}
+        conn = db.connect()
+        register_sql_functions(conn)
+        engine = AdvancedFilterEngine()
+        now = datetime.now()
+
+        checked = 0
+        for _ in range(400):
+            filters = _random_filters(rng)
+            plan = engine.compile(filters)
+            assert plan.sql_plan is not None, filters
+            category_id = rng.choice(category_ids)
+            sql, params = plan.sql_plan.sql(category_id=category_id, now=now)
+            from_sql = [row[0] for row in conn.execute(sql, params)]
+            in_memory = [int(item.id) for item in plan.apply(items[category_id], now=now)]
+            assert from_sql == in_memory, f"{filters}: {from_sql} != {in_memory}"
+            checked += len(in_memory)
+        print(f"  ✓ 400 combinaciones, mismos items y orden ({checked} items comparados)")
+
+        # Sin listas, como los paneles flotantes
+        filters = {'has_tags': True, 'sort_by': 'label_asc', 'top_n': 15}
+        panel_items = [item for item in items[category_ids[0]] if not item.is_list_item()]
+        expected = [int(item.id) for item in engine.apply_filters(panel_items, filters)]
+        assert engine.filter_item_ids(db, filters, category_ids[0], exclude_lists=True) == expected
+        print("  ✓ filter_item_ids excluyendo items de lista")
+
+        # Fechas guardadas como texto (filtros de paneles anclados): solo en memoria
+        text_range = {'created_at': {'custom_from': '2025-01-01', 'custom_to': '2025-12-31'}}
+        assert engine.compile(text_range).sql_plan is None
+        assert engine.filter_item_ids(db, text_range) is None
+        print("  ✓ Valores no traducibles: filtrado en memoria")
+        db.close()
+
+
+if __name__ == "__main__":
+    test_compiled_matches_sequential()
+    test_plan_cache()
+    test_sql_matches_memory()
+    print("\n✅ Tests completados")
@@ -0,0 +1,130 @@
+"""
+Script de testing para el caché de CategoryFilterEngine
+Prueba el LRU (orden de expulsión, límites de entradas y de categorías),
+la clave canónica de los filtros, las estadísticas propias de cada entrada
+y que los cambios en categorías (propios o externos) no sirvan resultados
+obsoletos
+"""
+
+import sqlite3
+import sys
+import tempfile
+from pathlib import Path
+import logging
+
+# Agregar src al path
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir / 'src'))
+
+from core.category_filter_engine import CategoryFilterEngine
+from database.connection_pool import close_all_connections
+from database.db_manager import DBManager
+
+# Configurar logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+
+
+def _names(categories) -> list:
+    return [category.name for category in categories]
+
+
+def test_filter_cache_lru():
+    """Test: LRU, clave canónica y estadísticas por entrada"""
+    print("\n" + "="*60)
+    print("TEST 1: CACHÉ LRU")
+    print("="*60)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = str(Path(tmp_dir) / "filter_cache_test.db")
+        db = DBManager(db_path)
+        for name in ("Alfa", "Beta", "Gamma", "Delta"):
+            db.add_category(name)
+        total = len(db.get_categories())
+        engine = CategoryFilterEngine(db_path, cache_max_size=2)
+
+        first = engine.apply_filters({'order_by': 'name', 'limit': 3})
+        engine.apply_filters({'order_by': 'name', 'limit': 1})
+        assert engine.get_filter_stats().filtered_categories == 1
+
+        # Mismos filtros en otro orden: acierto con las estadísticas de esa entrada
+        again = engine.apply_filters({'limit': 3, 'order_by': 'name'})
+        assert _names(again) == _names(first) and again is not first
+        stats = engine.get_filter_stats()
+        assert stats.filtered_categories == 3 and stats.total_categories == total
+        print("  ✓ Clave independiente del orden, estadísticas de la entrada")
+
+        # El resultado devuelto se puede modificar sin tocar el caché
+        again.clear()
+        assert len(engine.apply_filters({'order_by': 'name', 'limit': 3})) == 3
+
+        # limit=1 es la entrada usada hace más tiempo: la nueva la expulsa
+        engine.apply_filters({'order_by': 'name', 'limit': 2})
+        cache_stats = engine.get_cache_stats()
+        assert cache_stats['cache_evictions'] == 1 and cache_stats['cache_size'] == 2
+        hits = cache_stats['cache_hits']
+        engine.apply_filters({'order_by': 'name', 'limit': 3})
+        assert engine.get_cache_stats()['cache_hits'] == hits + 1
+        engine.apply_filters({'order_by': 'name', 'limit': 1})
+        assert engine.get_cache_stats()['cache_misses'] == 4
+        print("  ✓ Expulsión LRU (no FIFO)")
+
+        # Límite de categorías guardadas entre todas las entradas
+        small = CategoryFilterEngine(db_path, cache_max_categories=3)
+        small.apply_filters({'limit': 2})
+        small.apply_filters({'limit': 1})
+        assert small.get_cache_stats()['cached_categories'] == 3
+        small.apply_filters({'limit': 2, 'order_by': 'name'})
+        cache_stats = small.get_cache_stats()
+        assert cache_stats['cached_categories'] <= 3 and cache_stats['cache_evictions'] == 1
+        small.apply_filters({})
+        assert small.get_cache_stats()['cached_categories'] <= 3
+        print("  ✓ Límite de categorías en caché")
+
+        db.close()
+        close_all_connections(db_path)
+
+
+def test_filter_cache_invalidation():
+    """Test: los cambios en categories invalidan los resultados en caché"""
+    print("\n" + "="*60)
+    print("TEST 2: INVALIDACIÓN POR VERSIÓN DE DATOS")
+    print("="*60)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = str(Path(tmp_dir) / "filter_cache_test.db")
+        db = DBManager(db_path)
+        engine = CategoryFilterEngine(db_path)
+        filters = {'search_text': 'Zeta'}
+
+        assert engine.apply_filters(filters) == []
+        category_id = db.add_category("Zeta")
+        assert _names(engine.apply_filters(filters)) == ["Zeta"]
+        assert engine.get_cache_stats()['cache_invalidations'] >= 1
+        print("  ✓ Escritura por DBManager")
+
+        # Escritura de otra conexión (fuera del bus)
+        other = sqlite3.connect(db_path)
+        other.execute("UPDATE categories SET name = 'Zeta 2' WHERE id = ?", (category_id,))
+        other.commit()
+        other.close()
+        assert _names(engine.apply_filters(filters)) == ["Zeta 2"]
+        print("  ✓ Escritura externa (PRAGMA data_version)")
+
+        # Sin el suscriptor que vacía el caché, la versión de la clave basta
+        engine._changes.unsubscribe(engine._on_db_change)
+        db.update_category(category_id, name="Zeta 3")
+        assert len(engine._result_cache) == 1
+        assert _names(engine.apply_filters(filters)) == ["Zeta 3"]
+        print("  ✓ La versión forma parte de la clave")
+
+        db.close()
+        close_all_connections(db_path)
+
+
+if __name__ == "__main__":
+    test_filter_cache_lru()
+    test_filter_cache_invalidation()
+    print("\n✅ Tests completados")
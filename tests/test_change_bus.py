@@ -0,0 +1,216 @@
+"""
+Script de testing para el ChangeBus (versiones de datos y eventos de cambio)
+Prueba los eventos publicados por DBManager, la invalidación por categoría
+de ConfigManager y la detección de escrituras externas (PRAGMA data_version)
+"""
+
+import sys
+import sqlite3
+import tempfile
+import threading
+from pathlib import Path
+import logging
+
+# Agregar src al path
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir / 'src'))
+
+from database.db_manager import DBManager
+from core.config_manager import ConfigManager
+from core.dashboard_manager import DashboardManager
+from core.favorites_manager import FavoritesManager
+
+# Configurar logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+
+
+def test_db_writes_publish_events():
+    """Test: las escrituras de DBManager publican eventos y suben versiones"""
+    print("\n" + "="*60)
+    print("TEST 1: EVENTOS DE DBMANAGER")
+    print("="*60)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db = DBManager(str(Path(tmp_dir) / "bus_test.db"))
+        events = []
+        callback = events.append
+        db.changes.subscribe(callback, tables=('items', 'categories'))
+
+        category_id = db.add_category("Git")
+        item_id = db.add_item(category_id, "Status", "git status")
+        items_version = db.changes.version('items')
+        category_version = db.changes.category_version(category_id)
+
+        db.update_item(item_id, label="Status corto")
+        db.delete_item(item_id)
+        db.set_setting("theme", "dark")  # tabla no suscrita
+
+        assert [(e.table, e.action) for e in events] == [
+            ('categories', 'insert'), ('items', 'insert'), ('items', 'update'), ('items', 'delete')
+        ]
+        assert events[2].ids == (item_id,)
+        assert events[2].category_ids == (category_id,)
+        assert events[2].columns == ('label',)
+        assert events[3].category_ids == (category_id,)
+        assert db.changes.version('items') == items_version + 2
+        assert db.changes.category_version(category_id) == category_version + 2
+        assert db.changes.version('settings') >= 1
+
+        # Las escrituras propias no cuentan como externas
+        assert not db.changes.poll_external()
+        db.changes.unsubscribe(callback)
+        print("  ✓ Eventos con ids, categorías y columnas")
+        db.close()
+
+
+def test_config_cache_refreshes_changed_categories():
+    """Test: ConfigManager recarga solo las categorías modificadas"""
+    print("\n" + "="*60)
+    print("TEST 2: INVALIDACIÓN POR CATEGORÍA")
+    print("="*60)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        config = ConfigManager(db_path=str(Path(tmp_dir) / "bus_test.db"), base_dir=Path(tmp_dir))
+        db = config.db
+        git_id = db.add_category("Git")
+        docker_id = db.add_category("Docker")
+        item_id = db.add_item(git_id, "Status", "git status")
+        db.add_item(docker_id, "PS", "docker ps")
+
+        before = {c.name: c for c in config.get_categories()}
+        assert config.get_categories() is config.get_categories()
+
+        # Cambio de un item: solo se recarga su categoría
+        db.update_item(item_id, label="Status corto")
+        after = {c.name: c for c in config.get_categories()}
+        assert after['Docker'] is before['Docker']
+        assert after['Git'] is not before['Git']
+        assert [i.label for i in after['Git'].items] == ["Status corto"]
+
+        # Los volcados de uso no invalidan la caché
+        cached = config.get_categories()
+        db.update_last_used(item_id)
+        db.flush_usage()
+        assert config.get_categories() is cached
+
+        # Cambios en categorías: recarga completa
+        db.delete_category(docker_id)
+        assert [c.name for c in config.get_categories()] == ["Git"]
+        print("  ✓ Solo las categorías afectadas se recargan")
+        config.close()
+
+
+def test_external_writes_detected():
+    """Test: escrituras de otra conexión se detectan con PRAGMA data_version"""
+    print("\n" + "="*60)
+    print("TEST 3: ESCRITURAS EXTERNAS")
+    print("="*60)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = str(Path(tmp_dir) / "bus_test.db")
+        config = ConfigManager(db_path=db_path, base_dir=Path(tmp_dir))
+        category_id = config.db.add_category("Git")
+        config.db.add_item(category_id, "Status", "git status")
+        assert [i.label for i in config.get_categories()[0].items] == ["Status"]
+
+        # Otro proceso (conexión independiente) renombra el item
+        other = sqlite3.connect(db_path)
+        other.execute("UPDATE items SET label = 'Externo'")
+        other.commit()
+        other.close()
+
+        assert [i.label for i in config.get_categories()[0].items] == ["Externo"]
+        assert not config.db.changes.poll_external()
+        print("  ✓ Cambio externo detectado y caché recargada")
+        config.close()
+
+
+def test_external_write_before_own_commit():
+    """Test: un commit propio no oculta lo escrito antes fuera del bus"""
+    print("\n" + "="*60)
+    print("TEST 4: ESCRITURA EXTERNA SEGUIDA DE UNA PROPIA")
+    print("="*60)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = str(Path(tmp_dir) / "bus_test.db")
+        config = ConfigManager(db_path=db_path, base_dir=Path(tmp_dir))
+        git_id = config.db.add_category("Git")
+        docker_id = config.db.add_category("Docker")
+        config.db.add_item(git_id, "Status", "git status")
+        docker_item_id = config.db.add_item(docker_id, "PS", "docker ps")
+        assert config.get_categories()
+
+        events = []
+        callback = events.append
+        config.db.changes.subscribe(callback)
+
+        # Otro proceso renombra un item y, sin sondear, se escribe por el bus
+        other = sqlite3.connect(db_path)
+        other.execute("UPDATE items SET label = 'Externo' WHERE category_id = ?", (git_id,))
+        other.commit()
+        other.close()
+        config.db.update_item(docker_item_id, label="PS -a")
+
+        assert [event.action for event in events] == ['external', 'update']
+        labels = {c.name: [i.label for i in c.items] for c in config.get_categories()}
+        assert labels == {'Git': ["Externo"], 'Docker': ["PS -a"]}
+        print("  ✓ El cambio externo se publica antes que el propio")
+
+        # Las escrituras de FavoritesManager (pool) también se publican
+        events.clear()
+        item_id = config.get_categories()[0].items[0].id
+        favorites = FavoritesManager(db_path)
+        assert favorites.mark_as_favorite(int(item_id))
+        assert [event.action for event in events] == ['update']
+        assert events[0].table == 'items' and events[0].category_ids
+        assert not config.db.changes.poll_external()
+        print("  ✓ FavoritesManager publica sus cambios")
+
+        config.db.changes.unsubscribe(callback)
+        config.close()
+
+
+def test_dashboard_changes_from_other_thread():
+    """Test: cambios publicados desde otro hilo mientras la UI refresca la estructura"""
+    print("\n" + "="*60)
+    print("TEST 5: CATEGORÍAS PENDIENTES DESDE OTRO HILO")
+    print("="*60)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db = DBManager(str(Path(tmp_dir) / "bus_test.db"))
+        item_ids = []
+        for name in ("Git", "Docker", "Python"):
+            category_id = db.add_category(name)
+            item_ids += [db.add_item(category_id, f"{name} {n}", name) for n in range(3)]
+        dashboard = DashboardManager(db)
+        dashboard.get_full_structure()
+
+        def rename_items():
+            for round_number in range(20):
+                for item_id in item_ids:
+                    db.update_item(item_id, label=f"Item {item_id} v{round_number}")
+
+        writer = threading.Thread(target=rename_items)
+        writer.start()
+        while writer.is_alive():
+            dashboard.get_full_structure()
+        writer.join()
+
+        labels = {item['id']: item['label']
+                  for category in dashboard.get_full_structure()['categories']
+                  for item in category['items']}
+        assert labels == {item_id: f"Item {item_id} v19" for item_id in item_ids}
+        print("  ✓ Ningún cambio se pierde al refrescar la caché")
+        db.close()
+
+
+if __name__ == "__main__":
+    test_db_writes_publish_events()
+    test_config_cache_refreshes_changed_categories()
+    test_external_writes_detected()
+    test_external_write_before_own_commit()
+    test_dashboard_changes_from_other_thread()
+    print("\n✅ Tests completados")
@@ -0,0 +1,172 @@
+"""
+Script de testing para el change_log (cambios incrementales de items y categorías)
+Prueba los triggers, DBManager.get_changes_since y el resumen ChangeSet
+que usan los paneles y el dashboard para actualizar solo las filas afectadas
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+import logging
+
+# Agregar src al path
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir / 'src'))
+
+from database.db_manager import DBManager
+from core.change_watcher import ChangeSet
+
+# Configurar logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+
+
+def test_triggers_log_changes():
+    """Test: los triggers anotan altas, cambios, movimientos y bajas"""
+    print("\n" + "="*60)
+    print("TEST 1: TRIGGERS DEL CHANGE_LOG")
+    print("="*60)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db = DBManager(str(Path(tmp_dir) / "change_log_test.db"))
+        git_id = db.add_category("Git")
+        docker_id = db.add_category("Docker")
+        start = db.get_change_log_seq()
+
+        item_id = db.add_item(git_id, "Status", "git status")
+        db.update_item(item_id, label="Status corto")
+
+        # El uso no genera entradas
+        db.update_last_used(item_id)
+        db.flush_usage()
+
+        db.execute_update("UPDATE items SET category_id = ? WHERE id = ?", (docker_id, item_id))
+        db.delete_item(item_id)
+
+        changes = [(c['entity'], c['entity_id'], c['op'], c['category_id'])
+                   for c in db.get_changes_since(start)]
+        assert changes == [
+            ('item', item_id, 'insert', git_id),
+            ('item', item_id, 'update', git_id),
+            ('item', item_id, 'update', docker_id),
+            ('item', item_id, 'update', git_id),
+            ('item', item_id, 'delete', docker_id),
+        ], changes
+        print("  ✓ Insert, update, movimiento y delete anotados")
+
+        # Borrar una categoría anota también sus items (ON DELETE CASCADE)
+        other_id = db.add_item(git_id, "Log", "git log")
+        seq = db.get_change_log_seq()
+        db.delete_category(git_id)
+        changes = {(c['entity'], c['entity_id'], c['op']) for c in db.get_changes_since(seq)}
+        assert ('category', git_id, 'delete') in changes
+        assert ('item', other_id, 'delete') in changes
+        print("  ✓ Borrado de categoría con sus items")
+        db.close()
+
+
+def test_changes_since_gaps():
+    """Test: get_changes_since pide recarga completa si faltan entradas"""
+    print("\n" + "="*60)
+    print("TEST 2: RECORTE Y LÍMITE")
+    print("="*60)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db = DBManager(str(Path(tmp_dir) / "change_log_test.db"))
+        category_id = db.add_category("Bulk")
+        seq = db.get_change_log_seq()
+        db.add_items_bulk([
+            {'category_id': category_id, 'label': f"Item {i}", 'content': f"echo {i}"}
+            for i in range(5)
+        ])
+
+        assert len(db.get_changes_since(seq)) == 5
+        assert db.get_changes_since(seq, limit=3) is None
+        assert db.get_changes_since(db.get_change_log_seq()) == []
+
+        # Entradas recortadas: el lector se quedó atrás
+        db.execute_update("DELETE FROM change_log WHERE seq <= ?", (seq + 2,))
+        assert db.get_changes_since(seq) is None
+        assert len(db.get_changes_since(seq + 2)) == 3
+        print("  ✓ None si el log se recortó o supera el límite")
+        db.close()
+
+
+def test_change_set_and_items_by_ids():
+    """Test: ChangeSet agrupa por categoría y get_items_by_ids trae las filas"""
+    print("\n" + "="*60)
+    print("TEST 3: CHANGESET Y GET_ITEMS_BY_IDS")
+    print("="*60)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db = DBManager(str(Path(tmp_dir) / "change_log_test.db"))
+        git_id = db.add_category("Git")
+        docker_id = db.add_category("Docker")
+        seq = db.get_change_log_seq()
+
+        status_id = db.add_item(git_id, "Status", "git status", tags=["git"])
+        ps_id = db.add_item(docker_id, "PS", "docker ps")
+        db.execute_update("UPDATE items SET category_id = ? WHERE id = ?", (docker_id, status_id))
+        db.update_category(docker_id, name="Containers")
+
+        change_set = ChangeSet.from_rows(db.get_changes_since(seq))
+        assert change_set.item_ids == {status_id, ps_id}
+        assert change_set.category_ids == {git_id, docker_id}
+        assert change_set.changed_categories == {docker_id}
+        assert not change_set.structure_changed
+        assert change_set.last_seq == db.get_change_log_seq()
+        assert change_set.item_ids_for(git_id) == {status_id}
+        assert change_set.item_ids_for(docker_id) == {status_id, ps_id}
+        assert change_set.item_ids_for(999, shown_ids=[ps_id]) == {ps_id}
+
+        items = db.get_items_by_ids([ps_id, status_id, 12345])
+        assert [item['id'] for item in items] == [status_id, ps_id]
+        assert items[0]['category_id'] == docker_id
+        assert items[0]['tags'] == ["git"]
+
+        seq = db.get_change_log_seq()
+        db.add_category("Nueva")
+        assert ChangeSet.from_rows(db.get_changes_since(seq)).structure_changed
+        print("  ✓ Items agrupados por categoría y filas por id")
+        db.close()
+
+
+def test_new_item_columns_logged():
+    """Test: una columna añadida a items después de crear el trigger también se anota"""
+    print("\n" + "="*60)
+    print("TEST 4: COLUMNAS NUEVAS DE ITEMS")
+    print("="*60)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = str(Path(tmp_dir) / "change_log_test.db")
+        db = DBManager(db_path)
+        category_id = db.add_category("Git")
+        item_id = db.add_item(category_id, "Status", "git status")
+
+        # Migración posterior que añade una columna
+        conn = db.connect()
+        conn.execute("ALTER TABLE items ADD COLUMN notes TEXT")
+        conn.commit()
+        db.close()
+
+        db = DBManager(db_path)
+        start = db.get_change_log_seq()
+        db.execute_update("UPDATE items SET notes = 'ver log' WHERE id = ?", (item_id,))
+        db.update_last_used(item_id)
+        db.flush_usage()
+
+        changes = [(c['entity_id'], c['op']) for c in db.get_changes_since(start)]
+        assert changes == [(item_id, 'update')], changes
+        print("  ✓ Cambio en la columna nueva anotado (el uso sigue sin anotarse)")
+
+        db.close()
+
+
+if __name__ == "__main__":
+    test_triggers_log_changes()
+    test_changes_since_gaps()
+    test_change_set_and_items_by_ids()
+    test_new_item_columns_logged()
+    print("\n✅ Tests completados")
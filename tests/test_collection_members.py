@@ -0,0 +1,200 @@
+"""
+Script de testing para los miembros materializados de Smart Collections
+Prueba que collection_members coincide con ejecutar los filtros en vivo
+tras altas, cambios, movimientos, borrados y renombrados de categorías;
+que solo se evalúan los items que cambiaron; y la reconstrucción completa
+y el verificador de consistencia
+"""
+
+import random
+import sys
+import tempfile
+from pathlib import Path
+import logging
+
+# Agregar src al path
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir / 'src'))
+
+from core.smart_collections_manager import SmartCollectionsManager
+from database.connection_pool import close_all_connections
+from database.db_manager import DBManager
+from database.migrations.add_tag_groups_and_collections import migrate_add_tag_groups_and_collections
+
+# Configurar logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+
+TAGS = ['docker', 'git', 'python', 'wip']
+TYPES = ['TEXT', 'URL', 'CODE', 'PATH']
+
+
+def _setup(tmp_dir: str):
+    """Base de datos con dos categorías, items y colecciones de prueba"""
+    db_path = str(Path(tmp_dir) / "members_test.db")
+    db = DBManager(db_path)
+    categories = [db.add_category("DevOps"), db.add_category("Otros")]
+    rng = random.Random(25)
+    for n in range(40):
+        _add_item(db, rng, categories, n)
+    assert migrate_add_tag_groups_and_collections(db_path)
+
+    manager = SmartCollectionsManager(db_path)
+    manager.create_collection("Docker", query='tag:docker -type:code')
+    manager.create_collection("Favoritos", is_favorite=True, is_archived_filter=False)
+    manager.create_collection("DevOps", query='cat:DevOps')
+    manager.create_collection("Git", search_text='git')
+    manager.create_collection("Sin wip", tags_exclude='wip', item_type='CODE')
+    manager.create_collection("Usados", query='used>0')
+    manager.create_collection("Recientes", query='lastused<7d')
+    return db, db_path, categories, manager, rng
+
+
+def _add_item(db, rng, categories, n) -> int:
+    return db.add_item(rng.choice(categories), f"Item {n} {rng.choice(TAGS)}", f"contenido {n}",
+                       item_type=rng.choice(TYPES), tags=rng.sample(TAGS, rng.randint(0, 2)),
+                       is_favorite=rng.random() < 0.3)
+
+
+def _ids(items) -> list:
+    return sorted(item['id'] for item in items)
+
+
+def _check_all(manager):
+    """Cada colección: igual que ejecutar los filtros en vivo"""
+    counts = {collection['id']: collection['item_count']
+              for collection in manager.get_all_collections_with_count()}
+    for collection in manager.get_all_collections():
+        live = _ids(manager._execute_filters(collection))
+        assert _ids(manager.execute_collection(collection['id'])) == live, collection['name']
+        assert manager.get_collection_count(collection['id']) == len(live), collection['name']
+        assert counts[collection['id']] == len(live), collection['name']
+    assert manager.check_members() == {}
+
+
+def test_incremental_members():
+    """Test: mantenimiento incremental igual que ejecutar en vivo"""
+    print("\n" + "="*60)
+    print("TEST 1: MIEMBROS INCREMENTALES")
+    print("="*60)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db, db_path, categories, manager, rng = _setup(tmp_dir)
+        _check_all(manager)
+
+        # Las colecciones de uso/hora se ejecutan en vivo (sin miembros guardados)
+        conn = manager._get_connection()
+        states = {row[0] for row in conn.execute("SELECT collection_id FROM collection_members_state")}
+        live_ids = {manager.get_collection_by_name(name)['id'] for name in ("Usados", "Recientes")}
+        assert states and not states & live_ids
+        print("  ✓ Colecciones materializadas y en vivo")
+
+        # Espiar la sincronización: solo se evalúan los items cambiados
+        rebuilt, evaluated = [], []
+        rebuild, evaluate = manager._rebuild_members, manager._evaluate_items
+        manager._rebuild_members = lambda conn, collection, *args: (
+            rebuilt.append(collection['id']), rebuild(conn, collection, *args))
+        manager._evaluate_items = lambda conn, collection, item_ids: (
+            evaluated.append(set(item_ids)), evaluate(conn, collection, item_ids))
+
+        item_ids = [row[0] for row in conn.execute("SELECT id FROM items")]
+        for n in range(60):
+            operation = rng.randrange(7)
+            item_id = rng.choice(item_ids)
+            changed = {item_id}
+            if operation == 0:
+                item_id = _add_item(db, rng, categories, 100 + n)
+                item_ids.append(item_id)
+                changed = {item_id}
+            elif operation == 1:
+                db.update_item(item_id, tags=rng.sample(TAGS, rng.randint(0, 2)))
+            elif operation == 2:
+                db.update_item(item_id, is_favorite=rng.random() < 0.5,
+                               is_archived=rng.random() < 0.3, type=rng.choice(TYPES))
+            elif operation == 3:
+                db.update_item(item_id, label=f"Nuevo {rng.choice(TAGS)}")
+            elif operation == 4:
+                db.execute_update("UPDATE items SET category_id = ? WHERE id = ?",
+                                  (rng.choice(categories), item_id))
+            elif operation == 5 and len(item_ids) > 10:
+                db.delete_item(item_id)
+                item_ids.remove(item_id)
+            else:
+                # Uso: no se anota en change_log
+                db.execute_update("UPDATE items SET use_count = use_count + 1, "
+                                  "last_used = CURRENT_TIMESTAMP WHERE id = ?", (item_id,))
+                changed = set()
+
+            evaluated.clear()
+            _check_all(manager)
+            assert all(ids == changed for ids in evaluated), (operation, evaluated, changed)
+        assert rebuilt == []
+        print("  ✓ Solo se evalúan los items cambiados")
+
+        # Renombrar una categoría cambia cat:DevOps para todos sus items
+        db.update_category(categories[0], name="Antes DevOps")
+        db.update_category(categories[1], name="DevOps")
+        _check_all(manager)
+        assert rebuilt == []
+        print("  ✓ Renombrado de categorías")
+
+        db.close()
+        close_all_connections(db_path)
+
+
+def test_rebuild_and_check():
+    """Test: reconstrucción, edición, borrado y verificador de consistencia"""
+    print("\n" + "="*60)
+    print("TEST 2: RECONSTRUCCIÓN Y VERIFICACIÓN")
+    print("="*60)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db, db_path, categories, manager, rng = _setup(tmp_dir)
+        _check_all(manager)
+        conn = manager._get_connection()
+        docker = manager.get_collection_by_name("Docker")
+
+        # Editar la definición recalcula la colección
+        assert manager.update_collection(docker['id'], query='tag:git')
+        _check_all(manager)
+        print("  ✓ Colección editada")
+
+        # Cambios manuales en collection_members: el verificador los detecta
+        conn.execute("DELETE FROM collection_members WHERE collection_id = ?", (docker['id'],))
+        conn.execute("INSERT INTO collection_members (collection_id, item_id) VALUES (?, -1)", (docker['id'],))
+        conn.commit()
+        problems = manager.check_members()
+        assert set(problems) == {docker['id']} and problems[docker['id']]['extra'] == [-1]
+        assert problems[docker['id']]['missing']
+        assert manager.check_members(repair=True) == problems
+        _check_all(manager)
+        print("  ✓ Verificador y reparación")
+
+        # change_log recortado por detrás de una colección: se recalcula
+        for n in range(5):
+            _add_item(db, rng, categories, 200 + n)
+        conn.execute("DELETE FROM change_log")
+        conn.commit()
+        _add_item(db, rng, categories, 300)
+        _check_all(manager)
+        print("  ✓ change_log recortado")
+
+        materialized = manager.rebuild_members()
+        assert materialized == conn.execute("SELECT COUNT(*) FROM collection_members_state").fetchone()[0]
+        _check_all(manager)
+
+        assert manager.delete_collection(docker['id'])
+        assert conn.execute("SELECT COUNT(*) FROM collection_members WHERE collection_id = ?",
+                            (docker['id'],)).fetchone()[0] == 0
+        print("  ✓ Reconstrucción completa y borrado")
+
+        db.close()
+        close_all_connections(db_path)
+
+
+if __name__ == "__main__":
+    test_incremental_members()
+    test_rebuild_and_check()
+    print("\n✅ Tests completados")
@@ -0,0 +1,126 @@
+"""
+Script de testing para el pool de conexiones SQLite
+Prueba las conexiones por hilo, los PRAGMAs de rendimiento y el cierre reutilizable
+"""
+
+import sys
+import tempfile
+import threading
+from pathlib import Path
+import logging
+
+# Agregar src al path
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir / 'src'))
+
+from database.db_manager import DBManager
+from database.connection_pool import get_connection, close_all_connections
+from core.category_filter_engine import CategoryFilterEngine
+from core.favorites_manager import FavoritesManager
+
+# Configurar logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+
+
+def test_pool_per_thread_connections():
+    """Test: una conexión por hilo, reutilizada y con PRAGMAs aplicados"""
+    print("\n" + "="*60)
+    print("TEST 1: CONEXIONES POR HILO")
+    print("="*60)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = str(Path(tmp_dir) / "pool_test.db")
+        DBManager(db_path).close()
+
+        conn = get_connection(db_path)
+        assert get_connection(db_path) is conn
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+        assert conn.execute("PRAGMA busy_timeout").fetchone()[0] > 0
+
+        other = []
+        thread = threading.Thread(target=lambda: other.append(get_connection(db_path)))
+        thread.start()
+        thread.join()
+        assert other[0] is not conn
+        print("  ✓ Conexión reutilizada en el hilo y distinta entre hilos")
+
+        close_all_connections(db_path)
+        assert get_connection(db_path) is not conn
+        close_all_connections(db_path)
+
+
+def test_pool_close_discards_uncommitted():
+    """Test: close() de un gestor descarta lo no confirmado pero no cierra la conexión"""
+    print("\n" + "="*60)
+    print("TEST 2: CLOSE REUTILIZABLE")
+    print("="*60)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = str(Path(tmp_dir) / "pool_test.db")
+        DBManager(db_path).close()
+
+        conn = get_connection(db_path)
+        conn.execute("INSERT INTO categories (name, order_index) VALUES ('uncommitted', 99)")
+        conn.close()
+        assert conn.execute("SELECT COUNT(*) FROM categories WHERE name = 'uncommitted'").fetchone()[0] == 0
+
+        # Los gestores siguen funcionando sobre la conexión compartida
+        conn.execute("INSERT INTO categories (name, order_index, color) VALUES ('Pool', 99, '#123456')")
+        conn.commit()
+        engine = CategoryFilterEngine(db_path)
+        assert '#123456' in engine.get_available_colors()
+        assert get_connection(db_path) is conn
+        print("  ✓ Gestores operando sobre el pool")
+
+        close_all_connections(db_path)
+
+
+def test_failed_write_releases_connection():
+    """Test: una escritura que falla a medias no deja la transacción abierta"""
+    print("\n" + "="*60)
+    print("TEST 3: ERROR A MITAD DE UNA ESCRITURA")
+    print("="*60)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = str(Path(tmp_dir) / "pool_test.db")
+        db = DBManager(db_path)
+        category_id = db.add_category("Git")
+        first_id = db.add_item(category_id, "Status", "git status", is_favorite=True)
+        conn = get_connection(db_path)
+
+        # `with conn:` revierte lo ya ejecutado del bloque y relanza
+        try:
+            with conn:
+                conn.execute("UPDATE items SET label = 'a medias' WHERE id = ?", (first_id,))
+                raise RuntimeError("boom")
+        except RuntimeError:
+            pass
+        assert not conn.in_transaction
+        print("  ✓ with conn: rollback al fallar")
+
+        # El gestor captura el error (segundo id no válido tras el primer UPDATE)
+        favorites = FavoritesManager(db_path)
+        assert not favorites.reorder_favorites([first_id, object()])
+        assert not conn.in_transaction
+
+        # La conexión propia de DBManager puede escribir sin esperar al bloqueo
+        db.add_item(category_id, "Log", "git log")
+        conn.execute("INSERT INTO categories (name, order_index) VALUES ('Después', 99)")
+        conn.commit()
+        row = db.execute_query("SELECT label, favorite_order FROM items WHERE id = ?", (first_id,))[0]
+        assert row == {'label': "Status", 'favorite_order': 0}
+        print("  ✓ Bloqueo de escritura liberado y escritura a medias descartada")
+
+        db.close()
+        close_all_connections(db_path)
+
+
+if __name__ == "__main__":
+    test_pool_per_thread_connections()
+    test_pool_close_discards_uncommitted()
+    test_failed_write_releases_connection()
+    print("\n✅ Tests completados")
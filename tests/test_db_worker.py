@@ -0,0 +1,133 @@
+"""
+Script de testing para el acceso asíncrono a la base de datos
+Prueba el hilo escritor, los hilos lectores y el descarte de resultados obsoletos
+"""
+
+import os
+import sys
+import tempfile
+import time
+import threading
+from pathlib import Path
+import logging
+
+# Agregar src al path
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir / 'src'))
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+from PyQt6.QtWidgets import QApplication
+
+from core.db_worker import DBWorker, AsyncLoader
+from database.connection_pool import close_all_connections
+from database.db_manager import DBManager
+
+# Configurar logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+
+
+def _wait_for(condition, timeout: float = 5.0):
+    """Procesar eventos de Qt hasta que se cumpla la condición"""
+    app = QApplication.instance()
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        app.processEvents()
+        time.sleep(0.01)
+    assert condition(), "Timeout esperando al DBWorker"
+
+
+def test_worker_threads():
+    """Test: escrituras en un único hilo, lecturas fuera del hilo principal"""
+    print("\n" + "="*60)
+    print("TEST 1: HILOS DEL DBWORKER")
+    print("="*60)
+
+    worker = DBWorker(reader_threads=2)
+    try:
+        writer_threads = {worker.submit_write(threading.current_thread).result() for _ in range(5)}
+        assert len(writer_threads) == 1
+        assert next(iter(writer_threads)).name.startswith("db-writer")
+
+        reader = worker.submit_read(threading.current_thread).result()
+        assert reader is not threading.main_thread()
+        assert reader.name.startswith("db-reader")
+        print("  ✓ 1 hilo escritor, lectores fuera del hilo principal")
+    finally:
+        worker.shutdown()
+
+
+def test_async_loader_discards_stale_results():
+    """Test: solo se entrega el resultado de la petición más reciente"""
+    print("\n" + "="*60)
+    print("TEST 2: ASYNCLOADER")
+    print("="*60)
+
+    app = QApplication.instance() or QApplication([])
+    worker = DBWorker(reader_threads=2)
+    try:
+        loader = AsyncLoader(worker=worker)
+        results, errors = [], []
+        loader.loaded.connect(results.append)
+        loader.failed.connect(errors.append)
+
+        release = threading.Event()
+
+        def slow(value):
+            release.wait(5)
+            return value
+
+        loader.load(slow, "stale")
+        loader.load(lambda: "fresh")
+        _wait_for(lambda: results)
+        release.set()
+        time.sleep(0.1)
+        app.processEvents()
+        assert results == ["fresh"]
+
+        loader.load(lambda: 1 / 0)
+        _wait_for(lambda: errors)
+        assert "division" in errors[0]
+        print("  ✓ Resultados obsoletos descartados, errores reportados")
+    finally:
+        worker.shutdown()
+
+
+def test_worker_reads_use_own_connection():
+    """Test: DBManager en un hilo lector no comparte la conexión de la UI"""
+    print("\n" + "="*60)
+    print("TEST 3: CONEXIONES DE DBMANAGER EN LOS HILOS")
+    print("="*60)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = str(Path(tmp_dir) / "worker_test.db")
+        db = DBManager(db_path)
+        worker = DBWorker(reader_threads=1)
+        try:
+            # Escritura sin confirmar en la conexión del hilo principal
+            conn = db.connect()
+            conn.execute("INSERT INTO categories (name, order_index) VALUES ('Sin confirmar', 99)")
+
+            count_query = "SELECT COUNT(*) AS n FROM categories WHERE name = 'Sin confirmar'"
+            assert worker.submit_read(db.connect).result() is not conn
+            assert worker.submit_read(db.execute_query, count_query).result()[0]['n'] == 0
+            conn.rollback()
+            print("  ✓ El lector no ve escrituras sin confirmar")
+
+            category_id = worker.submit_write(db.add_category, "Desde el escritor").result()
+            assert db.execute_query("SELECT name FROM categories WHERE id = ?",
+                                    (category_id,))[0]['name'] == "Desde el escritor"
+            print("  ✓ Escrituras del hilo escritor visibles tras el commit")
+        finally:
+            worker.shutdown()
+            db.close()
+            close_all_connections(db_path)
+
+
+if __name__ == "__main__":
+    test_worker_threads()
+    test_async_loader_discards_stale_results()
+    test_worker_reads_use_own_connection()
+    print("\n✅ Tests completados")
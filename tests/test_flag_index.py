@@ -0,0 +1,197 @@
+"""
+Script de testing para el índice de bitmaps de flags (core/flag_index)
+Prueba que FlagIndex coincide con comprobar cada item (también tras
+altas, cambios y bajas), y los filtros y conteos del dashboard con
+bitmaps (DashboardManager.filter_and_sort_structure, filter_items,
+toggle_counts), incluida la actualización por categoría
+"""
+
+import random
+import sys
+import tempfile
+from pathlib import Path
+import logging
+
+# Agregar src al path
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir / 'src'))
+
+from core.dashboard_manager import DashboardManager
+from core.flag_index import FLAGS, FlagIndex, record_flags
+from database.db_manager import DBManager
+from models.item import Item, ItemType
+
+# Configurar logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+
+TYPES = ['TEXT', 'URL', 'CODE', 'PATH']
+
+
+def _item_dict(item_id: int, rng: random.Random) -> dict:
+    """Item como en la estructura del dashboard"""
+    return {
+        'id': item_id,
+        'label': f"Item {item_id}",
+        'type': rng.choice(TYPES),
+        'is_favorite': rng.random() < 0.3,
+        'is_sensitive': rng.random() < 0.2,
+        'is_active': rng.choice([1, 1, 1, 0]),
+        'is_archived': rng.random() < 0.2,
+        'is_list': rng.random() < 0.1,
+    }
+
+
+def _structure(rng: random.Random, num_categories: int = 12) -> dict:
+    item_id = 0
+    categories = []
+    for category_id in range(1, num_categories + 1):
+        items = []
+        for _ in range(rng.randint(0, 40)):
+            item_id += 1
+            items.append(_item_dict(item_id, rng))
+        categories.append({'id': category_id, 'name': f"Categoría {category_id}", 'items': items})
+    return {'categories': categories}
+
+
+def _check_index(index: FlagIndex, records: list):
+    """Cada bitmap coincide con comprobar cada registro"""
+    for flag_number, flag in enumerate(FLAGS):
+        expected = [record for record in records if record is not None and record_flags(record)[0][flag_number]]
+        assert index.select(getattr(index, flag)) == expected, flag
+        assert index.count(getattr(index, flag)) == len(expected)
+    for item_type in TYPES:
+        expected = [record for record in records if record is not None and record_flags(record)[1] == item_type]
+        assert index.select(index.types_bitmap([item_type.lower()])) == expected
+    assert len(index) == sum(record is not None for record in records)
+
+
+def test_flag_index():
+    """Test: bitmaps iguales a comprobar item a item, con cambios incrementales"""
+    print("\n" + "="*60)
+    print("TEST 1: BITMAPS DE FLAGS Y TIPOS")
+    print("="*60)
+
+    rng = random.Random(23)
+    records = [_item_dict(n, rng) for n in range(200)]
+    index = FlagIndex(records)
+    _check_index(index, records)
+    print("  ✓ Construcción inicial")
+
+    for n in range(300):
+        operation = rng.random()
+        if operation < 0.4:
+            record = _item_dict(1000 + n, rng)
+            assert index.add(record) == len(records)
+            records.append(record)
+        elif operation < 0.7:
+            position = rng.randrange(len(records))
+            if records[position] is not None:
+                records[position] = _item_dict(2000 + n, rng)
+                index.update(position, records[position])
+        else:
+            position = rng.randrange(len(records))
+            index.remove(position)
+            records[position] = None
+    _check_index(index, records)
+    assert index.holes == records.count(None)
+    print("  ✓ Altas, cambios y bajas por posición")
+
+    # Items (no dicts) y combinaciones
+    items = [Item(item_id=str(n), label=f"Item {n}", content="x", item_type=rng.choice(list(ItemType)),
+                  is_favorite=rng.random() < 0.5, is_list=rng.random() < 0.2) for n in range(100)]
+    items[0].is_active = False
+    items_index = FlagIndex(items)
+    bits = items_index.types_bitmap(['CODE', 'URL']) & items_index.favorite & ~items_index.list
+    assert items_index.select(bits) == [
+        item for item in items
+        if item.type in (ItemType.CODE, ItemType.URL) and item.is_favorite and not item.is_list_item()
+    ]
+    assert items_index.select(~items_index.active) == [items[0]]
+    print("  ✓ Items y combinaciones AND/OR/NOT")
+
+
+def _filter_reference(structure: dict, type_filters: dict, state_filters: dict) -> list:
+    """Filtro anterior de filter_and_sort_structure, item a item"""
+    result = []
+    for category in structure['categories']:
+        items = []
+        for item in category['items']:
+            if type_filters and not type_filters.get(item['type'], True):
+                continue
+            if state_filters:
+                is_normal = not item['is_favorite'] and not item['is_sensitive']
+                if not ((state_filters.get('favorites', True) and item['is_favorite'])
+                        or (state_filters.get('sensitive', True) and item['is_sensitive'])
+                        or (state_filters.get('normal', True) and is_normal)):
+                    continue
+            items.append(item['id'])
+        result.append((category['id'], items))
+    return result
+
+
+def _ids(structure: dict) -> list:
+    return [(category['id'], [item['id'] for item in category['items']])
+            for category in structure['categories']]
+
+
+def test_dashboard_filters():
+    """Test: filtros y conteos del dashboard con bitmaps"""
+    print("\n" + "="*60)
+    print("TEST 2: FILTROS Y CONTEOS DEL DASHBOARD")
+    print("="*60)
+
+    rng = random.Random(42)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db = DBManager(str(Path(tmp_dir) / "flags_test.db"))
+        manager = DashboardManager(db)
+        structure = _structure(rng)
+
+        for _ in range(100):
+            type_filters = {t: rng.random() < 0.6 for t in rng.sample(TYPES, rng.randint(0, 4))}
+            state_filters = {s: rng.random() < 0.6 for s in rng.sample(['favorites', 'sensitive', 'normal'],
+                                                                      rng.randint(0, 3))}
+            filtered = manager.filter_and_sort_structure(structure, type_filters, state_filters, sort_by='none')
+            assert _ids(filtered) == _filter_reference(structure, type_filters, state_filters)
+        assert _ids(manager.filter_and_sort_structure(structure, sort_by='none')) == _ids(structure)
+        print("  ✓ filter_and_sort_structure igual que comprobar cada item")
+
+        def toggles_reference(state, types):
+            matches = {
+                'favorites': lambda item: item['is_favorite'],
+                'inactive': lambda item: not item['is_active'],
+                'archived': lambda item: item['is_archived'],
+            }
+            return [(category['id'], [item['id'] for item in category['items']
+                                      if (state is None or matches[state](item))
+                                      and (not types or item['type'] in types)])
+                    for category in structure['categories']]
+
+        for state in (None, 'favorites', 'inactive', 'archived'):
+            for types in (set(), {'URL'}, {'CODE', 'TEXT'}):
+                assert _ids(manager.filter_items(structure, state, types)) == toggles_reference(state, types)
+                counts = manager.toggle_counts(structure, state, types)
+                for name in ('favorites', 'inactive', 'archived'):
+                    assert counts[name] == sum(len(ids) for _, ids in toggles_reference(name, types))
+                for item_type in TYPES:
+                    assert counts[item_type] == sum(len(ids) for _, ids in toggles_reference(state, {item_type}))
+        print("  ✓ Botones de estado/tipo y sus conteos")
+
+        # Refresco de una categoría (como _refresh_stale_categories): solo se reindexa esa
+        positions_before = dict(manager._flag_categories)
+        changed = dict(structure['categories'][3], items=[_item_dict(5000 + n, rng) for n in range(5)])
+        structure = {'categories': structure['categories'][:3] + [changed] + structure['categories'][5:]}
+        assert _ids(manager.filter_items(structure, 'favorites')) == toggles_reference('favorites', set())
+        assert manager._flag_categories[1] is positions_before[1]
+        assert 5 not in manager._flag_categories
+        assert manager.flag_index.holes > 0
+        print("  ✓ Solo las categorías cambiadas se reindexan")
+        db.close()
+
+
+if __name__ == "__main__":
+    test_flag_index()
+    test_dashboard_filters()
+    print("\n✅ Tests completados")
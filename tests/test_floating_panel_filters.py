@@ -0,0 +1,106 @@
+"""
+Script de testing para los filtros avanzados de FloatingPanel
+Prueba que al recargar una categoría con filtros activos solo se cargan
+las filas que los cumplen (SQL push-down) y que al cambiar o quitar los
+filtros se vuelve a cargar lo necesario
+"""
+
+import os
+import sys
+import time
+import tempfile
+from pathlib import Path
+import logging
+
+# Agregar src al path
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir / 'src'))
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+from PyQt6.QtWidgets import QApplication
+
+from core.config_manager import ConfigManager
+from database.connection_pool import close_all_connections
+from views.floating_panel import FloatingPanel
+
+# Configurar logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+
+
+def _wait_for(condition, timeout: float = 5.0):
+    """Procesar eventos de Qt hasta que se cumpla la condición"""
+    app = QApplication.instance()
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timeout"
+        app.processEvents()
+        time.sleep(0.01)
+
+
+def test_reload_loads_only_matching_rows():
+    """Test: recarga con filtros = solo las filas que los cumplen"""
+    print("\n" + "="*60)
+    print("TEST 1: RECARGA CON FILTROS ACTIVOS")
+    print("="*60)
+
+    app = QApplication.instance() or QApplication([])
+    previous_dir = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # Los botones de item abren widget_sidebar.db del directorio actual
+        os.chdir(tmp_dir)
+        try:
+            db_path = str(Path(tmp_dir) / "widget_sidebar.db")
+            config = ConfigManager(db_path=db_path, base_dir=Path(tmp_dir))
+            db = config.db
+            category_id = db.add_category("Git")
+            favorite_ids = [db.add_item(category_id, f"Item {n}", f"git {n}", is_favorite=n % 3 == 0)
+                            for n in range(10)]
+            favorite_ids = favorite_ids[::3]
+
+            panel = FloatingPanel(config_manager=config)
+            panel.load_category(config.get_category(category_id))
+            panel.on_filters_changed({'is_favorite': True})
+            assert sorted(panel._item_buttons) == favorite_ids
+            print("  ✓ Filtro en memoria sobre la categoría ya cargada")
+
+            # Espiar las consultas de la recarga
+            loaded = []
+            by_category, by_ids = db.get_items_by_category, db.get_items_by_ids
+            db.get_items_by_category = lambda *args: (loaded.append('category'), by_category(*args))[1]
+            db.get_items_by_ids = lambda ids: (loaded.append(sorted(ids)), by_ids(ids))[1]
+
+            panel.reload_current_category()
+            _wait_for(lambda: panel._loaded_filters is not None)
+            assert loaded == [favorite_ids]
+            assert sorted(int(item.id) for item in panel.all_items) == favorite_ids
+            assert sorted(panel._item_buttons) == favorite_ids
+            print("  ✓ Solo se cargan las filas de los IDs filtrados en SQL")
+
+            # Otros filtros: all_items no basta, se recarga con los nuevos
+            loaded.clear()
+            panel.on_filters_changed({'is_favorite': False})
+            _wait_for(lambda: panel._loaded_filters == {'is_favorite': False})
+            assert len(loaded) == 1 and loaded[0] != 'category'
+            assert len(panel._item_buttons) == 10 - len(favorite_ids)
+
+            # Sin filtros: recarga completa
+            loaded.clear()
+            panel.on_filters_cleared()
+            _wait_for(lambda: panel._loaded_filters is None and len(panel._item_buttons) == 10)
+            assert loaded == ['category']
+            print("  ✓ Cambiar o quitar filtros recarga lo necesario")
+
+            panel.close()
+            config.close()
+            close_all_connections(db_path)
+        finally:
+            os.chdir(previous_dir)
+    app.processEvents()
+
+
+if __name__ == "__main__":
+    test_reload_loads_only_matching_rows()
+    print("\n✅ Tests completados")
@@ -0,0 +1,136 @@
+"""
+Script de testing para la búsqueda difusa (core/fuzzy_index)
+Prueba errores de escritura (transposición, omisión, prefijo), las
+actualizaciones incrementales, la sincronización con la base de datos y
+las coincidencias difusas en SearchEngine y DashboardManager
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+import logging
+
+# Agregar src al path
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir / 'src'))
+
+from database.db_manager import DBManager
+from core.fuzzy_index import FuzzyIndex, SyncedFuzzyIndex, osa_distance
+from core.search_engine import SearchEngine
+from core.dashboard_manager import DashboardManager
+from models.category import Category
+from models.item import Item
+
+# Configurar logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+
+
+def test_fuzzy_matches():
+    """Test: errores de escritura y actualizaciones incrementales"""
+    print("\n" + "="*60)
+    print("TEST 1: FUZZYINDEX")
+    print("="*60)
+
+    assert osa_distance("dokcer", "docker", 2) == 1
+    assert osa_distance("comit", "commit", 2) == 1
+    assert osa_distance("abc", "xyz", 1) > 1
+    print("  ✓ Distancia OSA (una transposición es un error)")
+
+    index = FuzzyIndex()
+    index.update_item(1, "Docker compose up", ["devops"])
+    index.update_item(2, "git status", ["git"])
+    index.update_item(3, "kubectl get pods", ["k8s"], list_group="Kubernetes")
+    index.update_item(4, "Factura cliente", ["contabilidad"])
+
+    assert [item_id for item_id, _ in index.search("dokcer")] == [1]
+    assert [item_id for item_id, _ in index.search("git stauts")] == [2]
+    assert [item_id for item_id, _ in index.search("kubernets")] == [3]
+    assert [item_id for item_id, _ in index.search("contabilidda")] == [4]
+    # Prefijo con errores mientras se escribe
+    assert [item_id for item_id, _ in index.search("dokc")] == [1]
+    # Todos los términos deben coincidir
+    assert index.search("dokcer stauts") == []
+    assert index.search("zzzzzz") == []
+    print("  ✓ Transposición, omisión, prefijo y varios términos")
+
+    scores = dict(index.search("docker"))
+    assert scores[1] == 1.0
+    assert dict(index.search("dokcer"))[1] < 1.0
+    print("  ✓ La coincidencia exacta puntúa más que la difusa")
+
+    # item_ids restringe los candidatos
+    index.update_item(5, "docker build", [])
+    assert {item_id for item_id, _ in index.search("dokcer")} == {1, 5}
+    assert [item_id for item_id, _ in index.search("dokcer", item_ids={5})] == [5]
+    assert len(index.search("dokcer", limit=1)) == 1
+
+    # Renombrar y borrar actualizan el índice (y la caché de términos)
+    index.update_item(5, "podman build", [])
+    assert [item_id for item_id, _ in index.search("dokcer")] == [1]
+    index.remove_item(1)
+    assert index.search("dokcer") == []
+    assert len(index) == 4
+    print("  ✓ update_item/remove_item incrementales")
+
+
+def test_synced_index():
+    """Test: índice sincronizado con la base de datos y búsquedas difusas"""
+    print("\n" + "="*60)
+    print("TEST 2: SINCRONIZACIÓN Y BÚSQUEDA")
+    print("="*60)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db = DBManager(str(Path(tmp_dir) / "fuzzy_test.db"))
+        category_id = db.add_category("DevOps")
+        docker_id = db.add_item(category_id, "Docker compose", "docker compose up -d")
+        git_id = db.add_item(category_id, "Git status", "git status", tags=["git"])
+        dock_id = db.add_item(category_id, "Dock settings", "defaults write com.apple.dock")
+
+        index = SyncedFuzzyIndex(db)
+        assert [item_id for item_id, _ in index.search("dokcer")] == [docker_id]
+
+        # Los cambios llegan por el ChangeBus
+        db.update_item(git_id, label="Docker logs")
+        assert {item_id for item_id, _ in index.search("dokcer")} == {docker_id, git_id}
+        db.delete_item(docker_id)
+        assert [item_id for item_id, _ in index.search("dokcer")] == [git_id]
+        # Los usos no reconstruyen nada
+        db.update_last_used(git_id)
+        db.flush_usage()
+        assert not index._stale_ids
+        print("  ✓ SyncedFuzzyIndex sigue las escrituras")
+
+        # SearchEngine: primero las coincidencias exactas, luego las difusas
+        category = Category(category_id=str(category_id), name="DevOps", icon="")
+        category.items = [
+            Item(item_id=str(git_id), label="Docker logs", content="docker logs -f"),
+            Item(item_id=str(dock_id), label="Dock settings", content="defaults write"),
+        ]
+        engine = SearchEngine(fuzzy_index=index)
+        assert [item.label for item in engine.search_in_category("dock", category)] == \
+            ["Docker logs", "Dock settings"]
+        assert [item.label for item in engine.search_in_category("dokcer", category)] == ["Docker logs"]
+        assert SearchEngine().search_in_category("dokcer", category) == []
+        print("  ✓ SearchEngine añade coincidencias difusas")
+
+        # DashboardManager: coincidencias 'fuzzy' detrás de las exactas
+        dashboard = DashboardManager(db)
+        structure = dashboard.get_full_structure(force_refresh=True)
+        scope = {'categories': True, 'items': True, 'tags': True, 'content': True}
+        matches = dashboard.search("dokcer", scope, structure)
+        assert [match[0] for match in matches] == ['fuzzy']
+        item = structure['categories'][matches[0][1]]['items'][matches[0][2]]
+        assert item['id'] == git_id
+        assert dashboard.search("dokcer", {'categories': True, 'items': False,
+                                           'tags': False, 'content': False}, structure) == []
+        print("  ✓ DashboardManager.search devuelve coincidencias 'fuzzy'")
+        db.close()
+
+
+if __name__ == "__main__":
+    test_fuzzy_matches()
+    test_synced_index()
+    print("\n✅ Tests completados")
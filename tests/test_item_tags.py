@@ -0,0 +1,132 @@
+"""
+Script de testing para la tabla normalizada item_tags
+Prueba el match exacto de tags, la sincronización en add/update/delete y la migración legacy
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+import logging
+
+# Agregar src al path
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir / 'src'))
+
+from database.db_manager import DBManager
+from core.dashboard_manager import DashboardManager
+from database.migrations import add_item_tags
+
+# Configurar logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+
+
+def _item_tags(db: DBManager, item_id: int) -> list:
+    """Tags normalizados de un item"""
+    rows = db.execute_query("""
+        SELECT t.name FROM item_tags it JOIN tags t ON t.id = it.tag_id
+        WHERE it.item_id = ? ORDER BY t.name
+    """, (item_id,))
+    return [row['name'] for row in rows]
+
+
+def test_item_tags_sync():
+    """Test de sincronización de item_tags en add/update/delete"""
+    print("\n" + "="*60)
+    print("TEST 1: SINCRONIZACIÓN DE ITEM_TAGS")
+    print("="*60)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db = DBManager(str(Path(tmp_dir) / "tags_test.db"))
+        category_id = db.add_category("Dev")
+
+        git_id = db.add_item(category_id, "Git status", "git status", tags=["git", "cli", "Git"])
+        gh_id = db.add_item(category_id, "Open GitHub", "https://github.com", tags=["github"])
+
+        assert _item_tags(db, git_id) == ["cli", "git"]
+        assert _item_tags(db, gh_id) == ["github"]
+
+        # "git" ya no coincide con "github" (antes LIKE '%git%')
+        counts = dict(db.get_tag_counts())
+        print(f"  Conteos: {counts}")
+        assert counts == {"git": 1, "cli": 1, "github": 1}
+
+        db.update_item(git_id, tags=["vcs", "GIT"])
+        assert _item_tags(db, git_id) == ["git", "vcs"]
+
+        db.delete_item(gh_id)
+        assert _item_tags(db, gh_id) == []
+        assert dict(db.get_tag_counts()) == {"git": 1, "vcs": 1}
+        print("  ✓ item_tags sincronizado")
+
+        db.close()
+
+
+def test_item_tags_legacy_backfill():
+    """Test: al reabrir una BD sin item_tags se migran los tags JSON y CSV"""
+    print("\n" + "="*60)
+    print("TEST 2: MIGRACIÓN DE TAGS LEGACY")
+    print("="*60)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = str(Path(tmp_dir) / "tags_test.db")
+        db = DBManager(db_path)
+        category_id = db.add_category("Dev")
+
+        conn = db.connect()
+        add_item_tags.downgrade(conn)
+        conn.execute("""
+            INSERT INTO items (category_id, label, content, tags)
+            VALUES (?, 'JSON', 'a', '["docker", " compose "]'),
+                   (?, 'CSV', 'b', 'docker,k8s,,'),
+                   (?, 'Sin tags', 'c', NULL)
+        """, (category_id, category_id, category_id))
+        conn.commit()
+        db.close()
+
+        db = DBManager(db_path)
+        counts = dict(db.get_tag_counts())
+        print(f"  Conteos migrados: {counts}")
+        assert counts == {"docker": 2, "compose": 1, "k8s": 1}
+
+        db.close()
+
+
+def test_tag_search_and_cloud():
+    """Test: search_items y la nube de tags usan item_tags"""
+    print("\n" + "="*60)
+    print("TEST 3: BÚSQUEDA Y NUBE DE TAGS")
+    print("="*60)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db = DBManager(str(Path(tmp_dir) / "tags_test.db"))
+        category_id = db.add_category("Dev")
+
+        git_id = db.add_item(category_id, "Status", "status", tags=["git"])
+        db.add_item(category_id, "Open page", "https://example.com", tags=["github"])
+
+        assert [item['id'] for item in db.search_items("git")] == [git_id]
+        assert [item['id'] for item in db.search_items("GIT")] == [git_id]
+        print("  ✓ El tag \"git\" no coincide con \"github\" en search_items")
+
+        db.add_item(category_id, "Log", "log", tags=["git"])
+        dashboard = DashboardManager(db)
+        cloud = dashboard.get_tag_cloud()
+        print(f"  Nube: {cloud}")
+        assert cloud == [("git", 2), ("github", 1)]
+        assert dashboard._structure_cache is None
+
+        structure = {'categories': [{'tags': ["github", "tools"]}]}
+        assert dict(dashboard.get_tag_cloud(structure)) == {"git": 2, "github": 2, "tools": 1}
+        print("  ✓ Nube de tags construida con get_tag_counts")
+
+        db.close()
+
+
+if __name__ == "__main__":
+    test_item_tags_sync()
+    test_item_tags_legacy_backfill()
+    test_tag_search_and_cloud()
+    print("\n✅ Tests completados")
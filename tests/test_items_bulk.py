@@ -0,0 +1,114 @@
+"""
+Script de testing para la inserción masiva de items (DBManager.add_items_bulk)
+Prueba la inserción en una transacción, el cifrado en lote y el reporte de errores por fila
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+import logging
+
+# Agregar src al path
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir / 'src'))
+
+from database.db_manager import DBManager
+from core.encryption_manager import PARALLEL_ENCRYPT_THRESHOLD
+
+# Configurar logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+
+
+def test_add_items_bulk():
+    """Test de inserción masiva con errores por fila"""
+    print("\n" + "="*60)
+    print("TEST 1: INSERCIÓN MASIVA")
+    print("="*60)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cwd = os.getcwd()
+        os.chdir(tmp_dir)  # EncryptionManager usa .env relativo al directorio actual
+        try:
+            db = DBManager(str(Path(tmp_dir) / "bulk_test.db"))
+            category_id = db.add_category("Bulk")
+
+            rows = [
+                {'category_id': category_id, 'label': f"Item {i}", 'content': f"echo {i}",
+                 'item_type': 'CODE', 'tags': ["bulk", f"t{i % 3}"]}
+                for i in range(10)
+            ]
+            rows.append({'category_id': category_id, 'label': "", 'content': "x"})
+            rows.append({'category_id': 9999, 'label': "Orphan", 'content': "x"})
+            rows.append({'category_id': category_id, 'label': "Bad type", 'content': "x", 'item_type': 'FOO'})
+            rows.extend(
+                {'category_id': category_id, 'label': f"Secret {i}", 'content': f"pw{i}", 'is_sensitive': True}
+                for i in range(PARALLEL_ENCRYPT_THRESHOLD)
+            )
+
+            item_ids, errors = db.add_items_bulk(rows)
+            print(f"  Errores: {errors}")
+            assert [index for index, _ in errors] == [10, 11, 12]
+            assert item_ids[10:13] == [None, None, None]
+            assert len(set(i for i in item_ids if i is not None)) == 10 + PARALLEL_ENCRYPT_THRESHOLD
+
+            # Los ids corresponden a las filas de entrada
+            assert db.get_item(item_ids[3])['label'] == "Item 3"
+            assert db.get_item(item_ids[-1])['content'] == f"pw{PARALLEL_ENCRYPT_THRESHOLD - 1}"
+            stored = db.execute_query("SELECT content FROM items WHERE id = ?", (item_ids[-1],))
+            assert stored[0]['content'].startswith("gAAAAA")
+
+            counts = dict(db.get_tag_counts())
+            assert counts["bulk"] == 10 and counts["t0"] == 4
+            print("  ✓ Filas válidas insertadas, inválidas reportadas")
+
+            db.close()
+        finally:
+            os.chdir(cwd)
+
+
+def test_add_items_bulk_row_fallback():
+    """Test: un error de SQLite en una fila no aborta el resto del lote"""
+    print("\n" + "="*60)
+    print("TEST 2: FALLBACK FILA A FILA")
+    print("="*60)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db = DBManager(str(Path(tmp_dir) / "bulk_test.db"))
+        category_id = db.add_category("Bulk")
+
+        conn = db.connect()
+        conn.execute("""
+            CREATE TRIGGER reject_boom BEFORE INSERT ON items
+            WHEN new.label = 'boom' BEGIN SELECT RAISE(ABORT, 'boom rejected'); END
+        """)
+        conn.commit()
+
+        rows = [{'category_id': category_id, 'label': label, 'content': label}
+                for label in ("a", "boom", "c")]
+        item_ids, errors = db.add_items_bulk(rows)
+
+        assert errors == [(1, 'boom rejected')]
+        assert item_ids[1] is None
+        assert [db.get_item(i)['label'] for i in (item_ids[0], item_ids[2])] == ["a", "c"]
+        print("  ✓ Lote completado sin la fila rechazada")
+
+        # El fallback no descarta lo escrito antes en la transacción del llamador
+        with db.transaction() as conn:
+            conn.execute("UPDATE categories SET name = 'Bulk editada' WHERE id = ?", (category_id,))
+            item_ids, errors = db.add_items_bulk(rows)
+        assert errors == [(1, 'boom rejected')]
+        assert db.get_category(category_id)['name'] == "Bulk editada"
+        assert db.get_item(item_ids[2])['label'] == "c"
+        print("  ✓ La transacción abierta del llamador se conserva")
+
+        db.close()
+
+
+if __name__ == "__main__":
+    test_add_items_bulk()
+    test_add_items_bulk_row_fallback()
+    print("\n✅ Tests completados")
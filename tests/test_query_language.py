@@ -0,0 +1,232 @@
+"""
+Script de testing para el lenguaje de búsqueda (core/query_language)
+Prueba el análisis a AST y sus errores, la caché de planes, que la
+sentencia SQL y el predicado en memoria devuelven los mismos items, la
+búsqueda estructurada en SearchEngine/DashboardManager y las Smart
+Collections con consulta guardada
+"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+import logging
+
+# Agregar src al path
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir / 'src'))
+
+from database.db_manager import DBManager
+from database.migrations.add_tag_groups_and_collections import migrate_add_tag_groups_and_collections
+from core.query_language import (
+    And, CategoryTerm, CompareTerm, FlagTerm, Not, Or, QuerySyntaxError, TagTerm, TextTerm,
+    TypeTerm, compile_query, parse_query, try_compile_query
+)
+from core.search_engine import SearchEngine
+from core.dashboard_manager import DashboardManager
+from core.smart_collections_manager import SmartCollectionsManager
+from models.category import Category
+from models.item import Item
+
+# Configurar logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+
+QUERIES = [
+    'docker',
+    'dock comp',
+    '"docker compose"',
+    '"docker comp',
+    'tag:git',
+    'tag:GIT -is:fav',
+    'type:code is:fav',
+    'cat:devops -archived',
+    'used>5',
+    'used<=5 type:code',
+    'lastused<7d',
+    'created<2024-01-01',
+    'created>=2024-01-01 NOT docker',
+    'tag:git OR tag:docker',
+    '(docker OR git) is:fav',
+    'is:tagged -tag:git',
+    'is:sensitive',
+    'secreto',
+    'reunion',
+    'is:list lista',
+    '-(is:fav OR is:archived)',
+]
+
+
+def test_parse_and_cache():
+    """Test: análisis, errores y caché de planes"""
+    print("\n" + "="*60)
+    print("TEST 1: PARSER Y CACHÉ")
+    print("="*60)
+
+    ast = parse_query('tag:git type:code is:fav cat:Docker -archived used>5 "exact phrase"')
+    assert ast == And((
+        TagTerm('git'), TypeTerm('CODE'), FlagTerm('fav'), CategoryTerm('Docker'),
+        Not(FlagTerm('archived')), CompareTerm('use_count', '>', 5),
+        TextTerm(('exact', 'phrase'), phrase=True, prefix=False),
+    ))
+    assert parse_query('git OR (docker -tag:wip)') == Or((
+        TextTerm(('git',)), And((TextTerm(('docker',)), Not(TagTerm('wip')))),
+    ))
+    assert parse_query('') == And(())
+    # "-la" en un comando es texto, no una negación
+    assert parse_query('ls -la') == And((TextTerm(('ls',)), TextTerm(('la',))))
+    assert parse_query('NOT Reunión') == Not(TextTerm(('reunion',)))
+    print("  ✓ AST de filtros, negaciones, OR y grupos")
+
+    for invalid in ['tag:', '(docker', 'docker)', 'is:nada', 'type:zip', 'used>x',
+                    'created>ayer', 'git OR']:
+        try:
+            parse_query(invalid)
+        except QuerySyntaxError:
+            continue
+        raise AssertionError(f"'{invalid}' should not parse")
+    print("  ✓ Errores de sintaxis")
+
+    plan = compile_query('tag:git is:fav')
+    assert compile_query('tag:git is:fav') is plan
+    assert compile_query('tag:git is:fav', False) is not plan
+    assert plan.bind_params() == ('git',)
+    age_plan = compile_query('lastused<7d')
+    assert age_plan.bind_params(now=1_000_000) == (1_000_000 - 7 * 86400,)
+    print("  ✓ Planes cacheados por texto; antigüedades resueltas al ejecutar")
+
+    # Texto simple: los buscadores siguen usando su búsqueda por subcadena
+    assert try_compile_query('docker compose') is None
+    assert try_compile_query('tag:') is None
+    assert try_compile_query('tag:git docker').text == 'docker'
+    print("  ✓ try_compile_query solo devuelve consultas estructuradas válidas")
+
+
+def test_sql_matches_memory():
+    """Test: la sentencia SQL y el predicado en memoria coinciden"""
+    print("\n" + "="*60)
+    print("TEST 2: SQL Y MEMORIA EQUIVALENTES")
+    print("="*60)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db = DBManager(str(Path(tmp_dir) / "query_test.db"))
+        devops = db.add_category("DevOps")
+        notes = db.add_category("Notas")
+        docker_id = db.add_item(devops, "Docker compose", "docker compose up -d", item_type='CODE',
+                                tags=["docker"], is_favorite=True)
+        git_id = db.add_item(devops, "Git status", "git status", item_type='CODE', tags=["Git"])
+        old_id = db.add_item(devops, "Docker viejo", "docker run", item_type='CODE',
+                             tags=["docker", "legacy"], is_archived=True)
+        meeting_id = db.add_item(notes, "Reunión semanal", "sala 3", is_favorite=True)
+        secret_id = db.add_item(notes, "Clave", "secreto docker", is_sensitive=True, tags=["git"])
+        list_id = db.add_item(notes, "Compra", "leche", is_list=True, list_group="Lista super")
+
+        now = int(time.time())
+        day = 86400
+        for item_id, uses, created_days_ago, used_days_ago in [
+            (docker_id, 12, 10, 1), (git_id, 3, 900, 30), (old_id, 7, 1200, 400),
+            (meeting_id, 0, 2, 2), (secret_id, 6, 50, 3), (list_id, 1, 5, 20),
+        ]:
+            db.execute_update(
+                "UPDATE items SET use_count = ?, created_at_ts = ?, last_used_ts = ? WHERE id = ?",
+                (uses, now - created_days_ago * day, now - used_days_ago * day, item_id)
+            )
+
+        all_items = db.get_all_items(include_inactive=True)
+        for query in QUERIES:
+            plan = compile_query(query, db._fts_enabled)
+            sql, params = plan.sql(now=now)
+            sql_ids = {row['id'] for row in db.execute_query(sql, params)}
+            memory_ids = {item['id'] for item in plan.filter(all_items, now)}
+            assert sql_ids == memory_ids, f"{query!r}: SQL {sql_ids} != memoria {memory_ids}"
+        print(f"  ✓ {len(QUERIES)} consultas: mismos items en SQL y en memoria")
+
+        def ids(query):
+            return {row['id'] for row in db.query_items(query)}
+
+        assert ids('tag:git') == {git_id, secret_id}
+        assert ids('type:code is:fav') == {docker_id}
+        assert ids('cat:devops -archived used>5') == {docker_id}
+        assert ids('"docker compose"') == {docker_id}
+        # El contenido sensible no se busca
+        assert ids('secreto') == set()
+        assert ids('lastused<7d') == {docker_id, meeting_id, secret_id}
+        assert [row['id'] for row in db.query_items('type:code', limit=1)] == [docker_id]
+        print("  ✓ DBManager.query_items")
+
+        # Sin FTS5 el texto se busca con LIKE
+        plan = compile_query('tag:docker compose', fts_enabled=False)
+        sql, params = plan.sql()
+        assert {row['id'] for row in db.execute_query(sql, params)} == {docker_id}
+        print("  ✓ Texto con LIKE cuando no hay FTS5")
+
+        # Items del modelo y filas del dashboard
+        dashboard = DashboardManager(db)
+        structure = dashboard.get_full_structure(force_refresh=True)
+        scope = {'categories': True, 'items': True, 'tags': True, 'content': True}
+        matches = dashboard.search('cat:devops tag:docker -is:archived', scope, structure)
+        assert [structure['categories'][cat]['items'][idx]['id'] for _, cat, idx in matches] == [docker_id]
+        print("  ✓ DashboardManager.search con consulta estructurada")
+        db.close()
+
+    category = Category(category_id="1", name="DevOps", icon="")
+    category.items = [
+        Item(item_id="1", label="Docker compose", content="up -d", item_type="code", tags=["docker"]),
+        Item(item_id="2", label="Git status", content="git status", item_type="code",
+             tags=["git"], is_favorite=True),
+        Item(item_id="3", label="Docker notes", content="texto", tags=["docker"]),
+    ]
+    engine = SearchEngine()
+    assert [item.id for item in engine.search_in_category('type:code docker', category)] == ["1"]
+    assert [item.id for item in engine.search('cat:devops is:fav', [category])] == ["2"]
+    assert engine.search('cat:otra', [category]) == []
+    assert engine.highlight_matches("Docker compose", "tag:docker compose") == "Docker <mark>compose</mark>"
+    print("  ✓ SearchEngine con consulta estructurada")
+
+
+def test_smart_collection_query():
+    """Test: Smart Collections con consulta guardada"""
+    print("\n" + "="*60)
+    print("TEST 3: SMART COLLECTIONS")
+    print("="*60)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = str(Path(tmp_dir) / "collections_test.db")
+        db = DBManager(db_path)
+        category_id = db.add_category("DevOps")
+        docker_id = db.add_item(category_id, "Docker compose", "docker compose up", item_type='CODE',
+                                tags=["docker"], is_favorite=True)
+        db.add_item(category_id, "Git status", "git status", item_type='CODE', tags=["git"])
+        url_id = db.add_item(category_id, "Docker Hub", "https://hub.docker.com", item_type='URL',
+                             tags=["docker"])
+        assert migrate_add_tag_groups_and_collections(db_path)
+
+        manager = SmartCollectionsManager(db_path)
+        collection_id = manager.create_collection("Docker", query='tag:docker -type:code')
+        assert collection_id is not None
+        assert manager.get_collection(collection_id)['query'] == 'tag:docker -type:code'
+        assert [item['id'] for item in manager.execute_collection(collection_id)] == [url_id]
+
+        # La consulta se combina con AND con los filtros fijos
+        assert manager.update_collection(collection_id, query='docker', is_favorite=True)
+        assert [item['id'] for item in manager.execute_collection(collection_id)] == [docker_id]
+        print("  ✓ Consulta guardada, ejecutada y combinada con los filtros")
+
+        assert manager.create_collection("Rota", query='tag:') is None
+        assert not manager.update_collection(collection_id, query='(docker')
+        print("  ✓ Consultas inválidas rechazadas")
+
+        # item_type filtra por la columna type de items
+        commands = manager.get_collection_by_name("Todos los Comandos")
+        assert manager.get_collection_count(commands['id']) == 2
+        print("  ✓ Filtro item_type")
+        db.close()
+
+
+if __name__ == "__main__":
+    test_parse_and_cache()
+    test_sql_matches_memory()
+    test_smart_collection_query()
+    print("\n✅ Tests completados")
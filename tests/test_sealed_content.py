@@ -0,0 +1,95 @@
+"""
+Script de testing para el cifrado compartido y el contenido sellado
+Prueba que los items sensibles se cargan cifrados y se descifran solo bajo demanda
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+import logging
+
+# Agregar src al path
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir / 'src'))
+
+from database.db_manager import DBManager
+from core.encryption_manager import (
+    SealedContent, get_encryption_manager, reveal_all, DECRYPTION_ERROR
+)
+from models.item import Item
+
+# Configurar logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+
+
+def test_sealed_content_lazy():
+    """Test: items sensibles cargados como SealedContent y descifrados bajo demanda"""
+    print("\n" + "="*60)
+    print("TEST 1: CONTENIDO SELLADO")
+    print("="*60)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cwd = os.getcwd()
+        os.chdir(tmp_dir)  # EncryptionManager usa .env relativo al directorio actual
+        try:
+            db = DBManager(str(Path(tmp_dir) / "sealed_test.db"))
+            assert get_encryption_manager() is get_encryption_manager()
+
+            category_id = db.add_category("Secrets")
+            item_id = db.add_item(category_id, "API key", "sk-123", is_sensitive=True)
+            db.add_item(category_id, "Plain", "hello")
+
+            items = {i['label']: i for i in db.get_items_by_category(category_id)}
+            sealed = items['API key']['content']
+            assert isinstance(sealed, SealedContent)
+            assert not sealed.is_revealed
+            assert "sk-123" not in repr(sealed)
+            assert items['Plain']['content'] == "hello"
+
+            # El modelo descifra al acceder a item.content
+            item = Item(item_id=str(item_id), label="API key", content=sealed, is_sensitive=True)
+            assert item.is_content_sealed
+            assert item.content == "sk-123"
+            assert not item.is_content_sealed
+
+            # Guardar contenido sellado sin tocar no vuelve a cifrar el token
+            token = db.execute_query("SELECT content FROM items WHERE id = ?", (item_id,))[0]['content']
+            unchanged = db.get_items_by_category(category_id)[0]['content']
+            db.update_item(item_id, content=unchanged, label="API key v2")
+            stored = db.execute_query("SELECT content FROM items WHERE id = ?", (item_id,))[0]['content']
+            assert stored == token
+            assert db.get_item(item_id)['content'] == "sk-123"
+            print("  ✓ Descifrado solo bajo demanda")
+
+            db.close()
+        finally:
+            os.chdir(cwd)
+
+
+def test_reveal_all_batch():
+    """Test de descifrado en lote"""
+    print("\n" + "="*60)
+    print("TEST 2: DESCIFRADO EN LOTE")
+    print("="*60)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        env_file = str(Path(tmp_dir) / ".env")
+        manager = get_encryption_manager(env_file)
+        sealed = [SealedContent(manager.encrypt(f"secret {i}"), env_file) for i in range(5)]
+        sealed.append(SealedContent("gAAAAAcorrupted", env_file))
+
+        reveal_all(["plain"] + sealed, env_file)
+        assert all(s.is_revealed for s in sealed)
+        assert [s.reveal() for s in sealed[:5]] == [f"secret {i}" for i in range(5)]
+        assert sealed[5].reveal() == DECRYPTION_ERROR
+        print("  ✓ Lote descifrado con un único cipher")
+
+
+if __name__ == "__main__":
+    test_sealed_content_lazy()
+    test_reveal_all_batch()
+    print("\n✅ Tests completados")
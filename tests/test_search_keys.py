@@ -0,0 +1,118 @@
+"""
+Script de testing para las claves de búsqueda normalizadas (utils/search_keys)
+Prueba la normalización sin acentos, el resaltado sobre el texto original,
+las claves precalculadas de Item (e invalidación) y las búsquedas sin
+acentos en SearchEngine y DashboardManager
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+import logging
+
+# Agregar src al path
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir / 'src'))
+
+from database.db_manager import DBManager
+from utils.search_keys import fold, find_matches
+from core.search_engine import SearchEngine
+from core.dashboard_manager import DashboardManager
+from models.category import Category
+from models.item import Item
+
+# Configurar logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+
+
+def test_fold_and_item_keys():
+    """Test: normalización y claves precalculadas de Item"""
+    print("\n" + "="*60)
+    print("TEST 1: CLAVES DE BÚSQUEDA")
+    print("="*60)
+
+    assert fold("Reunión de EQUIPO") == "reunion de equipo"
+    assert fold("Año Ñandú ÜBER") == "ano nandu uber"
+    assert fold("Straße") == "strasse"
+    assert fold("Ørsted Привет") == "ørsted привет"
+    assert fold(None) == ""
+    text = "already lower"
+    assert fold(text) is text
+    print("  ✓ Minúsculas y sin acentos")
+
+    text = "Reunión con el café"
+    assert [text[start:end] for start, end in find_matches(text, "reunion")] == ["Reunión"]
+    assert [text[start:end] for start, end in find_matches(text, "cafe")] == ["café"]
+    # Texto ya descompuesto: el acento suelto queda dentro del tramo
+    decomposed = "café y cafe"
+    assert [decomposed[start:end] for start, end in find_matches(decomposed, "cafe")] == \
+        ["café", "cafe"]
+    assert find_matches("docker", "") == []
+    print("  ✓ Tramos sobre el texto original")
+
+    item = Item(item_id="1", label="Reunión", content="Café", tags=["Éxito"], description="Acción")
+    assert item.search_label == "reunion"
+    assert item.search_tags == ("exito",)
+    assert item.search_description == "accion"
+    assert "reunion" in item.search_text and "cafe" in item.search_text
+    # Asignar un campo descarta sus claves
+    item.label = "Otra Cosa"
+    item.tags = ["Nuevo"]
+    item.content = "Té verde"
+    assert item.search_label == "otra cosa"
+    assert "reunion" not in item.search_text and "te verde" in item.search_text
+    assert "nuevo" in item.search_text
+    # Los campos no se unen: "cosanuevo" no coincide
+    assert "cosanuevo" not in item.search_text
+    # El contenido sensible no forma parte de la clave
+    item.is_sensitive = True
+    assert "te verde" not in item.search_text
+    print("  ✓ Item: claves calculadas una vez e invalidadas al asignar")
+
+
+def test_accent_insensitive_search():
+    """Test: búsquedas sin acentos en SearchEngine y DashboardManager"""
+    print("\n" + "="*60)
+    print("TEST 2: BÚSQUEDA SIN ACENTOS")
+    print("="*60)
+
+    category = Category(category_id="1", name="Trabajo", icon="")
+    category.items = [
+        Item(item_id="1", label="Reunión semanal", content="sala 3"),
+        Item(item_id="2", label="Factura", content="enviar información"),
+        Item(item_id="3", label="Clave", content="secreto reunion", is_sensitive=True),
+        Item(item_id="4", label="Notas", content="texto", tags=["Análisis"]),
+    ]
+    engine = SearchEngine()
+    assert [item.label for item in engine.search_in_category("reunion", category)] == ["Reunión semanal"]
+    assert [item.label for item in engine.search_in_category("REUNIÓN", category)] == ["Reunión semanal"]
+    assert [item.label for item in engine.search_in_category("informacion", category)] == ["Factura"]
+    assert [item.label for item in engine.search_in_category("analisis", category)] == ["Notas"]
+    assert engine.highlight_matches("Reunión semanal", "reunion") == "<mark>Reunión</mark> semanal"
+    print("  ✓ SearchEngine sin acentos (y sin contenido sensible)")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db = DBManager(str(Path(tmp_dir) / "keys_test.db"))
+        category_id = db.add_category("Gestión")
+        db.add_item(category_id, "Reunión semanal", "sala 3")
+        db.add_item(category_id, "Factura", "enviar información", tags=["Contabilidad"])
+        db.add_item(category_id, "Clave", "secreto reunion", is_sensitive=True)
+
+        dashboard = DashboardManager(db)
+        structure = dashboard.get_full_structure(force_refresh=True)
+        scope = {'categories': True, 'items': True, 'tags': True, 'content': True}
+        assert [match[0] for match in dashboard.search("gestion", scope, structure)] == ['category']
+        assert [match[0] for match in dashboard.search("reunion", scope, structure)] == ['item']
+        assert [match[0] for match in dashboard.search("informacion", scope, structure)] == ['content']
+        assert [match[0] for match in dashboard.search("CONTABILIDAD", scope, structure)] == ['tag']
+        print("  ✓ DashboardManager.search sin acentos")
+        db.close()
+
+
+if __name__ == "__main__":
+    test_fold_and_item_keys()
+    test_accent_insensitive_search()
+    print("\n✅ Tests completados")
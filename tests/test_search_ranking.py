@@ -0,0 +1,163 @@
+"""
+Script de testing para el ranking de búsqueda (calidad + frecencia)
+Prueba item_frecency (relleno inicial y actualización desde UsageQueue),
+el orden de SearchRanker/SearchEngine y el de DBManager.search_items
+"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+import logging
+
+# Agregar src al path
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir / 'src'))
+
+from database.db_manager import DBManager
+from database.frecency import HALF_LIFE_DAYS, combine_scores, decayed_frecency, visit_score
+from core.search_ranker import SearchRanker, match_quality, EXACT_LABEL, LABEL_PREFIX, \
+    LABEL_WORD, LABEL_SUBSTRING, TAG_MATCH, CONTENT_MATCH, NO_MATCH
+from core.search_engine import SearchEngine
+from models.category import Category
+from models.item import Item
+
+# Configurar logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+
+
+def test_frecency_scores():
+    """Test: decaimiento y relleno de item_frecency desde el historial"""
+    print("\n" + "="*60)
+    print("TEST 1: FRECENCIA")
+    print("="*60)
+
+    now = time.time()
+    half_life = HALF_LIFE_DAYS * 86400
+    assert abs(decayed_frecency(visit_score(now), now) - 1.0) < 1e-9
+    assert abs(decayed_frecency(visit_score(now - half_life), now) - 0.5) < 1e-9
+    both = combine_scores(visit_score(now), visit_score(now - half_life))
+    assert abs(decayed_frecency(both, now) - 1.5) < 1e-9
+    assert decayed_frecency(None, now) == 0.0
+    print("  ✓ Un uso vale la mitad cada HALF_LIFE_DAYS")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = str(Path(tmp_dir) / "ranking_test.db")
+        db = DBManager(db_path)
+        category_id = db.add_category("Git")
+        old_id = db.add_item(category_id, "Old", "git log")
+        recent_id = db.add_item(category_id, "Recent", "git status")
+        db.add_item(category_id, "Unused", "git diff")
+
+        # Historial previo a la migración: 3 usos antiguos, 1 reciente
+        conn = db.connect()
+        for days in (60, 61, 62):
+            conn.execute("""
+                INSERT INTO item_usage_history (item_id, used_at, used_at_ts)
+                VALUES (?, datetime(?, 'unixepoch'), ?)
+            """, (old_id, int(now) - days * 86400, int(now) - days * 86400))
+        conn.execute("""
+            INSERT INTO item_usage_history (item_id, used_at, used_at_ts)
+            VALUES (?, datetime(?, 'unixepoch'), ?)
+        """, (recent_id, int(now), int(now)))
+        conn.execute("DROP TABLE item_frecency")
+        conn.commit()
+        db.close()
+
+        db = DBManager(db_path)
+        scores = db.get_frecency_scores()
+        assert set(scores) == {old_id, recent_id}
+        assert scores[recent_id] > scores[old_id]
+        assert db.get_frecency_scores([old_id]) == {old_id: scores[old_id]}
+        print("  ✓ Relleno inicial desde item_usage_history")
+
+        # Los usos nuevos actualizan el score en el volcado de UsageQueue
+        for _ in range(3):
+            db.update_last_used(old_id)
+        db.flush_usage()
+        assert db.get_frecency_scores([old_id])[old_id] > scores[recent_id]
+
+        # Borrar el item borra su score
+        db.delete_item(old_id)
+        assert old_id not in db.get_frecency_scores()
+        print("  ✓ UsageQueue actualiza y el borrado limpia item_frecency")
+        db.close()
+
+
+def test_ranker_order():
+    """Test: calidad de coincidencia y frecencia en SearchRanker"""
+    print("\n" + "="*60)
+    print("TEST 2: ORDEN DE SEARCHRANKER")
+    print("="*60)
+
+    assert match_quality("status", "Status") == EXACT_LABEL
+    assert match_quality("status", "Status corto") == LABEL_PREFIX
+    assert match_quality("status", "git-status") == LABEL_WORD
+    assert match_quality("status", "gitstatus") == LABEL_SUBSTRING
+    assert match_quality("status", "Estado", tags=["status"]) == TAG_MATCH
+    assert match_quality("status", "Estado", content="git status") == CONTENT_MATCH
+    assert match_quality("status", "Estado", description="ver status") == CONTENT_MATCH
+    assert match_quality("status", "Estado") == NO_MATCH
+    print("  ✓ Niveles de calidad")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db = DBManager(str(Path(tmp_dir) / "ranking_test.db"))
+        category_id = db.add_category("Git")
+        ids = {label: db.add_item(category_id, label, content, tags=tags)
+               for label, content, tags in [
+                   ("Contenido", "git status -s", None),
+                   ("gitstatus", "git status", None),
+                   ("Estado", "git st", ["status"]),
+                   ("git-status", "git status", None),
+                   ("Status corto", "git status -s", None),
+                   ("Status", "git status", None),
+               ]}
+
+        category = Category(category_id=str(category_id), name="Git", icon="")
+        category.items = [Item(item_id=str(item_id), label=label, content="git status")
+                          for label, item_id in ids.items()]
+        category.items[2].tags = ["status"]
+
+        ranker = SearchRanker(db)
+        engine = SearchEngine(ranker=ranker)
+        results = [item.label for item in engine.search_in_category("status", category)]
+        assert results == ["Status", "Status corto", "git-status", "gitstatus", "Estado", "Contenido"]
+
+        # Sin ranker se mantiene el orden original
+        assert [item.label for item in SearchEngine().search_in_category("status", category)] == \
+            [item.label for item in category.items]
+
+        # Usos recientes adelantan un nivel, pero nunca al label exacto
+        for _ in range(20):
+            db.update_last_used(ids["gitstatus"])
+        db.flush_usage()
+        results = [item.label for item in engine.search_in_category("status", category)]
+        assert results[:4] == ["Status", "Status corto", "gitstatus", "git-status"], results
+        print("  ✓ Frecencia combinada con la calidad, refrescada tras el volcado")
+
+        # Un prefijo muy usado (frecencia > 10) sigue por detrás del label exacto
+        for _ in range(30):
+            db.update_last_used(ids["Status corto"])
+        db.flush_usage()
+        assert ranker.frecency(ids["Status corto"]) > 10
+        now = time.time()
+        assert ranker.score(EXACT_LABEL, ids["Status"], now) > \
+            ranker.score(LABEL_PREFIX, ids["Status corto"], now)
+        results = [item.label for item in engine.search_in_category("status", category)]
+        assert results[:2] == ["Status", "Status corto"], results
+        print("  ✓ La frecencia nunca adelanta al label exacto")
+
+        # DBManager.search_items: label exacto, prefijo, resto por frecencia
+        rows = [row['label'] for row in db.search_items("status")]
+        assert rows[:3] == ["Status", "Status corto", "gitstatus"], rows
+        print("  ✓ search_items ordena por coincidencia y frecencia")
+        db.close()
+
+
+if __name__ == "__main__":
+    test_frecency_scores()
+    test_ranker_order()
+    print("\n✅ Tests completados")
@@ -0,0 +1,146 @@
+"""
+Script de testing para la búsqueda incremental (core/search_session)
+Prueba la caché de consultas (acierto, filtrado desde la consulta anterior,
+recorrido completo), la invalidación al cambiar candidatos o contexto y
+que SearchEngine y DashboardManager devuelven lo mismo que sin caché
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+import logging
+
+# Agregar src al path
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir / 'src'))
+
+from database.db_manager import DBManager
+from core.search_session import SearchSession
+from core.search_engine import SearchEngine
+from core.dashboard_manager import DashboardManager
+from models.category import Category
+from models.item import Item
+
+# Configurar logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+
+
+def test_session_cache():
+    """Test: aciertos, filtrado incremental e invalidación"""
+    print("\n" + "="*60)
+    print("TEST 1: SEARCHSESSION")
+    print("="*60)
+
+    scanned = []
+
+    def matcher(query, candidates):
+        scanned.append(len(candidates))
+        return [word for word in candidates if query in word]
+
+    words = ["docker compose", "docker build", "git commit", "compose file", "kubectl"]
+    session = SearchSession(matcher)
+
+    assert session.search("co", words) == ["docker compose", "git commit", "compose file"]
+    assert session.search("com", words) == ["docker compose", "git commit", "compose file"]
+    assert session.search("comp", words) == ["docker compose", "compose file"]
+    # Las dos últimas solo recorrieron los resultados de la anterior
+    assert scanned == [5, 3, 3]
+    assert session.stats()['misses'] == 1 and session.stats()['narrowed'] == 2
+    print("  ✓ Cada consulta que extiende otra filtra sus resultados")
+
+    # Backspace: la caché responde sin recorrer nada
+    assert session.search("com", words) == ["docker compose", "git commit", "compose file"]
+    assert session.hits == 1 and len(scanned) == 3
+    # El resultado es una copia: modificarla no altera la caché
+    session.search("com", words).append("extra")
+    assert session.search("com", words) == ["docker compose", "git commit", "compose file"]
+
+    # Cambiar texto en medio: recorrido completo
+    assert session.search("kube", words) == ["kubectl"]
+    assert scanned[-1] == 5 and session.misses == 2
+    print("  ✓ LRU para backspace y recorrido completo si no hay base")
+
+    # Otra lista con los mismos objetos no invalida; otros candidatos sí
+    assert session.search("comp", list(words)) == ["docker compose", "compose file"]
+    assert session.misses == 2
+    assert session.search("comp", words + ["composer"]) == ["docker compose", "compose file", "composer"]
+    assert session.misses == 3
+    # Igual con otro contexto
+    session.search("comp", words + ["composer"], context="otro")
+    assert session.misses == 4
+
+    # LRU acotada
+    small = SearchSession(matcher, cache_size=2)
+    for query in ("a", "b", "c"):
+        small.search(query, words)
+    assert small.stats()['cached_queries'] == 2
+    print("  ✓ Invalidación por candidatos y contexto")
+
+
+def test_engines_match_uncached():
+    """Test: SearchEngine y DashboardManager con sesión dan lo mismo que sin ella"""
+    print("\n" + "="*60)
+    print("TEST 2: SEARCHENGINE Y DASHBOARDMANAGER")
+    print("="*60)
+
+    category = Category(category_id="1", name="DevOps", icon="")
+    category.items = [
+        Item(item_id="1", label="Docker compose", content="docker compose up"),
+        Item(item_id="2", label="Git status", content="git status", tags=["docker"]),
+        Item(item_id="3", label="Kubectl", content="kubectl get pods"),
+    ]
+    engine = SearchEngine()
+    for query in ("d", "do", "doc", "dock", "docker", "dock", "git", "docker c"):
+        expected = [item for item in category.items
+                    if query in item.label.lower() or query in item.content.lower()
+                    or any(query in tag for tag in item.tags)]
+        assert engine.search_in_category(query, category) == expected, query
+    assert engine.session.narrowed > 0 and engine.session.hits > 0
+
+    # Un item recargado (mismo id, otro objeto) invalida la caché
+    category.items = list(category.items)
+    category.items[2] = Item(item_id="3", label="Docker kubectl", content="kubectl")
+    assert [item.label for item in engine.search_in_category("docker", category)] == \
+        ["Docker compose", "Git status", "Docker kubectl"]
+    print("  ✓ SearchEngine.search_in_category")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db = DBManager(str(Path(tmp_dir) / "session_test.db"))
+        category_id = db.add_category("DevOps")
+        db.add_item(category_id, "Docker compose", "docker compose up")
+        db.add_item(category_id, "Git status", "git status", tags=["docker"])
+        db.add_item(category_id, "Kubectl", "kubectl get pods")
+
+        dashboard = DashboardManager(db)
+        structure = dashboard.get_full_structure(force_refresh=True)
+        scope = {'categories': True, 'items': True, 'tags': True, 'content': True}
+        results = {}
+        for query in ("d", "do", "doc", "dock", "docker", "dock", "git"):
+            results[query] = dashboard.search(query, scope, structure)
+
+        fresh = DashboardManager(db)
+        for query, matches in results.items():
+            fresh.search_session.reset()
+            assert fresh.search(query, scope, structure) == matches, query
+        assert [match[0] for match in results["docker"]] == ['item', 'tag']
+        assert dashboard.search_session.hits == 1
+
+        # Otro alcance invalida la caché
+        content_only = dict(scope, items=False, tags=False)
+        assert [match[0] for match in dashboard.search("docker", content_only, structure)] == ['content']
+
+        # Una estructura nueva (datos cambiados) también
+        db.add_item(category_id, "Docker logs", "docker logs -f")
+        structure = dashboard.get_full_structure()
+        assert len(dashboard.search("docker", scope, structure)) == 3
+        print("  ✓ DashboardManager.search")
+        db.close()
+
+
+if __name__ == "__main__":
+    test_session_cache()
+    test_engines_match_uncached()
+    print("\n✅ Tests completados")
@@ -0,0 +1,124 @@
+"""
+Script de testing para las estadísticas de búsqueda (SearchEngine.get_search_stats)
+Prueba el índice inverso item -> categoría (CategoryIndex), que el
+desglose por categoría coincide con el recorrido anterior y las facetas
+por tipo y por tag
+"""
+
+import random
+import sys
+from pathlib import Path
+import logging
+
+# Agregar src al path
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir / 'src'))
+
+from core.search_engine import SearchEngine
+from models.category import Category, CategoryIndex
+from models.item import Item, ItemType
+
+# Configurar logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+
+
+def _categories(num_categories: int, items_per_category: int, rng: random.Random) -> list:
+    categories = []
+    item_id = 0
+    for category_id in range(num_categories):
+        category = Category(category_id=str(category_id), name=f"Categoría {category_id % 7}")
+        for _ in range(items_per_category):
+            item_id += 1
+            category.items.append(Item(
+                item_id=str(item_id),
+                label=f"{rng.choice(['docker', 'git', 'deploy'])} {item_id}",
+                content="comando",
+                item_type=rng.choice(list(ItemType)),
+                tags=rng.sample(['dev', 'ops', 'git', 'prod'], rng.randint(0, 2)),
+            ))
+        categories.append(category)
+    return categories
+
+
+def test_category_index():
+    """Test: índice inverso con listas reemplazadas y modificadas"""
+    print("\n" + "="*60)
+    print("TEST 1: ÍNDICE INVERSO ITEM -> CATEGORÍA")
+    print("="*60)
+
+    first = Category(category_id="1", name="DevOps")
+    second = Category(category_id="2", name="Notas")
+    docker = Item(item_id="1", label="Docker", content="docker")
+    note = Item(item_id="2", label="Nota", content="texto")
+    first.add_item(docker)
+    second.add_item(note)
+
+    index = CategoryIndex()
+    index.sync([first, second])
+    assert index.position_of(docker) == 0 and index.position_of(note) == 1
+    assert index.position_of(Item(item_id="1", label="Docker", content="docker")) is None
+    print("  ✓ Posición de la categoría de cada item (por objeto, no por id)")
+
+    # Lista modificada sin cambiar de longitud: el item nuevo reconstruye el índice
+    moved = Item(item_id="3", label="Kubectl", content="kubectl")
+    second.items[0] = moved
+    index.sync([first, second])
+    assert index.position_of(moved) == 1
+    second.remove_item("3")
+    first.add_item(moved)
+    index.sync([first, second])
+    assert index.position_of(moved) == 0
+    print("  ✓ Cambios en las listas de items detectados")
+
+
+def test_search_stats():
+    """Test: desglose por categoría y facetas de tipo y tag"""
+    print("\n" + "="*60)
+    print("TEST 2: ESTADÍSTICAS Y FACETAS")
+    print("="*60)
+
+    categories = _categories(30, 40, random.Random(7))
+    categories[3].is_active = False
+    engine = SearchEngine()
+
+    for query in ("docker", "git", "de", "tag:git", "type:code"):
+        stats = engine.get_search_stats(query, categories)
+        results = engine.search(query, categories)
+
+        # Recorrido anterior: primera categoría que contiene cada item
+        expected = {}
+        for item in results:
+            for category in categories:
+                if item in category.items:
+                    expected[category.name] = expected.get(category.name, 0) + 1
+                    break
+        assert stats['total_results'] == len(results)
+        assert stats['category_breakdown'] == expected, query
+
+        types = {}
+        tags = {}
+        for item in results:
+            types[item.type.value] = types.get(item.type.value, 0) + 1
+            for tag in item.tags:
+                tags[tag] = tags.get(tag, 0) + 1
+        assert stats['type_breakdown'] == types
+        assert stats['tag_breakdown'] == tags
+        counts = list(stats['tag_breakdown'].values())
+        assert counts == sorted(counts, reverse=True)
+    print("  ✓ Desglose por categoría igual que el recorrido anterior")
+    print("  ✓ Facetas por tipo y por tag (las más frecuentes primero)")
+
+    assert engine.get_search_stats("zzz", categories) == {
+        'total_results': 0, 'query': "zzz", 'category_breakdown': {},
+        'type_breakdown': {}, 'tag_breakdown': {},
+    }
+    print("  ✓ Sin resultados")
+
+
+if __name__ == "__main__":
+    test_category_index()
+    test_search_stats()
+    print("\n✅ Tests completados")
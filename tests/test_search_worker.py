@@ -0,0 +1,123 @@
+"""
+Script de testing para las búsquedas en segundo plano (core/search_worker)
+Prueba la espera adaptativa al coste, la cancelación de búsquedas
+obsoletas y la entrega de resultados por lotes
+"""
+
+import os
+import sys
+import time
+import threading
+from pathlib import Path
+import logging
+
+# Agregar src al path
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir / 'src'))
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+from PyQt6.QtWidgets import QApplication
+
+from core.search_worker import AdaptiveDebounce, SearchWorker
+
+# Configurar logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+
+
+def _wait_for(condition, timeout: float = 5.0):
+    """Procesar eventos de Qt hasta que se cumpla la condición"""
+    app = QApplication.instance()
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        app.processEvents()
+        time.sleep(0.01)
+    assert condition(), "Timeout esperando al SearchWorker"
+
+
+def test_adaptive_debounce():
+    """Test: la espera sigue al coste medido, entre el mínimo y el máximo"""
+    print("\n" + "="*60)
+    print("TEST 1: ESPERA ADAPTATIVA")
+    print("="*60)
+
+    debounce = AdaptiveDebounce(min_ms=80, max_ms=400, factor=2.0, smoothing=0.5)
+    assert debounce.interval() == 80
+    assert debounce.record(5) == 80
+    # Búsquedas caras: la espera crece, sin pasar del máximo
+    assert debounce.record(105) == 110
+    for _ in range(10):
+        debounce.record(1000)
+    assert debounce.interval() == 400
+    # Y vuelve a bajar cuando buscar vuelve a ser barato
+    for _ in range(20):
+        debounce.record(1)
+    assert debounce.interval() == 80
+    print("  ✓ Espera entre 80 y 400 ms según el coste medio")
+
+
+def test_cancellation_and_batches():
+    """Test: solo llegan los resultados de la última búsqueda, por lotes"""
+    print("\n" + "="*60)
+    print("TEST 2: CANCELACIÓN Y LOTES")
+    print("="*60)
+
+    app = QApplication.instance() or QApplication([])
+    worker = SearchWorker(first_batch_size=3, batch_size=4)
+    try:
+        batches, finished = [], []
+        worker.batch_ready.connect(lambda request_id, items, first: batches.append((request_id, items, first)))
+        worker.search_finished.connect(lambda request_id, total, ms: finished.append((request_id, total)))
+
+        release = threading.Event()
+        started = threading.Event()
+        checked = []
+
+        def slow_search(request, query):
+            started.set()
+            release.wait(5)
+            checked.append(request.cancelled)
+            return None if request.cancelled else [query]
+
+        def search(request, count):
+            assert threading.current_thread() is not threading.main_thread()
+            return list(range(count))
+
+        first_id = worker.submit(slow_search, "stale")
+        started.wait(5)
+        queued_id = worker.submit(search, 100)
+        last_id = worker.submit(search, 10)
+        assert first_id < queued_id < last_id
+        release.set()
+
+        _wait_for(lambda: sum(len(items) for _, items, _ in batches) == 10)
+        app.processEvents()
+        assert checked == [True]
+        assert finished == [(last_id, 10)]
+        assert [(request_id, first) for request_id, _, first in batches] == \
+            [(last_id, True), (last_id, False), (last_id, False)]
+        assert [items for _, items, _ in batches] == [[0, 1, 2], [3, 4, 5, 6], [7, 8, 9]]
+        print("  ✓ Búsquedas obsoletas canceladas; primera pantalla y luego lotes")
+
+        # Una búsqueda nueva detiene los lotes pendientes de la anterior
+        batches.clear()
+        worker.submit(search, 50)
+        _wait_for(lambda: batches)
+        worker.submit(search, 2)
+        _wait_for(lambda: len(batches) >= 2 and batches[-1][2])
+        time.sleep(0.05)
+        app.processEvents()
+        assert batches[-1][1] == [0, 1]
+        assert all(request_id == batches[0][0] for request_id, _, _ in batches[:-1])
+        assert sum(len(items) for _, items, _ in batches[:-1]) < 50
+        print("  ✓ Lotes pendientes descartados al lanzar otra búsqueda")
+    finally:
+        worker.shutdown()
+
+
+if __name__ == "__main__":
+    test_adaptive_debounce()
+    test_cancellation_and_batches()
+    print("\n✅ Tests completados")
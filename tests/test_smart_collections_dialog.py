@@ -0,0 +1,96 @@
+"""
+Script de testing para el diálogo de Smart Collections
+Prueba que el conteo de items (que sincroniza collection_members) se
+ejecuta en el hilo escritor del DBWorker y no en el hilo de la UI
+"""
+
+import os
+import sys
+import time
+import tempfile
+import threading
+from pathlib import Path
+import logging
+
+# Agregar src al path
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir / 'src'))
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+from PyQt6.QtWidgets import QApplication
+
+from database.connection_pool import close_all_connections
+from database.db_manager import DBManager
+from database.migrations.add_tag_groups_and_collections import migrate_add_tag_groups_and_collections
+from views.dialogs.smart_collections_dialog import SmartCollectionCard, SmartCollectionsDialog
+
+# Configurar logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+
+
+def _wait_for(condition, timeout: float = 5.0):
+    """Procesar eventos de Qt hasta que se cumpla la condición"""
+    app = QApplication.instance()
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timeout"
+        app.processEvents()
+        time.sleep(0.01)
+
+
+def _cards(dialog) -> dict:
+    """Cards mostradas: {nombre: item_count}"""
+    cards = {}
+    for index in range(dialog.collections_layout.count()):
+        widget = dialog.collections_layout.itemAt(index).widget()
+        if isinstance(widget, SmartCollectionCard):
+            cards[widget.collection['name']] = widget.collection['item_count']
+    return cards
+
+
+def test_collections_load_off_ui_thread():
+    """Test: colecciones y conteos se cargan en el hilo escritor"""
+    print("\n" + "="*60)
+    print("TEST 1: CARGA DE COLECCIONES EN SEGUNDO PLANO")
+    print("="*60)
+
+    app = QApplication.instance() or QApplication([])
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = str(Path(tmp_dir) / "collections_dialog_test.db")
+        db = DBManager(db_path)
+        category_id = db.add_category("DevOps")
+        for n in range(6):
+            db.add_item(category_id, f"Item {n}", f"contenido {n}", tags=["docker"] if n % 2 else ["git"])
+        assert migrate_add_tag_groups_and_collections(db_path)
+
+        class Dialog(SmartCollectionsDialog):
+            def get_db_path(self) -> str:
+                return db_path
+
+        dialog = Dialog()
+        dialog.manager.create_collection("Docker", query='tag:docker')
+
+        # Espiar el hilo en que se cuentan los items
+        threads = []
+        add_item_counts = dialog.manager.add_item_counts
+        dialog.manager.add_item_counts = lambda collections: (
+            threads.append(threading.current_thread().name), add_item_counts(collections))[1]
+
+        dialog.search_input.setText("Dock")
+        _wait_for(lambda: _cards(dialog) == {"Docker": 3})
+        assert threads and all(name.startswith("db-writer") for name in threads)
+        assert dialog.stats_label.text().startswith("📊 Total:")
+        print("  ✓ Conteo y sincronización de miembros en el hilo escritor")
+
+        dialog.close()
+        close_all_connections(db_path)
+        db.close()
+    app.processEvents()
+
+
+if __name__ == "__main__":
+    test_collections_load_off_ui_thread()
+    print("\n✅ Tests completados")
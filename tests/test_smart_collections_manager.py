@@ -234,7 +234,7 @@ def test_execute_collection():
         if items:
             print(f"    Primeros items:")
             for item in items[:3]:
-                print(f"      - [{item['item_type']}] {item['label']}")
+                print(f"      - [{item['type']}] {item['label']}")
 
     return True
 
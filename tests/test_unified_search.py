@@ -0,0 +1,176 @@
+"""
+Script de testing para la búsqueda común (core/unified_search, search_index)
+Prueba que los triggers mantienen el índice con cada escritura (alta,
+edición y borrado de pestañas del bloc de notas, marcadores, historial y
+sesiones), que no se indexa contenido sensible, el orden de cada tipo y
+que la búsqueda con LIKE sin FTS5 encuentra lo mismo
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+import logging
+
+# Agregar src al path
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir / 'src'))
+
+from database.db_manager import DBManager
+from database.migrations import add_notebook_tabs_table
+from core.unified_search import (
+    KIND_BOOKMARK, KIND_CLIPBOARD, KIND_ITEM, KIND_NOTEBOOK_TAB, KIND_SESSION, UnifiedSearch
+)
+
+# Configurar logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+
+# Tablas de sesiones (migrate_add_sessions.py solo migra widget_sidebar.db)
+SESSION_TABLES = """
+    CREATE TABLE IF NOT EXISTS browser_sessions (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT NOT NULL,
+        is_auto_save BOOLEAN DEFAULT 0,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+    CREATE TABLE IF NOT EXISTS session_tabs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        session_id INTEGER NOT NULL,
+        url TEXT NOT NULL,
+        title TEXT DEFAULT 'Nueva pestaña',
+        position INTEGER DEFAULT 0,
+        is_active BOOLEAN DEFAULT 0,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (session_id) REFERENCES browser_sessions(id) ON DELETE CASCADE
+    );
+"""
+
+
+def _open_db(db_path: str) -> DBManager:
+    """Base de datos con las tablas opcionales (bloc de notas y sesiones)"""
+    db = DBManager(db_path)
+    conn = db.connect()
+    add_notebook_tabs_table.upgrade(conn)
+    conn.executescript(SESSION_TABLES)
+    conn.commit()
+    db.close()
+    # Al reabrir, la migración indexa las tablas creadas después
+    return DBManager(db_path)
+
+
+def _ids(search: UnifiedSearch, query: str, kind: str) -> list:
+    return [result.ref_id for result in search.search(query, kinds=[kind]).get(kind, [])]
+
+
+def test_index_follows_writes():
+    """Test: el índice sigue a las escrituras de DBManager"""
+    print("\n" + "="*60)
+    print("TEST 1: ÍNDICE MANTENIDO POR TRIGGERS")
+    print("="*60)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = str(Path(tmp_dir) / "unified_test.db")
+        db = _open_db(db_path)
+        search = UnifiedSearch(db_path)
+        assert search.kinds == (KIND_ITEM, KIND_NOTEBOOK_TAB, KIND_BOOKMARK, KIND_CLIPBOARD, KIND_SESSION)
+
+        category_id = db.add_category("DevOps")
+        item_id = db.add_item(category_id, "Docker compose", "docker compose up")
+        tab_id = db.add_notebook_tab("Notas reunión")
+        bookmark_id = db.add_bookmark("Docker Hub", "https://hub.docker.com", "Dev")
+        db.add_to_history(item_id, "docker compose up -d")
+        session_id = db.save_session("Trabajo", [{'url': 'https://docs.docker.com', 'title': 'Docs'}])
+        db.save_session("Auto", [{'url': 'https://kubernetes.io', 'title': 'Kubernetes'}], is_auto_save=True)
+
+        results = search.search("dock")
+        assert [result.ref_id for result in results[KIND_ITEM]] == [item_id]
+        assert [result.ref_id for result in results[KIND_BOOKMARK]] == [bookmark_id]
+        assert [result.ref_id for result in results[KIND_SESSION]] == [session_id]
+        assert results[KIND_CLIPBOARD][0].title == "Docker compose"
+        assert results[KIND_CLIPBOARD][0].content == "docker compose up -d"
+        assert KIND_NOTEBOOK_TAB not in results
+        assert _ids(search, "reunion", KIND_NOTEBOOK_TAB) == [tab_id]
+        print("  ✓ Altas indexadas en el mismo commit, sin acentos y por prefijo")
+
+        # Ediciones y borrados
+        db.update_notebook_tab(tab_id, content="docker swarm init")
+        assert _ids(search, "swarm", KIND_NOTEBOOK_TAB) == [tab_id]
+        db.update_bookmark(bookmark_id, title="Registro de imágenes")
+        assert _ids(search, "registro", KIND_BOOKMARK) == [bookmark_id]
+        assert _ids(search, "hub", KIND_BOOKMARK) == [bookmark_id]  # la URL sigue indexada
+        db.save_session("Auto", [{'url': 'https://kubernetes.io', 'title': 'Kubernetes'}], is_auto_save=True)
+        assert _ids(search, "kubernetes", KIND_SESSION) == []
+        db.delete_session(session_id)
+        db.delete_bookmark(bookmark_id)
+        db.delete_notebook_tab(tab_id)
+        db.clear_history()
+        assert search.search("docker", kinds=[KIND_NOTEBOOK_TAB, KIND_BOOKMARK,
+                                               KIND_CLIPBOARD, KIND_SESSION]) == {}
+        assert db.execute_query("SELECT COUNT(*) AS n FROM search_index")[0]['n'] == 0
+        print("  ✓ Ediciones reindexadas; borrados (también en cascada) fuera del índice")
+
+        # Contenido sensible: ni se indexa ni se devuelve
+        secret_id = db.add_item(category_id, "Clave servidor", "hunter2", is_sensitive=True)
+        db.add_to_history(secret_id, "hunter2")
+        tab_id = db.add_notebook_tab("Privado")
+        db.update_notebook_tab(tab_id, content="hunter2", is_sensitive=1)
+        assert search.search("hunter2") == {}
+        history = search.search("clave", kinds=[KIND_CLIPBOARD])[KIND_CLIPBOARD]
+        assert history[0].content is None
+        print("  ✓ Contenido sensible excluido")
+        db.close()
+
+
+def test_ranking_and_fallback():
+    """Test: orden de cada tipo y búsqueda con LIKE sin FTS5"""
+    print("\n" + "="*60)
+    print("TEST 2: ORDEN POR TIPO Y LIKE")
+    print("="*60)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = str(Path(tmp_dir) / "ranking_test.db")
+        db = _open_db(db_path)
+        search = UnifiedSearch(db_path)
+
+        in_url = db.add_bookmark("Documentación", "https://example.com/backup")
+        in_title = db.add_bookmark("Backup diario", "https://example.com/diario")
+        newer_in_url = db.add_bookmark("Servidor", "https://example.com/backups")
+        # Primero el título (bm25), después el resto, el más reciente primero
+        assert _ids(search, "backup", KIND_BOOKMARK) == [in_title, newer_in_url, in_url]
+        assert _ids(search, "backup", KIND_BOOKMARK)[:1] == \
+            [result.ref_id for result in search.search("backup", limit_per_kind=1)[KIND_BOOKMARK]]
+
+        category_id = db.add_category("Notas")
+        item_id = db.add_item(category_id, "Deploy", "make deploy")
+        first = db.add_to_history(item_id, "make deploy")
+        second = db.add_to_history(item_id, "make deploy staging")
+        # Historial: lo más reciente primero
+        assert _ids(search, "deploy", KIND_CLIPBOARD) == [second, first]
+        print("  ✓ Títulos por relevancia, resto e historial por recencia")
+
+        # Solo la última palabra es un prefijo mientras se escribe
+        assert _ids(search, "make dep", KIND_CLIPBOARD) == [second, first]
+        assert _ids(search, "mak deploy", KIND_CLIPBOARD) == []
+        assert _ids(search, "make deploy ", KIND_CLIPBOARD) == [second, first]
+        assert _ids(search, "staging d", KIND_CLIPBOARD) == [second]
+        assert search.search("d") == {}
+        print("  ✓ Prefijo solo en la última palabra; prefijos de una letra ignorados")
+
+        like = UnifiedSearch(db_path)
+        like._items_fts = like._index_enabled = False
+        for query in ["backup", "deploy", "make deploy", "documentacion servidor", "example"]:
+            indexed = {kind: {r.ref_id for r in results} for kind, results in search.search(query).items()}
+            scanned = {kind: {r.ref_id for r in results} for kind, results in like.search(query).items()}
+            assert indexed == scanned, f"{query!r}: {indexed} != {scanned}"
+        assert _ids(like, "backup", KIND_BOOKMARK) == [in_title, newer_in_url, in_url]
+        print("  ✓ Sin FTS5, LIKE encuentra lo mismo y en el mismo orden")
+        db.close()
+
+
+if __name__ == "__main__":
+    test_index_follows_writes()
+    test_ranking_and_fallback()
+    print("\n✅ Tests completados")
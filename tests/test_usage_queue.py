@@ -0,0 +1,177 @@
+"""
+Script de testing para la escritura diferida de usos (UsageQueue)
+Prueba la agrupación por item, los disparadores de volcado y la recuperación del journal
+"""
+
+import sys
+import time
+import tempfile
+from pathlib import Path
+import logging
+
+# Agregar src al path
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir / 'src'))
+
+from database.db_manager import DBManager
+from database.usage_queue import UsageQueue
+
+# Configurar logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+
+NEVER_MS = 60 * 60 * 1000
+
+
+def _create_db(tmp_dir: str):
+    """Crear BD temporal con dos items"""
+    db_path = str(Path(tmp_dir) / "usage_test.db")
+    db = DBManager(db_path)
+    category_id = db.add_category("Git")
+    first_id = db.add_item(category_id, "Git status", "git status")
+    second_id = db.add_item(category_id, "Git log", "git log")
+    return db, db_path, first_id, second_id
+
+
+def _use_count(db: DBManager, item_id: int) -> int:
+    return db.execute_query("SELECT use_count FROM items WHERE id = ?", (item_id,))[0]['use_count']
+
+
+def test_usage_events_are_coalesced():
+    """Test: N usos del mismo item = un UPDATE con +N y N filas de historial"""
+    print("\n" + "="*60)
+    print("TEST 1: AGRUPACIÓN DE USOS POR ITEM")
+    print("="*60)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db, db_path, first_id, second_id = _create_db(tmp_dir)
+        queue = UsageQueue(db_path, flush_interval_ms=NEVER_MS, idle_ms=NEVER_MS, max_pending=1000)
+
+        for _ in range(10):
+            queue.record_use(first_id, execution_time_ms=5)
+        queue.record_use(second_id, success=False, error_message="boom")
+        queue.record_history(first_id, "git status", keep_latest=3)
+        queue.record_history(first_id, "git status", keep_latest=3)
+
+        assert _use_count(db, first_id) == 0
+        assert queue.journal_path.exists()
+
+        assert queue.flush() == 13
+        assert _use_count(db, first_id) == 10
+        assert _use_count(db, second_id) == 1
+        history = db.execute_query("SELECT COUNT(*) AS n FROM item_usage_history")[0]['n']
+        assert history == 11
+        assert len(db.get_history()) == 2
+        assert not queue.journal_path.exists()
+        print("  ✓ 11 usos volcados en una transacción, journal vaciado")
+
+        queue.close()
+        db.close()
+
+
+def test_flush_triggers():
+    """Test: volcado automático por tamaño de cola y por inactividad"""
+    print("\n" + "="*60)
+    print("TEST 2: DISPARADORES DE VOLCADO")
+    print("="*60)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db, db_path, first_id, _ = _create_db(tmp_dir)
+
+        queue = UsageQueue(db_path, flush_interval_ms=NEVER_MS, idle_ms=NEVER_MS, max_pending=3)
+        for _ in range(3):
+            queue.record_use(first_id)
+        deadline = time.monotonic() + 5
+        while queue.pending_count and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert _use_count(db, first_id) == 3
+        print("  ✓ Volcado al alcanzar max_pending")
+
+        queue.configure(max_pending=1000, idle_ms=50)
+        queue.record_last_used(first_id)
+        deadline = time.monotonic() + 5
+        while queue.pending_count and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert queue.pending_count == 0
+        print("  ✓ Volcado tras idle_ms sin eventos")
+
+        queue.close()
+        db.close()
+
+
+def test_journal_recovery():
+    """Test: los eventos no volcados se recuperan del journal al reabrir"""
+    print("\n" + "="*60)
+    print("TEST 3: RECUPERACIÓN DEL JOURNAL")
+    print("="*60)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db, db_path, first_id, _ = _create_db(tmp_dir)
+        journal = Path(tmp_dir) / "usage.journal"
+
+        crashed = UsageQueue(db_path, flush_interval_ms=NEVER_MS, idle_ms=NEVER_MS,
+                             journal_path=journal)
+        crashed.record_use(first_id)
+        crashed.flush()
+        crashed.record_use(first_id)
+        crashed.record_use(first_id)
+        # Simular cierre inesperado: el journal conserva el último evento
+        # ya volcado (checkpoint) además de los pendientes
+        lines = journal.read_text().splitlines()
+        journal.write_text("\n".join(['{"kind": "use", "item_id": %d, "seq": 1}' % first_id] + lines)
+                           + '\n{"kind": "us')
+        assert _use_count(db, first_id) == 1
+
+        recovered = UsageQueue(db_path, journal_path=journal)
+        assert _use_count(db, first_id) == 3
+        assert recovered.pending_count == 0
+        assert not journal.exists()
+        print("  ✓ Solo los eventos posteriores al checkpoint se reaplican")
+
+        recovered.close()
+        db.close()
+
+
+def test_recovery_after_clean_shutdown():
+    """Test: tras un cierre limpio (sin journal) la numeración sigue por encima del checkpoint"""
+    print("\n" + "="*60)
+    print("TEST 4: CIERRE LIMPIO Y LUEGO CIERRE INESPERADO")
+    print("="*60)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db, db_path, first_id, _ = _create_db(tmp_dir)
+        journal = Path(tmp_dir) / "usage.journal"
+
+        clean = UsageQueue(db_path, flush_interval_ms=NEVER_MS, idle_ms=NEVER_MS,
+                           journal_path=journal)
+        for _ in range(5):
+            clean.record_use(first_id)
+        clean.close()
+        assert _use_count(db, first_id) == 5
+        assert not journal.exists()
+        print("  ✓ Cierre limpio: checkpoint guardado y journal eliminado")
+
+        # Simular cierre inesperado: no se vuelca ni se cierra
+        crashed = UsageQueue(db_path, flush_interval_ms=NEVER_MS, idle_ms=NEVER_MS,
+                             journal_path=journal)
+        crashed.record_use(first_id)
+        crashed.record_use(first_id)
+        assert journal.exists()
+
+        recovered = UsageQueue(db_path, journal_path=journal)
+        assert _use_count(db, first_id) == 7
+        assert recovered.pending_count == 0
+        print("  ✓ Los eventos nuevos no se descartan como ya volcados")
+
+        recovered.close()
+        db.close()
+
+
+if __name__ == "__main__":
+    test_usage_events_are_coalesced()
+    test_flush_triggers()
+    test_journal_recovery()
+    test_recovery_after_clean_shutdown()
+    print("\n✅ Tests completados")
@@ -0,0 +1,205 @@
+"""
+Script de testing para los agregados de uso (usage rollups)
+Compara las estadísticas servidas desde los agregados con las mismas
+consultas sobre item_usage_history completo
+"""
+
+import sys
+import random
+import tempfile
+from pathlib import Path
+import logging
+
+# Agregar src al path
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir / 'src'))
+
+from database.db_manager import DBManager
+from database.migrations import add_usage_rollups
+from core.stats_manager import StatsManager
+from core.usage_tracker import UsageTracker
+
+# Configurar logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+
+
+def _create_db(tmp_dir: str, seed: int = 7) -> str:
+    """Crear BD temporal con historial aleatorio de 40 días"""
+    db_path = str(Path(tmp_dir) / "rollups_test.db")
+    db = DBManager(db_path)
+    categories = [db.add_category("Git"), db.add_category("Docker")]
+    item_ids = [db.add_item(categories[i % 2], f"Item {i}", f"cmd {i}") for i in range(8)]
+
+    rng = random.Random(seed)
+    rows = []
+    for _ in range(600):
+        seconds_ago = rng.randint(0, 40 * 86400)
+        rows.append((rng.choice(item_ids), f"-{seconds_ago} seconds",
+                     rng.randint(0, 9000), 1 if rng.random() > 0.2 else 0))
+
+    conn = db.connect()
+    conn.executemany("""
+        INSERT INTO item_usage_history (item_id, used_at, execution_time_ms, success)
+        VALUES (?, datetime('now', ?), ?, ?)
+    """, rows)
+    conn.execute("""
+        UPDATE items SET use_count = (
+            SELECT COUNT(*) FROM item_usage_history h WHERE h.item_id = items.id
+        )
+    """)
+    conn.commit()
+    db.close()
+    return db_path
+
+
+def _raw(conn, query, params=()):
+    return [tuple(row) for row in conn.execute(query, params).fetchall()]
+
+
+def _assert_matches_history(db_path: str):
+    """Comparar las APIs de estadísticas con consultas sobre el historial"""
+    tracker = UsageTracker(db_path)
+    stats = StatsManager(db_path)
+    conn = tracker._get_connection()
+
+    by_day = [(r['day'], r['executions'], r['unique_items'], r['successful'], r['failed'])
+              for r in tracker.get_usage_by_day(30)]
+    assert by_day == _raw(conn, """
+        SELECT date(used_at) as day, COUNT(*), COUNT(DISTINCT item_id),
+               SUM(CASE WHEN success = 1 THEN 1 ELSE 0 END),
+               SUM(CASE WHEN success = 0 THEN 1 ELSE 0 END)
+        FROM item_usage_history
+        WHERE used_at >= datetime('now', '-30 days')
+        GROUP BY day ORDER BY day DESC
+    """)
+
+    by_hour = [(r['hour'], r['executions'], r['avg_time_seconds']) for r in tracker.get_usage_by_hour(7)]
+    assert by_hour == _raw(conn, """
+        SELECT strftime('%H', used_at) as hour, COUNT(*),
+               ROUND(AVG(execution_time_ms) / 1000.0, 2)
+        FROM item_usage_history
+        WHERE used_at >= datetime('now', '-7 days')
+        GROUP BY hour ORDER BY hour
+    """)
+
+    assert tracker.get_total_executions_week() == _raw(conn, """
+        SELECT COUNT(*) FROM item_usage_history WHERE used_at >= datetime('now', '-7 days')
+    """)[0][0]
+
+    for item_id, in _raw(conn, "SELECT id FROM items"):
+        avg, errors = _raw(conn, """
+            SELECT AVG(CASE WHEN success = 1 THEN execution_time_ms END),
+                   SUM(CASE WHEN success = 0 THEN 1 ELSE 0 END)
+            FROM item_usage_history WHERE item_id = ?
+        """, (item_id,))[0]
+        assert tracker.get_average_execution_time(item_id) == (round(avg / 1000.0, 2) if avg else 0.0)
+        assert tracker.get_error_count(item_id) == (errors or 0)
+
+    recent = {r['id']: r['recent_uses'] for r in stats.get_most_used_items(limit=100, days=7)}
+    assert recent == dict(_raw(conn, """
+        SELECT i.id, COUNT(h.id) FROM items i
+        LEFT JOIN item_usage_history h ON i.id = h.item_id
+            AND h.used_at >= datetime('now', '-7 days')
+        GROUP BY i.id
+    """))
+
+    dashboard = stats.get_dashboard_stats()
+    total, successful, today = _raw(conn, """
+        SELECT COUNT(*), SUM(success = 1), SUM(date(used_at) = date('now'))
+        FROM item_usage_history
+    """)[0]
+    assert dashboard['total_executions'] == total
+    assert dashboard['executions_today'] == (today or 0)
+    assert dashboard['success_rate'] == (round(successful / total * 100, 2) if total else 100.0)
+
+    productivity = stats.get_productivity_stats(7)
+    active_days, total_ms = _raw(conn, """
+        SELECT COUNT(DISTINCT date(used_at)), SUM(execution_time_ms)
+        FROM item_usage_history WHERE used_at >= datetime('now', '-7 days')
+    """)[0]
+    assert productivity['active_days'] == active_days
+    assert productivity['total_time_seconds'] == round((total_ms or 0) / 1000.0, 2)
+
+    failing = [(r['id'], r['total_executions'], r['failures'], r['error_rate'])
+               for r in stats.get_most_failing_items(limit=100, min_executions=1)]
+    assert sorted(failing) == sorted(_raw(conn, """
+        SELECT i.id, COUNT(h.id) as total_executions,
+               SUM(CASE WHEN h.success = 0 THEN 1 ELSE 0 END),
+               ROUND(100.0 * SUM(CASE WHEN h.success = 0 THEN 1 ELSE 0 END) / COUNT(h.id), 2) as error_rate
+        FROM items i JOIN item_usage_history h ON i.id = h.item_id
+        GROUP BY i.id HAVING total_executions >= 1 AND error_rate > 5
+    """))
+
+    categories = [(r['day'], r['category'], r['executions'])
+                  for r in stats.get_category_usage_by_day(30)]
+    assert sorted(categories) == sorted(_raw(conn, """
+        SELECT date(h.used_at), c.name, COUNT(*)
+        FROM item_usage_history h
+        JOIN items i ON i.id = h.item_id
+        JOIN categories c ON c.id = i.category_id
+        WHERE h.used_at >= datetime('now', '-30 days')
+        GROUP BY date(h.used_at), c.id
+    """))
+
+
+def test_rollups_match_raw_history():
+    """Test: estadísticas desde agregados == estadísticas desde el historial"""
+    print("\n" + "="*60)
+    print("TEST 1: AGREGADOS EQUIVALENTES AL HISTORIAL")
+    print("="*60)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = _create_db(tmp_dir)
+        _assert_matches_history(db_path)
+        print("  ✓ Ventanas, totales y agrupaciones idénticas")
+
+
+def test_rollups_follow_deletes_and_moves():
+    """Test: limpieza de historial, cambio de categoría y borrado de items"""
+    print("\n" + "="*60)
+    print("TEST 2: MANTENIMIENTO INCREMENTAL")
+    print("="*60)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = _create_db(tmp_dir)
+        db = DBManager(db_path)
+
+        UsageTracker(db_path).cleanup_old_history(days=20)
+        conn = db.connect()
+        conn.execute("UPDATE items SET category_id = (SELECT MIN(id) FROM categories) WHERE id = 2")
+        conn.execute("PRAGMA foreign_keys = ON")
+        conn.execute("DELETE FROM items WHERE id = 3")
+        conn.commit()
+
+        _assert_matches_history(db_path)
+        print("  ✓ Agregados actualizados por los triggers")
+        db.close()
+
+
+def test_rollups_backfill():
+    """Test: una BD sin agregados los reconstruye desde el historial"""
+    print("\n" + "="*60)
+    print("TEST 3: BACKFILL DE BD EXISTENTE")
+    print("="*60)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = _create_db(tmp_dir)
+        db = DBManager(db_path)
+        conn = db.connect()
+        add_usage_rollups.downgrade(conn)
+        conn.commit()
+        db.close()
+
+        DBManager(db_path).close()
+        _assert_matches_history(db_path)
+        print("  ✓ Agregados reconstruidos al reabrir")
+
+
+if __name__ == "__main__":
+    test_rollups_match_raw_history()
+    test_rollups_follow_deletes_and_moves()
+    test_rollups_backfill()
+    print("\n✅ Tests completados")
@@ -0,0 +1,125 @@
+"""
+Benchmark: filtros avanzados compilados (core/advanced_filter_engine)
+
+Aplica combinaciones de filtros habituales del panel de filtros avanzados
+a 10k y 100k items sintéticos y compara:
+
+- antes: una copia de la lista y una list comprehension por filtro (con
+  los tipos pasados a mayúsculas en cada item)
+- ahora: AdvancedFilterEngine.apply_filters (plan compilado y cacheado,
+  una sola pasada, top N con heap)
+
+Uso:
+    python util/benchmarks/benchmark_advanced_filters.py [num_items ...]
+"""
+
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Agregar src al path
+root_dir = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(root_dir / 'src'))
+
+from core.advanced_filter_engine import AdvancedFilterEngine
+from models.item import Item, ItemType
+
+REPEAT = 5
+TAGS = ['git', 'docker', 'python', 'ops', 'sql', 'web']
+
+FILTER_SETS = {
+    "tipo": {'type': ['CODE', 'URL']},
+    "tipo+favorito+tags": {'type': ['CODE', 'URL'], 'is_favorite': True,
+                           'tags': {'values': ['git', 'docker'], 'mode': 'OR'}},
+    "todo (7 filtros)": {'type': ['CODE', 'URL', 'TEXT'], 'is_sensitive': False, 'has_tags': True,
+                         'tags': {'values': ['git'], 'mode': 'OR'},
+                         'use_count': {'operator': '>', 'value': 2},
+                         'last_used': {'preset': 'last_30_days'},
+                         'created_at': {'preset': 'this_month'}},
+    "orden+top 20": {'is_sensitive': False, 'sort_by': 'use_count_desc', 'top_n': 20},
+    "top 20 sin orden": {'type': ['TEXT'], 'top_n': 20},
+}
+
+
+def make_items(num_items: int, rng: random.Random) -> list:
+    now = datetime.now()
+    items = []
+    for item_id in range(num_items):
+        item = Item(
+            item_id=str(item_id),
+            label=f"Item {item_id}",
+            content="contenido",
+            item_type=rng.choice(list(ItemType)),
+            is_sensitive=rng.random() < 0.1,
+            is_favorite=rng.random() < 0.2,
+            tags=rng.sample(TAGS, rng.randint(0, 3)),
+        )
+        item.use_count = rng.randint(0, 20)
+        item.created_at = now - timedelta(days=rng.randint(0, 90))
+        item.last_used = now - timedelta(days=rng.randint(0, 90))
+        items.append(item)
+    return items
+
+
+def apply_sequential(items: list, filters: dict) -> list:
+    """Filtrado anterior: una lista nueva por cada filtro"""
+    filtered = items.copy()
+    if filters.get('type'):
+        filtered = [i for i in filtered if i.type.value.upper() in [t.upper() for t in filters['type']]]
+    if filters.get('is_favorite') is not None:
+        filtered = [i for i in filtered if i.is_favorite == filters['is_favorite']]
+    if filters.get('is_sensitive') is not None:
+        filtered = [i for i in filtered if i.is_sensitive == filters['is_sensitive']]
+    if filters.get('has_tags') is not None:
+        filtered = [i for i in filtered if bool(i.tags) == filters['has_tags']]
+    if filters.get('tags'):
+        values = filters['tags']['values']
+        filtered = [i for i in filtered if i.tags and any(t in i.tags for t in values)]
+    if filters.get('use_count'):
+        filtered = [i for i in filtered if getattr(i, 'use_count', 0) > filters['use_count']['value']]
+    now = datetime.now()
+    if filters.get('last_used'):
+        start = now - timedelta(days=30)
+        filtered = [i for i in filtered if i.last_used >= start]
+    if filters.get('created_at'):
+        start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        filtered = [i for i in filtered if i.created_at and i.created_at >= start]
+    if filters.get('sort_by'):
+        filtered = sorted(filtered, key=lambda x: getattr(x, 'use_count', 0), reverse=True)
+    if filters.get('top_n'):
+        filtered = filtered[:filters['top_n']]
+    return filtered
+
+
+def measure(apply, items: list, filters: dict) -> tuple:
+    """(ms por aplicación, número de resultados)"""
+    result = apply(items, filters)
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        apply(items, filters)
+    return (time.perf_counter() - start) * 1000 / REPEAT, len(result)
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10_000, 100_000]
+    engine = AdvancedFilterEngine()
+
+    for num_items in sizes:
+        items = make_items(num_items, random.Random(42))
+
+        print("=" * 60)
+        print(f"FILTROS AVANZADOS: {num_items} items ({REPEAT} repeticiones)")
+        print("=" * 60)
+        print(f"  {'filtros':22} {'antes':>10} {'ahora':>10} {'x':>7}  resultados")
+        for name, filters in FILTER_SETS.items():
+            before_ms, before_count = measure(apply_sequential, items, filters)
+            after_ms, after_count = measure(engine.apply_filters, items, filters)
+            assert before_count == after_count, name
+            print(f"  {name:22} {before_ms:8.2f}ms {after_ms:8.2f}ms {before_ms / after_ms:6.1f}x  {after_count}")
+        print()
+
+
+if __name__ == "__main__":
+    main()
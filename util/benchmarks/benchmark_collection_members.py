@@ -0,0 +1,116 @@
+"""
+Benchmark: miembros materializados de Smart Collections (collection_members)
+
+Crea una base de datos temporal con N items sintéticos y las colecciones
+predefinidas más algunas con consulta, y compara:
+
+- antes: contar cada colección ejecutando sus filtros sobre items
+  (get_all_collections_with_count) y abrir una colección ejecutándolos
+- ahora: conteos con un GROUP BY sobre collection_members y apertura por
+  índice, después de sincronizar un cambio de un item
+
+Uso:
+    python util/benchmarks/benchmark_collection_members.py [num_items ...]
+"""
+
+import logging
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Agregar src al path
+root_dir = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(root_dir / 'src'))
+
+from core.smart_collections_manager import SmartCollectionsManager
+from database.connection_pool import close_all_connections
+from database.db_manager import DBManager
+from database.migrations.add_tag_groups_and_collections import migrate_add_tag_groups_and_collections
+
+REPEAT = 5
+TAGS = ['git', 'docker', 'python', 'ops', 'sql', 'web']
+
+
+def populate(db_path: str, num_items: int, rng: random.Random) -> None:
+    db = DBManager(db_path)
+    categories = [db.add_category(f"Categoría {n}") for n in range(10)]
+    conn = db.connect()
+    conn.executemany(
+        "INSERT INTO items (category_id, label, content, type, tags, is_favorite) VALUES (?, ?, ?, ?, ?, ?)",
+        [(rng.choice(categories), f"Item {n} {rng.choice(TAGS)}", f"contenido {n}",
+          rng.choice(['TEXT', 'URL', 'CODE', 'PATH']),
+          '["' + '", "'.join(rng.sample(TAGS, rng.randint(1, 2))) + '"]',
+          int(rng.random() < 0.2))
+         for n in range(num_items)]
+    )
+    conn.execute("""
+        INSERT OR IGNORE INTO tags (name)
+        SELECT DISTINCT value FROM items, json_each(items.tags)
+    """)
+    conn.execute("""
+        INSERT OR IGNORE INTO item_tags (item_id, tag_id)
+        SELECT items.id, tags.id FROM items, json_each(items.tags) JOIN tags ON tags.name = value
+    """)
+    conn.commit()
+    db.close()
+    migrate_add_tag_groups_and_collections(db_path)
+
+
+def measure(function) -> float:
+    """ms por llamada"""
+    function()
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        function()
+    return (time.perf_counter() - start) * 1000 / REPEAT
+
+
+def main():
+    logging.disable(logging.INFO)
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10_000, 100_000]
+
+    for num_items in sizes:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            db_path = str(Path(tmp_dir) / "benchmark.db")
+            populate(db_path, num_items, random.Random(42))
+            manager = SmartCollectionsManager(db_path)
+            manager.create_collection("Docker", query='tag:docker -type:code')
+            manager.create_collection("Favoritos git", query='is:fav tag:git')
+            manager.create_collection("Texto", search_text='Item 1')
+            collections = manager.get_all_collections()
+            opened = manager.get_collection_by_name("Docker")
+
+            def counts_live():
+                return [len(manager._execute_filters(collection)) for collection in collections]
+
+            def counts_materialized():
+                # Un item cambiado desde la última sincronización
+                conn = manager._get_connection()
+                conn.execute("UPDATE items SET label = label || '' WHERE id = 1")
+                conn.commit()
+                return [collection['item_count'] for collection in manager.get_all_collections_with_count()]
+
+            build_ms = measure(manager.rebuild_members)
+            before_ms = measure(counts_live)
+            after_ms = measure(counts_materialized)
+            assert counts_live() == counts_materialized()
+            open_before_ms = measure(lambda: manager._execute_filters(opened))
+            open_after_ms = measure(lambda: manager.execute_collection(opened['id']))
+
+            print("=" * 60)
+            print(f"SMART COLLECTIONS: {num_items} items, {len(collections)} colecciones "
+                  f"({REPEAT} repeticiones)")
+            print("=" * 60)
+            print(f"  reconstrucción completa:  {build_ms:8.2f}ms")
+            print(f"  contar todas:  antes {before_ms:8.2f}ms  ahora {after_ms:8.2f}ms  "
+                  f"{before_ms / after_ms:5.1f}x")
+            print(f"  abrir Docker:  antes {open_before_ms:8.2f}ms  ahora {open_after_ms:8.2f}ms  "
+                  f"{open_before_ms / open_after_ms:5.1f}x")
+            print()
+            close_all_connections(db_path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Benchmark: índice de bitmaps de flags (core/flag_index)
+
+Combina filtros de estado y tipo (como los botones del dashboard y los
+filtros del panel flotante) sobre 10k y 100k items sintéticos y compara:
+
+- antes: una list comprehension por combinación, comprobando cada item
+- ahora: AND/OR/NOT de los bitmaps de FlagIndex y select() / count()
+
+Uso:
+    python util/benchmarks/benchmark_flag_index.py [num_items ...]
+"""
+
+import random
+import sys
+import time
+from pathlib import Path
+
+# Agregar src al path
+root_dir = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(root_dir / 'src'))
+
+from core.flag_index import FlagIndex
+from models.item import Item, ItemType
+
+REPEAT = 5
+
+COMBINATIONS = {
+    "favoritos": (
+        lambda items: [i for i in items if i.is_favorite],
+        lambda index: index.favorite,
+    ),
+    "normales (activos)": (
+        lambda items: [i for i in items if i.is_active and not i.is_archived],
+        lambda index: index.active & ~index.archived,
+    ),
+    "CODE|URL + favorito": (
+        lambda items: [i for i in items if i.type in (ItemType.CODE, ItemType.URL) and i.is_favorite],
+        lambda index: index.types_bitmap(['CODE', 'URL']) & index.favorite,
+    ),
+    "no sensible, sin listas": (
+        lambda items: [i for i in items if not i.is_sensitive and not i.is_list_item()],
+        lambda index: ~index.sensitive & ~index.list,
+    ),
+}
+
+
+def make_items(num_items: int, rng: random.Random) -> list:
+    items = []
+    for item_id in range(num_items):
+        item = Item(
+            item_id=str(item_id),
+            label=f"Item {item_id}",
+            content="contenido",
+            item_type=rng.choice(list(ItemType)),
+            is_sensitive=rng.random() < 0.1,
+            is_favorite=rng.random() < 0.05,
+            is_list=rng.random() < 0.05,
+        )
+        item.is_active = rng.random() < 0.9
+        item.is_archived = rng.random() < 0.1
+        items.append(item)
+    return items
+
+
+def measure(function) -> tuple:
+    """(ms por llamada, resultado)"""
+    result = function()
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        function()
+    return (time.perf_counter() - start) * 1000 / REPEAT, result
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10_000, 100_000]
+
+    for num_items in sizes:
+        items = make_items(num_items, random.Random(42))
+        build_ms, index = measure(lambda: FlagIndex(items))
+
+        print("=" * 60)
+        print(f"BITMAPS DE FLAGS: {num_items} items ({REPEAT} repeticiones)")
+        print("=" * 60)
+        print(f"  construir índice: {build_ms:.2f}ms")
+        print(f"  {'combinación':24} {'antes':>10} {'select':>10} {'count':>10}  resultados")
+        for name, (scan, bits) in COMBINATIONS.items():
+            before_ms, expected = measure(lambda: scan(items))
+            select_ms, selected = measure(lambda: index.select(bits(index)))
+            count_ms, count = measure(lambda: index.count(bits(index)))
+            assert selected == expected and count == len(expected), name
+            print(f"  {name:24} {before_ms:8.2f}ms {select_ms:8.2f}ms {count_ms:8.3f}ms  {count}")
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""
+Benchmark: búsqueda difusa con el índice de trigramas (core/fuzzy_index)
+
+Construye un FuzzyIndex con items sintéticos (labels, tags y list_group
+generados a partir de un vocabulario de comandos y palabras) y mide la
+latencia de consultas con errores de escritura. Objetivo: p95 < 10 ms
+para 100k items.
+
+También mide una actualización incremental (update_item) y compara con la
+búsqueda por subcadena que se hacía antes (que no encuentra "dokcer").
+
+Uso:
+    python util/benchmarks/benchmark_fuzzy_search.py [num_items]
+"""
+
+import gc
+import random
+import sys
+import time
+from pathlib import Path
+
+# Agregar src al path
+root_dir = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(root_dir / 'src'))
+
+from core.fuzzy_index import FuzzyIndex
+
+TARGET_MS = 10.0
+COLD_RUNS = 5
+
+BASE_WORDS = [
+    "docker", "compose", "kubectl", "git", "status", "commit", "push", "pull",
+    "branch", "merge", "rebase", "python", "pytest", "install", "server",
+    "deploy", "backup", "database", "postgres", "mysql", "redis", "nginx",
+    "config", "logs", "restart", "network", "volume", "container", "image",
+    "build", "release", "password", "token", "email", "address", "invoice",
+    "meeting", "project", "report", "template", "snippet", "query", "select",
+    "update", "delete", "create", "cliente", "factura", "contraseña", "correo",
+    "dirección", "reunión", "proyecto", "plantilla", "consulta", "servidor",
+]
+
+# Consultas con errores (transposición, omisión, sustitución) y prefijos
+QUERIES = [
+    "dokcer", "kubctl", "comit", "pyhton", "databse", "restrat", "contianer",
+    "dokcer compose", "git stauts", "facutra", "contraseña", "servdor",
+    "postgers", "deplyo", "templte", "invocie", "reunion", "dock", "kube",
+]
+
+
+def synthetic_words(rng: random.Random, count: int) -> list:
+    """Vocabulario: palabras base, variantes con sufijos e identificadores"""
+    suffixes = ["", "s", "er", "ing", "ed", "_prod", "_dev", "-v2", "ctl", "ado"]
+    words = set(BASE_WORDS)
+    while len(words) < count:
+        base = rng.choice(BASE_WORDS)
+        kind = rng.random()
+        if kind < 0.5:
+            words.add(base + rng.choice(suffixes))
+        elif kind < 0.8:
+            words.add(f"{base}{rng.randint(1, 999)}")
+        else:
+            words.add("".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(4, 10))))
+    return sorted(words)
+
+
+def build_index(num_items: int, rng: random.Random):
+    """Índice con num_items items sintéticos"""
+    words = synthetic_words(rng, max(2000, num_items // 4))
+    index = FuzzyIndex()
+    items = {}
+    for item_id in range(1, num_items + 1):
+        label = " ".join(rng.choice(words) for _ in range(rng.randint(2, 4)))
+        tags = [rng.choice(BASE_WORDS) for _ in range(rng.randint(0, 3))]
+        list_group = rng.choice(words) if rng.random() < 0.05 else None
+        index.update_item(item_id, label, tags, list_group)
+        items[item_id] = label
+    return index, items
+
+
+def percentile(values: list, fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def main():
+    num_items = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    rng = random.Random(42)
+
+    start = time.perf_counter()
+    index, items = build_index(num_items, rng)
+    build_ms = (time.perf_counter() - start) * 1000
+    # La construcción deja mucha basura pendiente: no medir esa pausa del GC
+    gc.collect()
+
+    # Cada consulta se mide varias veces "en frío" (sin la caché de términos)
+    # y luego repetida con la caché
+    cold, warm = [], []
+    results = {}
+    for query in QUERIES:
+        for _ in range(COLD_RUNS):
+            index._query_cache.clear()
+            start = time.perf_counter()
+            results[query] = index.search(query, limit=50)
+            cold.append((time.perf_counter() - start) * 1000)
+        for _ in range(5):
+            start = time.perf_counter()
+            index.search(query, limit=50)
+            warm.append((time.perf_counter() - start) * 1000)
+
+    assert results["dokcer"], "dokcer should match docker"
+    assert any("docker" in items[item_id] for item_id, _ in results["dokcer"])
+
+    # Actualización incremental de un item
+    updates = []
+    for item_id in rng.sample(range(1, num_items + 1), 200):
+        start = time.perf_counter()
+        index.update_item(item_id, f"renamed {rng.choice(BASE_WORDS)} {item_id}", ["edited"])
+        updates.append((time.perf_counter() - start) * 1000)
+
+    # Búsqueda anterior: subcadena exacta sobre todos los labels
+    start = time.perf_counter()
+    substring_hits = [item_id for item_id, label in items.items() if "dokcer" in label.lower()]
+    substring_ms = (time.perf_counter() - start) * 1000
+
+    print("=" * 60)
+    print(f"BÚSQUEDA DIFUSA: {num_items} items, {index.vocabulary_size} palabras")
+    print("=" * 60)
+    print(f"  Construcción del índice:        {build_ms:10.1f} ms")
+    print(f"  Consulta en frío p50 / p95:     {percentile(cold, 0.5):6.2f} / {percentile(cold, 0.95):6.2f} ms")
+    print(f"  Consulta en caché p50 / p95:    {percentile(warm, 0.5):6.2f} / {percentile(warm, 0.95):6.2f} ms")
+    print(f"  Consulta más lenta:             {max(cold):10.2f} ms")
+    print(f"  update_item p95:                {percentile(updates, 0.95):10.3f} ms")
+    print(f"  Subcadena 'dokcer' (antes):     {substring_ms:10.1f} ms, {len(substring_hits)} resultados")
+    print(f"  Difusa 'dokcer':                {len(results['dokcer'])} resultados")
+    print()
+    for query in ("dokcer", "git stauts", "kubctl"):
+        best = results[query][:3]
+        print(f"  {query!r}: " + ", ".join(f"{items[item_id]!r} ({score:.2f})" for item_id, score in best))
+
+    p95 = percentile(cold, 0.95)
+    print()
+    print(f"  Objetivo p95 < {TARGET_MS:.0f} ms: {'OK' if p95 < TARGET_MS else 'NO'} ({p95:.2f} ms)")
+    return 0 if p95 < TARGET_MS else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,132 @@
+"""
+Benchmark: claves de búsqueda precalculadas (utils/search_keys, Item.search_*)
+
+Simula escribir varias consultas letra a letra sobre items sintéticos con
+textos en español y compara:
+
+- antes: label/content/tags pasados a minúsculas en cada pulsación
+- ahora: SearchEngine.match_items contra las claves normalizadas del Item
+
+Mide latencia por pulsación, las cadenas temporales que se dejan de crear
+en cada pulsación, el coste (tiempo y memoria retenida, tracemalloc) de
+calcular las claves una vez y cuántos resultados encuentra
+cada versión (las consultas sin acentos solo encuentran el texto acentuado
+con las claves).
+
+Uso:
+    python util/benchmarks/benchmark_search_keys.py [num_items]
+"""
+
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+# Agregar src al path
+root_dir = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(root_dir / 'src'))
+
+from core.search_engine import SearchEngine
+from models.item import Item
+
+WORDS = [
+    "Reunión", "configuración", "Dirección", "contraseña", "Factura", "cliente",
+    "público", "análisis", "Git", "docker", "compose", "servidor", "Código",
+    "búsqueda", "información", "Año", "Teléfono", "correo", "plantilla", "Índice",
+    "deploy", "backup", "base", "datos", "útil", "rápido", "acción", "versión",
+]
+
+# Se escriben letra a letra
+TYPED_QUERIES = ["reunion", "configuracion", "docker compose", "codigo", "factura"]
+
+
+def make_items(num_items: int, rng: random.Random) -> list:
+    """Items con label, contenido, tags y descripción aleatorios"""
+    items = []
+    for item_id in range(1, num_items + 1):
+        items.append(Item(
+            item_id=str(item_id),
+            label=" ".join(rng.choice(WORDS) for _ in range(rng.randint(2, 4))),
+            content=" ".join(rng.choice(WORDS) for _ in range(rng.randint(8, 30))),
+            tags=[rng.choice(WORDS).lower() for _ in range(rng.randint(0, 3))],
+            description=" ".join(rng.choice(WORDS) for _ in range(3)) if rng.random() < 0.3 else None,
+        ))
+    return items
+
+
+def match_lowercase(query: str, items: list) -> list:
+    """Búsqueda anterior: minúsculas de cada campo en cada pulsación"""
+    matching_items = []
+    for item in items:
+        label_match = query in item.label.lower()
+        content_match = not item.is_sensitive and query in item.content.lower()
+        tags_match = any(query in tag.lower() for tag in item.tags)
+        if label_match or content_match or tags_match:
+            matching_items.append(item)
+    return matching_items
+
+
+def keystrokes() -> list:
+    return [query[:length] for query in TYPED_QUERIES for length in range(1, len(query) + 1)]
+
+
+def measure(matcher, items: list) -> tuple:
+    """(ms por pulsación, resultados de cada consulta completa)"""
+    queries = keystrokes()
+    start = time.perf_counter()
+    for query in queries:
+        matcher(query, items)
+    elapsed_ms = (time.perf_counter() - start) * 1000 / len(queries)
+    results = {query: len(matcher(query, items)) for query in TYPED_QUERIES}
+    return elapsed_ms, results
+
+
+def lowercase_garbage(items: list) -> tuple:
+    """(cadenas, bytes) temporales que match_lowercase crea en cada pulsación"""
+    strings = [item.label.lower() for item in items]
+    strings += [item.content.lower() for item in items]
+    strings += [tag.lower() for item in items for tag in item.tags]
+    return len(strings), sum(sys.getsizeof(string) for string in strings)
+
+
+def main():
+    num_items = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    items = make_items(num_items, random.Random(42))
+    engine = SearchEngine()
+
+    # Las claves se calculan una vez (la primera búsqueda); medir ese coste.
+    # La memoria se mide aparte, sobre otra copia: tracemalloc ralentiza mucho
+    start = time.perf_counter()
+    for item in items:
+        item.search_text, item.search_description
+    keys_ms = (time.perf_counter() - start) * 1000
+
+    copies = make_items(num_items, random.Random(42))
+    tracemalloc.start()
+    for item in copies:
+        item.search_text, item.search_description
+    keys_kib = tracemalloc.get_traced_memory()[0] / 1024
+    tracemalloc.stop()
+    del copies
+
+    before_ms, before_results = measure(match_lowercase, items)
+    after_ms, after_results = measure(engine.match_items, items)
+    garbage_count, garbage_bytes = lowercase_garbage(items)
+
+    print("=" * 60)
+    print(f"CLAVES DE BÚSQUEDA: {num_items} items, {len(keystrokes())} pulsaciones")
+    print("=" * 60)
+    print(f"  Calcular claves (una vez):      {keys_ms:10.1f} ms, {keys_kib / 1024:6.1f} MiB retenidos")
+    print(f"  Antes (lower por pulsación):    {before_ms:10.2f} ms/pulsación")
+    print(f"  Ahora (claves precalculadas):   {after_ms:10.2f} ms/pulsación")
+    print(f"  Mejora de latencia:             {before_ms / after_ms:10.1f}x")
+    print(f"  Cadenas temporales/pulsación:   {garbage_count:10} antes ({garbage_bytes / 1024 / 1024:.1f} MiB), 0 ahora")
+    print()
+    print("  Resultados (antes -> ahora):")
+    for query in TYPED_QUERIES:
+        print(f"    {query!r:18} {before_results[query]:6} -> {after_results[query]:6}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Benchmark: carga de estructura completa (categorías + items)
+
+Compara el camino anterior (una query de items por categoría, N+1) con la
+carga masiva DBManager.get_categories_with_items() sobre una base de datos
+sintética de 50k items.
+
+Uso:
+    python util/benchmarks/benchmark_structure_loader.py [num_items] [num_categories]
+"""
+
+import os
+import sys
+import time
+import random
+import tempfile
+from pathlib import Path
+
+# Agregar src al path
+root_dir = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(root_dir / 'src'))
+
+from database.db_manager import DBManager
+
+
+def build_synthetic_db(db_path: str, num_items: int, num_categories: int) -> DBManager:
+    """Crear una base de datos sintética con categorías e items"""
+    db = DBManager(db_path)
+    conn = db.connect()
+
+    conn.executemany(
+        "INSERT INTO categories (name, icon, order_index) VALUES (?, ?, ?)",
+        [(f"Categoría {i}", "📁", i) for i in range(num_categories)]
+    )
+    category_ids = [row[0] for row in conn.execute("SELECT id FROM categories")]
+
+    rng = random.Random(42)
+    types = ['TEXT', 'URL', 'CODE', 'PATH']
+    rows = []
+    for i in range(num_items):
+        tags = '["git", "docker", "tag%d"]' % (i % 50)
+        rows.append((
+            rng.choice(category_ids), f"Item {i}", f"echo contenido {i}",
+            types[i % 4], tags, f"Descripción {i}"
+        ))
+    conn.executemany("""
+        INSERT INTO items (category_id, label, content, type, tags, description)
+        VALUES (?, ?, ?, ?, ?, ?)
+    """, rows)
+    conn.commit()
+    return db
+
+
+def load_legacy(db: DBManager):
+    """Camino anterior: una query por categoría"""
+    categories = db.get_categories()
+    for category in categories:
+        category['items'] = db.get_items_by_category(category['id'])
+    return categories
+
+
+def load_bulk(db: DBManager):
+    """Camino nuevo: carga masiva agrupada en una pasada"""
+    return db.get_categories_with_items()
+
+
+def time_it(func, *args, repeat: int = 3) -> float:
+    """Mejor tiempo (ms) de varias ejecuciones"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, (time.perf_counter() - start) * 1000)
+    return best
+
+
+def main():
+    num_items = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    num_categories = int(sys.argv[2]) if len(sys.argv) > 2 else 300
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # EncryptionManager usa .env relativo al directorio actual
+        os.chdir(tmp_dir)
+        db = build_synthetic_db(str(Path(tmp_dir) / "bench.db"), num_items, num_categories)
+
+        legacy = load_legacy(db)
+        bulk = load_bulk(db)
+        assert [len(c['items']) for c in legacy] == [len(c['items']) for c in bulk]
+        assert [[i['id'] for i in c['items']] for c in legacy] == \
+               [[i['id'] for i in c['items']] for c in bulk]
+
+        legacy_ms = time_it(load_legacy, db)
+        bulk_ms = time_it(load_bulk, db)
+        db.close()
+
+    print("=" * 60)
+    print(f"ESTRUCTURA: {num_categories} categorías, {num_items} items")
+    print("=" * 60)
+    print(f"  N+1 (get_items_by_category):    {legacy_ms:10.1f} ms")
+    print(f"  Bulk (get_categories_with_items): {bulk_ms:8.1f} ms")
+    print(f"  Speedup: {legacy_ms / bulk_ms:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
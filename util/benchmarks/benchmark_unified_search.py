@@ -0,0 +1,165 @@
+"""
+Benchmark: búsqueda común (core/unified_search, search_index)
+
+Crea una base de datos temporal con items, pestañas del bloc de notas,
+marcadores, historial del portapapeles y sesiones del navegador, simula
+escribir varias consultas letra a letra y mide, por pulsación, lo que
+tarda buscar en todas las entidades (8 resultados por tipo):
+
+- índices FTS5 (items_fts + search_index), lo que usa la búsqueda global
+- LIKE sobre las tablas de origen (sin FTS5)
+
+El objetivo es que una pulsación busque todo en menos de 20 ms.
+
+Uso:
+    python util/benchmarks/benchmark_unified_search.py [num_items]
+"""
+
+import logging
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Agregar src al path
+root_dir = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(root_dir / 'src'))
+
+from database.db_manager import DBManager
+from database.migrations import add_notebook_tabs_table
+from core.unified_search import UnifiedSearch
+
+TARGET_MS = 20
+
+WORDS = [
+    "Reunión", "configuración", "Dirección", "contraseña", "Factura", "cliente",
+    "público", "análisis", "Git", "docker", "compose", "servidor", "Código",
+    "búsqueda", "información", "Año", "Teléfono", "correo", "plantilla", "Índice",
+    "deploy", "backup", "base", "datos", "útil", "rápido", "acción", "versión",
+]
+
+# Se escriben letra a letra
+TYPED_QUERIES = ["reunion", "docker compose", "factura cliente", "deploy", "zzz"]
+
+# Tablas de sesiones (migrate_add_sessions.py solo migra widget_sidebar.db)
+SESSION_TABLES = """
+    CREATE TABLE IF NOT EXISTS browser_sessions (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT NOT NULL,
+        is_auto_save BOOLEAN DEFAULT 0,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+    CREATE TABLE IF NOT EXISTS session_tabs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        session_id INTEGER NOT NULL,
+        url TEXT NOT NULL,
+        title TEXT DEFAULT 'Nueva pestaña',
+        position INTEGER DEFAULT 0,
+        is_active BOOLEAN DEFAULT 0,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (session_id) REFERENCES browser_sessions(id) ON DELETE CASCADE
+    );
+"""
+
+
+def text(rng: random.Random, low: int, high: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(rng.randint(low, high)))
+
+
+def populate(db_path: str, num_items: int, rng: random.Random) -> None:
+    """Datos sintéticos; los triggers mantienen los índices al insertar"""
+    db = DBManager(db_path)
+    conn = db.connect()
+    add_notebook_tabs_table.upgrade(conn)
+    conn.executescript(SESSION_TABLES)
+    conn.commit()
+    db.close()
+
+    # Reabrir: las migraciones indexan las tablas recién creadas
+    db = DBManager(db_path)
+    conn = db.connect()
+    category_ids = [db.add_category(f"Categoría {n}") for n in range(20)]
+    conn.executemany(
+        "INSERT INTO items (category_id, label, content, type, tags, description) VALUES (?, ?, ?, 'TEXT', ?, ?)",
+        [(rng.choice(category_ids), text(rng, 2, 4), text(rng, 8, 30),
+          '["' + rng.choice(WORDS).lower() + '"]', text(rng, 3, 3))
+         for _ in range(num_items)]
+    )
+    conn.executemany(
+        "INSERT INTO notebook_tabs (title, content, position) VALUES (?, ?, ?)",
+        [(text(rng, 1, 3), text(rng, 50, 200), n) for n in range(num_items // 20)]
+    )
+    conn.executemany(
+        "INSERT INTO bookmarks (title, url, folder, order_index) VALUES (?, ?, ?, ?)",
+        [(text(rng, 2, 5), f"https://example.com/{n}/{rng.choice(WORDS)}", rng.choice(WORDS), n)
+         for n in range(num_items // 10)]
+    )
+    conn.executemany(
+        "INSERT INTO clipboard_history (item_id, content) VALUES (?, ?)",
+        [(rng.randint(1, num_items), text(rng, 5, 20)) for _ in range(num_items)]
+    )
+    for n in range(num_items // 100):
+        cursor = conn.execute("INSERT INTO browser_sessions (name) VALUES (?)", (text(rng, 1, 3),))
+        conn.executemany(
+            "INSERT INTO session_tabs (session_id, url, title, position) VALUES (?, ?, ?, ?)",
+            [(cursor.lastrowid, f"https://example.com/{position}", text(rng, 2, 5), position)
+             for position in range(rng.randint(2, 15))]
+        )
+    conn.commit()
+    db.close()
+
+
+def keystrokes() -> list:
+    return [query[:length] for query in TYPED_QUERIES for length in range(1, len(query) + 1)]
+
+
+def measure(search: UnifiedSearch) -> tuple:
+    """(ms por pulsación: mediana, p95 y máximo; resultados de cada consulta completa)"""
+    search.search("warmup")
+    timings = []
+    for query in keystrokes():
+        start = time.perf_counter()
+        search.search(query)
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    results = {query: sum(len(kind) for kind in search.search(query).values())
+               for query in TYPED_QUERIES}
+    return statistics.median(timings), timings[int(len(timings) * 0.95)], timings[-1], results
+
+
+def main():
+    num_items = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    logging.disable(logging.INFO)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = str(Path(tmp_dir) / "benchmark.db")
+        start = time.perf_counter()
+        populate(db_path, num_items, random.Random(42))
+        populate_s = time.perf_counter() - start
+
+        fts = UnifiedSearch(db_path)
+        like = UnifiedSearch(db_path)
+        like._items_fts = like._index_enabled = False
+
+        fts_median, fts_p95, fts_max, fts_results = measure(fts)
+        like_median, like_p95, like_max, like_results = measure(like)
+
+    print("=" * 60)
+    print(f"BÚSQUEDA COMÚN: {num_items} items, {num_items // 20} pestañas, {num_items // 10} marcadores,")
+    print(f"{num_items} entradas de historial, {num_items // 100} sesiones; {len(keystrokes())} pulsaciones")
+    print("=" * 60)
+    print(f"  Crear e indexar:           {populate_s:10.1f} s")
+    print(f"  FTS5 (search_index):       {fts_median:8.2f} ms mediana, {fts_p95:8.2f} p95, {fts_max:8.2f} máx")
+    print(f"  LIKE (sin FTS5):           {like_median:8.2f} ms mediana, {like_p95:8.2f} p95, {like_max:8.2f} máx")
+    print(f"  Objetivo < {TARGET_MS} ms (p95):     {'OK' if fts_p95 < TARGET_MS else 'NO'}")
+    print()
+    print("  Resultados (FTS5 / LIKE):")
+    for query in TYPED_QUERIES:
+        print(f"    {query!r:18} {fts_results[query]:6} / {like_results[query]:6}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Script de mantenimiento de los miembros materializados de Smart Collections
+
+Comprueba que collection_members coincide con ejecutar los filtros de cada
+colección en vivo y, si se pide, repara las diferencias o recalcula todo.
+
+Uso:
+    python util/migrations/rebuild_collection_members.py [db_path] [--repair | --rebuild]
+
+    (sin opciones)  solo comprobar
+    --repair        recalcular las colecciones con diferencias
+    --rebuild       recalcular todas las colecciones desde cero
+"""
+
+import sys
+import logging
+from pathlib import Path
+
+# Agregar src al path
+root_dir = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(root_dir / 'src'))
+
+from core.smart_collections_manager import SmartCollectionsManager
+
+
+def main() -> int:
+    logging.basicConfig(level=logging.WARNING, format='%(levelname)s - %(message)s')
+
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    options = {arg for arg in sys.argv[1:] if arg.startswith('--')}
+    db_path = Path(args[0]) if args else root_dir / "widget_sidebar.db"
+
+    if not db_path.exists():
+        print(f"❌ Database file not found: {db_path}")
+        return 1
+
+    manager = SmartCollectionsManager(str(db_path))
+
+    if '--rebuild' in options:
+        count = manager.rebuild_members()
+        print(f"✅ Recalculadas {count} colecciones materializadas")
+        return 0
+
+    problems = manager.check_members(repair='--repair' in options)
+    if not problems:
+        print("✅ Todas las colecciones materializadas están al día")
+        return 0
+
+    for collection_id, difference in problems.items():
+        collection = manager.get_collection(collection_id) or {'name': collection_id}
+        print(f"⚠️  {collection['name']}: {len(difference['missing'])} faltan, "
+              f"{len(difference['extra'])} sobran")
+    if '--repair' in options:
+        print(f"✅ Reparadas {len(problems)} colecciones")
+        return 0
+    print("Ejecuta con --repair para recalcularlas")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())